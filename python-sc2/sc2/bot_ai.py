@@ -20,6 +20,7 @@ from sc2.constants import (
     TERRAN_TECH_REQUIREMENT,
     ZERG_TECH_REQUIREMENT,
 )
+from sc2.damage_matrix import DamageMatrix
 from sc2.data import Alert, Race, Result, Target
 from sc2.dicts.unit_research_abilities import RESEARCH_INFO
 from sc2.dicts.unit_train_build_abilities import TRAIN_INFO
@@ -126,6 +127,15 @@ class BotAI(BotAIInternal):
         """Possible start locations for enemies."""
         return self.game_info.start_locations
 
+    @cached_property
+    def damage_matrix(self) -> DamageMatrix:
+        """Damage and DPS of many attackers against many targets at once, see DamageMatrix.
+
+        Example:
+        dps = self.damage_matrix.dps(self.units, self.enemy_units)
+        """
+        return DamageMatrix(self.game_data)
+
     @cached_property
     def main_base_ramp(self) -> Ramp:
         """Returns the Ramp instance of the closest main-ramp to start location.
@@ -1264,11 +1274,32 @@ class BotAI(BotAIInternal):
         :param unit_tag:
         """
 
+    async def on_units_destroyed(self, unit_tags: list[int]) -> None:
+        """
+        Called once per step with the tags of all units that died on this step.
+        Override this instead of 'on_unit_destroyed' to handle the deaths as a single batch.
+        The default implementation calls 'on_unit_destroyed' for every tag.
+
+        :param unit_tags:
+        """
+        for unit_tag in unit_tags:
+            await self.on_unit_destroyed(unit_tag)
+
     async def on_unit_created(self, unit: Unit) -> None:
         """Override this in your bot class. This function is called when a unit is created.
 
         :param unit:"""
 
+    async def on_units_created(self, units: list[Unit]) -> None:
+        """
+        Called once per step with all units that were created on this step.
+        The default implementation calls 'on_unit_created' for every unit.
+
+        :param units:
+        """
+        for unit in units:
+            await self.on_unit_created(unit)
+
     async def on_unit_type_changed(self, unit: Unit, previous_type: UnitTypeId) -> None:
         """Override this in your bot class. This function is called when a unit type has changed. To get the current UnitTypeId of the unit, use 'unit.type_id'
 
@@ -1330,6 +1361,26 @@ class BotAI(BotAIInternal):
         :param unit:
         """
 
+    async def on_enemy_units_entered_vision(self, units: list[Unit]) -> None:
+        """
+        Called once per step with all enemy units and structures that entered vision on this step.
+        The default implementation calls 'on_enemy_unit_entered_vision' for every unit.
+
+        :param units:
+        """
+        for unit in units:
+            await self.on_enemy_unit_entered_vision(unit)
+
+    async def on_enemy_units_left_vision(self, unit_tags: list[int]) -> None:
+        """
+        Called once per step with the tags of all enemy units and structures that left vision on this step.
+        The default implementation calls 'on_enemy_unit_left_vision' for every tag.
+
+        :param unit_tags:
+        """
+        for unit_tag in unit_tags:
+            await self.on_enemy_unit_left_vision(unit_tag)
+
     async def on_enemy_unit_left_vision(self, unit_tag: int) -> None:
         """
         Override this in your bot class. This function is called when an enemy unit (unit or structure) left vision (which was visible last frame).
@@ -43,6 +43,7 @@ from sc2.units import Units
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
     # pyre-ignore[21]
+    from scipy.spatial import cKDTree
     from scipy.spatial.distance import cdist, pdist
 
 if TYPE_CHECKING:
@@ -110,6 +111,8 @@ class BotAIInternal(ABC):
         self.race: Race | None = None
         self.enemy_race: Race | None = None
         self._generated_frame = -100
+        self._positions_frame = -100
+        self._tree_frame = -100
         self._units_created: Counter = Counter()
         self._unit_tags_seen_this_game: set[int] = set()
         self._units_previous_map: dict[int, Unit] = {}
@@ -117,6 +120,12 @@ class BotAIInternal(ABC):
         self._enemy_units_previous_map: dict[int, Unit] = {}
         self._enemy_structures_previous_map: dict[int, Unit] = {}
         self._all_units_previous_map: dict[int, Unit] = {}
+        # Tag maps of the current frame, filled in _prepare_units and swapped to the previous maps on the next step
+        self._units_map: dict[int, Unit] = {}
+        self._structures_map: dict[int, Unit] = {}
+        self._enemy_units_map: dict[int, Unit] = {}
+        self._enemy_structures_map: dict[int, Unit] = {}
+        self._all_units_map: dict[int, Unit] = {}
         self._previous_upgrades: set[UpgradeId] = set()
         self._expansion_positions_list: list[Point2] = []
         self._resource_location_to_expansion_position_dict: dict[Point2, set[Point2]] = {}
@@ -641,8 +650,11 @@ class BotAIInternal(ABC):
         if self.townhalls:
             self.game_info.player_start_location = self.townhalls.first.position
             # Calculate and cache expansion locations forever inside 'self._cache_expansion_locations', this is done to prevent a bug when this is run and cached later in the game
-            self._find_expansion_locations()
-        self.game_info.map_ramps, self.game_info.vision_blockers = self.game_info._find_ramps_and_vision_blockers()
+            # Expansion locations, ramps and vision blockers may already have been loaded in on_before_start
+            if not self._expansion_positions_list:
+                self._find_expansion_locations()
+        if self.game_info.map_ramps is None:
+            self.game_info.map_ramps, self.game_info.vision_blockers = self.game_info._find_ramps_and_vision_blockers()
         self._time_before_step: float = time.perf_counter()
 
     @final
@@ -656,13 +668,12 @@ class BotAIInternal(ABC):
         # update pathing grid, which unfortunately is in GameInfo instead of GameState
         self.game_info.pathing_grid = PixelMap(proto_game_info.game_info.start_raw.pathing_grid, in_bits=True)
         # Required for events, needs to be before self.units are initialized so the old units are stored
-        self._units_previous_map: dict[int, Unit] = {unit.tag: unit for unit in self.units}
-        self._structures_previous_map: dict[int, Unit] = {structure.tag: structure for structure in self.structures}
-        self._enemy_units_previous_map: dict[int, Unit] = {unit.tag: unit for unit in self.enemy_units}
-        self._enemy_structures_previous_map: dict[int, Unit] = {
-            structure.tag: structure for structure in self.enemy_structures
-        }
-        self._all_units_previous_map: dict[int, Unit] = {unit.tag: unit for unit in self.all_units}
+        # The maps of the last frame are swapped in, new maps are created while the units are prepared
+        self._units_previous_map: dict[int, Unit] = self._units_map
+        self._structures_previous_map: dict[int, Unit] = self._structures_map
+        self._enemy_units_previous_map: dict[int, Unit] = self._enemy_units_map
+        self._enemy_structures_previous_map: dict[int, Unit] = self._enemy_structures_map
+        self._all_units_previous_map: dict[int, Unit] = self._all_units_map
 
         self._prepare_units()
         self.minerals: int = state.common.minerals
@@ -709,6 +720,11 @@ class BotAIInternal(ABC):
         self.placeholders: Units = Units([], self)
         self.techlab_tags: set[int] = set()
         self.reactor_tags: set[int] = set()
+        units_map: dict[int, Unit] = {}
+        structures_map: dict[int, Unit] = {}
+        enemy_units_map: dict[int, Unit] = {}
+        enemy_structures_map: dict[int, Unit] = {}
+        all_units_map: dict[int, Unit] = {}
 
         worker_types: set[UnitTypeId] = {UnitTypeId.DRONE, UnitTypeId.DRONEBURROWED, UnitTypeId.SCV, UnitTypeId.PROBE}
 
@@ -725,6 +741,7 @@ class BotAIInternal(ABC):
                 unit_obj = Unit(unit, self, distance_calculation_index=index, base_build=self.base_build)
                 index += 1
                 self.all_units.append(unit_obj)
+                all_units_map[unit.tag] = unit_obj
                 if unit.display_type == IS_PLACEHOLDER:
                     self.placeholders.append(unit_obj)
                     continue
@@ -751,6 +768,7 @@ class BotAIInternal(ABC):
                     unit_id: UnitTypeId = unit_obj.type_id
                     if unit_obj.is_structure:
                         self.structures.append(unit_obj)
+                        structures_map[unit.tag] = unit_obj
                         if unit_id in race_townhalls[self.race]:
                             self.townhalls.append(unit_obj)
                         elif unit_id in ALL_GAS or unit_obj.vespene_contents:
@@ -772,6 +790,7 @@ class BotAIInternal(ABC):
                             self.reactor_tags.add(unit_obj.tag)
                     else:
                         self.units.append(unit_obj)
+                        units_map[unit.tag] = unit_obj
                         if unit_id in worker_types:
                             self.workers.append(unit_obj)
                         elif unit_id == UnitTypeId.LARVA:
@@ -781,8 +800,16 @@ class BotAIInternal(ABC):
                     self.all_enemy_units.append(unit_obj)
                     if unit_obj.is_structure:
                         self.enemy_structures.append(unit_obj)
+                        enemy_structures_map[unit.tag] = unit_obj
                     else:
                         self.enemy_units.append(unit_obj)
+                        enemy_units_map[unit.tag] = unit_obj
+
+        self._units_map = units_map
+        self._structures_map = structures_map
+        self._enemy_units_map = enemy_units_map
+        self._enemy_structures_map = enemy_structures_map
+        self._all_units_map = all_units_map
 
         # Force distance calculation and caching on all units using scipy pdist or cdist
         if self.distance_calculation_method == 1:
@@ -842,20 +869,25 @@ class BotAIInternal(ABC):
 
     @final
     async def _issue_unit_added_events(self) -> None:
-        for unit in self.units:
-            if unit.tag not in self._units_previous_map and unit.tag not in self._unit_tags_seen_this_game:
-                self._unit_tags_seen_this_game.add(unit.tag)
+        previous_tags = self._units_previous_map.keys()
+        new_tags: set[int] = self._units_map.keys() - previous_tags - self._unit_tags_seen_this_game
+        if new_tags:
+            created: list[Unit] = [self._units_map[unit_tag] for unit_tag in new_tags]
+            self._unit_tags_seen_this_game |= new_tags
+            for unit in created:
                 self._units_created[unit.type_id] += 1
-                await self.on_unit_created(unit)
-            elif unit.tag in self._units_previous_map:
-                previous_frame_unit: Unit = self._units_previous_map[unit.tag]
-                # Check if a unit took damage this frame and then trigger event
-                if unit.health < previous_frame_unit.health or unit.shield < previous_frame_unit.shield:
-                    damage_amount = previous_frame_unit.health - unit.health + previous_frame_unit.shield - unit.shield
-                    await self.on_unit_took_damage(unit, damage_amount)
-                # Check if a unit type has changed
-                if previous_frame_unit.type_id != unit.type_id:
-                    await self.on_unit_type_changed(unit, previous_frame_unit.type_id)
+            await self.on_units_created(created)
+
+        for unit_tag in self._units_map.keys() & previous_tags:
+            unit: Unit = self._units_map[unit_tag]
+            previous_frame_unit: Unit = self._units_previous_map[unit_tag]
+            # Check if a unit took damage this frame and then trigger event
+            if unit.health < previous_frame_unit.health or unit.shield < previous_frame_unit.shield:
+                damage_amount = previous_frame_unit.health - unit.health + previous_frame_unit.shield - unit.shield
+                await self.on_unit_took_damage(unit, damage_amount)
+            # Check if a unit type has changed
+            if previous_frame_unit.type_id != unit.type_id:
+                await self.on_unit_type_changed(unit, previous_frame_unit.type_id)
 
     @final
     async def _issue_upgrade_events(self) -> None:
@@ -867,16 +899,16 @@ class BotAIInternal(ABC):
     @final
     async def _issue_building_events(self) -> None:
         for structure in self.structures:
-            if structure.tag not in self._structures_previous_map:
+            previous_frame_structure: Unit | None = self._structures_previous_map.get(structure.tag, None)
+            if previous_frame_structure is None:
                 if structure.build_progress < 1:
                     await self.on_building_construction_started(structure)
                 else:
                     # Include starting townhall
                     self._units_created[structure.type_id] += 1
                     await self.on_building_construction_complete(structure)
-            elif structure.tag in self._structures_previous_map:
+            else:
                 # Check if a structure took damage this frame and then trigger event
-                previous_frame_structure: Unit = self._structures_previous_map[structure.tag]
                 if (
                     structure.health < previous_frame_structure.health
                     or structure.shield < previous_frame_structure.shield
@@ -899,25 +931,28 @@ class BotAIInternal(ABC):
     @final
     async def _issue_vision_events(self) -> None:
         # Call events for enemy unit entered vision
-        for enemy_unit in self.enemy_units:
-            if enemy_unit.tag not in self._enemy_units_previous_map:
-                await self.on_enemy_unit_entered_vision(enemy_unit)
-        for enemy_structure in self.enemy_structures:
-            if enemy_structure.tag not in self._enemy_structures_previous_map:
-                await self.on_enemy_unit_entered_vision(enemy_structure)
+        entered_vision: list[Unit] = [
+            self._enemy_units_map[unit_tag]
+            for unit_tag in self._enemy_units_map.keys() - self._enemy_units_previous_map.keys()
+        ]
+        entered_vision.extend(
+            self._enemy_structures_map[unit_tag]
+            for unit_tag in self._enemy_structures_map.keys() - self._enemy_structures_previous_map.keys()
+        )
+        if entered_vision:
+            await self.on_enemy_units_entered_vision(entered_vision)
 
         # Call events for enemy unit left vision
-        enemy_units_left_vision: set[int] = set(self._enemy_units_previous_map) - self.enemy_units.tags
-        for enemy_unit_tag in enemy_units_left_vision:
-            await self.on_enemy_unit_left_vision(enemy_unit_tag)
-        enemy_structures_left_vision: set[int] = set(self._enemy_structures_previous_map) - self.enemy_structures.tags
-        for enemy_structure_tag in enemy_structures_left_vision:
-            await self.on_enemy_unit_left_vision(enemy_structure_tag)
+        left_vision: list[int] = list(self._enemy_units_previous_map.keys() - self._enemy_units_map.keys())
+        left_vision.extend(self._enemy_structures_previous_map.keys() - self._enemy_structures_map.keys())
+        if left_vision:
+            await self.on_enemy_units_left_vision(left_vision)
 
     @final
     async def _issue_unit_dead_events(self) -> None:
-        for unit_tag in self.state.dead_units & set(self._all_units_previous_map):
-            await self.on_unit_destroyed(unit_tag)
+        dead_tags: set[int] = self.state.dead_units & self._all_units_previous_map.keys()
+        if dead_tags:
+            await self.on_units_destroyed(list(dead_tags))
 
     # DISTANCE CALCULATION
 
@@ -942,17 +977,36 @@ class BotAIInternal(ABC):
             return self.calculate_distances()
         return self._cached_cdist
 
+    @final
+    @property
+    def _all_units_positions(self) -> np.ndarray:
+        """Positions of all_units as an array of shape (n, 2), row i belongs to the unit with distance_calculation_index i.
+        Calculated once per game_loop and shared by distance calculations and sc2.points.Points, do not modify."""
+        if self._positions_frame != self.state.game_loop:
+            self._positions_frame = self.state.game_loop
+            # Converts tuple [(1, 2), (3, 4)] to flat list like [1, 2, 3, 4]
+            flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
+            # Converts to numpy array, then converts the flat array back to shape (n, 2): [[1, 2], [3, 4]]
+            self._cached_positions = np.fromiter(
+                flat_positions,
+                dtype=float,
+                count=2 * self._units_count,
+            ).reshape((-1, 2))
+        return self._cached_positions
+
+    @final
+    @property
+    def _all_units_tree(self) -> cKDTree:
+        """KD-tree of _all_units_positions, built once per game_loop and shared by the spatially indexed Units queries."""
+        if self._tree_frame != self.state.game_loop:
+            self._tree_frame = self.state.game_loop
+            self._cached_tree = cKDTree(self._all_units_positions)
+        return self._cached_tree
+
     @final
     def _calculate_distances_method1(self) -> np.ndarray:
         self._generated_frame = self.state.game_loop
-        # Converts tuple [(1, 2), (3, 4)] to flat list like [1, 2, 3, 4]
-        flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
-        # Converts to numpy array, then converts the flat array back to shape (n, 2): [[1, 2], [3, 4]]
-        positions_array: np.ndarray = np.fromiter(
-            flat_positions,
-            dtype=float,
-            count=2 * self._units_count,
-        ).reshape((self._units_count, 2))
+        positions_array: np.ndarray = self._all_units_positions
         assert len(positions_array) == self._units_count
         # See performance benchmarks
         self._cached_pdist = pdist(positions_array, "sqeuclidean")
@@ -962,14 +1016,7 @@ class BotAIInternal(ABC):
     @final
     def _calculate_distances_method2(self) -> np.ndarray:
         self._generated_frame = self.state.game_loop
-        # Converts tuple [(1, 2), (3, 4)] to flat list like [1, 2, 3, 4]
-        flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
-        # Converts to numpy array, then converts the flat array back to shape (n, 2): [[1, 2], [3, 4]]
-        positions_array: np.ndarray = np.fromiter(
-            flat_positions,
-            dtype=float,
-            count=2 * self._units_count,
-        ).reshape((self._units_count, 2))
+        positions_array: np.ndarray = self._all_units_positions
         assert len(positions_array) == self._units_count
         # See performance benchmarks
         self._cached_cdist = cdist(positions_array, positions_array, "sqeuclidean")
@@ -980,12 +1027,7 @@ class BotAIInternal(ABC):
     def _calculate_distances_method3(self) -> np.ndarray:
         """Nearly same as above, but without asserts"""
         self._generated_frame = self.state.game_loop
-        flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
-        positions_array: np.ndarray = np.fromiter(
-            flat_positions,
-            dtype=float,
-            count=2 * self._units_count,
-        ).reshape((-1, 2))
+        positions_array: np.ndarray = self._all_units_positions
         # See performance benchmarks
         self._cached_cdist = cdist(positions_array, positions_array, "sqeuclidean")
 
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from sc2.constants import DAMAGE_BONUS_PER_UPGRADE, IS_LIGHT
+from sc2.data import Attribute, TargetType
+from sc2.ids.buff_id import BuffId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+if TYPE_CHECKING:
+    from sc2.game_data import GameData
+    from sc2.unit import Unit
+    from sc2.units import Units
+
+UPGRADE_LEVELS = 4
+# No unit has more than two weapons in game data
+WEAPON_SLOTS = 2
+MIN_DAMAGE = 0.5
+
+
+class Weapon(NamedTuple):
+    type: int
+    damage: float
+    attacks: int
+    range: float
+    speed: float
+    damage_bonus: tuple = ()
+
+
+# Units that don't have their weapons in game data
+HARDCODED_WEAPONS: dict[UnitTypeId, list[Weapon]] = {
+    UnitTypeId.BATTLECRUISER: [
+        Weapon(TargetType.Ground.value, 8, 1, 6, 0.224),
+        Weapon(TargetType.Air.value, 5, 1, 6, 0.224),
+    ],
+    # Expect fully loaded bunker with marines
+    UnitTypeId.BUNKER: [Weapon(TargetType.Any.value, 6, 4, 6, 0.854)],
+}
+
+# Weapon speed is divided by these when the unit has the buff
+BUFF_SPEED_DIVISORS: dict[UnitTypeId, tuple[BuffId, float]] = {
+    UnitTypeId.MARINE: (BuffId.STIMPACK, 1.5),
+    UnitTypeId.MARAUDER: (BuffId.STIMPACKMARAUDER, 1.5),
+}
+# Weapon speed of our units is divided by these when we have the upgrade
+UPGRADE_SPEED_DIVISORS: dict[UnitTypeId, tuple[UpgradeId, float]] = {
+    UnitTypeId.ZERGLING: (UpgradeId.ZERGLINGATTACKSPEED, 1.4),
+    UnitTypeId.ADEPT: (UpgradeId.ADEPTPIERCINGATTACK, 1.45),
+}
+# Weapon range of our units is increased by these when we have the upgrade
+UPGRADE_RANGE_BONUSES: dict[UnitTypeId, tuple[UpgradeId, float]] = {
+    UnitTypeId.HYDRALISK: (UpgradeId.EVOLVEGROOVEDSPINES, 1),
+    UnitTypeId.PHOENIX: (UpgradeId.PHOENIXRANGEUPGRADE, 2),
+    UnitTypeId.PLANETARYFORTRESS: (UpgradeId.HISECAUTOTRACKING, 1),
+    UnitTypeId.MISSILETURRET: (UpgradeId.HISECAUTOTRACKING, 1),
+    UnitTypeId.AUTOTURRET: (UpgradeId.HISECAUTOTRACKING, 1),
+}
+# Light bonus of hellions with blue flame
+BLUE_FLAME_BONUS = 5
+
+
+class DamageMatrix:
+    """Damage and DPS of many attackers against many targets at once, as in Unit.calculate_damage_vs_target.
+
+    Damage per attack of every weapon of an attacker type against every target type and attack upgrade level
+    is calculated from game data when the attacker type is first used. Armor, shields, buffs and upgrades of
+    the units are then applied to all pairs of attackers and targets with NumPy.
+
+    Differences to Unit.calculate_damage_vs_target:
+    - Overkill damage is always included
+    - Bunkers attack as four marines, so armor reduces their damage
+    - Battlecruiser attacks break shields like other weapons instead of using shield armor for the whole attack
+    """
+
+    def __init__(self, game_data: GameData) -> None:
+        self._game_data = game_data
+        type_values = sorted(game_data.units)
+        size = max(max(type_values), max(type_id.value for type_id in UnitTypeId)) + 1
+        # Row of every unit type in the target arrays. Unknown types use the last row, which has no armor or attributes
+        self._target_rows = np.full(size, len(type_values), dtype=np.int32)
+        self._target_rows[type_values] = np.arange(len(type_values))
+
+        rows = len(type_values) + 1
+        self.armor = np.zeros(rows, dtype=float)
+        self.attributes = np.zeros((rows, max(attribute.value for attribute in Attribute) + 1), dtype=bool)
+        for row, type_value in enumerate(type_values):
+            proto = game_data.units[type_value]._proto
+            self.armor[row] = proto.armor
+            self.attributes[row, list(proto.attributes)] = True
+
+        # Row of every attacker type, -1 until the type is first used. The arrays grow when attacker types are added.
+        self._attacker_rows = np.full(size, -1, dtype=np.int32)
+        self._attacker_count = 0
+        # Damage per attack of every weapon against every target type and upgrade level
+        self._damage = np.zeros((0, rows, WEAPON_SLOTS, UPGRADE_LEVELS), dtype=float)
+        # TargetType of every weapon, 0 for empty weapon slots
+        self._weapon_types = np.zeros((0, WEAPON_SLOTS), dtype=np.int32)
+        self._attacks = np.zeros((0, WEAPON_SLOTS), dtype=float)
+        self._ranges = np.zeros((0, WEAPON_SLOTS), dtype=float)
+        self._speeds = np.zeros((0, WEAPON_SLOTS), dtype=float)
+        self._light_bonus = np.zeros((0, WEAPON_SLOTS), dtype=bool)
+
+    def attacker_rows(self, type_values: np.ndarray) -> np.ndarray:
+        """Rows of the attacker types in the damage arrays, calculating the damage of new types."""
+        rows = self._attacker_rows[type_values]
+        if (rows < 0).any():
+            for type_value in np.unique(type_values[rows < 0]):
+                self._add_attacker(int(type_value))
+            rows = self._attacker_rows[type_values]
+        return rows
+
+    def target_rows(self, type_values: np.ndarray) -> np.ndarray:
+        return self._target_rows[type_values]
+
+    def _add_attacker(self, type_value: int) -> None:
+        type_id = UnitTypeId(type_value)
+        if type_id in HARDCODED_WEAPONS:
+            weapons = HARDCODED_WEAPONS[type_id]
+        elif type_value in self._game_data.units:
+            weapons = self._game_data.units[type_value]._proto.weapons
+        else:
+            weapons = []
+
+        row = self._attacker_count
+        if row == len(self._damage):
+            capacity = max(16, 2 * row)
+            self._damage = self._grow(self._damage, capacity)
+            self._weapon_types = self._grow(self._weapon_types, capacity)
+            self._attacks = self._grow(self._attacks, capacity)
+            self._ranges = self._grow(self._ranges, capacity)
+            self._speeds = self._grow(self._speeds, capacity)
+            self._light_bonus = self._grow(self._light_bonus, capacity)
+
+        levels = np.arange(UPGRADE_LEVELS)
+        for slot, weapon in enumerate(weapons[:WEAPON_SLOTS]):
+            bonus_per_upgrade = DAMAGE_BONUS_PER_UPGRADE.get(type_id, {}).get(weapon.type, {})
+            damage = weapon.damage + levels * bonus_per_upgrade.get(None, 1)
+            # Only the largest bonus against the attributes of the target is applied
+            bonus = np.zeros((len(self.armor), UPGRADE_LEVELS), dtype=float)
+            for damage_bonus in weapon.damage_bonus:
+                values = damage_bonus.bonus + levels * bonus_per_upgrade.get(damage_bonus.attribute, 0)
+                bonus = np.maximum(bonus, np.where(self.attributes[:, damage_bonus.attribute, np.newaxis], values, 0))
+                if damage_bonus.attribute == IS_LIGHT:
+                    self._light_bonus[row, slot] = True
+
+            self._damage[row, :, slot] = damage + bonus
+            self._weapon_types[row, slot] = weapon.type
+            self._attacks[row, slot] = weapon.attacks
+            self._ranges[row, slot] = weapon.range
+            self._speeds[row, slot] = weapon.speed
+
+        self._attacker_rows[type_value] = row
+        self._attacker_count += 1
+
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    def damage_by_type(
+        self,
+        attacker_types: np.ndarray,
+        target_types: np.ndarray,
+        target_flying: np.ndarray,
+        attack_upgrades: np.ndarray | int = 0,
+        armor_upgrades: np.ndarray | int = 0,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Damage per full attack, weapon speed and weapon range of attacker types against target types without
+        shields, buffs or upgrades other than the attack and armor levels.
+
+        :param attacker_types: UnitTypeId values of the attackers
+        :param target_types: UnitTypeId values of the targets
+        :param target_flying: Mask of the targets that are flying
+        :param attack_upgrades: Attack upgrade levels of the attackers
+        :param armor_upgrades: Armor upgrade levels of the targets
+        :return: Arrays of shape (attackers, targets)
+        """
+        attacker_types = np.asarray(attacker_types, dtype=np.int32)
+        target_types = np.asarray(target_types, dtype=np.int32)
+        attacker_count = len(attacker_types)
+        target_count = len(target_types)
+        target_rows = self.target_rows(target_types)
+        return self._calculate(
+            attackers=self.attacker_rows(attacker_types),
+            ready=np.ones(attacker_count, dtype=bool),
+            attack_upgrades=np.broadcast_to(attack_upgrades, attacker_count),
+            speed_divisors=np.ones(attacker_count),
+            range_bonuses=np.zeros(attacker_count),
+            light_bonuses=np.zeros(attacker_count),
+            targets=target_rows,
+            layers=self._layers(target_types, np.asarray(target_flying, dtype=bool)),
+            armor=self.armor[target_rows] + armor_upgrades,
+            shield_armor=np.zeros(target_count),
+            guardian_shield=np.zeros(target_count, dtype=bool),
+            shield=np.zeros(target_count),
+        )
+
+    def dps_by_type(
+        self,
+        attacker_types: np.ndarray,
+        target_types: np.ndarray,
+        target_flying: np.ndarray,
+        attack_upgrades: np.ndarray | int = 0,
+        armor_upgrades: np.ndarray | int = 0,
+    ) -> np.ndarray:
+        """Same as damage_by_type for DPS."""
+        return self._dps(
+            *self.damage_by_type(attacker_types, target_types, target_flying, attack_upgrades, armor_upgrades)
+        )
+
+    def damage(
+        self, attackers: Units | list[Unit], targets: Units | list[Unit], ignore_armor: bool = False
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Damage per full attack, weapon speed and weapon range of every attacker against every target, as in
+        Unit.calculate_damage_vs_target.
+
+        :param attackers:
+        :param targets:
+        :param ignore_armor:
+        :return: Arrays of shape (attackers, targets)
+        """
+        attacker_count = len(attackers)
+        target_count = len(targets)
+        attacker_types = np.fromiter(
+            (unit._proto.unit_type for unit in attackers), dtype=np.int32, count=attacker_count
+        )
+        target_types = np.fromiter((unit._proto.unit_type for unit in targets), dtype=np.int32, count=target_count)
+
+        attack_upgrades = np.fromiter(
+            (unit.attack_upgrade_level for unit in attackers), dtype=np.int32, count=attacker_count
+        )
+        ready = np.fromiter((self._can_attack(unit) for unit in attackers), dtype=bool, count=attacker_count)
+        modifiers = np.array([self._attacker_modifiers(unit) for unit in attackers], dtype=float).reshape(-1, 3)
+
+        target_rows = self.target_rows(target_types)
+        flying = np.fromiter((unit.is_flying for unit in targets), dtype=bool, count=target_count)
+        shield = np.fromiter((unit.shield for unit in targets), dtype=float, count=target_count)
+        if ignore_armor:
+            armor = np.zeros(target_count)
+            shield_armor = np.zeros(target_count)
+            guardian_shield = np.zeros(target_count, dtype=bool)
+        else:
+            armor_modifiers = np.array([self._armor_modifiers(unit) for unit in targets], dtype=float).reshape(-1, 3)
+            armor = self.armor[target_rows] + armor_modifiers[:, 0]
+            shield_armor = armor_modifiers[:, 1]
+            guardian_shield = armor_modifiers[:, 2] > 0
+
+        return self._calculate(
+            attackers=self.attacker_rows(attacker_types),
+            ready=ready,
+            attack_upgrades=attack_upgrades,
+            speed_divisors=modifiers[:, 0],
+            range_bonuses=modifiers[:, 1],
+            light_bonuses=modifiers[:, 2],
+            targets=target_rows,
+            layers=self._layers(target_types, flying),
+            armor=armor,
+            shield_armor=shield_armor,
+            guardian_shield=guardian_shield,
+            shield=shield,
+        )
+
+    def dps(self, attackers: Units | list[Unit], targets: Units | list[Unit], ignore_armor: bool = False) -> np.ndarray:
+        """DPS of every attacker against every target as an array of shape (attackers, targets), as in
+        Unit.calculate_dps_vs_target."""
+        return self._dps(*self.damage(attackers, targets, ignore_armor))
+
+    @staticmethod
+    def _dps(damage: np.ndarray, speed: np.ndarray, weapon_range: np.ndarray) -> np.ndarray:
+        return np.divide(damage, speed, out=np.zeros_like(damage), where=speed > 0)
+
+    @staticmethod
+    def _layers(target_types: np.ndarray, flying: np.ndarray) -> np.ndarray:
+        """TargetType values of the weapons that can hit the targets as bit masks."""
+        layers = np.where(flying, TargetType.Air.value, TargetType.Ground.value)
+        # Colossus can be hit by both ground and air weapons
+        layers[target_types == UnitTypeId.COLOSSUS.value] = TargetType.Any.value
+        return layers
+
+    @staticmethod
+    def _can_attack(unit: Unit) -> bool:
+        # Structures that are not completed can't attack
+        if not unit.is_ready:
+            return False
+        if unit.type_id == UnitTypeId.BUNKER:
+            return unit.is_enemy and unit.is_active
+        return True
+
+    @staticmethod
+    def _attacker_modifiers(unit: Unit) -> tuple[float, float, float]:
+        """Weapon speed divisor, range bonus and light damage bonus of the attacker."""
+        type_id = unit.type_id
+        speed_divisor = 1.0
+        range_bonus = 0.0
+        light_bonus = 0.0
+        upgrades = unit._bot_object.state.upgrades
+        if type_id in BUFF_SPEED_DIVISORS:
+            buff, divisor = BUFF_SPEED_DIVISORS[type_id]
+            if buff in unit.buffs:
+                speed_divisor = divisor
+        elif type_id in UPGRADE_SPEED_DIVISORS:
+            upgrade, divisor = UPGRADE_SPEED_DIVISORS[type_id]
+            if unit.is_mine and upgrade in upgrades:
+                speed_divisor = divisor
+        elif type_id in UPGRADE_RANGE_BONUSES:
+            upgrade, bonus = UPGRADE_RANGE_BONUSES[type_id]
+            if unit.is_mine and upgrade in upgrades:
+                range_bonus = bonus
+        elif type_id == UnitTypeId.HELLION and UpgradeId.HIGHCAPACITYBARRELS in upgrades:
+            light_bonus = BLUE_FLAME_BONUS
+        return speed_divisor, range_bonus, light_bonus
+
+    @staticmethod
+    def _armor_modifiers(unit: Unit) -> tuple[float, float, float]:
+        """Armor bonus, shield armor and guardian shield of the target."""
+        armor = unit.armor_upgrade_level
+        shield_armor = unit.shield_upgrade_level
+        # Ultralisk armor upgrade, only works if target belongs to the bot calling this function
+        if (
+            unit.type_id in {UnitTypeId.ULTRALISK, UnitTypeId.ULTRALISKBURROWED}
+            and unit.is_mine
+            and UpgradeId.CHITINOUSPLATING in unit._bot_object.state.upgrades
+        ):
+            armor += 2
+        buffs = unit.buffs
+        # Anti armor missile of raven
+        if BuffId.RAVENSHREDDERMISSILETINT in buffs:
+            armor -= 2
+            shield_armor -= 2
+        return armor, shield_armor, BuffId.GUARDIANSHIELD in buffs
+
+    def _calculate(
+        self,
+        attackers: np.ndarray,
+        ready: np.ndarray,
+        attack_upgrades: np.ndarray,
+        speed_divisors: np.ndarray,
+        range_bonuses: np.ndarray,
+        light_bonuses: np.ndarray,
+        targets: np.ndarray,
+        layers: np.ndarray,
+        armor: np.ndarray,
+        shield_armor: np.ndarray,
+        guardian_shield: np.ndarray,
+        shield: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Arrays are per attacker or per target. Pair arrays below are of shape (attackers, targets, weapons)."""
+        attack_upgrades = np.clip(attack_upgrades, 0, UPGRADE_LEVELS - 1)[:, np.newaxis]
+        per_attack = self._damage[attackers[:, np.newaxis], targets[np.newaxis, :], :, attack_upgrades]
+        light = self.attributes[targets, Attribute.Light.value]
+        per_attack = per_attack + (
+            light_bonuses[:, np.newaxis, np.newaxis]
+            * light[np.newaxis, :, np.newaxis]
+            * self._light_bonus[attackers][:, np.newaxis, :]
+        )
+
+        # Guardian shield adds 2 armor against ranged weapons
+        ranges = self._ranges[attackers][:, np.newaxis, :]
+        guardian_armor = 2 * (guardian_shield[np.newaxis, :, np.newaxis] & (ranges >= 2))
+        armor = armor[np.newaxis, :, np.newaxis] + guardian_armor
+        shield_armor = shield_armor[np.newaxis, :, np.newaxis] + guardian_armor
+        per_health_attack = np.maximum(MIN_DAMAGE, per_attack - armor)
+        per_shield_attack = np.maximum(MIN_DAMAGE, per_attack - shield_armor)
+
+        # Attacks hit shields until they are gone, the rest of the attack that breaks the shield hits health
+        attacks = self._attacks[attackers][:, np.newaxis, :]
+        shield = shield[np.newaxis, :, np.newaxis]
+        shield_attacks = np.where(shield > 0, np.minimum(attacks, np.ceil(shield / per_shield_attack)), 0)
+        shield_left = shield - shield_attacks * per_shield_attack
+        overflow = np.maximum(0, -shield_left)
+        health_damage = np.where(overflow > 0, np.maximum(MIN_DAMAGE, overflow - armor), 0)
+        health_damage += (attacks - shield_attacks) * per_health_attack
+        damage = shield - np.maximum(0, shield_left) + health_damage
+
+        # Weapon with the most damage against each target, as in calculate_damage_vs_target
+        usable = (self._weapon_types[attackers][:, np.newaxis, :] & layers[np.newaxis, :, np.newaxis]) != 0
+        usable &= ready[:, np.newaxis, np.newaxis]
+        damage = np.where(usable, damage, -1)
+        best = np.argmax(damage, axis=2)[..., np.newaxis]
+        damage = np.take_along_axis(damage, best, axis=2)[..., 0]
+        can_attack = damage >= 0
+        speed = np.take_along_axis(np.broadcast_to(self._speeds[attackers][:, np.newaxis, :], usable.shape), best, 2)
+        weapon_range = np.take_along_axis(np.broadcast_to(ranges, usable.shape), best, 2)
+
+        damage = np.where(can_attack, damage, 0)
+        speed = np.where(can_attack, speed[..., 0] / speed_divisors[:, np.newaxis], 0)
+        weapon_range = np.where(can_attack, weapon_range[..., 0] + range_bonuses[:, np.newaxis], 0)
+        return damage, speed, weapon_range
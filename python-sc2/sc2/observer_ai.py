@@ -109,11 +109,31 @@ class ObserverAI(BotAIInternal):
         :param unit_tag:
         """
 
+    async def on_units_destroyed(self, unit_tags: list[int]) -> None:
+        """
+        Called once per step with the tags of all units that died on this step.
+        The default implementation calls 'on_unit_destroyed' for every tag.
+
+        :param unit_tags:
+        """
+        for unit_tag in unit_tags:
+            await self.on_unit_destroyed(unit_tag)
+
     async def on_unit_created(self, unit: Unit) -> None:
         """Override this in your bot class. This function is called when a unit is created.
 
         :param unit:"""
 
+    async def on_units_created(self, units: list[Unit]) -> None:
+        """
+        Called once per step with all units that were created on this step.
+        The default implementation calls 'on_unit_created' for every unit.
+
+        :param units:
+        """
+        for unit in units:
+            await self.on_unit_created(unit)
+
     async def on_building_construction_started(self, unit: Unit) -> None:
         """
         Override this in your bot class.
@@ -137,6 +157,40 @@ class ObserverAI(BotAIInternal):
         :param upgrade:
         """
 
+    async def on_enemy_unit_entered_vision(self, unit: Unit) -> None:
+        """
+        Override this in your bot class. This function is called when an enemy unit (unit or structure) entered vision (which was not visible last frame).
+
+        :param unit:
+        """
+
+    async def on_enemy_units_entered_vision(self, units: list[Unit]) -> None:
+        """
+        Called once per step with all enemy units and structures that entered vision on this step.
+        The default implementation calls 'on_enemy_unit_entered_vision' for every unit.
+
+        :param units:
+        """
+        for unit in units:
+            await self.on_enemy_unit_entered_vision(unit)
+
+    async def on_enemy_unit_left_vision(self, unit_tag: int) -> None:
+        """
+        Override this in your bot class. This function is called when an enemy unit (unit or structure) left vision (which was visible last frame).
+
+        :param unit_tag:
+        """
+
+    async def on_enemy_units_left_vision(self, unit_tags: list[int]) -> None:
+        """
+        Called once per step with the tags of all enemy units and structures that left vision on this step.
+        The default implementation calls 'on_enemy_unit_left_vision' for every tag.
+
+        :param unit_tags:
+        """
+        for unit_tag in unit_tags:
+            await self.on_enemy_unit_left_vision(unit_tag)
+
     async def on_start(self) -> None:
         """
         Override this in your bot class. This function is called after "on_start".
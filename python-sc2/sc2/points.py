@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sc2.position import Point2
+
+if TYPE_CHECKING:
+    from sc2.unit import Unit
+    from sc2.units import Units
+
+
+def _xy(target: Unit | Point2 | tuple[float, float]) -> tuple[float, float]:
+    position = getattr(target, "position_tuple", target)
+    return position[0], position[1]
+
+
+class Points:
+    """A batch of 2d positions backed by an (n, 2) float array.
+
+    Point2 calculations create a new Python object for every intermediate value, which adds up when the same
+    calculation is done for many points. Points does the same calculations for all points at once.
+    Row order is kept in every operation that returns an array or a mask, so results can be mapped back
+    to the units or points that the batch was created from.
+
+    Example::
+
+        points = Points.from_units(self.units)
+        distances = points.distance_to(self.start_location)
+        close_units = self.units.subgroup(unit for unit, close in zip(self.units, distances < 10) if close)
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: np.ndarray) -> None:
+        """
+        :param array: Positions as an array of shape (n, 2).
+        """
+        assert array.ndim == 2 and array.shape[1] == 2, f"Expected an array of shape (n, 2), got {array.shape}"
+        self.array: np.ndarray = array
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point2 | tuple[float, float]]) -> Points:
+        flat = (coord for point in points for coord in (point[0], point[1]))
+        return cls(np.fromiter(flat, dtype=float).reshape((-1, 2)))
+
+    @classmethod
+    def from_units(cls, units: Units | list[Unit]) -> Points:
+        """Positions of units in the same order as the units.
+        Positions of 'bot.all_units' are calculated once per step and shared without copying."""
+        bot = getattr(units, "_bot_object", None)
+        if bot is not None and units is getattr(bot, "all_units", None):
+            return cls(bot._all_units_positions)
+        flat = (coord for unit in units for coord in unit.position_tuple)
+        return cls(np.fromiter(flat, dtype=float, count=2 * len(units)).reshape((-1, 2)))
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __bool__(self) -> bool:
+        return len(self.array) > 0
+
+    def __iter__(self) -> Iterator[Point2]:
+        return (Point2(row) for row in self.array.tolist())
+
+    def __getitem__(self, item: int | slice | np.ndarray) -> Point2 | Points:
+        """Integer index returns a single Point2, a slice, index array or boolean mask returns Points."""
+        if isinstance(item, (int, np.integer)):
+            return Point2(self.array[item].tolist())
+        return Points(self.array[item])
+
+    def __repr__(self) -> str:
+        return f"Points({self.array.tolist()})"
+
+    def to_list(self) -> list[Point2]:
+        return [Point2(row) for row in self.array.tolist()]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.array[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.array[:, 1]
+
+    @property
+    def center(self) -> Point2:
+        assert self, "Points is empty"
+        return Point2(self.array.mean(axis=0).tolist())
+
+    @property
+    def rounded(self) -> Points:
+        """Same as Point2.rounded for every point."""
+        return Points(np.floor(self.array))
+
+    def offset(self, p: Point2 | tuple[float, float]) -> Points:
+        return Points(self.array + _xy(p))
+
+    def distance_squared_to(self, target: Unit | Point2 | tuple[float, float]) -> np.ndarray:
+        """Squared distances from every point to the target, useful for comparisons."""
+        deltas = self.array - _xy(target)
+        return np.einsum("ij,ij->i", deltas, deltas)
+
+    def distance_to(self, target: Unit | Point2 | tuple[float, float]) -> np.ndarray:
+        """Distances from every point to the target."""
+        return np.sqrt(self.distance_squared_to(target))
+
+    def distance_matrix(self, other: Points) -> np.ndarray:
+        """Distances between every point of this batch (rows) and the other batch (columns)."""
+        deltas = self.array[:, np.newaxis, :] - other.array[np.newaxis, :, :]
+        return np.sqrt(np.einsum("ijk,ijk->ij", deltas, deltas))
+
+    def closest_index(self, target: Unit | Point2 | tuple[float, float]) -> int:
+        assert self, "Points is empty"
+        return int(np.argmin(self.distance_squared_to(target)))
+
+    def closest(self, target: Unit | Point2 | tuple[float, float]) -> Point2:
+        """Point of this batch that is closest to the target."""
+        return self[self.closest_index(target)]
+
+    def furthest_index(self, target: Unit | Point2 | tuple[float, float]) -> int:
+        assert self, "Points is empty"
+        return int(np.argmax(self.distance_squared_to(target)))
+
+    def furthest(self, target: Unit | Point2 | tuple[float, float]) -> Point2:
+        return self[self.furthest_index(target)]
+
+    def sort_indices(self, target: Unit | Point2 | tuple[float, float], reverse: bool = False) -> np.ndarray:
+        indices = np.argsort(self.distance_squared_to(target), kind="stable")
+        return indices[::-1] if reverse else indices
+
+    def sort_by_distance(self, target: Unit | Point2 | tuple[float, float], reverse: bool = False) -> Points:
+        """Points sorted by their distance to the target, closest first."""
+        return Points(self.array[self.sort_indices(target, reverse)])
+
+    def in_circle_mask(self, center: Unit | Point2 | tuple[float, float], radius: float) -> np.ndarray:
+        """Boolean mask of points that are at most radius away from center."""
+        return self.distance_squared_to(center) <= radius * radius
+
+    def in_circle(self, center: Unit | Point2 | tuple[float, float], radius: float) -> Points:
+        return Points(self.array[self.in_circle_mask(center, radius)])
+
+    def towards(
+        self, target: Unit | Point2 | tuple[float, float], distance: float | np.ndarray = 1, limit: bool = False
+    ) -> Points:
+        """Same as Point2.towards for every point. Points that are at the target are not moved.
+
+        :param target:
+        :param distance: A single distance, or a distance for each point.
+        :param limit: Don't move points past the target.
+        """
+        deltas = _xy(target) - self.array
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        if limit:
+            distance = np.minimum(lengths, distance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(lengths > 0, distance / lengths, 0.0)
+        return Points(self.array + deltas * scale[:, np.newaxis])
@@ -199,6 +199,34 @@ class Point2(Pointlike):
     def offset(self, p: Point2) -> Point2:
         return Point2((self[0] + p[0], self[1] + p[1]))
 
+    def towards(self, p: Unit | Pointlike, distance: int | float = 1, limit: bool = False) -> Point2:
+        """Same as Pointlike.towards, without creating intermediate objects.
+
+        :param p:
+        :param distance:
+        :param limit:
+        """
+        p = p.position
+        dx = p[0] - self[0]
+        dy = p[1] - self[1]
+        if abs(dx) <= EPSILON and abs(dy) <= EPSILON:
+            return self
+        d = math.hypot(dx, dy)
+        if limit:
+            distance = min(d, distance)
+        return self.__class__((self[0] + dx / d * distance, self[1] + dy / d * distance))
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            if len(other) == 2:
+                return abs(self[0] - other[0]) <= EPSILON and abs(self[1] - other[1]) <= EPSILON
+        except TypeError:
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
     def random_on_distance(self, distance) -> Point2:
         if isinstance(distance, (tuple, list)):  # interval
             distance = distance[0] + random.random() * (distance[1] - distance[0])
@@ -323,6 +351,11 @@ class Point2(Pointlike):
 
 
 class Point3(Point2):
+    # Point2 fast paths only handle two coordinates
+    towards = Pointlike.towards
+    __eq__ = Pointlike.__eq__
+    __hash__ = Pointlike.__hash__
+
     @classmethod
     def from_proto(cls, data) -> Point3:
         """
@@ -9,13 +9,23 @@ from typing import TYPE_CHECKING, Any
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
+from sc2.units_index import UnitsIndex, is_current_unit
 
 if TYPE_CHECKING:
     from sc2.bot_ai import BotAI
 
 
 class Units(list):
-    """A collection of Unit objects. Makes it easy to select units by selectors."""
+    """A collection of Unit objects. Makes it easy to select units by selectors.
+
+    Units objects with at least SPATIAL_INDEX_MIN_UNITS units that are queried more than once in the same game_loop
+    answer distance queries (closer_than, closest_to etc.) with the KD-tree that the bot builds for all units.
+    The results are the same as without the index.
+    """
+
+    SPATIAL_INDEX_MIN_UNITS: int = 32
+    _spatial_index: UnitsIndex | None = None
+    _spatial_queries: int = 0
 
     @classmethod
     def from_proto(cls, units, bot_object: BotAI) -> Units:
@@ -91,6 +101,66 @@ class Units(list):
     def __hash__(self) -> int:
         return hash(unit.tag for unit in self)
 
+    # Appending and extending change the length, which is checked before the spatial index is used.
+    # Other changes in place have to drop the index.
+
+    def __setitem__(self, key, value) -> None:
+        self._spatial_index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        self._spatial_index = None
+        super().__delitem__(key)
+
+    def insert(self, index, unit: Unit) -> None:
+        self._spatial_index = None
+        super().insert(index, unit)
+
+    def remove(self, unit: Unit) -> None:
+        self._spatial_index = None
+        super().remove(unit)
+
+    def pop(self, index=-1) -> Unit:
+        self._spatial_index = None
+        return super().pop(index)
+
+    def clear(self) -> None:
+        self._spatial_index = None
+        super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._spatial_index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._spatial_index = None
+        super().reverse()
+
+    def _index_for(self, position: Unit | Point2 | tuple[float, float]) -> UnitsIndex | None:
+        """Spatial index for a distance query to position, or None if the query should scan all units.
+
+        :param position:
+        """
+        if len(self) < self.SPATIAL_INDEX_MIN_UNITS:
+            return None
+        bot = self._bot_object
+        if isinstance(position, Unit) and not is_current_unit(bot, position):
+            return None
+        index = self._spatial_index
+        if index is None or index.game_loop != bot.state.game_loop or index.length != len(self):
+            # Building the index takes one pass over all units, so it is only built on the second query
+            self._spatial_queries += 1
+            if self._spatial_queries < 2:
+                return None
+            index = self._spatial_index = UnitsIndex(self, bot)
+        return index if index.valid else None
+
+    @staticmethod
+    def _center_of(position: Unit | Point2 | tuple[float, float]) -> tuple[float, float]:
+        if isinstance(position, Unit):
+            return position.position_tuple
+        return position[0], position[1]
+
     @property
     def amount(self) -> int:
         return len(self)
@@ -173,6 +243,14 @@ class Units(list):
         :param unit:
         :param bonus_distance:
         """
+        index = self._index_for(unit) if bonus_distance >= 0 else None
+        if index is not None:
+            reach = unit.radius + index.max_radius(self) + max(unit.ground_range, unit.air_range) + bonus_distance
+            return self.subgroup(
+                self[i]
+                for i in index.in_distance(unit.position_tuple, reach)
+                if unit.target_in_range(self[i], bonus_distance=bonus_distance)
+            )
         return self.filter(lambda x: unit.target_in_range(x, bonus_distance=bonus_distance))
 
     def closest_distance_to(self, position: Unit | Point2) -> float:
@@ -226,14 +304,16 @@ class Units(list):
         :param position:
         """
         assert self, "Units object is empty"
+        index = self._index_for(position)
+        units = self if index is None else [self[i] for i in index.closest_n(self._center_of(position), 1)]
         if isinstance(position, Unit):
             return min(
-                (unit1 for unit1 in self),
+                (unit1 for unit1 in units),
                 key=lambda unit2: self._bot_object._distance_squared_unit_to_unit(unit2, position),
             )
 
-        distances = self._bot_object._distance_units_to_pos(self, position)
-        return min(((unit, dist) for unit, dist in zip(self, distances)), key=lambda my_tuple: my_tuple[1])[0]
+        distances = self._bot_object._distance_units_to_pos(units, position)
+        return min(((unit, dist) for unit, dist in zip(units, distances)), key=lambda my_tuple: my_tuple[1])[0]
 
     def furthest_to(self, position: Unit | Point2) -> Unit:
         """Returns the furhest unit (from this Units object) to the target unit or position.
@@ -273,15 +353,17 @@ class Units(list):
         """
         if not self:
             return self
+        index = self._index_for(position)
+        units = self if index is None else [self[i] for i in index.in_distance(self._center_of(position), distance)]
         if isinstance(position, Unit):
             distance_squared = distance**2
             return self.subgroup(
                 unit
-                for unit in self
+                for unit in units
                 if self._bot_object._distance_squared_unit_to_unit(unit, position) < distance_squared
             )
-        distances = self._bot_object._distance_units_to_pos(self, position)
-        return self.subgroup(unit for unit, dist in zip(self, distances) if dist < distance)
+        distances = self._bot_object._distance_units_to_pos(units, position)
+        return self.subgroup(unit for unit, dist in zip(units, distances) if dist < distance)
 
     def further_than(self, distance: float, position: Unit | Point2) -> Units:
         """Returns all units (from this Units object) that are further than 'distance' away from target unit or position.
@@ -299,15 +381,17 @@ class Units(list):
         """
         if not self:
             return self
+        index = self._index_for(position)
+        units = self if index is None else [self[i] for i in index.not_in_distance(self._center_of(position), distance)]
         if isinstance(position, Unit):
             distance_squared = distance**2
             return self.subgroup(
                 unit
-                for unit in self
+                for unit in units
                 if distance_squared < self._bot_object._distance_squared_unit_to_unit(unit, position)
             )
-        distances = self._bot_object._distance_units_to_pos(self, position)
-        return self.subgroup(unit for unit, dist in zip(self, distances) if distance < dist)
+        distances = self._bot_object._distance_units_to_pos(units, position)
+        return self.subgroup(unit for unit, dist in zip(units, distances) if distance < dist)
 
     def in_distance_between(
         self, position: Unit | Point2 | tuple[float, float], distance1: float, distance2: float
@@ -328,18 +412,23 @@ class Units(list):
         """
         if not self:
             return self
+        index = self._index_for(position)
+        if index is None:
+            units = self
+        else:
+            units = [self[i] for i in index.in_distance_between(self._center_of(position), distance1, distance2)]
         if isinstance(position, Unit):
             distance1_squared = distance1**2
             distance2_squared = distance2**2
             return self.subgroup(
                 unit
-                for unit in self
+                for unit in units
                 if distance1_squared
                 < self._bot_object._distance_squared_unit_to_unit(unit, position)
                 < distance2_squared
             )
-        distances = self._bot_object._distance_units_to_pos(self, position)
-        return self.subgroup(unit for unit, dist in zip(self, distances) if distance1 < dist < distance2)
+        distances = self._bot_object._distance_units_to_pos(units, position)
+        return self.subgroup(unit for unit, dist in zip(units, distances) if distance1 < dist < distance2)
 
     def closest_n_units(self, position: Unit | Point2, n: int) -> Units:
         """Returns the n closest units in distance to position.
@@ -357,6 +446,10 @@ class Units(list):
         """
         if not self:
             return self
+        index = self._index_for(position) if 0 < n < len(self) else None
+        if index is not None:
+            candidates = self.subgroup(self[i] for i in index.closest_n(self._center_of(position), n))
+            return self.subgroup(candidates._list_sorted_by_distance_to(position)[:n])
         return self.subgroup(self._list_sorted_by_distance_to(position)[:n])
 
     def furthest_n_units(self, position: Unit | Point2, n: int) -> Units:
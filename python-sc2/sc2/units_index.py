@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sc2.unit import Unit
+
+if TYPE_CHECKING:
+    from sc2.bot_ai import BotAI
+    from sc2.units import Units
+
+# Added to every search radius so that rounding differences between the KD-tree and the distance functions
+# of BotAI can't drop a unit that the linear scan would have found
+MARGIN = 1e-6
+
+
+def is_current_unit(bot: BotAI, unit: Unit) -> bool:
+    """True if the unit is from the current game_loop and its distance_calculation_index points to itself."""
+    index = unit.distance_calculation_index
+    all_units = bot.all_units
+    return 0 <= index < len(all_units) and all_units[index] is unit
+
+
+class UnitsIndex:
+    """Rows of the units of a Units object in the positions and KD-tree that the bot calculates for all_units
+    once per game_loop.
+
+    The index only selects candidates for a query. Units are checked again with the same distance functions
+    that the linear scan in Units uses, so the results and their order are exactly the same.
+    Units that contain units from an older game_loop (e.g. remembered enemy units) or the same unit twice
+    can't be indexed and 'valid' is False for them.
+    """
+
+    __slots__ = ("_bot", "game_loop", "length", "valid", "rows", "rank", "_positions", "_max_radius")
+
+    def __init__(self, units: Units, bot: BotAI) -> None:
+        self._bot = bot
+        self.game_loop: int = bot.state.game_loop
+        self.length: int = len(units)
+        self._positions: np.ndarray | None = None
+        self._max_radius: float | None = None
+
+        all_units = bot.all_units
+        count = len(all_units)
+        rows = []
+        for unit in units:
+            row = unit.distance_calculation_index
+            if not 0 <= row < count or all_units[row] is not unit:
+                break
+            rows.append(row)
+        self.rows: np.ndarray = np.array(rows, dtype=np.intp)
+        # Position in the Units object for every row of all_units, -1 for units that are not in it
+        self.rank: np.ndarray = np.full(count, -1, dtype=np.intp)
+        self.rank[self.rows] = np.arange(len(rows))
+        self.valid: bool = len(rows) == self.length and np.count_nonzero(self.rank >= 0) == self.length
+
+    @property
+    def positions(self) -> np.ndarray:
+        if self._positions is None:
+            self._positions = self._bot._all_units_positions[self.rows]
+        return self._positions
+
+    def max_radius(self, units: Units) -> float:
+        if self._max_radius is None:
+            self._max_radius = max(unit.radius for unit in units)
+        return self._max_radius
+
+    def in_distance(self, center: tuple[float, float], distance: float) -> list[int]:
+        """Positions in the Units object, in ascending order, of units that may be at most distance away from center."""
+        if distance < 0:
+            return []
+        found = self.rank[self._bot._all_units_tree.query_ball_point(center, distance + MARGIN)]
+        found = found[found >= 0]
+        found.sort()
+        return found.tolist()
+
+    def not_in_distance(self, center: tuple[float, float], distance: float) -> list[int]:
+        """Positions of units that may be further than distance away from center, in ascending order."""
+        mask = np.ones(self.length, dtype=bool)
+        mask[self.in_distance(center, distance - 2 * MARGIN)] = False
+        return np.flatnonzero(mask).tolist()
+
+    def in_distance_between(self, center: tuple[float, float], distance1: float, distance2: float) -> list[int]:
+        """Positions of units that may be between distance1 and distance2 away from center, in ascending order."""
+        candidates = self.in_distance(center, distance2)
+        if distance1 - 2 * MARGIN < 0:
+            return candidates
+        too_close = set(self.in_distance(center, distance1 - 2 * MARGIN))
+        return [i for i in candidates if i not in too_close]
+
+    def closest_n(self, center: tuple[float, float], n: int) -> list[int]:
+        """Positions of units that may be one of the n closest units to center, in ascending order."""
+        deltas = self.positions - center
+        distances = np.sqrt(np.einsum("ij,ij->i", deltas, deltas))
+        nth_distance = np.partition(distances, n - 1)[n - 1] if n < len(distances) else distances.max()
+        return np.flatnonzero(distances <= nth_distance + 2 * MARGIN).tolist()
@@ -0,0 +1,127 @@
+"""
+Compares Point2 calculations done one point at a time against the same calculations done with sc2.points.Points.
+
+Run this file using
+uv run pytest test/benchmark_points.py --benchmark-compare
+"""
+
+from __future__ import annotations
+
+import random
+
+from sc2.points import Points
+from sc2.position import Point2
+
+AMOUNT = 200
+
+points = [Point2((random.uniform(0, 200), random.uniform(0, 200))) for _ in range(AMOUNT)]
+batch = Points.from_points(points)
+target = Point2((random.uniform(0, 200), random.uniform(0, 200)))
+
+
+def distance_to_point2(ps: list[Point2], p: Point2):
+    return [point.distance_to_point2(p) for point in ps]
+
+
+def distance_to_points(ps: Points, p: Point2):
+    return ps.distance_to(p)
+
+
+def towards_point2(ps: list[Point2], p: Point2):
+    return [point.towards(p, 2) for point in ps]
+
+
+def towards_points(ps: Points, p: Point2):
+    return ps.towards(p, 2)
+
+
+def closest_point2(ps: list[Point2], p: Point2):
+    return p.closest(ps)
+
+
+def closest_points(ps: Points, p: Point2):
+    return ps.closest(p)
+
+
+def sort_by_distance_point2(ps: list[Point2], p: Point2):
+    return p.sort_by_distance(ps)
+
+
+def sort_by_distance_points(ps: Points, p: Point2):
+    return ps.sort_by_distance(p)
+
+
+def in_circle_point2(ps: list[Point2], p: Point2):
+    return [point for point in ps if point.distance_to_point2(p) <= 30]
+
+
+def in_circle_points(ps: Points, p: Point2):
+    return ps.in_circle(p, 30)
+
+
+def rounded_point2(ps: list[Point2]):
+    return [point.rounded for point in ps]
+
+
+def rounded_points(ps: Points):
+    return ps.rounded
+
+
+def test_distance_to_point2(benchmark):
+    result = benchmark(distance_to_point2, points, target)
+    assert len(result) == AMOUNT
+
+
+def test_distance_to_points(benchmark):
+    result = benchmark(distance_to_points, batch, target)
+    assert len(result) == AMOUNT
+
+
+def test_towards_point2(benchmark):
+    result = benchmark(towards_point2, points, target)
+    assert len(result) == AMOUNT
+
+
+def test_towards_points(benchmark):
+    result = benchmark(towards_points, batch, target)
+    assert len(result) == AMOUNT
+
+
+def test_closest_point2(benchmark):
+    result = benchmark(closest_point2, points, target)
+    assert result == batch.closest(target)
+
+
+def test_closest_points(benchmark):
+    result = benchmark(closest_points, batch, target)
+    assert result == target.closest(points)
+
+
+def test_sort_by_distance_point2(benchmark):
+    result = benchmark(sort_by_distance_point2, points, target)
+    assert len(result) == AMOUNT
+
+
+def test_sort_by_distance_points(benchmark):
+    result = benchmark(sort_by_distance_points, batch, target)
+    assert len(result) == AMOUNT
+
+
+def test_in_circle_point2(benchmark):
+    result = benchmark(in_circle_point2, points, target)
+    assert len(result) == len(batch.in_circle(target, 30))
+
+
+def test_in_circle_points(benchmark):
+    result = benchmark(in_circle_points, batch, target)
+    assert len(result) == len(in_circle_point2(points, target))
+
+
+def test_rounded_point2(benchmark):
+    result = benchmark(rounded_point2, points)
+    assert len(result) == AMOUNT
+
+
+def test_rounded_points(benchmark):
+    result = benchmark(rounded_points, batch)
+    assert len(result) == AMOUNT
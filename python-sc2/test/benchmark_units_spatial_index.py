@@ -0,0 +1,83 @@
+"""
+Compares Units distance queries done with a linear scan against the same queries answered with the spatial index,
+for 50 to 400 units.
+
+Run this file using
+uv run pytest test/benchmark_units_spatial_index.py --benchmark-compare
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from sc2.bot_ai import BotAI
+from sc2.game_state import GameState
+from sc2.position import Point2
+from sc2.units import Units
+from test.test_pickled_data import MAPS, build_bot_object_from_pickle_data, load_map_pickle_data
+
+AMOUNTS = [50, 100, 200, 400]
+
+
+def bot_with_units(amount: int) -> BotAI:
+    """Bot where all_units are 'amount' copies of the first unit of the pickled observation at random positions."""
+    raw_game_data, raw_game_info, raw_observation = load_map_pickle_data(MAPS[0])
+    raw_units = raw_observation.observation.raw_data.units
+    template = raw_units[0]
+    copies = []
+    for tag in range(1, amount + 1):
+        raw_unit = type(template)()
+        raw_unit.CopyFrom(template)
+        raw_unit.tag = tag
+        raw_unit.pos.x = random.uniform(0, 200)
+        raw_unit.pos.y = random.uniform(0, 200)
+        copies.append(raw_unit)
+    del raw_units[:]
+    raw_units.extend(copies)
+    bot = build_bot_object_from_pickle_data(raw_game_data, raw_game_info, raw_observation)
+    assert isinstance(bot.state, GameState)
+    return bot
+
+
+def create_units(amount: int, indexed: bool) -> tuple[Units, Point2]:
+    bot = bot_with_units(amount)
+    units = bot.all_units
+    units.SPATIAL_INDEX_MIN_UNITS = 1 if indexed else amount + 1
+    target = Point2((random.uniform(0, 200), random.uniform(0, 200)))
+    # The first query builds the index
+    units.closer_than(10, target)
+    units.closer_than(10, target)
+    return units, target
+
+
+def closer_than_point(units: Units, target: Point2):
+    return units.closer_than(10, target)
+
+
+def closer_than_unit(units: Units, target: Point2):
+    return units.closer_than(10, units[0])
+
+
+def closest_to(units: Units, target: Point2):
+    return units.closest_to(target)
+
+
+def closest_n_units(units: Units, target: Point2):
+    return units.closest_n_units(target, 5)
+
+
+def in_attack_range_of(units: Units, target: Point2):
+    return units.in_attack_range_of(units[0], 5)
+
+
+@pytest.mark.parametrize(
+    "query", [closer_than_point, closer_than_unit, closest_to, closest_n_units, in_attack_range_of]
+)
+@pytest.mark.parametrize("amount", AMOUNTS)
+@pytest.mark.parametrize("indexed", [False, True], ids=["linear", "indexed"])
+def test_units_query(benchmark, query, amount, indexed):
+    units, target = create_units(amount, indexed)
+    benchmark(query, units, target)
+    assert (units._spatial_index is not None) == indexed
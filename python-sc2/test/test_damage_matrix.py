@@ -0,0 +1,115 @@
+"""
+Checks that DamageMatrix gives the same damage, weapon speed and weapon range as Unit.calculate_damage_vs_target.
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from sc2.data import Alliance
+from sc2.ids.buff_id import BuffId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+UNIT_TYPES = [
+    UnitTypeId.SCV,
+    UnitTypeId.MARINE,
+    UnitTypeId.MARAUDER,
+    UnitTypeId.HELLION,
+    UnitTypeId.SIEGETANKSIEGED,
+    UnitTypeId.THOR,
+    UnitTypeId.VIKINGFIGHTER,
+    UnitTypeId.MISSILETURRET,
+    UnitTypeId.ZEALOT,
+    UnitTypeId.STALKER,
+    UnitTypeId.ADEPT,
+    UnitTypeId.IMMORTAL,
+    UnitTypeId.COLOSSUS,
+    UnitTypeId.ARCHON,
+    UnitTypeId.TEMPEST,
+    UnitTypeId.PHOTONCANNON,
+    UnitTypeId.ZERGLING,
+    UnitTypeId.BANELING,
+    UnitTypeId.QUEEN,
+    UnitTypeId.ROACH,
+    UnitTypeId.HYDRALISK,
+    UnitTypeId.MUTALISK,
+    UnitTypeId.CORRUPTOR,
+    UnitTypeId.ULTRALISK,
+    UnitTypeId.OVERLORD,
+    UnitTypeId.NEXUS,
+]
+
+
+@pytest.fixture(autouse=True)
+def keep_unit_class_cache():
+    """test_pickled_data checks the types in the cache, so the types created here are removed from it."""
+    cache = dict(Unit.class_cache)
+    yield
+    Unit.class_cache.clear()
+    Unit.class_cache.update(cache)
+
+
+def create_unit(bot, type_id: UnitTypeId, rng: random.Random) -> Unit:
+    unit = Unit(bot.workers[0]._proto.__class__(), bot)
+    proto = unit._proto
+    proto.CopyFrom(bot.workers[0]._proto)
+    proto.unit_type = type_id.value
+    proto.tag = rng.randrange(1, 2**32)
+    proto.alliance = rng.choice([Alliance.Self.value, Alliance.Enemy.value])
+    proto.health_max = rng.choice([35, 100, 400])
+    proto.health = rng.uniform(1, proto.health_max)
+    proto.shield_max = rng.choice([0, 0, 20, 100])
+    proto.shield = rng.choice([0, 1, 7, proto.shield_max])
+    proto.is_flying = type_id in {
+        UnitTypeId.VIKINGFIGHTER,
+        UnitTypeId.TEMPEST,
+        UnitTypeId.MUTALISK,
+        UnitTypeId.CORRUPTOR,
+        UnitTypeId.OVERLORD,
+    }
+    proto.attack_upgrade_level = rng.randrange(4)
+    proto.armor_upgrade_level = rng.randrange(4)
+    proto.shield_upgrade_level = rng.randrange(4)
+    proto.build_progress = rng.choice([1, 1, 1, 0.5])
+    for buff in [BuffId.STIMPACK, BuffId.GUARDIANSHIELD, BuffId.RAVENSHREDDERMISSILETINT]:
+        if rng.random() < 0.2:
+            proto.buff_ids.append(buff.value)
+    return unit
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_damage_matches_unit_calculation(seed):
+    rng = random.Random(seed)
+    bot = get_map_specific_bot(MAPS[0])
+    units = [create_unit(bot, type_id, rng) for type_id in UNIT_TYPES for _ in range(2)]
+
+    damage, speed, weapon_range = bot.damage_matrix.damage(units, units)
+    dps = bot.damage_matrix.dps(units, units)
+
+    for i, attacker in enumerate(units):
+        for j, target in enumerate(units):
+            expected = attacker.calculate_damage_vs_target(target)
+            assert (damage[i, j], speed[i, j], weapon_range[i, j]) == pytest.approx(expected), (attacker, target)
+            assert dps[i, j] == pytest.approx(attacker.calculate_dps_vs_target(target))
+
+
+def test_damage_by_type():
+    bot = get_map_specific_bot(MAPS[0])
+    matrix = bot.damage_matrix
+    attackers = np.array([UnitTypeId.MARINE.value, UnitTypeId.STALKER.value, UnitTypeId.NEXUS.value])
+    targets = np.array([UnitTypeId.ZERGLING.value, UnitTypeId.ROACH.value, UnitTypeId.MUTALISK.value])
+
+    damage, speed, weapon_range = matrix.damage_by_type(attackers, targets, np.array([False, False, True]))
+
+    # Roach has 1 armor and stalker has a bonus against armored units
+    assert damage.tolist() == [[6, 5, 6], [13, 17, 13], [0, 0, 0]]
+    assert weapon_range[1].tolist() == [6, 6, 6]
+    assert speed[2].tolist() == [0, 0, 0]
+
+    dps = matrix.dps_by_type(attackers, targets, np.array([False, False, True]), attack_upgrades=1, armor_upgrades=1)
+    assert dps[0, 0] == pytest.approx(6 / speed[0, 0])
@@ -0,0 +1,42 @@
+import asyncio
+from unittest import mock
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.observer_ai import ObserverAI
+
+
+class RecordingObserver(ObserverAI):
+    def __init__(self):
+        self.events = []
+
+    async def on_unit_created(self, unit):
+        self.events.append(("created", unit.tag))
+
+    async def on_unit_destroyed(self, unit_tag):
+        self.events.append(("destroyed", unit_tag))
+
+    async def on_enemy_unit_entered_vision(self, unit):
+        self.events.append(("entered", unit.tag))
+
+    async def on_enemy_unit_left_vision(self, unit_tag):
+        self.events.append(("left", unit_tag))
+
+
+def create_unit(tag: int):
+    return mock.Mock(tag=tag, type_id=UnitTypeId.PROBE, health=20, shield=20)
+
+
+def test_issue_events_calls_observer_unit_hooks():
+    observer = RecordingObserver()
+    observer._initialize_variables()
+    observer.state = mock.Mock(dead_units={1}, upgrades=set())
+    observer.structures = []
+
+    observer._all_units_previous_map = {1: create_unit(1)}
+    observer._units_map = {2: create_unit(2)}
+    observer._enemy_units_previous_map = {3: create_unit(3)}
+    observer._enemy_units_map = {4: create_unit(4)}
+
+    asyncio.run(observer.issue_events())
+
+    assert observer.events == [("destroyed", 1), ("created", 2), ("entered", 4), ("left", 3)]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import math
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from sc2.points import Points
+from sc2.position import Point2
+
+coordinates = st.floats(min_value=0, max_value=250)
+point_lists = st.lists(st.tuples(coordinates, coordinates).map(Point2), min_size=1, max_size=50)
+
+
+@given(point_lists, st.tuples(coordinates, coordinates).map(Point2))
+def test_distances_match_point2(points: list[Point2], target: Point2):
+    batch = Points.from_points(points)
+
+    distances = batch.distance_to(target)
+    for point, distance in zip(points, distances):
+        assert math.isclose(point.distance_to_point2(target), distance, abs_tol=1e-9)
+
+    assert math.isclose(
+        batch.closest(target).distance_to_point2(target),
+        min(p.distance_to_point2(target) for p in points),
+        abs_tol=1e-9,
+    )
+    sorted_distances = [p.distance_to_point2(target) for p in batch.sort_by_distance(target)]
+    for distance, expected in zip(sorted_distances, sorted(p.distance_to_point2(target) for p in points)):
+        assert math.isclose(distance, expected, abs_tol=1e-9)
+    assert len(batch.in_circle(target, 50)) == sum(1 for p in points if p.distance_to_point2(target) <= 50)
+
+
+@given(
+    point_lists, st.tuples(coordinates, coordinates).map(Point2), st.floats(min_value=0, max_value=20), st.booleans()
+)
+def test_towards_matches_point2(points: list[Point2], target: Point2, distance: float, limit: bool):
+    for point, moved in zip(points, Points.from_points(points).towards(target, distance, limit)):
+        expected = point.towards(target, distance, limit)
+        assert math.isclose(expected.x, moved.x, abs_tol=1e-6)
+        assert math.isclose(expected.y, moved.y, abs_tol=1e-6)
+
+
+def test_conversions():
+    points = [Point2((1.5, 2.7)), Point2((3.2, 4.9))]
+    batch = Points.from_points(points)
+
+    assert batch.to_list() == points
+    assert batch[1] == points[1]
+    assert batch.rounded.to_list() == [p.rounded for p in points]
+    assert batch.offset(Point2((1, 1))).to_list() == [p.offset(Point2((1, 1))) for p in points]
+    assert batch.center == Point2.center(points)
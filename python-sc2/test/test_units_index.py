@@ -0,0 +1,88 @@
+"""
+Checks that Units queries answered with the spatial index return the same units in the same order as the linear scan.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from sc2.position import Point2
+from sc2.units import Units
+from test.test_pickled_data import MAPS, get_map_specific_bot
+
+
+def linear(units: Units) -> Units:
+    copy = units.copy()
+    copy.SPATIAL_INDEX_MIN_UNITS = len(units) + 1
+    return copy
+
+
+def indexed(units: Units) -> Units:
+    copy = units.copy()
+    copy.SPATIAL_INDEX_MIN_UNITS = 1
+    copy._spatial_queries = 1
+    return copy
+
+
+@pytest.mark.parametrize("method", [0, 2])
+@pytest.mark.parametrize("map_path", MAPS[:3], ids=lambda map_path: map_path.stem)
+def test_queries_match_linear_scan(map_path, method):
+    random.seed(map_path.stem)
+    bot = get_map_specific_bot(map_path)
+    bot._distances_override_functions(method)
+    units = bot.all_units
+    assert len(units) >= 32
+
+    targets = random.sample(list(units), 5) + [
+        Point2((random.uniform(0, 200), random.uniform(0, 200))) for _ in range(5)
+    ]
+    # Units on the exact distance of a query must be handled the same way
+    targets.append(units[0].position.offset(Point2((3, 4))))
+    for target in targets:
+        for distance in [0, 1, 5, 10.5, 30, 1000]:
+            assert indexed(units).closer_than(distance, target) == linear(units).closer_than(distance, target)
+            assert indexed(units).further_than(distance, target) == linear(units).further_than(distance, target)
+            assert indexed(units).in_distance_between(target, distance, distance + 7) == linear(
+                units
+            ).in_distance_between(target, distance, distance + 7)
+        assert indexed(units).closest_to(target) is linear(units).closest_to(target)
+        query_units = indexed(units)
+        query_units.closer_than(5, target)
+        assert query_units._spatial_index.valid
+        for n in [1, 3, 20]:
+            assert indexed(units).closest_n_units(target, n) == linear(units).closest_n_units(target, n)
+
+    for attacker in bot.workers:
+        for bonus_distance in [0, 2, 50]:
+            assert indexed(units).in_attack_range_of(attacker, bonus_distance) == linear(units).in_attack_range_of(
+                attacker, bonus_distance
+            )
+
+
+def test_index_is_dropped_when_units_change():
+    bot = get_map_specific_bot(MAPS[0])
+    units = indexed(bot.all_units)
+    center = units[0].position
+
+    assert units[0] in units.closer_than(1, center)
+    units._spatial_index = None
+    assert units.closer_than(1, center)
+    assert units._spatial_index is not None
+
+    first = units[0]
+    units[0] = units[-1]
+    assert units._spatial_index is None
+    assert first not in units.closer_than(1, center)
+
+
+def test_remembered_units_are_not_indexed():
+    bot = get_map_specific_bot(MAPS[0])
+    units = indexed(bot.all_units)
+    bot.all_units = Units(bot.all_units, bot)
+    bot.all_units[0] = units[1]
+
+    center = units[0].position
+    assert units.closer_than(5, center) == linear(units).closer_than(5, center)
+    assert not units._spatial_index.valid
@@ -1,5 +1,6 @@
 from typing import Optional, List
 
+from sc2.points import Points
 from sc2.position import Point2
 from sharpy import sc2math
 from sharpy.general.extended_power import ExtendedPower
@@ -33,13 +34,8 @@ class CombatUnits:
 
     def is_too_spread_out(self) -> bool:
         if self._total_distance is None:
-            self._total_distance = 0
-            self._area_by_circles = 3
-
-            for unit in self.units:
-                d = unit.distance_to(self.center)
-                self._total_distance += d
-                self._area_by_circles += unit.radius**2
+            self._total_distance = float(Points.from_units(self.units).distance_to(self.center).sum())
+            self._area_by_circles = 3 + sum(unit.radius**2 for unit in self.units)
         total_area_thing = (self._total_distance / len(self.units)) ** 2
         # self.knowledge.print(
         #     f"spread: {self._total_distance} d to {total_area_thing} r and _area_by_circles {self._area_by_circles }"
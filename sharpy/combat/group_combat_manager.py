@@ -3,9 +3,10 @@ from typing import List, Dict, Optional, Union
 from sharpy.combat import *
 from sharpy.general.extended_power import ExtendedPower
 from sharpy.interfaces import ICombatManager
-from sharpy.managers.core import UnitCacheManager, PathingManager, ManagerBase
+from sharpy.managers.core import UnitCacheManager, PathingManager, PathRequest, ManagerBase
 from sharpy.combat import Action
 from sc2.units import Units
+from sc2pathlib import MapType
 
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2, Point3
@@ -105,6 +106,15 @@ class GroupCombatManager(ManagerBase, ICombatManager):
 
         self.own_groups: List[CombatUnits] = self.group_own_units(our_units)
 
+        if self.pather.parallel and isinstance(target, Point2):
+            # Search paths of all groups at once, action_to then finds them in the path cache
+            retreat = move_type in {MoveType.DefensiveRetreat, MoveType.PanicRetreat}
+            self.pather.find_paths(
+                PathRequest(group.center, target, map_type=MapType.Ground if retreat else None, influence=retreat)
+                for group in self.own_groups
+                if group.ground_units
+            )
+
         if self.debug:
             fn = lambda group: group.center.distance_to(self.ai.start_location)
             sorted_list = sorted(self.own_groups, key=fn)
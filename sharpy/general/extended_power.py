@@ -1,4 +1,4 @@
-from typing import Union, List, Set
+from typing import Dict, Iterable, Union, List, Set, Tuple
 
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.unit import Unit
@@ -201,3 +201,42 @@ class ExtendedPower:
         self.siege_power = 0
         self.detectors = 0
         self.stealth_power = 0
+
+
+class ExtendedPowerTracker:
+    """
+    ExtendedPower of a group of units that changes from step to step.
+
+    The power of every unit is stored by tag, so an update only adds and subtracts the power of units that
+    entered or left the group or changed their type or health since the previous update.
+    """
+
+    def __init__(self, values: "UnitValue"):
+        self.power = ExtendedPower(values)
+        self._unit_powers: Dict[int, Tuple[tuple, ExtendedPower]] = {}
+
+    def update(self, units: Iterable[Unit]) -> ExtendedPower:
+        old = self._unit_powers
+        self._unit_powers = {}
+
+        for unit in units:
+            if unit.tag in self._unit_powers:
+                continue
+            key = (unit.type_id, unit.health, unit.shield, unit.health_max, unit.shield_max)
+            entry = old.pop(unit.tag, None)
+            if entry is None or entry[0] != key:
+                if entry is not None:
+                    self.power.substract_power(entry[1])
+                unit_power = ExtendedPower(self.power.values)
+                unit_power.add_unit(unit)
+                self.power.add_power(unit_power)
+                entry = (key, unit_power)
+            self._unit_powers[unit.tag] = entry
+
+        for _, unit_power in old.values():
+            self.power.substract_power(unit_power)
+
+        if not self._unit_powers:
+            # Don't let rounding errors pile up
+            self.power.clear()
+        return self.power
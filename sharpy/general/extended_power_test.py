@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sharpy.managers.core import UnitValue
+
+from .extended_power import ExtendedPower, ExtendedPowerTracker
+
+
+class FakeUnit:
+    def __init__(self, tag: int, type_id: UnitTypeId, health: float):
+        self.tag = tag
+        self.type_id = type_id
+        self.health = health
+        self.health_max = 100
+        self.shield = 0
+        self.shield_max = 0
+
+
+def full_power(values: UnitValue, units) -> ExtendedPower:
+    power = ExtendedPower(values)
+    for unit in units:
+        power.add_unit(unit)
+    return power
+
+
+class TestExtendedPowerTracker:
+    @mock.patch("sharpy.general.extended_power.Unit", FakeUnit)
+    def test_tracked_power_matches_full_power(self):
+        values = UnitValue()
+        tracker = ExtendedPowerTracker(values)
+        marine = FakeUnit(1, UnitTypeId.MARINE, 45)
+        tank = FakeUnit(2, UnitTypeId.SIEGETANKSIEGED, 100)
+        viking = FakeUnit(3, UnitTypeId.VIKINGFIGHTER, 100)
+
+        for units in ([marine, tank], [marine, tank, viking], [FakeUnit(1, UnitTypeId.MARINE, 10), viking]):
+            power = tracker.update(units)
+            expected = full_power(values, units)
+            # Siege power of add_unit is not a sum, the tracker sums the siege power of every unit
+            for field in ("power", "air_power", "ground_power", "air_presence", "ground_presence"):
+                assert getattr(power, field) == pytest.approx(getattr(expected, field))
+
+        assert tracker.update([]).power == 0
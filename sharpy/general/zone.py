@@ -10,7 +10,7 @@ from sc2.unit import Unit
 from sc2.position import Point2
 from sc2.units import Units
 
-from sharpy.general.extended_power import ExtendedPower
+from sharpy.general.extended_power import ExtendedPower, ExtendedPowerTracker
 
 import enum
 
@@ -63,7 +63,9 @@ class Zone:
         self._original_mineral_fields: Units = self.ai.expansion_locations_dict.get(
             self.center_location, Units([], self.ai)
         )
-        self.mineral_fields: Units = Units(self._original_mineral_fields.copy(), self.ai)
+        self._mineral_fields: Units = Units(self._original_mineral_fields.copy(), self.ai)
+        self._mineral_fields_stale = False
+        self._original_mineral_positions: List[Point2] = [mf.position for mf in self._original_mineral_fields]
 
         self.last_minerals: int = 10000000  # Arbitrary value just to ensure a lower value will get updated.
         # Game time seconds when scout has last circled around the center location of this zone.
@@ -80,12 +82,15 @@ class Zone:
         self.our_units: Units = Units([], self.ai)
         self.our_workers: Units = Units([], self.ai)
         self.enemy_workers: Units = Units([], self.ai)
-        self.known_enemy_power: ExtendedPower = ExtendedPower(self.unit_values)
-        self.our_power: ExtendedPower = ExtendedPower(self.unit_values)
+        self._known_enemy_power_tracker = ExtendedPowerTracker(self.unit_values)
+        self._our_power_tracker = ExtendedPowerTracker(self.unit_values)
+        self.known_enemy_power: ExtendedPower = self._known_enemy_power_tracker.power
+        self.our_power: ExtendedPower = self._our_power_tracker.power
 
         # Assaulting enemies can be further away, but zone defense should prepare for at least that amount of defense
         self.assaulting_enemies: Units = Units([], self.ai)
-        self.assaulting_enemy_power: ExtendedPower = ExtendedPower(self.unit_values)
+        self._assaulting_enemy_power_tracker = ExtendedPowerTracker(self.unit_values)
+        self.assaulting_enemy_power: ExtendedPower = self._assaulting_enemy_power_tracker.power
 
         # 3 positions behind minerals
         self.behind_mineral_positions: List[Point2] = self._init_behind_mineral_positions()
@@ -194,23 +199,22 @@ class Zone:
         else:
             return ZoneResources.Empty
 
-    def update(self):
-        self.mineral_fields.clear()
-        for mf in self._original_mineral_fields:
-            new_mf = self.cache.mineral_fields.get(mf.position, None)
-            if new_mf:
-                self.mineral_fields.append(new_mf)
-
-        self.our_power.clear()
-        self.known_enemy_power.clear()
-        self.assaulting_enemy_power.clear()
+    @property
+    def mineral_fields(self) -> Units:
+        """Mineral fields of the zone that still exist, looked up from the unit cache when first used on a step."""
+        if self._mineral_fields_stale:
+            self._mineral_fields_stale = False
+            mineral_fields = self.cache.mineral_fields
+            self._mineral_fields = Units(
+                [mf for mf in map(mineral_fields.get, self._original_mineral_positions) if mf], self.ai
+            )
+        return self._mineral_fields
 
-        # Own and enemy units are figured out in zone manager update.
+    def update(self):
+        self._mineral_fields_stale = True
 
-        # Only add units that we can fight against
-        self.known_enemy_units = self.known_enemy_units.filter(lambda x: x.cloak != 2)
-        self.enemy_workers = self.known_enemy_units.of_type(worker_types)
-        self.our_workers: Units = self.our_units.of_type(worker_types)
+        # Own and enemy units and workers are figured out in zone manager update.
+        # Only enemy units that we can fight against are included.
 
         self._minerals_counter.execute()
         self._update_gas_buildings()
@@ -223,21 +227,17 @@ class Zone:
         if self.ai.is_visible(self.mineral_line_center):
             self.last_scouted_mineral_line = self.knowledge.ai.time
 
-        for unit in self.our_units:
-            # Our unit is inside the zone
-            self.our_power.add_unit(unit)
-
-        for unit in self.known_enemy_units:
-            # Enemy unit is inside the zone
-            self.known_enemy_power.add_unit(unit)
+        # Power only changes for units that entered or left the zone or changed health
+        self._our_power_tracker.update(self.our_units)
+        self._known_enemy_power_tracker.update(self.known_enemy_units)
 
         if self.is_ours:
             self.calc_needs_evacuation()
             self.assaulting_enemies: Units = self.cache.enemy_in_range(self.center_location, self.danger_radius)
-            self.assaulting_enemy_power.add_units(self.assaulting_enemies)
         else:
             self.needs_evacuation = False
             self.assaulting_enemies.clear()
+        self._assaulting_enemy_power_tracker.update(self.assaulting_enemies)
 
     def check_best_mineral_field(self) -> Optional[Unit]:
         best_score = 0
@@ -1,7 +1,20 @@
 from abc import abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sharpy.managers.core import ManagerBase
 
 
 class ILagHandler:
     @abstractmethod
     def step_took(self, ms: float):
         pass
+
+    @property
+    def lagging(self) -> bool:
+        """True when low priority work is skipped in order to keep up with the game."""
+        return False
+
+    def defer(self, manager: "ManagerBase") -> bool:
+        """True if the manager should skip its update and post update on this step."""
+        return False
@@ -67,6 +67,11 @@ class IUnitCache(ABC):
         """Returns all own units of the specified type(s)."""
         pass
 
+    @abstractmethod
+    def own_ready_count(self, type_id: UnitTypeId) -> int:
+        """Returns the amount of own ready units of the specified type."""
+        pass
+
     @abstractmethod
     def enemy(self, type_id: Union[UnitTypeId, Iterable[UnitTypeId]]) -> Units:
         """Returns all enemy units of the specified type(s)."""
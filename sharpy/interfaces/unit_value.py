@@ -1,5 +1,7 @@
 from abc import abstractmethod, ABC
-from typing import Union, Optional
+from typing import Union, Optional, Tuple
+
+import numpy as np
 
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.unit import Unit
@@ -85,6 +87,31 @@ class IUnitValues(ABC):
     def real_speed(self, unit: Unit) -> float:
         pass
 
+    @abstractmethod
+    def costs(self, type_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Minerals and gas costs of the unit types, given as an array of UnitTypeId.value."""
+        pass
+
+    @abstractmethod
+    def unit_powers(self, units: Units) -> np.ndarray:
+        """Same as power for all of the units."""
+        pass
+
+    @abstractmethod
+    def unit_ranges(self, units: Units) -> Tuple[np.ndarray, np.ndarray]:
+        """Same as ground_range and air_range for all of the units."""
+        pass
+
+    @abstractmethod
+    def real_ranges(self, units: Units, targets: Units) -> np.ndarray:
+        """Same as real_range for all pairs of units and targets, as an array of shape (units, targets)."""
+        pass
+
+    @abstractmethod
+    def unit_speeds(self, units: Units) -> np.ndarray:
+        """Same as real_speed for all of the units."""
+        pass
+
     @abstractmethod
     def should_kite(self, unit_type: UnitTypeId) -> bool:
         pass
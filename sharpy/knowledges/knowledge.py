@@ -1,7 +1,7 @@
 import logging
 import string
 from configparser import ConfigParser
-from typing import List, Optional, Callable, Type, Union
+from typing import List, Optional, Callable, Set, Type, Union
 
 from sc2.data import Race, Result
 from sharpy.events import UnitDestroyedEvent
@@ -22,6 +22,8 @@ from sc2.position import Point2
 from typing import TYPE_CHECKING, TypeVar
 
 from sharpy.managers.core import LogManager
+from sharpy.tools.map_cache import MapCache
+from sharpy.tools.scheduler import Scheduler
 
 if TYPE_CHECKING:
     from sharpy.knowledges import SkeletonBot
@@ -39,11 +41,17 @@ class Knowledge:
         self.config: ConfigParser = None
         self._debug: bool = False
         self.is_chat_allowed: bool = False
+        self.cache_requirements: bool = False
+        self.map_cache: Optional[MapCache] = None
 
         self.started = False
         self.action_handler: ActionManager = ActionManager()
         self.version_manager: VersionManager = VersionManager()
         self.managers: List[ManagerBase] = []
+        # Periodic work of managers, see Scheduler.register
+        self.scheduler: Scheduler = Scheduler()
+        # Managers that the lag handler skipped on the current step
+        self._deferred_managers: Set[ManagerBase] = set()
 
         self.iteration: int = 0
         self.reserved_minerals: int = 0
@@ -61,10 +69,12 @@ class Knowledge:
 
         # Event listeners
         self._on_unit_destroyed_listeners: List[Callable] = list()
+        self._on_units_destroyed_listeners: List[Callable] = list()
 
     @property
     def debug(self) -> bool:
-        return self._debug
+        # Debug drawing is skipped while the bot is lagging
+        return self._debug and (self.lag_handler is None or not self.lag_handler.lagging)
 
     @property
     def my_race(self):
@@ -86,6 +96,10 @@ class Knowledge:
         self.config: ConfigParser = self.ai.config
         self.is_chat_allowed = self.config["general"].getboolean("chat")
         self._debug = self.config["general"].getboolean("debug")
+        self.cache_requirements = self.config["general"].getboolean("cache_requirements") is True
+        self.map_cache = ai.map_cache
+        if self.map_cache is not None:
+            self.map_cache.save_map_analysis(ai)
         self.my_worker_type = UnitValue.get_worker_type(self.my_race)
 
         if self.ai.start_location is None:
@@ -155,6 +169,7 @@ class Knowledge:
         self.combat_manager = self.get_manager(ICombatManager)
         self.data_manager = self.get_manager(IDataManager)
         self.previous_units_manager = self.get_manager(IPreviousUnitsManager)
+        self.scheduler.begin_step(self.ai.time, self.ai.client.game_step)
 
         for manager in self.managers:
             await manager.start(self)
@@ -170,12 +185,19 @@ class Knowledge:
         self.reserved_minerals = 0
         self.reserved_gas = 0
 
+        self._deferred_managers.clear()
+        self.scheduler.begin_step(self.ai.time, self.ai.client.game_step)
+
         for manager in self.managers:
+            if self.lag_handler is not None and self.lag_handler.defer(manager):
+                self._deferred_managers.add(manager)
+                continue
             await manager.update()
 
     async def post_update(self):
         for manager in self.managers:
-            await manager.post_update()
+            if manager not in self._deferred_managers:
+                await manager.post_update()
 
     def step_took(self, ns_step: float):
         """Time taken in nanosecond for the current step to run."""
@@ -235,14 +257,26 @@ class Knowledge:
     # region Knowledge event handlers
 
     async def on_unit_destroyed(self, unit_tag: int):
+        await self.on_units_destroyed([unit_tag])
+
+    async def on_units_destroyed(self, unit_tags: List[int]):
         # BotAI._units_previous_map[unit_tag] does not contain enemies. :(
-        if self.previous_units_manager:
+        if not self.previous_units_manager:
+            return
+
+        events: List[UnitDestroyedEvent] = []
+        for unit_tag in unit_tags:
             unit = self.previous_units_manager.last_unit(unit_tag)
             if unit:
-                self.fire_event(self._on_unit_destroyed_listeners, UnitDestroyedEvent(unit_tag, unit))
+                events.append(UnitDestroyedEvent(unit_tag, unit))
             else:
                 self.print(f"Unknown unit destroyed: {unit_tag}", log_level=logging.DEBUG)
 
+        if events:
+            self.fire_event(self._on_units_destroyed_listeners, events)
+            for event in events:
+                self.fire_event(self._on_unit_destroyed_listeners, event)
+
     # todo: if this is useful, it should be refactored as a more general solution
 
     def register_on_unit_destroyed_listener(self, func: Callable[[UnitDestroyedEvent], None]):
@@ -254,6 +288,16 @@ class Knowledge:
     def unregister_on_unit_destroyed_listener(self, func):
         self._on_unit_destroyed_listeners.remove(func)
 
+    def register_on_units_destroyed_listener(self, func: Callable[[List[UnitDestroyedEvent]], None]):
+        """Registers a listener that is called once per step with all units that were destroyed on that step."""
+        assert isinstance(func, Callable)
+        if self.previous_units_manager is None:
+            raise Exception("Previous units manager needs the be set to register for the unit destroyed event")
+        self._on_units_destroyed_listeners.append(func)
+
+    def unregister_on_units_destroyed_listener(self, func):
+        self._on_units_destroyed_listeners.remove(func)
+
     @staticmethod
     def fire_event(listeners, event):
         for listener in listeners:
@@ -276,6 +320,9 @@ class Knowledge:
         step_time_max = round(self.ai.step_time[2])
         self.print(f"Step time max: {step_time_max}", stats=False)
 
+        for line in self.scheduler.summary():
+            self.print(line, "Scheduler", stats=False)
+
         for manager in self.managers:
             await manager.on_end(game_result)
 
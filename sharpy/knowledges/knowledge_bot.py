@@ -65,6 +65,10 @@ class KnowledgeBot(SkeletonBot, ABC):
         ]
         if user_managers:
             managers.extend(user_managers)
+        if self.config["general"].getboolean("record_game") is True:
+            managers.append(GameRecorder())
+        if self.config["general"].getboolean("lag_handler") is True:
+            managers.append(LagHandler())
         managers.append(CustomFuncManager(self.pre_step_execute))
         managers.append(ActManager(self.create_plan))
         self.knowledge.pre_start(self, managers)
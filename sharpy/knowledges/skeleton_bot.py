@@ -13,6 +13,7 @@ from config import get_config, get_version
 from abc import abstractmethod, ABC
 from typing import TYPE_CHECKING, Optional, List
 from sharpy.knowledges.knowledge import Knowledge
+from sharpy.tools.map_cache import MapCache
 
 
 if TYPE_CHECKING:
@@ -21,6 +22,9 @@ if TYPE_CHECKING:
 
 
 class SkeletonBot(BotAI, ABC):
+    # Set in on_before_start when map_cache is enabled in config.ini
+    map_cache: Optional[MapCache] = None
+
     def __init__(self, name: str):
         self.knowledge = Knowledge()
         self.name = name
@@ -106,6 +110,11 @@ class SkeletonBot(BotAI, ABC):
             await self._do_actions(self.actions)
             self.actions.clear()
 
+        if self.config["general"].getboolean("map_cache") is True:
+            # Skips expansion location and ramp calculations when the map has been analyzed before
+            self.map_cache = MapCache(self.game_info)
+            self.map_cache.load_map_analysis(self)
+
         self.client.game_step = int(self.config["general"]["game_step_size"])
 
     async def split_workers(self):
@@ -133,8 +142,8 @@ class SkeletonBot(BotAI, ABC):
             if townhall.type_id == UnitTypeId.HATCHERY:
                 self.units(UnitTypeId.LARVA).first.train(UnitTypeId.DRONE)
 
-    async def on_unit_destroyed(self, unit_tag: int):
-        await self.knowledge.on_unit_destroyed(unit_tag)
+    async def on_units_destroyed(self, unit_tags: List[int]):
+        await self.knowledge.on_units_destroyed(unit_tags)
 
     async def on_end(self, game_result: Result):
         await self.knowledge.on_end(game_result)
@@ -1,4 +1,4 @@
-from .manager_base import ManagerBase
+from .manager_base import ManagerBase, ManagerPriority
 from .act_manager import ActManager
 from .gather_point_solver import GatherPointSolver
 from .log_manager import LogManager
@@ -11,7 +11,7 @@ from .building_solver import BuildingSolver
 from .income_calculator import IncomeCalculator
 from .unit_role_manager import UnitRoleManager
 from .lostunitsmanager import LostUnitsManager
-from .pathing_manager import PathingManager
+from .pathing_manager import PathingManager, PathRequest
 from .unit_value import UnitValue
 from .enemy_units_manager import EnemyUnitsManager
 from .previousunitsmanager import PreviousUnitsManager
@@ -0,0 +1,203 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sc2.bot_ai import BotAI
+from sc2.dicts.unit_abilities import UNIT_ABILITIES
+from sc2.dicts.unit_research_abilities import RESEARCH_INFO
+from sc2.dicts.unit_train_build_abilities import TRAIN_INFO
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+from sc2.unit import Unit
+
+# Abilities that are always available for a completed unit that has them
+BASIC_PREFIXES: Tuple[str, ...] = (
+    "ATTACK_",
+    "MOVE_",
+    "STOP_",
+    "HOLDPOSITION_",
+    "PATROL_",
+    "SCAN_MOVE",
+    "RALLY_",
+    "LAND_",
+    "BURROWUP_",
+    "HARVEST_GATHER_",
+    "EFFECT_REPAIR_",
+    "EFFECT_SPRAY_",
+    "MORPH_SUPPLYDEPOT_",
+)
+
+# Abilities that only cost energy and have no cooldown
+ENERGY_COST: Dict[AbilityId, int] = {
+    AbilityId.EFFECT_CHRONOBOOSTENERGYCOST: 50,
+    AbilityId.EFFECT_INJECTLARVA: 25,
+    AbilityId.BUILD_CREEPTUMOR_QUEEN: 25,
+    AbilityId.CALLDOWNMULE_CALLDOWNMULE: 50,
+    AbilityId.SUPPLYDROP_SUPPLYDROP: 50,
+    AbilityId.SCANNERSWEEP_SCAN: 50,
+    AbilityId.PSISTORM_PSISTORM: 75,
+    AbilityId.FEEDBACK_FEEDBACK: 50,
+    AbilityId.GUARDIANSHIELD_GUARDIANSHIELD: 75,
+    AbilityId.FORCEFIELD_FORCEFIELD: 50,
+    AbilityId.EMP_EMP: 75,
+    AbilityId.EFFECT_INTERFERENCEMATRIX: 50,
+    AbilityId.EFFECT_ANTIARMORMISSILE: 75,
+    AbilityId.FUNGALGROWTH_FUNGALGROWTH: 75,
+    AbilityId.NEURALPARASITE_NEURALPARASITE: 100,
+    AbilityId.SPAWNCHANGELING_SPAWNCHANGELING: 50,
+    AbilityId.EFFECT_ABDUCT: 75,
+    AbilityId.PARASITICBOMB_PARASITICBOMB: 125,
+    AbilityId.BLINDINGCLOUD_BLINDINGCLOUD: 100,
+}
+
+# Abilities that need research before they can be used
+REQUIRED_UPGRADE: Dict[AbilityId, UpgradeId] = {
+    AbilityId.PSISTORM_PSISTORM: UpgradeId.PSISTORMTECH,
+    AbilityId.NEURALPARASITE_NEURALPARASITE: UpgradeId.NEURALPARASITE,
+    AbilityId.EFFECT_STIM_MARINE: UpgradeId.STIMPACK,
+    AbilityId.EFFECT_STIM_MARAUDER: UpgradeId.STIMPACK,
+}
+
+# Abilities with a cooldown that can't be seen from the observation.
+# They are known to be unavailable before the research is done, after that only the server knows.
+COOLDOWN_UPGRADE: Dict[AbilityId, UpgradeId] = {
+    AbilityId.EFFECT_CHARGE: UpgradeId.CHARGE,
+    AbilityId.EFFECT_BLINK_STALKER: UpgradeId.BLINKTECH,
+}
+
+# Burrowing without burrow research
+NATURAL_BURROW: Set[AbilityId] = {AbilityId.BURROWDOWN_WIDOWMINE, AbilityId.BURROWDOWN_LURKER}
+
+# Warp gate cooldowns are not part of the observation
+SERVER_ONLY_TYPES: Set[UnitTypeId] = {UnitTypeId.WARPGATE}
+
+# Resolves whether ability is available for the unit, None when the model doesn't know.
+Rule = Callable[[Unit], Optional[bool]]
+
+
+class AbilityModel:
+    """
+    Local model of available abilities that is built from python-sc2 ability, train and research tables.
+
+    The model covers tech requirements, resources, energy costs and researched upgrades.
+    Units with abilities that depend on things the model can't see, such as cooldowns, are left for the server.
+    """
+
+    def __init__(self, ai: BotAI):
+        self.ai = ai
+        self._rules: Dict[UnitTypeId, List[Tuple[AbilityId, Rule]]] = {}
+        # Results of unit independent requirement checks, cleared every step
+        self._step_results: Dict[AbilityId, bool] = {}
+
+    def new_step(self):
+        self._step_results.clear()
+
+    def available(self, unit: Unit) -> Optional[List[AbilityId]]:
+        """Returns available abilities for the unit or None if the server needs to be queried."""
+        rules = self._rules.get(unit.type_id, None)
+        if rules is None:
+            rules = self._create_rules(unit.type_id)
+            self._rules[unit.type_id] = rules
+
+        if unit.build_progress < 1:
+            return []
+
+        abilities: List[AbilityId] = []
+        for ability, rule in rules:
+            result = rule(unit)
+            if result is None:
+                return None
+            if result:
+                abilities.append(ability)
+        return abilities
+
+    def known_abilities(self, type_id: UnitTypeId) -> Set[AbilityId]:
+        return UNIT_ABILITIES.get(type_id, set())
+
+    def _create_rules(self, type_id: UnitTypeId) -> List[Tuple[AbilityId, Rule]]:
+        train_abilities: Dict[AbilityId, Tuple[UnitTypeId, dict]] = {}
+        for created_type, info in TRAIN_INFO.get(type_id, {}).items():
+            train_abilities[info["ability"]] = (created_type, info)
+
+        research_abilities: Dict[AbilityId, Tuple[UpgradeId, dict]] = {}
+        for upgrade, info in RESEARCH_INFO.get(type_id, {}).items():
+            research_abilities[info["ability"]] = (upgrade, info)
+
+        rules: List[Tuple[AbilityId, Rule]] = []
+        for ability in sorted(self.known_abilities(type_id), key=lambda a: a.value):
+            rules.append((ability, self._create_rule(type_id, ability, train_abilities, research_abilities)))
+        return rules
+
+    def _create_rule(
+        self,
+        type_id: UnitTypeId,
+        ability: AbilityId,
+        train_abilities: Dict[AbilityId, Tuple[UnitTypeId, dict]],
+        research_abilities: Dict[AbilityId, Tuple[UpgradeId, dict]],
+    ) -> Rule:
+        if type_id in SERVER_ONLY_TYPES:
+            return lambda unit: None
+
+        name = ability.name
+        if ability in train_abilities:
+            created_type, info = train_abilities[ability]
+            return lambda unit: self._can_train(unit, ability, created_type, info)
+        if ability in research_abilities:
+            upgrade, info = research_abilities[ability]
+            return lambda unit: self._can_research(unit, ability, upgrade, info)
+        if ability in ENERGY_COST:
+            cost = ENERGY_COST[ability]
+            upgrade = REQUIRED_UPGRADE.get(ability, None)
+            return lambda unit: unit.energy >= cost and self._has_upgrade(upgrade)
+        if ability in REQUIRED_UPGRADE:
+            upgrade = REQUIRED_UPGRADE[ability]
+            return lambda unit: self._has_upgrade(upgrade)
+        if ability in COOLDOWN_UPGRADE:
+            upgrade = COOLDOWN_UPGRADE[ability]
+            return lambda unit: None if self._has_upgrade(upgrade) else False
+        if name.startswith("BURROWDOWN"):
+            if ability in NATURAL_BURROW:
+                return lambda unit: True
+            return lambda unit: self._has_upgrade(UpgradeId.BURROW)
+        if name.startswith("LIFT_"):
+            return lambda unit: not unit.orders
+        if ability == AbilityId.SMART or name.startswith(BASIC_PREFIXES):
+            return lambda unit: True
+        return lambda unit: None
+
+    def _has_upgrade(self, upgrade: Optional[UpgradeId]) -> bool:
+        return upgrade is None or upgrade in self.ai.state.upgrades
+
+    def _can_train(self, unit: Unit, ability: AbilityId, created_type: UnitTypeId, info: dict) -> bool:
+        if info.get("requires_techlab", False) and not unit.has_techlab:
+            return False
+        if info.get("requires_power", False) and not unit.is_powered:
+            return False
+
+        result = self._step_results.get(ability, None)
+        if result is None:
+            result = (
+                self._building_ready(info.get("required_building", None))
+                and self._has_upgrade(info.get("required_upgrade", None))
+                and self.ai.can_afford(created_type)
+            )
+            self._step_results[ability] = result
+        return result
+
+    def _can_research(self, unit: Unit, ability: AbilityId, upgrade: UpgradeId, info: dict) -> bool:
+        if info.get("requires_power", False) and not unit.is_powered:
+            return False
+
+        result = self._step_results.get(ability, None)
+        if result is None:
+            result = (
+                upgrade not in self.ai.state.upgrades
+                and self.ai.already_pending_upgrade(upgrade) == 0
+                and self._building_ready(info.get("required_building", None))
+                and self._has_upgrade(info.get("required_upgrade", None))
+                and self.ai.can_afford(upgrade)
+            )
+            self._step_results[ability] = result
+        return result
+
+    def _building_ready(self, type_id: Optional[UnitTypeId]) -> bool:
+        return type_id is None or self.ai.structure_type_build_progress(type_id) == 1
@@ -0,0 +1,63 @@
+from typing import Set
+from unittest import mock
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+from .ability_model import AbilityModel
+
+
+def mock_ai(minerals: int, upgrades: Set[UpgradeId]) -> mock.Mock:
+    ai = mock.Mock()
+    ai.state.upgrades = upgrades
+    ai.can_afford = lambda item: minerals >= 100
+    ai.structure_type_build_progress = lambda type_id: 1 if type_id == UnitTypeId.BARRACKS else 0
+    ai.already_pending_upgrade = lambda upgrade: 0
+    return ai
+
+
+def mock_unit(type_id: UnitTypeId, energy: float = 0) -> mock.Mock:
+    unit = mock.Mock()
+    unit.type_id = type_id
+    unit.build_progress = 1
+    unit.energy = energy
+    unit.orders = []
+    unit.has_techlab = False
+    return unit
+
+
+class TestAbilityModel:
+    def test_train_abilities_follow_tech_and_resources(self):
+        model = AbilityModel(mock_ai(150, set()))
+        scv = mock_unit(UnitTypeId.SCV)
+
+        abilities = model.available(scv)
+
+        assert AbilityId.MOVE_MOVE in abilities
+        assert AbilityId.TERRANBUILD_SUPPLYDEPOT in abilities
+        # Factory requires barracks, armory requires factory
+        assert AbilityId.TERRANBUILD_FACTORY in abilities
+        assert AbilityId.TERRANBUILD_ARMORY not in abilities
+
+        poor_model = AbilityModel(mock_ai(50, set()))
+        assert AbilityId.TERRANBUILD_SUPPLYDEPOT not in poor_model.available(scv)
+
+    def test_upgrades_and_energy(self):
+        model = AbilityModel(mock_ai(0, set()))
+        assert AbilityId.EFFECT_STIM_MARINE not in model.available(mock_unit(UnitTypeId.MARINE))
+
+        model = AbilityModel(mock_ai(0, {UpgradeId.STIMPACK}))
+        assert AbilityId.EFFECT_STIM_MARINE in model.available(mock_unit(UnitTypeId.MARINE))
+
+        model = AbilityModel(mock_ai(0, set()))
+        assert AbilityId.SCANNERSWEEP_SCAN not in model.available(mock_unit(UnitTypeId.ORBITALCOMMAND, 49))
+        assert AbilityId.SCANNERSWEEP_SCAN in model.available(mock_unit(UnitTypeId.ORBITALCOMMAND, 50))
+
+    def test_unobservable_cooldowns_are_left_to_server(self):
+        model = AbilityModel(mock_ai(0, set()))
+        assert model.available(mock_unit(UnitTypeId.STALKER)) is not None
+
+        model = AbilityModel(mock_ai(0, {UpgradeId.BLINKTECH}))
+        assert model.available(mock_unit(UnitTypeId.STALKER)) is None
+        assert model.available(mock_unit(UnitTypeId.WARPGATE)) is None
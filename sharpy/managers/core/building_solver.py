@@ -257,21 +257,68 @@ class BuildingSolver(ManagerBase, IBuildingSolver):
             elif self.knowledge.my_race == Race.Terran:
                 self.wall_type = WallType.TerranMainDepots
 
-        if self.wall_type == WallType.ProtossNaturalOneUnit:
-            if not await self.natural_wall():
+        map_cache = self.knowledge.map_cache
+        # Solution depends on the start location and race, in addition to the map
+        start = self.ai.start_location
+        cache_name = f"building_solver_{self.knowledge.my_race.name}_{self.wall_type.name}_{start.x}_{start.y}"
+
+        if map_cache is None or not self.load_solution(map_cache.load(cache_name)):
+            if self.wall_type == WallType.ProtossNaturalOneUnit:
+                if not await self.natural_wall():
+                    self.zerg_wall()
+            elif self.wall_type == WallType.ProtossMainProtoss:
+                self.protoss_wall()
+            elif self.wall_type == WallType.ProtossMainZerg:
                 self.zerg_wall()
-        elif self.wall_type == WallType.ProtossMainProtoss:
-            self.protoss_wall()
-        elif self.wall_type == WallType.ProtossMainZerg:
-            self.zerg_wall()
-        elif self.wall_type == WallType.TerranMainDepots:
-            self.terran_depot_wall()
+            elif self.wall_type == WallType.TerranMainDepots:
+                self.terran_depot_wall()
 
-        self.solve_buildings()
+            self.solve_buildings()
+
+            if map_cache is not None:
+                map_cache.save(cache_name, self.solution_arrays())
 
         if self.debug:
             self.grid.save("buildGrid.bmp")
 
+    def solution_arrays(self) -> Dict[str, np.ndarray]:
+        """Returns the solved building positions and grid as arrays."""
+        positions = [
+            (area.value, position.x, position.y)
+            for area, area_positions in self._building_positions.items()
+            for position in area_positions
+        ]
+        arrays = self.grid.to_arrays()
+        arrays["positions"] = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        arrays["wall2x2"] = np.array(self._wall2x2, dtype=np.float64).reshape(-1, 2)
+        arrays["wall3x3"] = np.array(self._wall3x3, dtype=np.float64).reshape(-1, 2)
+        arrays["zealot"] = np.array([self._zealot] if self._zealot else [], dtype=np.float64).reshape(-1, 2)
+        return arrays
+
+    def load_solution(self, arrays: Optional[Dict[str, np.ndarray]]) -> bool:
+        """Sets building positions and grid from arrays returned by solution_arrays."""
+        if arrays is None:
+            return False
+
+        try:
+            building_positions: Dict[BuildArea, List[Point2]] = dict()
+            for area, x, y in arrays["positions"].tolist():
+                building_positions.setdefault(BuildArea(int(area)), []).append(Point2((x, y)))
+            wall2x2 = [Point2(position) for position in arrays["wall2x2"].tolist()]
+            wall3x3 = [Point2(position) for position in arrays["wall3x3"].tolist()]
+            zealot = [Point2(position) for position in arrays["zealot"].tolist()]
+        except (KeyError, ValueError):
+            return False
+
+        if not self.grid.from_arrays(arrays):
+            return False
+
+        self._building_positions = building_positions
+        self._wall2x2 = wall2x2
+        self._wall3x3 = wall3x3
+        self._zealot = zealot[0] if zealot else None
+        return True
+
     def terran_depot_wall(self):
         main: Zone = self.zone_manager.own_main_zone
         if main.ramp.ramp.depot_in_middle:
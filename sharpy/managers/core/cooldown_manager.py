@@ -1,5 +1,7 @@
 from typing import Dict, List, Optional, Set
 
+from sc2.data import Result
+from sharpy.managers.core.ability_model import AbilityModel
 from sharpy.managers.core.manager_base import ManagerBase
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
@@ -11,29 +13,120 @@ class CooldownManager(ManagerBase):
     """
     Global cooldown manager that is shared between all units.
     TODO: Rename to ability manager?
+
+    Available abilities are resolved with a local `AbilityModel` and the server is only queried
+    for the units that the model can't resolve.
+
+    @param use_model: When False all own units are queried from the server every step.
+    @param query_interval: Steps between server queries for units that the model can't resolve.
+    @param validate_interval: Steps between checking a sample of model results against the server, 0 to disable.
+    @param validate_count: Number of units checked against the server on validation steps.
     """
 
-    def __init__(self):
+    def __init__(
+        self, use_model: bool = True, query_interval: int = 1, validate_interval: int = 50, validate_count: int = 5
+    ):
         super().__init__()
+        self.use_model = use_model
+        self.query_interval = max(1, query_interval)
+        self.validate_interval = validate_interval
+        self.validate_count = validate_count
         self.used_dict: Dict[int, Dict[AbilityId, float]] = dict()
         self.available_dict: Dict[int, List[AbilityId]] = dict()
         self.adept_to_shade: Dict[int, int] = dict()
         self.shade_to_adept: Dict[int, int] = dict()
         self._shade_tags_handled: Set[int] = set()
+        self.model: Optional[AbilityModel] = None
+        # Last server results for units that the model can't resolve
+        self._server_dict: Dict[int, List[AbilityId]] = dict()
+        self._step = 0
+        self.queried_units = 0
+        self.validated_units = 0
+        self.disagreements = 0
+        self.ability_disagreements: Dict[AbilityId, int] = dict()
+
+    async def start(self, knowledge: "Knowledge"):
+        await super().start(knowledge)
+        self.model = AbilityModel(self.ai)
 
     async def update(self):
         self.available_dict.clear()
+        self._step += 1
         if len(self.ai.all_own_units) < 1:
             return
+
+        if self.use_model:
+            await self.update_with_model()
+        else:
+            try:
+                result: List[List[AbilityId]] = await self.ai.get_available_abilities(self.ai.all_own_units)
+            except Exception as e:
+                self.print(f"Get available abilities failed: {e}")
+                return
+
+            for i in range(0, len(self.ai.all_own_units)):
+                self.available_dict[self.ai.all_own_units[i].tag] = result[i]
+
+        self.update_shades()
+
+    async def update_with_model(self):
+        self.model.new_step()
+        query_step = self._step % self.query_interval == 0
+        validate_step = self.validate_interval > 0 and self._step % self.validate_interval == 0
+        server_dict: Dict[int, List[AbilityId]] = dict()
+        query: List[Unit] = []
+        validate: List[Unit] = []
+
+        for unit in self.ai.all_own_units:
+            abilities = self.model.available(unit)
+            if abilities is not None:
+                self.available_dict[unit.tag] = abilities
+                if validate_step and len(validate) < self.validate_count:
+                    validate.append(unit)
+                continue
+
+            last_result = self._server_dict.get(unit.tag, None)
+            if query_step or last_result is None:
+                query.append(unit)
+            else:
+                self.available_dict[unit.tag] = last_result
+                server_dict[unit.tag] = last_result
+
+        self._server_dict = server_dict
+
+        if not query and not validate:
+            return
+
         try:
-            result: List[List[AbilityId]] = await self.ai.get_available_abilities(self.ai.all_own_units)
+            result: List[List[AbilityId]] = await self.ai.get_available_abilities(query + validate)
         except Exception as e:
             self.print(f"Get available abilities failed: {e}")
             return
 
-        for i in range(0, len(self.ai.all_own_units)):
-            self.available_dict[self.ai.all_own_units[i].tag] = result[i]
+        self.queried_units += len(query)
+        for i in range(0, len(query)):
+            self.available_dict[query[i].tag] = result[i]
+            self._server_dict[query[i].tag] = result[i]
 
+        for i in range(0, len(validate)):
+            self.validate(validate[i], result[len(query) + i])
+
+    def validate(self, unit: Unit, server_result: List[AbilityId]):
+        """Compares model result for the unit to the server result and uses the server result."""
+        known = self.model.known_abilities(unit.type_id)
+        local = set(self.available_dict[unit.tag])
+        server = {ability for ability in server_result if ability in known}
+        self.validated_units += 1
+
+        difference = local.symmetric_difference(server)
+        if difference:
+            self.disagreements += 1
+            for ability in difference:
+                self.ability_disagreements[ability] = self.ability_disagreements.get(ability, 0) + 1
+
+        self.available_dict[unit.tag] = server_result
+
+    def update_shades(self):
         shades = self.cache.own(UnitTypeId.ADEPTPHASESHIFT)
 
         if len(shades) == 0:
@@ -71,6 +164,16 @@ class CooldownManager(ManagerBase):
     async def post_update(self):
         pass
 
+    async def on_end(self, game_result: Result):
+        if not self.use_model:
+            return
+        self.print(
+            f"Ability model: {self.queried_units} server queried units, "
+            f"{self.disagreements} / {self.validated_units} validated units disagreed with server"
+        )
+        for ability, count in sorted(self.ability_disagreements.items(), key=lambda item: -item[1]):
+            self.print(f"{ability.name}: {count} disagreements")
+
     @property
     def time(self) -> float:
         return self.knowledge.ai.time
@@ -1,5 +1,7 @@
 import string
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
 
 from s2clientprotocol.debug_pb2 import Color
 
@@ -22,6 +24,12 @@ from .zone_area import ZoneArea
 if TYPE_CHECKING:
     from sharpy.knowledges import *
 
+BUILD_GRID_CACHE = "build_grid"
+
+_build_areas = {area.value: area for area in BuildArea}
+_zone_areas = {zone.value: zone for zone in ZoneArea}
+_cliffs = {cliff.value: cliff for cliff in Cliff}
+
 
 class BuildGrid(Grid):
     def __init__(self, knowledge: "Knowledge"):
@@ -35,8 +43,12 @@ class BuildGrid(Grid):
         # noinspection PyUnresolvedReferences
         self.knowledge = knowledge  # type: Knowledge
         self.zone_manager = knowledge.zone_manager
-        self.Generate(ai)
-        self.SolveCliffs(ai)
+        map_cache = knowledge.map_cache
+        if map_cache is None or not self.from_arrays(map_cache.load(BUILD_GRID_CACHE)):
+            self.Generate(ai)
+            self.SolveCliffs(ai)
+            if map_cache is not None:
+                map_cache.save(BUILD_GRID_CACHE, self.to_arrays())
         self.townhall_color = Point3((200, 170, 55))
         self.building_color = Point3((255, 155, 55))
         self.pylon_color = Point3((55, 255, 200))
@@ -178,6 +190,44 @@ class BuildGrid(Grid):
                 y += 1
             x += 1
 
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Returns the state of every cell as arrays indexed by [x, y]."""
+        cells = [cell for column in self._data for cell in column]
+        shape = (self.width, self.height)
+        return {
+            "area": np.array([cell.Area.value for cell in cells], dtype=np.int16).reshape(shape),
+            "zone": np.array([cell.ZoneIndex.value for cell in cells], dtype=np.int16).reshape(shape),
+            "building": np.array([cell.BuildingIndex for cell in cells], dtype=np.int32).reshape(shape),
+            "cliff": np.array([cell.Cliff.value for cell in cells], dtype=np.int16).reshape(shape),
+        }
+
+    def from_arrays(self, arrays: Optional[Dict[str, np.ndarray]]) -> bool:
+        """Sets the state of every cell from arrays returned by to_arrays. Returns False if the arrays don't fit."""
+        if arrays is None:
+            return False
+
+        try:
+            if any(arrays[name].shape != (self.width, self.height) for name in ("area", "zone", "building", "cliff")):
+                return False
+            columns = zip(
+                arrays["area"].tolist(), arrays["zone"].tolist(), arrays["building"].tolist(), arrays["cliff"].tolist()
+            )
+            data = []
+            for areas, zones, buildings, cliffs in columns:
+                column = []
+                for area, zone, building, cliff in zip(areas, zones, buildings, cliffs):
+                    cell = GridArea(_build_areas[area])
+                    cell.ZoneIndex = _zone_areas[zone]
+                    cell.BuildingIndex = building
+                    cell.Cliff = _cliffs[cliff]
+                    column.append(cell)
+                data.append(column)
+        except KeyError:
+            return False
+
+        self._data = data
+        return True
+
     def save(self, filename: string):
         if self.knowledge.debug:
             self.save_image(filename, self.select_color)
@@ -1,16 +1,50 @@
 import logging
+import queue
 import string
+import threading
+import time
 from configparser import ConfigParser
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from sc2.data import Result
 from sc2.main import logger
 from sharpy.interfaces import ILogManager
 from .manager_base import ManagerBase
 
 root_logger = logging.getLogger()
 
+# log level, message, tag, stats, start_with
+LogRecord = Tuple[int, str, Optional[str], Optional[Tuple[float, float, int, int, int, int]], Optional[str]]
+
+
+def format_record(record: LogRecord) -> str:
+    log_level, message, tag, stats, start_with = record
+
+    if tag is not None:
+        message = f"[{tag}] {message}"
+
+    if stats is not None:
+        game_time, step_time, minerals, vespene, supply_used, supply_cap = stats
+        time_formatted = f"{int(game_time // 60):02}:{int(game_time % 60):02}"
+        message = (
+            f"{time_formatted.rjust(5)} {str(round(step_time)).rjust(4)}ms "
+            f"{str(minerals).rjust(4)}M {str(vespene).rjust(4)}G "
+            f"{str(supply_used).rjust(3)}/{str(supply_cap).rjust(3)}U {message}"
+        )
+
+    if start_with:
+        message = start_with + message
+    return message
+
 
 class LogManager(ManagerBase, ILogManager):
+    """
+    Prints log messages with game stats.
+
+    When async_log is enabled in config.ini, log records are queued without formatting
+    and a background thread formats and writes them. Queued records are flushed on game end.
+    """
+
     config: ConfigParser
     logger: Any  # TODO: type?
     start_with: Optional[str]
@@ -18,14 +52,29 @@ class LogManager(ManagerBase, ILogManager):
     def __init__(self) -> None:
         super().__init__()
         self.start_with = None
+        self.async_log = False
+        self._tag_enabled: Dict[str, bool] = {}
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._thread: Optional[threading.Thread] = None
+        # Time spent in print calls
+        self.print_calls = 0
+        self.print_ns = 0
+        self.step_print_ns = 0
+        self.max_step_print_ns = 0
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
         self.logger = logger
         self.config = knowledge.config
+        self.async_log = self.config["general"].getboolean("async_log") is True
+        if self.async_log:
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._write_records, name="LogManager", daemon=True)
+            self._thread.start()
 
     async def update(self):
-        pass
+        self.max_step_print_ns = max(self.max_step_print_ns, self.step_print_ns)
+        self.step_print_ns = 0
 
     async def post_update(self):
         pass
@@ -39,29 +88,66 @@ class LogManager(ManagerBase, ILogManager):
         :param stats: When true, stats such as time, minerals, gas, and supply are added to the log message.
         :param log_level: Optional logging level. Default is INFO.
         """
+        ns_print = time.perf_counter_ns()
 
         if self.ai.run_custom and self.ai.player_id != 1 and not self.ai.realtime:
             # No logging for player 2 in custom games
             return
 
         if tag is not None:
-            debug_log = self.config["debug_log"]
-            enabled = debug_log.getboolean(tag, fallback=True)
+            enabled = self._tag_enabled.get(tag, None)
+            if enabled is None:
+                enabled = self.config["debug_log"].getboolean(tag, fallback=True)
+                self._tag_enabled[tag] = enabled
             if not enabled:
                 return
 
-        if tag is not None:
-            message = f"[{tag}] {message}"
-
+        stats_values = None
         if stats:
-            last_step_time = round(self.ai.step_time[3])
-
-            message = (
-                f"{self.ai.time_formatted.rjust(5)} {str(last_step_time).rjust(4)}ms "
-                f"{str(self.ai.minerals).rjust(4)}M {str(self.ai.vespene).rjust(4)}G "
-                f"{str(self.ai.supply_used).rjust(3)}/{str(self.ai.supply_cap).rjust(3)}U {message}"
+            stats_values = (
+                self.ai.time,
+                self.ai.step_time[3],
+                self.ai.minerals,
+                self.ai.vespene,
+                self.ai.supply_used,
+                self.ai.supply_cap,
             )
 
-        if self.start_with:
-            message = self.start_with + message
-        self.logger.log(log_level, message)
+        record: LogRecord = (log_level, message, tag, stats_values, self.start_with)
+
+        if self._queue is not None:
+            self._queue.put(record)
+        else:
+            self.logger.log(log_level, format_record(record))
+
+        ns_print = time.perf_counter_ns() - ns_print
+        self.print_calls += 1
+        self.print_ns += ns_print
+        self.step_print_ns += ns_print
+
+    def _write_records(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            self.logger.log(record[0], format_record(record))
+
+    def flush(self):
+        """Writes all queued log records and stops the background writer."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+
+    async def on_end(self, game_result: Result):
+        if self.print_calls > 0:
+            self.print(
+                f"{self.print_calls} log calls took {self.print_ns / 1e6:.1f} ms, "
+                f"{self.print_ns / self.print_calls / 1000:.1f} us per call, "
+                f"max {self.max_step_print_ns / 1e6:.2f} ms per step",
+                type(self).__name__,
+                stats=False,
+            )
+        self.flush()
@@ -0,0 +1,53 @@
+import logging
+from configparser import ConfigParser
+from typing import List, Tuple
+from unittest import mock
+
+import pytest
+
+from sc2.data import Result
+
+from .log_manager import LogManager
+
+
+def create_config(async_log: bool) -> ConfigParser:
+    config = ConfigParser()
+    config.read_dict({"general": {"async_log": str(async_log)}, "debug_log": {"Hidden": "no"}})
+    return config
+
+
+async def create_manager(async_log: bool) -> Tuple[LogManager, List[Tuple[int, str]]]:
+    knowledge = mock.Mock()
+    knowledge.config = create_config(async_log)
+    knowledge.ai.run_custom = False
+    knowledge.ai.time = 75.0
+    knowledge.ai.step_time = (0, 0, 0, 12.4)
+    knowledge.ai.minerals = 50
+    knowledge.ai.vespene = 0
+    knowledge.ai.supply_used = 12
+    knowledge.ai.supply_cap = 15
+
+    manager = LogManager()
+    await manager.start(knowledge)
+    written: List[Tuple[int, str]] = []
+    manager.logger = mock.Mock()
+    manager.logger.log = lambda level, message: written.append((level, message))
+    return manager, written
+
+
+class TestLogManager:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("async_log", [False, True])
+    async def test_messages_are_formatted_and_filtered(self, async_log: bool):
+        manager, written = await create_manager(async_log)
+
+        manager.print("first", "Shown")
+        manager.print("hidden", "Hidden")
+        manager.print("second", stats=False, log_level=logging.WARNING)
+        await manager.on_end(Result.Victory)
+
+        assert written[0] == (logging.INFO, "01:15   12ms   50M    0G  12/ 15U [Shown] first")
+        assert written[1] == (logging.WARNING, "second")
+        assert all("hidden" not in message for _, message in written)
+        # Includes the summary printed on game end
+        assert manager.print_calls == 3
@@ -1,3 +1,4 @@
+import enum
 import logging
 import string
 from abc import ABC, abstractmethod
@@ -16,7 +17,17 @@ if TYPE_CHECKING:
     from sharpy.managers.core import UnitCacheManager, UnitValue
 
 
+class ManagerPriority(enum.IntEnum):
+    # May be skipped for a while when the bot is lagging
+    Low = 0
+    Normal = 1
+
+
 class ManagerBase(ABC, Component):
+    priority: ManagerPriority = ManagerPriority.Normal
+    # Time in seconds between updates of a low priority manager that is skipped because the bot is lagging
+    min_cadence: float = 1
+
     @abstractmethod
     async def update(self):
         pass
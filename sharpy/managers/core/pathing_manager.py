@@ -1,10 +1,11 @@
 import logging
-from typing import Dict, List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 from math import floor
 
-from sc2.data import Race
+from sc2.data import Race, Result
 from sc2.game_info import GameInfo
 from sc2.ids.effect_id import EffectId
 from sc2.position import Point2, Point3
@@ -19,6 +20,19 @@ from .manager_base import ManagerBase
 from sharpy.managers.core.unit_value import buildings_2x2, buildings_3x3, buildings_5x5
 from sharpy.sc2math import point_normalize
 
+PathResult = Tuple[List[Tuple[int, int]], float]
+
+
+class PathRequest(NamedTuple):
+    start: Point2
+    end: Point2
+    # Unit is large and requires path to have width of 2 to pass
+    large: bool = False
+    # Map of Sc2Map to search, None searches path_finder_terrain that ignores buildings and influence
+    map_type: Optional[MapType] = None
+    # Avoid enemy influence, only used with map_type
+    influence: bool = False
+
 
 class PathingManager(ManagerBase):
     map: Sc2Map
@@ -28,6 +42,9 @@ class PathingManager(ManagerBase):
         super().__init__()
         self.found_points = []
         self.found_points_air = []
+        # Results of path searches since the grids were last updated
+        self._path_cache: Dict[tuple, PathResult] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -47,6 +64,15 @@ class PathingManager(ManagerBase):
         self.path_finder_terrain = sc2pathlib.PathFinder(_data)
         self.path_finder_terrain.normalize_influence(20)
 
+        threads = self.knowledge.config["general"].getint("pathing_threads", fallback=0)
+        if threads > 0:
+            self._executor = ThreadPoolExecutor(threads, thread_name_prefix="PathingManager")
+
+    @property
+    def parallel(self) -> bool:
+        """True if batched path searches are split between worker threads."""
+        return self._executor is not None
+
     @property
     def overlord_spots(self) -> List[Point2]:
         points = []
@@ -57,6 +83,7 @@ class PathingManager(ManagerBase):
 
     async def update(self):
         await self.update_influence()
+        self._path_cache.clear()
         self.found_points.clear()
         self.found_points_air.clear()
 
@@ -221,6 +248,11 @@ class PathingManager(ManagerBase):
         #     self.path_finder_air.add_influence(positions, -5, 6)
         #     self.path_finder_ground.add_influence(positions, -5, 6)
 
+    async def on_end(self, game_result: Result):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     async def post_update(self):
         if self.debug:
             # TODO: Plot Air
@@ -232,8 +264,66 @@ class PathingManager(ManagerBase):
                 point3 = Point3((point.x, point.y, z))
                 self.client.debug_box2_out(point3, 0.25)
 
+    def find_paths(self, requests: Iterable[PathRequest]) -> List[PathResult]:
+        """
+        Finds paths for all requests in one call.
+        Identical requests are searched only once and results are reused until the grids are updated on next frame.
+        When pathing_threads is set in config.ini, the searches are split between worker threads, which
+        only speeds them up if the native pathing library releases the GIL.
+
+        :return: Tuple of path points and total distance for every request in the same order.
+            The path is empty if no path was found.
+        """
+        requests = list(requests)
+        keys = [self._request_key(request) for request in requests]
+        missing: Dict[tuple, PathRequest] = {}
+        for key, request in zip(keys, requests):
+            if key not in self._path_cache:
+                missing[key] = request
+
+        if len(missing) > 1 and self._executor is not None:
+            results = self._executor.map(self._search, missing.values())
+        else:
+            results = map(self._search, missing.values())
+        self._path_cache.update(zip(missing.keys(), results))
+        return [self._path_cache[key] for key in keys]
+
+    def _find(self, request: PathRequest) -> PathResult:
+        key = self._request_key(request)
+        result = self._path_cache.get(key)
+        if result is None:
+            result = self._search(request)
+            self._path_cache[key] = result
+        return result
+
+    @staticmethod
+    def _request_key(request: PathRequest) -> tuple:
+        if request.map_type is None:
+            # PathFinder rounds the positions to the closest grid point
+            return (
+                round(request.start[0]),
+                round(request.start[1]),
+                round(request.end[0]),
+                round(request.end[1]),
+                request.large,
+            )
+        return (
+            request.start[0],
+            request.start[1],
+            request.end[0],
+            request.end[1],
+            request.large,
+            request.map_type,
+            request.influence,
+        )
+
+    def _search(self, request: PathRequest) -> PathResult:
+        if request.map_type is None:
+            return self.path_finder_terrain.find_path(request.start, request.end, request.large)
+        return self.map.find_path(request.map_type, request.start, request.end, request.large, request.influence)
+
     def walk_distance(self, start: Point2, target: Point2) -> float:
-        result = self.map.find_path(MapType.Ground, start, target)
+        result = self._find(PathRequest(start, target, map_type=MapType.Ground))
         path = result[0]
 
         if len(path) < 1:
@@ -241,7 +331,7 @@ class PathingManager(ManagerBase):
         return result[1]
 
     def find_path(self, start: Point2, target: Point2, target_index: int = 20) -> Point2:
-        result = self.path_finder_terrain.find_path(start, target)
+        result = self._find(PathRequest(start, target))
         path = result[0]
 
         if len(path) < 1:
@@ -272,7 +362,7 @@ class PathingManager(ManagerBase):
         return Point2((pos[0], pos[1]))
 
     def find_influence_air_path(self, start: Point2, target: Point2) -> Point2:
-        result = self.map.find_path_influence(MapType.Air, start, target)
+        result = self._find(PathRequest(start, target, map_type=MapType.Air, influence=True))
         path = result[0]
         target_index = 4
 
@@ -291,7 +381,7 @@ class PathingManager(ManagerBase):
     def find_influence_ground_path(
         self, start: Point2, target: Point2, target_index: int = 5, map_type: MapType = MapType.Ground
     ) -> Point2:
-        result = self.map.find_path_influence(map_type, start, target)
+        result = self._find(PathRequest(start, target, map_type=map_type, influence=True))
         path = result[0]
 
         if len(path) < 1:
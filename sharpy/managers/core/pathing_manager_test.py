@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from sc2.position import Point2
+from sc2pathlib import MapType
+
+from .pathing_manager import PathingManager, PathRequest
+
+
+class CountingPathFinder:
+    def __init__(self):
+        self.searches = []
+        self.results = []
+        self.lock = Lock()
+
+    def find_path(self, *args):
+        with self.lock:
+            self.searches.append(args)
+            result = [(len(self.searches), 0)], float(len(self.searches))
+            self.results.append(result)
+            return result
+
+
+def create_pathing_manager() -> PathingManager:
+    manager = PathingManager()
+    manager.path_finder_terrain = CountingPathFinder()
+    manager.map = CountingPathFinder()
+    return manager
+
+
+class TestPathingManager:
+    def test_identical_requests_are_searched_once(self):
+        manager = create_pathing_manager()
+        requests = [
+            PathRequest(Point2((10, 10)), Point2((50, 50))),
+            PathRequest(Point2((10.2, 9.9)), Point2((50, 50))),
+            PathRequest(Point2((10, 10)), Point2((50, 50)), map_type=MapType.Ground),
+            PathRequest(Point2((10, 10)), Point2((50, 50)), map_type=MapType.Ground, influence=True),
+            PathRequest(Point2((10, 10)), Point2((50, 50)), map_type=MapType.Ground),
+        ]
+
+        results = manager.find_paths(requests)
+
+        assert len(manager.path_finder_terrain.searches) == 1
+        assert len(manager.map.searches) == 2
+        assert results[0] is results[1]
+        assert results[2] is results[4]
+        assert results[2] is not results[3]
+        assert manager.walk_distance(Point2((10, 10)), Point2((50, 50))) == results[2][1]
+        assert len(manager.map.searches) == 2
+
+    def test_worker_threads_keep_request_order(self):
+        manager = create_pathing_manager()
+        manager._executor = ThreadPoolExecutor(2)
+        requests = [PathRequest(Point2((i, i)), Point2((50, 50)), map_type=MapType.Air) for i in range(20)]
+
+        results = manager.find_paths(requests)
+        manager._executor.shutdown()
+
+        searched = {args[1]: result for args, result in zip(manager.map.searches, manager.map.results)}
+        assert results == [searched[request.start] for request in requests]
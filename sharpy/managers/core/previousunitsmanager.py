@@ -7,11 +7,13 @@ from sc2.unit import Unit
 
 
 class PreviousUnitsManager(ManagerBase, IPreviousUnitsManager):
-    """Keeps track of units from the previous iteration. Useful for checking eg. which unit died."""
+    """
+    Keeps track of units from the previous iteration. Useful for checking eg. which unit died.
+    Uses the tag map of the previous frame that BotAI swaps in on every step, so no copies are made.
+    """
 
     def __init__(self):
         super().__init__()
-        self.previous_units: Dict[int, Unit] = dict()
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -19,20 +21,19 @@ class PreviousUnitsManager(ManagerBase, IPreviousUnitsManager):
     async def update(self):
         pass
 
+    @property
+    def previous_units(self) -> Dict[int, Unit]:
+        return self.ai._all_units_previous_map
+
     def last_unit(self, tag: int) -> Optional[Unit]:
-        return self.previous_units.get(tag, None)
+        return self.ai._all_units_previous_map.get(tag, None)
 
     def last_position(self, unit: Unit) -> Point2:
         """
         Return unit position in last frame, or current if unit was just created.
         """
-        previous_unit = self.previous_units.get(unit.tag, unit)
+        previous_unit = self.ai._all_units_previous_map.get(unit.tag, unit)
         return previous_unit.position
 
     async def post_update(self):
-        """Updates previous units so we know what they are on the next iteration.
-        Needs to be run right before the end of an iteration."""
-        self.previous_units = dict()
-
-        for unit in self.ai.all_units:  # type: Unit
-            self.previous_units[unit.tag] = unit
+        pass
@@ -1,4 +1,4 @@
-from typing import List, Union, Set, TYPE_CHECKING
+from typing import Optional, Union, Set, TYPE_CHECKING
 
 from sc2.bot_ai import BotAI
 from sc2.unit import Unit
@@ -11,44 +11,44 @@ if TYPE_CHECKING:
 
 
 class UnitsInRole:
+    """
+    View of the units in a single role of `UnitRoleManager`.
+    Tags are kept up to date by the manager, units are materialized lazily when they are requested.
+    """
+
     def __init__(self, task: Union[int, UnitTask], cache: "UnitCacheManager", ai: BotAI):
         self.task = task
-        self.units: Units = Units([], ai)
         self.tags: Set[int] = set()
         self.cache = cache
+        self.ai = ai
+        self._units: Optional[Units] = None
+
+    @property
+    def units(self) -> Units:
+        if self._units is None:
+            units = Units([], self.ai)
+            for tag in self.tags:
+                unit = self.cache.by_tag(tag)
+                if unit is not None:
+                    units.append(unit)
+            self._units = units
+        return self._units
 
     def clear(self):
-        self.units.clear()
         self.tags.clear()
-
-    def register_units(self, units: Units):
-        for unit in units:
-            self.register_unit(unit)
+        self._units = None
 
     def register_unit(self, unit: Unit):
         if unit.tag not in self.tags:
-            self.units.append(unit)
             self.tags.add(unit.tag)
+            if self._units is not None:
+                self._units.append(unit)
 
-    def remove_units(self, units: Units):
-        for unit in units:
-            self.remove_unit(unit)
-
-    def remove_unit(self, unit: Unit):
-        if unit.tag in self.tags:
-            self.units.remove(unit)
-            self.tags.remove(unit.tag)
+    def remove_tag(self, tag: int):
+        if tag in self.tags:
+            self.tags.remove(tag)
+            self._units = None
 
     def update(self):
-        self.units.clear()
-        new_tags: Set[int] = set()
-
-        for tag in self.tags:
-            unit = self.cache.by_tag(tag)
-
-            if unit is not None and unit.is_mine:
-                # update unit to collection
-                self.units.append(unit)
-                new_tags.add(tag)
-
-        self.tags = new_tags
+        """Units are materialized again from the current frame when they are next requested."""
+        self._units = None
@@ -34,6 +34,7 @@ class UnitCacheManager(ManagerBase, IUnitCache):
         super().__init__()
         self.tag_cache: Dict[int, Unit] = {}
         self._own_unit_cache: Dict[UnitTypeId, Units] = {}
+        self._own_ready_counts: Dict[UnitTypeId, int] = {}
         self._enemy_unit_cache: Dict[UnitTypeId, Units] = {}
         self.own_tree: Optional[cKDTree] = None
         self.enemy_tree: Optional[cKDTree] = None
@@ -102,6 +103,10 @@ class UnitCacheManager(ManagerBase, IUnitCache):
             units.extend(self._own_unit_cache.get(single_type, self.empty_units))
         return units
 
+    def own_ready_count(self, type_id: UnitTypeId) -> int:
+        """Returns the amount of own ready units of the specified type."""
+        return self._own_ready_counts.get(type_id, 0)
+
     @property
     def own_townhalls(self) -> Units:
         """Returns all of our own townhalls."""
@@ -156,11 +161,18 @@ class UnitCacheManager(ManagerBase, IUnitCache):
             return units.filter(self.range_filter)
         return units
 
+    def is_in_range_by_default(self, enemy: Unit) -> bool:
+        """True if enemy_in_range with default arguments returns the enemy unit when it is in range."""
+        if self.only_targetable_enemies_default and not (enemy.can_be_attacked or enemy.is_snapshot):
+            return False
+        return self.range_filter is None or self.range_filter(enemy)
+
     async def update(self):
         self.update_minerals()
 
         self.tag_cache.clear()
         self._own_unit_cache.clear()
+        self._own_ready_counts.clear()
         self._enemy_unit_cache.clear()
         self.force_fields.clear()
         self._effects_cache.clear()
@@ -174,6 +186,8 @@ class UnitCacheManager(ManagerBase, IUnitCache):
             if units.amount == 0:
                 self._own_unit_cache[unit.type_id] = units
             units.append(unit)
+            if unit.is_ready:
+                self._own_ready_counts[unit.type_id] = self._own_ready_counts.get(unit.type_id, 0) + 1
             self.own_numpy_vectors.append(np.array([unit.position.x, unit.position.y]))
 
         for unit in self.ai.all_enemy_units:
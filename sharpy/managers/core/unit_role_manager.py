@@ -1,4 +1,4 @@
-from typing import List, Union, Set, Iterable, Optional
+from typing import Dict, List, Union, Set, Iterable, Optional
 
 from sc2.data import Race
 from sharpy.managers.core.manager_base import ManagerBase
@@ -20,6 +20,8 @@ class UnitRoleManager(ManagerBase):
         super().__init__()
         self.role_count = UnitRoleManager.MAX_VALUE
         self.had_task_set: Set[int] = set()
+        # Role table, unit tag to the index of its role
+        self.unit_roles: Dict[int, int] = {}
         # If this is True, then units will drop their role if it wasn't set in previous iteration
         self.set_tag_each_iteration = True
 
@@ -41,32 +43,37 @@ class UnitRoleManager(ManagerBase):
             self.roles.append(UnitsInRole(index, self.cache, self.ai))
 
     def attack_ended(self):
-        attackers = self.roles[UnitTask.Attacking].units
-        self.roles[UnitTask.Idle].register_units(attackers)
-        self.roles[UnitTask.Attacking].clear()
+        for unit in self.roles[UnitTask.Attacking].units:
+            self._assign(UnitTask.Idle, unit)
+        self._clear_role(UnitTask.Attacking)
+
+    def _assign(self, task: Union[int, UnitTask], unit: Unit):
+        """Moves the unit to the role in constant time."""
+        tag = unit.tag
+        previous = self.unit_roles.get(tag, None)
+        if previous == task:
+            return
+        if previous is not None:
+            self.roles[previous].remove_tag(tag)
+        self.unit_roles[tag] = task
+        self.roles[task].register_unit(unit)
 
-    def set_tasks(self, task: Union[int, UnitTask], units: Units):
-        for i in range(0, self.role_count):
-            if i == task:
-                self.roles[i].register_units(units)
-            else:
-                self.roles[i].remove_units(units)
+    def _clear_role(self, task: Union[int, UnitTask]):
+        for tag in self.roles[task].tags:
+            self.unit_roles.pop(tag, None)
+        self.roles[task].clear()
 
+    def set_tasks(self, task: Union[int, UnitTask], units: Units):
         for unit in units:
-            if unit.tag not in self.had_task_set:
-                self.had_task_set.add(unit.tag)
+            self._assign(task, unit)
+            self.had_task_set.add(unit.tag)
 
     def is_in_role(self, task: Union[int, UnitTask], unit: Unit) -> bool:
-        return unit.tag in self.roles[task].tags
+        return self.unit_roles.get(unit.tag, None) == task
 
     def set_task(self, task: Union[int, UnitTask], unit: Unit):
-        if unit.tag not in self.had_task_set:
-            self.had_task_set.add(unit.tag)
-        for i in range(0, self.role_count):
-            if i == task:
-                self.roles[i].register_unit(unit)
-            else:
-                self.roles[i].remove_unit(unit)
+        self.had_task_set.add(unit.tag)
+        self._assign(task, unit)
 
     def clear_tasks(self, units: Union[Units, Iterable[int]]):
         for unit in units:
@@ -79,11 +86,7 @@ class UnitRoleManager(ManagerBase):
             if unit is None:
                 return  # Unit doesn't exist, do nothing
 
-        for i in range(0, self.role_count):
-            if i == UnitTask.Idle:
-                self.roles[i].register_unit(unit)
-            else:
-                self.roles[i].remove_unit(unit)
+        self._assign(UnitTask.Idle, unit)
 
     def units(self, task: Union[int, UnitTask]) -> Units:
         return self.roles[task].units
@@ -125,8 +128,8 @@ class UnitRoleManager(ManagerBase):
 
     def get_unit_by_tag_from_task(self, tag: int, task: Union[int, UnitTask]) -> Optional[Unit]:
         """Get unit by its tag from the specified role."""
-        if tag in self.roles[task].tags:
-            return self.roles[task].units.by_tag(tag)
+        if self.unit_roles.get(tag, None) == task:
+            return self.cache.by_tag(tag)
         return None
 
     @property
@@ -230,15 +233,18 @@ class UnitRoleManager(ManagerBase):
         return units.of_type([UnitTypeId.DRONE, UnitTypeId.PROBE, UnitTypeId.SCV])
 
     def unit_role(self, unit: Unit) -> UnitTask:
-        for role in self.roles:
-            if unit.tag in role.tags:
-                return role.task
+        task = self.unit_roles.get(unit.tag, None)
+        if task is not None:
+            return self.roles[task].task
 
         # This should not happen as all units should always have a task, but it'd be undetermined task
         return UnitTask.Idle
 
     # Always update at the start of loop
     async def update(self):
+        for role in self.roles:
+            role.update()
+
         left_over = self.ai.units
         if self.knowledge.my_race == Race.Zerg:
             left_over = left_over.exclude_type(UnitTypeId.LARVA)
@@ -250,23 +256,24 @@ class UnitRoleManager(ManagerBase):
                 if unit.tag in self.had_task_set:
                     continue
 
-                if unit.tag in self.roles[UnitTask.Idle].tags or unit.tag in self.roles[UnitTask.Gathering].tags:
+                task = self.unit_roles.get(unit.tag, None)
+                if task == UnitTask.Idle or task == UnitTask.Gathering:
                     continue
 
                 self.clear_task(unit)
 
-        for i in range(1, self.role_count):
-            self.roles[i].update()
-            left_over = left_over.tags_not_in(self.roles[i].tags)
-
+        self._remove_missing_units()
+        left_over = left_over.filter(lambda u: self.unit_roles.get(u.tag, UnitTask.Idle) == UnitTask.Idle)
         left_over = left_over.tags_not_in(self.had_task_set).exclude_type(UnitTypeId.ADEPTPHASESHIFT)
 
-        self.roles[UnitTask.Idle].clear()
+        self._clear_role(UnitTask.Idle)
         gatherers = left_over.collecting
-        self.roles[UnitTask.Gathering].register_units(gatherers)
+        for unit in gatherers:
+            self._assign(UnitTask.Gathering, unit)
 
         # Everything else goes to idle
-        self.roles[UnitTask.Idle].register_units(left_over.tags_not_in(gatherers.tags))
+        for unit in left_over.tags_not_in(gatherers.tags):
+            self._assign(UnitTask.Idle, unit)
 
         # reassign overlords and other to reserved so that they're not used for defense
         peace_units = left_over.of_type(self.peace_unit_types)
@@ -277,6 +284,17 @@ class UnitRoleManager(ManagerBase):
 
         self.had_task_set.clear()
 
+    def _remove_missing_units(self):
+        """Drops units that no longer exist or are no longer ours from the role table."""
+        missing = []
+        for tag in self.unit_roles:
+            unit = self.cache.by_tag(tag)
+            if unit is None or not unit.is_mine:
+                missing.append(tag)
+
+        for tag in missing:
+            self.roles[self.unit_roles.pop(tag)].remove_tag(tag)
+
     async def post_update(self):
         if self.debug:
             idle = len(self.roles[UnitTask.Idle].tags)
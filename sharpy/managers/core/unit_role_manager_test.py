@@ -0,0 +1,56 @@
+from typing import Dict, List
+
+import pytest
+from unittest import mock
+
+from sc2.units import Units
+
+from .roles import UnitTask
+from .unit_role_manager import UnitRoleManager
+
+
+def mock_units(count: int) -> List[mock.Mock]:
+    units = []
+    for tag in range(1, count + 1):
+        unit = mock.Mock()
+        unit.tag = tag
+        unit.is_mine = True
+        units.append(unit)
+    return units
+
+
+async def mock_manager(units: List[mock.Mock]) -> UnitRoleManager:
+    by_tag: Dict[int, mock.Mock] = {unit.tag: unit for unit in units}
+    knowledge = mock.Mock()
+    knowledge.unit_cache.by_tag = lambda tag: by_tag.get(tag, None)
+    manager = UnitRoleManager()
+    await manager.start(knowledge)
+    return manager
+
+
+class TestUnitRoleManager:
+    @pytest.mark.asyncio
+    async def test_set_tasks_moves_units_between_roles(self):
+        units = mock_units(10)
+        manager = await mock_manager(units)
+
+        manager.set_tasks(UnitTask.Attacking, Units(units, manager.ai))
+        manager.set_tasks(UnitTask.Defending, Units(units[:4], manager.ai))
+
+        assert manager.units(UnitTask.Attacking).amount == 6
+        assert manager.units(UnitTask.Defending).amount == 4
+        assert manager.unit_role(units[0]) == UnitTask.Defending
+        assert manager.unit_role(units[9]) == UnitTask.Attacking
+        assert not manager.is_in_role(UnitTask.Attacking, units[0])
+
+    @pytest.mark.asyncio
+    async def test_attack_ended_moves_attackers_to_idle(self):
+        units = mock_units(3)
+        manager = await mock_manager(units)
+
+        manager.set_tasks(UnitTask.Attacking, Units(units, manager.ai))
+        manager.attack_ended()
+
+        assert manager.units(UnitTask.Attacking).amount == 0
+        assert manager.units(UnitTask.Idle).amount == 3
+        assert manager.unit_role(units[1]) == UnitTask.Idle
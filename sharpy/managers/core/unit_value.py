@@ -1,5 +1,8 @@
 import logging
-from typing import Union, Optional, List, Callable, Dict
+import math
+from typing import Union, Optional, List, Dict, Tuple
+
+import numpy as np
 
 from sc2.data import Race, race_townhalls
 from sharpy.general.unit_feature import UnitFeature
@@ -90,6 +93,68 @@ REVERSE_MORPHS_DICT = {
 }
 
 
+UNIT_TABLE_DTYPE = np.dtype(
+    [
+        ("minerals", float),
+        ("gas", float),
+        ("supply", float),
+        ("combat_value", float),
+        ("build_time", np.int32),
+        ("real_type", np.int32),
+        # Ranges that replace the weapon ranges of game data, nan when the weapon range is used
+        ("ground_range", float),
+        ("ground_range_upgraded", float),
+        ("air_range", float),
+        ("air_range_upgraded", float),
+        # Speed of enemy units that are assumed to have their speed upgrade, nan when there is no upgrade
+        ("upgraded_speed", float),
+        # Speed multiplier of enemy zerg units on creep
+        ("creep_speed", float),
+    ]
+)
+
+# Normal and upgraded ground range of units whose range isn't the weapon range in game data
+ground_range_overrides: Dict[UnitTypeId, Tuple[float, float]] = {
+    UnitTypeId.RAVEN: (9, 9),
+    UnitTypeId.ORACLE: (4, 4),
+    UnitTypeId.CARRIER: (8, 8),
+    UnitTypeId.BATTLECRUISER: (6, 6),
+    UnitTypeId.DISRUPTOR: (10, 10),
+    UnitTypeId.BANELING: (0.1, 0.1),
+    UnitTypeId.SENTRY: (5, 5),
+    UnitTypeId.VOIDRAY: (6, 6),
+    UnitTypeId.WIDOWMINEBURROWED: (5, 5),
+    UnitTypeId.ORACLESTASISTRAP: (5, 5),
+    UnitTypeId.LURKERMP: (8, 10),
+    UnitTypeId.LURKERMPBURROWED: (8, 10),
+    UnitTypeId.COLOSSUS: (7, 9),
+    # Cyclone range is upgraded when lock on is active
+    UnitTypeId.CYCLONE: (6, 9),
+}
+
+air_range_overrides: Dict[UnitTypeId, Tuple[float, float]] = {
+    UnitTypeId.RAVEN: (9, 9),
+    UnitTypeId.CARRIER: (8, 8),
+    UnitTypeId.BATTLECRUISER: (6, 6),
+    UnitTypeId.SENTRY: (5, 5),
+    UnitTypeId.VOIDRAY: (6, 6),
+    UnitTypeId.WIDOWMINEBURROWED: (5, 5),
+    UnitTypeId.CYCLONE: (6, 9),
+}
+
+upgraded_speeds: Dict[UnitTypeId, float] = {
+    UnitTypeId.ZERGLING: 6.58,
+}
+
+CREEP_SPEED = 1.3
+creep_speeds: Dict[UnitTypeId, float] = {
+    UnitTypeId.QUEEN: 2.6667,
+    UnitTypeId.HYDRALISK: 1.5,
+}
+# Enemy zerglings are assumed to have the speed upgrade after this time
+ZERGLING_SPEED_TIME = 200
+
+
 class UnitData:
     def __init__(
         self,
@@ -245,7 +310,6 @@ class UnitValue(ManagerBase, IUnitValues):
         super().__init__()
         self.combat_ignore = {UnitTypeId.OVERLORD, UnitTypeId.LARVA} | self.not_really_structure
         self._enemy_worker_type: Optional[UnitTypeId] = None
-        self.init_range_dicts()
 
         self.unit_data = {
             # Units
@@ -473,6 +537,53 @@ class UnitValue(ManagerBase, IUnitValues):
             if UnitFeature.Detector in unit_data.features:
                 self.detectors.append(unit_data_key)
 
+        self.table = self.create_table()
+        # Views to columns of the table for scalar lookups
+        self._minerals = self.table["minerals"]
+        self._gas = self.table["gas"]
+        self._supply = self.table["supply"]
+        self._combat_value = self.table["combat_value"]
+        self._build_time = self.table["build_time"]
+        self._ground_range = self.table["ground_range"]
+        self._ground_range_upgraded = self.table["ground_range_upgraded"]
+        self._air_range = self.table["air_range"]
+        self._air_range_upgraded = self.table["air_range_upgraded"]
+        self._upgraded_speed = self.table["upgraded_speed"]
+        self._creep_speed = self.table["creep_speed"]
+
+    def create_table(self) -> np.ndarray:
+        """Static data of all unit types in a structured array indexed by UnitTypeId.value."""
+        table = np.zeros(max(type_id.value for type_id in UnitTypeId) + 1, dtype=UNIT_TABLE_DTYPE)
+        table["combat_value"] = 1
+        table["real_type"] = np.arange(len(table))
+        for column in ("ground_range", "ground_range_upgraded", "air_range", "air_range_upgraded", "upgraded_speed"):
+            table[column] = np.nan
+        table["creep_speed"] = CREEP_SPEED
+
+        for type_id, data in self.unit_data.items():
+            row = table[type_id.value]
+            row["minerals"] = data.minerals
+            row["gas"] = data.gas
+            row["supply"] = data.supply
+            row["combat_value"] = data.combat_value
+            row["build_time"] = data.build_time or 0
+
+        table[UnitTypeId.WARPGATE.value]["build_time"] = table[UnitTypeId.GATEWAY.value]["build_time"]
+
+        for type_id, real_type in real_types.items():
+            table[type_id.value]["real_type"] = real_type.value
+        for type_id, (normal, upgraded) in ground_range_overrides.items():
+            table[type_id.value]["ground_range"] = normal
+            table[type_id.value]["ground_range_upgraded"] = upgraded
+        for type_id, (normal, upgraded) in air_range_overrides.items():
+            table[type_id.value]["air_range"] = normal
+            table[type_id.value]["air_range_upgraded"] = upgraded
+        for type_id, speed in upgraded_speeds.items():
+            table[type_id.value]["upgraded_speed"] = speed
+        for type_id, multiplier in creep_speeds.items():
+            table[type_id.value]["creep_speed"] = multiplier
+        return table
+
     @property
     def enemy_worker_type(self) -> Optional[UnitTypeId]:
         if self._enemy_worker_type is None:
@@ -483,63 +594,6 @@ class UnitValue(ManagerBase, IUnitValues):
     def my_worker_type(self) -> Optional[UnitTypeId]:
         return self._my_worker_type
 
-    def init_range_dicts(self):
-        self._ground_range_dict: Dict[UnitTypeId, Callable[[Unit], float]] = {
-            UnitTypeId.RAVEN: lambda u: 9,
-            UnitTypeId.ORACLE: lambda u: 4,
-            UnitTypeId.CARRIER: lambda u: 8,
-            UnitTypeId.BATTLECRUISER: lambda u: 6,
-            UnitTypeId.DISRUPTOR: lambda u: 10,
-            UnitTypeId.BANELING: lambda u: 0.1,
-            UnitTypeId.SENTRY: lambda u: 5,
-            UnitTypeId.VOIDRAY: lambda u: 6,
-            UnitTypeId.WIDOWMINEBURROWED: lambda u: 5,
-            UnitTypeId.ORACLESTASISTRAP: lambda u: 5,
-        }
-
-        self._air_range_dict: Dict[UnitTypeId, Callable[[Unit], float]] = {
-            UnitTypeId.RAVEN: lambda u: 9,
-            UnitTypeId.CARRIER: lambda u: 8,
-            UnitTypeId.BATTLECRUISER: lambda u: 6,
-            UnitTypeId.SENTRY: lambda u: 5,
-            UnitTypeId.VOIDRAY: lambda u: 6,
-            UnitTypeId.WIDOWMINEBURROWED: lambda u: 5,
-        }
-
-        def lurker_range(unit: Unit):
-            if self.knowledge.version_manager.base_version < GameVersion.V_4_11_0:
-                return 8
-            else:
-                if unit.is_mine and self.ai.already_pending_upgrade(UpgradeId.LURKERRANGE) >= 1:
-                    return 10
-                return 8
-
-        def cyclone_range(unit: Unit):
-            if not unit.is_mine:
-                return 9  # worst case
-            if self.knowledge.cooldown_manager.is_ready(unit.tag, AbilityId.LOCKON_LOCKON):
-                return 6
-            if self.knowledge.cooldown_manager.is_ready(unit.tag, AbilityId.CANCEL_LOCKON):
-                return 9
-            return 6  # ?
-
-        def colossus_range(unit: Unit):
-            if not unit.is_mine:
-                if self.ai.time > 6 * 60:
-                    # Let's assume the worst, enemy has the upgrade!
-                    return 9
-                return 7
-
-            if self.ai.already_pending_upgrade(UpgradeId.EXTENDEDTHERMALLANCE) >= 1:
-                return 9
-            return 7
-
-        self._ground_range_dict[UnitTypeId.LURKERMP] = lurker_range
-        self._ground_range_dict[UnitTypeId.LURKERMPBURROWED] = lurker_range
-        self._ground_range_dict[UnitTypeId.COLOSSUS] = colossus_range
-        self._ground_range_dict[UnitTypeId.CYCLONE] = cyclone_range
-        self._air_range_dict[UnitTypeId.CYCLONE] = cyclone_range
-
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
         self._my_worker_type = self.get_worker_type(knowledge.ai.race)
@@ -582,39 +636,20 @@ class UnitValue(ManagerBase, IUnitValues):
         return completion_time
 
     def minerals(self, unit_type: UnitTypeId) -> float:
-        unit = self.unit_data.get(unit_type, None)
-        if unit is not None:
-            return unit.minerals
-        return 0
+        return float(self._minerals[unit_type.value])
 
     def gas(self, unit_type: UnitTypeId) -> float:
-        unit = self.unit_data.get(unit_type, None)
-        if unit is not None:
-            return unit.gas
-        return 0
+        return float(self._gas[unit_type.value])
 
     def supply(self, unit_type: UnitTypeId) -> float:
-        unit = self.unit_data.get(unit_type, None)
-        if unit is not None:
-            return unit.supply
-        return 0
+        return float(self._supply[unit_type.value])
 
     def defense_value(self, unit_type: UnitTypeId) -> float:
         """Deprecated, don't use with main bot any more! use power instead."""
-        unit = self.unit_data.get(unit_type, None)
-        if unit is not None:
-            return unit.combat_value
-        return 1.0
+        return float(self._combat_value[unit_type.value])
 
     def build_time(self, unit_type: UnitTypeId) -> int:
-        if unit_type == UnitTypeId.WARPGATE:
-            unit_type = UnitTypeId.GATEWAY
-
-        unit = self.unit_data.get(unit_type, None)
-        if unit is not None and unit.build_time is not None:
-            return unit.build_time
-
-        return 0
+        return int(self._build_time[unit_type.value])
 
     def power(self, unit: Unit) -> float:
         """Returns combat power of the unit, taking into account it's known health and shields."""
@@ -631,22 +666,49 @@ class UnitValue(ManagerBase, IUnitValues):
         return self.power_by_type(unit.type_id, health_percentage)
 
     def power_by_type(self, type_id: UnitTypeId, health_percentage: float = 1) -> float:
-        unit_value = self.unit_data.get(type_id, None)
-        if unit_value is not None:
-            return unit_value.combat_value * health_percentage
-        return 1.0 * health_percentage
+        return float(self._combat_value[type_id.value]) * health_percentage
 
     def ground_range(self, unit: Unit) -> float:
-        func = self._ground_range_dict.get(unit.type_id, None)
-        if func:
-            return func(unit)
-        return unit.ground_range
+        value = unit.type_id.value
+        ground_range = self._ground_range[value]
+        if math.isnan(ground_range):
+            return unit.ground_range
+        if self._range_upgraded(unit):
+            return float(self._ground_range_upgraded[value])
+        return float(ground_range)
 
     def air_range(self, unit: Unit) -> float:
-        func = self._air_range_dict.get(unit.type_id, None)
-        if func:
-            return func(unit)
-        return unit.air_range
+        value = unit.type_id.value
+        air_range = self._air_range[value]
+        if math.isnan(air_range):
+            return unit.air_range
+        if self._range_upgraded(unit):
+            return float(self._air_range_upgraded[value])
+        return float(air_range)
+
+    def _range_upgraded(self, unit: Unit) -> bool:
+        """True if the unit has its upgraded range in the range overrides."""
+        type_id = unit.type_id
+        if type_id == UnitTypeId.LURKERMP or type_id == UnitTypeId.LURKERMPBURROWED:
+            if self.knowledge.version_manager.base_version < GameVersion.V_4_11_0:
+                return False
+            return unit.is_mine and self.ai.already_pending_upgrade(UpgradeId.LURKERRANGE) >= 1
+
+        if type_id == UnitTypeId.COLOSSUS:
+            if not unit.is_mine:
+                # Let's assume the worst, enemy has the upgrade!
+                return self.ai.time > 6 * 60
+            return self.ai.already_pending_upgrade(UpgradeId.EXTENDEDTHERMALLANCE) >= 1
+
+        if type_id == UnitTypeId.CYCLONE:
+            if not unit.is_mine:
+                return True  # worst case
+            cooldowns = self.knowledge.cooldown_manager
+            return not cooldowns.is_ready(unit.tag, AbilityId.LOCKON_LOCKON) and cooldowns.is_ready(
+                unit.tag, AbilityId.CANCEL_LOCKON
+            )
+
+        return False
 
     def can_shoot_air(self, unit: Unit) -> bool:
         return self.air_range(unit) > 0
@@ -671,28 +733,127 @@ class UnitValue(ManagerBase, IUnitValues):
         return unit.radius + corrected_range + other.radius
 
     def real_speed(self, unit: Unit) -> float:
-        type_id = unit.type_id
         # TODO: OWn speed adjustments from upgrades
         # TODO: Hydralisk, banshee, warp prism, observer, better detection for zergling speed
         speed = unit.movement_speed
 
-        if unit.is_enemy:
-            if self.knowledge.enemy_race == Race.Zerg:
-                if type_id == UnitTypeId.ZERGLING:
-                    if self.ai.time > 200:
-                        speed = 6.58
-
-                on_creep = self.ai.has_creep(unit.position)
+        if unit.is_enemy and self.knowledge.enemy_race == Race.Zerg:
+            value = unit.type_id.value
+            upgraded_speed = self._upgraded_speed[value]
+            if self.ai.time > ZERGLING_SPEED_TIME and not math.isnan(upgraded_speed):
+                speed = float(upgraded_speed)
 
-                if on_creep:
-                    if type_id == UnitTypeId.QUEEN:
-                        return speed * 2.6667
-                    if type_id == UnitTypeId.HYDRALISK:
-                        return speed * 1.5
-                    return speed * 1.3
+            if self.ai.has_creep(unit.position):
+                return speed * float(self._creep_speed[value])
 
         return speed
 
+    # Vectorized counterparts of the methods above. Type ids are arrays of UnitTypeId.value and masks are boolean
+    # arrays with one value per unit.
+
+    @staticmethod
+    def type_values(units: Units) -> np.ndarray:
+        return np.fromiter((unit.type_id.value for unit in units), dtype=np.int32, count=len(units))
+
+    def costs(self, type_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Minerals and gas costs of the unit types."""
+        return self._minerals[type_ids], self._gas[type_ids]
+
+    def real_type_values(self, type_ids: np.ndarray) -> np.ndarray:
+        return self.table["real_type"][type_ids]
+
+    def powers(
+        self,
+        type_ids: np.ndarray,
+        health: np.ndarray,
+        shield: np.ndarray,
+        health_max: np.ndarray,
+        shield_max: np.ndarray,
+    ) -> np.ndarray:
+        current_health = np.asarray(health, dtype=float) + shield
+        maximum_health = np.asarray(health_max, dtype=float) + shield_max
+        known = maximum_health > 0
+        health_ratio = np.divide(current_health, maximum_health, out=np.ones_like(current_health), where=known)
+        health_percentage = np.where(known, 0.5 + 0.5 * health_ratio, 1)
+        return self._combat_value[type_ids] * health_percentage
+
+    def ground_ranges(self, type_ids: np.ndarray, weapon_ranges: np.ndarray, upgraded: np.ndarray) -> np.ndarray:
+        """
+        @param weapon_ranges: Ground ranges of the units in game data, used for types without a range override
+        @param upgraded: Mask of the units that have their upgraded range
+        """
+        ranges = np.where(upgraded, self._ground_range_upgraded[type_ids], self._ground_range[type_ids])
+        return np.where(np.isnan(ranges), weapon_ranges, ranges)
+
+    def air_ranges(self, type_ids: np.ndarray, weapon_ranges: np.ndarray, upgraded: np.ndarray) -> np.ndarray:
+        """Same as ground_ranges for air ranges."""
+        ranges = np.where(upgraded, self._air_range_upgraded[type_ids], self._air_range[type_ids])
+        return np.where(np.isnan(ranges), weapon_ranges, ranges)
+
+    def speeds(
+        self, type_ids: np.ndarray, movement_speeds: np.ndarray, upgraded: np.ndarray, on_creep: np.ndarray
+    ) -> np.ndarray:
+        """
+        @param movement_speeds: Movement speeds of the units in game data
+        @param upgraded: Mask of the units that are assumed to have their speed upgrade
+        @param on_creep: Mask of the units that get the creep speed bonus
+        """
+        upgraded_speeds = self._upgraded_speed[type_ids]
+        speeds = np.where(upgraded & ~np.isnan(upgraded_speeds), upgraded_speeds, movement_speeds)
+        return speeds * np.where(on_creep, self._creep_speed[type_ids], 1)
+
+    def unit_powers(self, units: Units) -> np.ndarray:
+        """Same as power for all of the units."""
+        count = len(units)
+        return self.powers(
+            self.type_values(units),
+            np.fromiter((unit.health for unit in units), dtype=float, count=count),
+            np.fromiter((unit.shield for unit in units), dtype=float, count=count),
+            np.fromiter((unit.health_max for unit in units), dtype=float, count=count),
+            np.fromiter((unit.shield_max for unit in units), dtype=float, count=count),
+        )
+
+    def unit_ranges(self, units: Units) -> Tuple[np.ndarray, np.ndarray]:
+        """Same as ground_range and air_range for all of the units."""
+        count = len(units)
+        type_ids = self.type_values(units)
+        upgraded = np.fromiter((self._range_upgraded(unit) for unit in units), dtype=bool, count=count)
+        ground = np.fromiter((unit.ground_range for unit in units), dtype=float, count=count)
+        air = np.fromiter((unit.air_range for unit in units), dtype=float, count=count)
+        return self.ground_ranges(type_ids, ground, upgraded), self.air_ranges(type_ids, air, upgraded)
+
+    def real_ranges(self, units: Units, targets: Units) -> np.ndarray:
+        """Same as real_range for all pairs of units and targets, as an array of shape (units, targets)."""
+        ground, air = self.unit_ranges(units)
+        radius = np.fromiter((unit.radius for unit in units), dtype=float, count=len(units))
+        target_radius = np.fromiter((target.radius for target in targets), dtype=float, count=len(targets))
+        target_air = np.fromiter(
+            (target.is_flying or target.has_buff(BuffId.GRAVITONBEAM) for target in targets),
+            dtype=bool,
+            count=len(targets),
+        )
+
+        ranges = np.where(target_air[np.newaxis, :], air[:, np.newaxis], ground[:, np.newaxis])
+        return np.where(ranges > 0, radius[:, np.newaxis] + ranges + target_radius[np.newaxis, :], ranges)
+
+    def unit_speeds(self, units: Units) -> np.ndarray:
+        """Same as real_speed for all of the units."""
+        count = len(units)
+        type_ids = self.type_values(units)
+        speeds = np.fromiter((unit.movement_speed for unit in units), dtype=float, count=count)
+        if self.knowledge.enemy_race != Race.Zerg:
+            return speeds
+
+        enemy = np.fromiter((unit.is_enemy for unit in units), dtype=bool, count=count)
+        upgraded = enemy & (self.ai.time > ZERGLING_SPEED_TIME)
+        creep = self.ai.state.creep.data_numpy
+        x = np.fromiter((unit.position_tuple[0] for unit in units), dtype=float, count=count)
+        y = np.fromiter((unit.position_tuple[1] for unit in units), dtype=float, count=count)
+        xs = np.clip(np.floor(x).astype(int), 0, creep.shape[1] - 1)
+        ys = np.clip(np.floor(y).astype(int), 0, creep.shape[0] - 1)
+        on_creep = enemy & (creep[ys, xs] == 1)
+        return self.speeds(type_ids, speeds, upgraded, on_creep)
+
     def should_kite(self, unit_type: UnitTypeId) -> bool:
         if unit_type == UnitTypeId.VOIDRAY or unit_type == UnitTypeId.ARCHON:
             return False
@@ -1,4 +1,12 @@
+from unittest import mock
+
+import numpy as np
+
+from sc2.bot_ai import BotAI
+from sc2.data import Race
 from sc2.ids.unit_typeid import UnitTypeId
+from sc2.pixel_map import PixelMap
+from sc2.position import Point2
 
 from .unit_value import UnitValue
 
@@ -27,3 +35,68 @@ class TestUnitValue:
         assert not unit_value.is_townhall(UnitTypeId.BARRACKS)
         assert not unit_value.is_townhall(UnitTypeId.GATEWAY)
         assert not unit_value.is_townhall(UnitTypeId.SPAWNINGPOOL)
+
+    def test_table_matches_scalar_values(self):
+        unit_value = UnitValue()
+        type_list = list(unit_value.unit_data) + [UnitTypeId.NOTAUNIT]
+        type_ids = np.array([type_id.value for type_id in type_list])
+
+        minerals, gas = unit_value.costs(type_ids)
+        powers = unit_value.powers(type_ids, np.full(len(type_ids), 10), 0, np.full(len(type_ids), 20), 0)
+
+        assert minerals.tolist() == [unit_value.minerals(type_id) for type_id in type_list]
+        assert gas.tolist() == [unit_value.gas(type_id) for type_id in type_list]
+        assert powers.tolist() == [unit_value.power_by_type(type_id, 0.75) for type_id in type_list]
+        assert unit_value.build_time(UnitTypeId.WARPGATE) == unit_value.build_time(UnitTypeId.GATEWAY)
+        assert unit_value.real_type_values(type_ids).tolist() == [
+            unit_value.real_type(type_id).value for type_id in type_list
+        ]
+
+    def test_vectorized_ranges_and_speeds(self):
+        unit_value = UnitValue()
+        type_ids = np.array([UnitTypeId.MARINE.value, UnitTypeId.COLOSSUS.value, UnitTypeId.COLOSSUS.value])
+        upgraded = np.array([True, False, True])
+
+        ranges = unit_value.ground_ranges(type_ids, np.array([5.0, 7.0, 7.0]), upgraded)
+
+        assert ranges.tolist() == [5, 7, 9]
+
+        type_ids = np.array([UnitTypeId.ZERGLING.value, UnitTypeId.ZERGLING.value, UnitTypeId.QUEEN.value])
+        speeds = unit_value.speeds(
+            type_ids, np.array([4.13, 4.13, 1.31]), np.array([False, True, True]), np.array([False, False, True])
+        )
+
+        assert speeds.tolist() == [4.13, 6.58, 1.31 * 2.6667]
+
+    def test_unit_speeds_match_real_speed(self):
+        unit_value = UnitValue()
+        unit_value.knowledge = mock.Mock(enemy_race=Race.Zerg)
+        creep = np.zeros((10, 10), dtype=np.uint8)
+        creep[:, :5] = 1
+        creep_proto = mock.Mock(size=mock.Mock(x=10, y=10), data=creep.tobytes())
+        unit_value.ai = mock.Mock(time=300, state=mock.Mock(creep=PixelMap(creep_proto)))
+        unit_value.ai.has_creep = lambda position: BotAI.has_creep(unit_value.ai, position)
+
+        def create_unit(type_id: UnitTypeId, x: float, is_enemy: bool = True):
+            position = Point2((x, 3.2))
+            return mock.Mock(
+                type_id=type_id,
+                movement_speed=3.15,
+                is_enemy=is_enemy,
+                position=position,
+                position_tuple=(position.x, position.y),
+            )
+
+        units = [
+            create_unit(UnitTypeId.ZERGLING, 1.5),
+            create_unit(UnitTypeId.QUEEN, 2.0),
+            # On the edge of creep, x rounds to the cell without creep but floors to the cell with it
+            create_unit(UnitTypeId.HYDRALISK, 4.6),
+            create_unit(UnitTypeId.ROACH, 5.4),
+            create_unit(UnitTypeId.ROACH, 3.0, is_enemy=False),
+        ]
+
+        speeds = unit_value.unit_speeds(units)
+
+        assert speeds.tolist() == [unit_value.real_speed(unit) for unit in units]
+        assert speeds[2] == 3.15 * 1.5
@@ -1,21 +1,21 @@
 import enum
 import logging
 import sys
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
-import sc2pathlib
 from sc2.unit import Unit
 from sharpy import sc2math
 from sharpy.general.path import Path
 from sharpy.interfaces import IZoneManager
 from sc2.game_info import Ramp
 from sc2.units import Units
-from sharpy.managers.core.pathing_manager import PathingManager
+from sharpy.managers.core.pathing_manager import PathingManager, PathRequest
 
 from sharpy.managers.core.manager_base import ManagerBase
-from sharpy.general.zone import Zone
+from sharpy.general.zone import Zone, worker_types
 from sc2.position import Point2, Point3
 import numpy as np
+from scipy.spatial import cKDTree
 
 
 class MapName(enum.Enum):
@@ -145,6 +145,8 @@ class ZoneManager(ManagerBase, IZoneManager):
         self.found_enemy_start: Optional[Point2] = None
         self._enemy_zones: List[Zone] = []
         self._our_zones: List[Zone] = []
+        # Zone of every map cell from the pathing map, used to find the zones of units
+        self._zone_grid: Optional[np.ndarray] = None
 
     @property
     def expansion_zones(self) -> List[Zone]:
@@ -185,6 +187,17 @@ class ZoneManager(ManagerBase, IZoneManager):
             for zone in self.zone_manager.expansion_zones:
                 expansion_locations_list.append(zone.center_location)
             pather.map.calculate_zones(expansion_locations_list)
+            self._zone_grid = self._calculate_zone_grid(pather)
+
+    def _calculate_zone_grid(self, pather: PathingManager) -> np.ndarray:
+        """Zone of every cell in [x, y] order as returned by get_zone, 0 for cells outside of zones."""
+        area = self.ai.game_info.playable_area
+        size = self.ai.game_info.map_size
+        grid = np.zeros((size.width, size.height), dtype=np.int16)
+        for x in range(int(area.x), int(area.x + area.width)):
+            for y in range(int(area.y), int(area.y + area.height)):
+                grid[x, y] = pather.map.get_zone(Point2((x, y)))
+        return grid
 
     def init_zones(self):
         if len(self.ai._expansion_positions_list) == 0:
@@ -288,15 +301,15 @@ class ZoneManager(ManagerBase, IZoneManager):
 
     def init_zone_pathing(self):
         """Init zone pathing. This needs to be run after all managers have properly started."""
-        pf: sc2pathlib.PathFinder = self.knowledge.pathing_manager.path_finder_terrain
         zone_count = len(self._expansion_zones)
-        for i in range(0, zone_count):
-            for j in range(i + 1, zone_count):
-                path_data = pf.find_path(
-                    self._expansion_zones[i].center_location, self._expansion_zones[j].center_location
-                )
-                self._expansion_zones[i].paths[j] = Path(path_data)
-                self._expansion_zones[j].paths[i] = Path(path_data, True)
+        pairs = [(i, j) for i in range(0, zone_count) for j in range(i + 1, zone_count)]
+        results = self.knowledge.pathing_manager.find_paths(
+            PathRequest(self._expansion_zones[i].center_location, self._expansion_zones[j].center_location)
+            for i, j in pairs
+        )
+        for (i, j), path_data in zip(pairs, results):
+            self._expansion_zones[i].paths[j] = Path(path_data)
+            self._expansion_zones[j].paths[i] = Path(path_data, True)
 
         for i in range(1, zone_count - 1):
             # Recalculate improved gather points based on pathing
@@ -417,118 +430,124 @@ class ZoneManager(ManagerBase, IZoneManager):
             self._sort_expansion_zones()
 
     def update_own_units_zones(self):
-        # Figure out all the zones the units are set in
-        tags_in_zones: Dict[int, List[int]] = {}
-
-        for zone in self._expansion_zones:
-            # Clear zones
-            zone.our_units.clear()
-
-        unknown_tags = set()
-
-        for unit in self.ai.all_own_units:
-            zone_index = self.pather.map.get_zone(unit.position) - 1
-            if zone_index < 0:
-                # No zone detected, what to do now?
-                unknown_tags.add(unit.tag)
-            else:
-                zone = self._expansion_zones[zone_index]
-                zone.our_units.append(unit)
-                tags_in_zones[unit.tag] = [zone_index]
-
-        for tag in unknown_tags:
-            # Create empty arrays for easy code later
-            tags_in_zones[tag] = []
-
-        for zone in self._expansion_zones:
-            units = self.cache.own_in_range(zone.center_location, zone.radius)
-            for unit in units:
-                if unit.tag in unknown_tags:
-                    # Registering zone here
-                    tags_in_zones[unit.tag].append(zone.zone_index)
-                    zone.our_units.append(unit)
-
-        for tag, zone_indices in tags_in_zones.items():
-            if len(zone_indices) > 1:
-                # the unit is registered in multiple zones, let's make it be in only one zone
-                unit = self.cache.by_tag(tag)
-                best_d: Optional[float] = None
-                best_index = None
-                for zone_index in zone_indices:
-                    zone = self._expansion_zones[zone_index]
-                    d = unit.distance_to(zone.center_location)
-                    # structures in the same zone are at the same height, units walking in ramps need also accounting
-                    height_difference = abs(zone.height - self.ai.get_terrain_height(unit))
-                    d += 10 * height_difference
-                    if zone.is_neutral:
-                        # We'll want to count units as being in relevant zones if possible
-                        d += 5
-
-                    if best_d is None or d < best_d:
-                        best_index = zone_index
-                        best_d = d
-
-                for zone_index in zone_indices:
-                    if zone_index != best_index:
-                        # Remove the unit from other zones
-                        self._expansion_zones[zone_index].our_units.remove(unit)
+        own = self.cache.all_own
+        zone_indices = self._zone_indices(own, self.cache.own_tree)
+        zone_units = self._split_by_zone(own, zone_indices)
+        zone_workers = self._split_by_zone(own, self._only_workers(own, zone_indices))
+        for zone, units, workers in zip(self._expansion_zones, zone_units, zone_workers):
+            zone.our_units = units
+            zone.our_workers = workers
 
     def update_enemy_units_zones(self):
-        # Figure out all the zones the units are set in
-        tags_in_zones: Dict[int, List[int]] = {}
-
-        for zone in self._expansion_zones:
-            # Clear zones
-            zone.known_enemy_units.clear()
-
-        unknown_tags = set()
-
-        for unit in self.ai.all_enemy_units:
-            zone_index = self.pather.map.get_zone(unit.position) - 1
-            if zone_index < 0:
-                # No zone detected, what to do now?
-                unknown_tags.add(unit.tag)
-            else:
-                zone = self._expansion_zones[zone_index]
-                zone.known_enemy_units.append(unit)
-                tags_in_zones[unit.tag] = [zone_index]
-
-        for tag in unknown_tags:
-            # Create empty arrays for easy code later
-            tags_in_zones[tag] = []
-
-        for zone in self._expansion_zones:
-            units = self.cache.enemy_in_range(zone.center_location, zone.radius)
-            for unit in units:
-                if unit.tag in unknown_tags:
-                    # Registering zone here
-                    tags_in_zones[unit.tag].append(zone.zone_index)
-                    zone.known_enemy_units.append(unit)
-
-        for tag, zone_indices in tags_in_zones.items():
-            if len(zone_indices) > 1:
-                # the unit is registered in multiple zones, let's make it be in only one zone
-                unit = self.cache.by_tag(tag)
-                best_d: Optional[float] = None
-                best_index = None
-                for zone_index in zone_indices:
-                    zone = self._expansion_zones[zone_index]
-                    d = unit.distance_to(zone.center_location)
-                    # structures in the same zone are at the same height, units walking in ramps need also accounting
-                    height_difference = abs(zone.height - self.ai.get_terrain_height(unit))
-                    d += 10 * height_difference
-                    if zone.is_neutral:
-                        # We'll want to count units as being in relevant zones if possible
-                        d += 5
-
-                    if best_d is None or d < best_d:
-                        best_index = zone_index
-                        best_d = d
-
-                for zone_index in zone_indices:
-                    if zone_index != best_index:
-                        # Remove the unit from other zones
-                        self._expansion_zones[zone_index].known_enemy_units.remove(unit)
+        enemies = self.ai.all_enemy_units
+        # Only add units that we can fight against
+        not_cloaked = np.fromiter((unit.cloak != 2 for unit in enemies), dtype=bool, count=len(enemies))
+        zone_indices = self._zone_indices(
+            enemies, self.cache.enemy_tree, self.cache.is_in_range_by_default, not_cloaked
+        )
+        zone_units = self._split_by_zone(enemies, zone_indices)
+        zone_workers = self._split_by_zone(enemies, self._only_workers(enemies, zone_indices))
+        for zone, units, workers in zip(self._expansion_zones, zone_units, zone_workers):
+            zone.known_enemy_units = units
+            zone.enemy_workers = workers
+
+    def _units_by_zone(
+        self,
+        units: Units,
+        tree: Optional[cKDTree],
+        range_filter: Optional[Callable[[Unit], bool]] = None,
+        included: Optional[np.ndarray] = None,
+    ) -> List[Units]:
+        """
+        Splits units to expansion zones. Every unit is placed in at most one zone.
+
+        Units are placed in the zone of their cell in the zone grid. Units without a zone are placed in zones that
+        they are in range of, and when there are multiple such zones the one with the closest center wins,
+        penalized by the height difference and by the zone being neutral.
+
+        @param units: Units in the same order as the positions of the tree
+        @param tree: Tree of unit positions from the unit cache
+        @param range_filter: Units without a zone grid cell are only placed in zones in range if this returns True
+        @param included: Boolean mask of the units that can be placed in zones, all units if None
+        """
+        return self._split_by_zone(units, self._zone_indices(units, tree, range_filter, included))
+
+    def _zone_indices(
+        self,
+        units: Units,
+        tree: Optional[cKDTree],
+        range_filter: Optional[Callable[[Unit], bool]] = None,
+        included: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Index of the expansion zone of every unit, -1 for units without a zone. See _units_by_zone."""
+        if tree is None or len(units) == 0:
+            return np.full(len(units), -1, dtype=np.int32)
+
+        positions = tree.data
+        zone_indices = np.full(len(positions), -1, dtype=np.int32)
+        if self._zone_grid is not None:
+            width, height = self._zone_grid.shape
+            # get_zone rounds positions to the nearest cell
+            xs = np.floor(positions[:, 0] + 0.5).astype(np.int32)
+            ys = np.floor(positions[:, 1] + 0.5).astype(np.int32)
+            inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            zone_indices[inside] = self._zone_grid[xs[inside], ys[inside]] - 1
+
+        unknown = np.flatnonzero(zone_indices < 0)
+        if range_filter is not None:
+            unknown = np.array([i for i in unknown if range_filter(units[i])], dtype=np.int64)
+
+        if len(unknown) > 0:
+            zone_indices[unknown] = self._closest_zones_in_range(positions[unknown])
+
+        if included is not None:
+            zone_indices[~included] = -1
+        return zone_indices
+
+    def _split_by_zone(self, units: Units, zone_indices: np.ndarray) -> List[Units]:
+        """Units of every expansion zone, in their original order."""
+        zone_count = len(self._expansion_zones)
+        if len(units) == 0:
+            return [Units([], self.ai) for _ in range(zone_count)]
+
+        # Stable sort keeps the units of every zone in the original order
+        order = np.argsort(zone_indices, kind="stable")
+        bounds = np.cumsum(np.bincount(zone_indices + 1, minlength=zone_count + 1))
+        sorted_units = [units[i] for i in order]
+        return [Units(sorted_units[bounds[i] : bounds[i + 1]], self.ai) for i in range(zone_count)]
+
+    @staticmethod
+    def _only_workers(units: Units, zone_indices: np.ndarray) -> np.ndarray:
+        """Zone indices with every unit that isn't a worker left out of the zones."""
+        is_worker = np.fromiter((unit.type_id in worker_types for unit in units), dtype=bool, count=len(units))
+        return np.where(is_worker, zone_indices, -1)
+
+    def _closest_zones_in_range(self, positions: np.ndarray) -> np.ndarray:
+        """Index of the best zone in range for every position, -1 if no zone is in range."""
+        zones = self._expansion_zones
+        centers = np.array([zone.center_location for zone in zones], dtype=float)
+        radii = np.array([zone.radius for zone in zones], dtype=float)
+        zone_heights = np.array([zone.height for zone in zones], dtype=float)
+        neutral = np.array([zone.is_neutral for zone in zones], dtype=bool)
+
+        distances = np.linalg.norm(positions[:, np.newaxis, :] - centers[np.newaxis, :, :], axis=2)
+
+        terrain_height = self.ai.game_info.terrain_height.data_numpy
+        # Same cells as get_terrain_height, which floors the position
+        cells = np.floor(positions).astype(np.int32)
+        xs = np.clip(cells[:, 0], 0, terrain_height.shape[1] - 1)
+        ys = np.clip(cells[:, 1], 0, terrain_height.shape[0] - 1)
+        unit_heights = terrain_height[ys, xs].astype(float)
+
+        # structures in the same zone are at the same height, units walking in ramps need also accounting
+        scores = distances + 10 * np.abs(zone_heights[np.newaxis, :] - unit_heights[:, np.newaxis])
+        # We'll want to count units as being in relevant zones if possible
+        scores += 5 * neutral
+        scores[distances > radii] = np.inf
+
+        best = np.argmin(scores, axis=1)
+        best[np.isinf(scores[np.arange(len(positions)), best])] = -1
+        return best
 
     # endregion
 
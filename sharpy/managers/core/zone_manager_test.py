@@ -0,0 +1,81 @@
+from unittest import mock
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.units import Units
+
+from .zone_manager import ZoneManager
+
+
+def create_zone_manager() -> ZoneManager:
+    zone_manager = ZoneManager()
+    terrain_height = np.zeros((64, 64), dtype=np.uint8)
+    # High ground at the top of the map, in [y, x] order
+    terrain_height[18:, :] = 20
+    zone_manager.ai = mock.Mock()
+    zone_manager.ai.game_info.terrain_height.data_numpy = terrain_height
+    zone_manager._expansion_zones = [
+        mock.Mock(center_location=Point2((10, 10)), radius=10, height=0, is_neutral=True),
+        mock.Mock(center_location=Point2((26, 10)), radius=10, height=0, is_neutral=False),
+        mock.Mock(center_location=Point2((26, 26)), radius=10, height=20, is_neutral=True),
+    ]
+    zone_manager._zone_grid = np.zeros((64, 64), dtype=np.int16)
+    # Cells of the first zone in [x, y] order, the rest of the map isn't in any zone
+    zone_manager._zone_grid[5:15, 5:15] = 1
+    return zone_manager
+
+
+def zone_tags(zone_manager: ZoneManager, positions, range_filter=None):
+    units = Units([mock.Mock(tag=i) for i in range(len(positions))], None)
+    zone_units = zone_manager._units_by_zone(units, cKDTree(np.array(positions, dtype=float)), range_filter)
+    return [[unit.tag for unit in units] for units in zone_units]
+
+
+class TestZoneManager:
+    def test_units_are_placed_in_one_zone(self):
+        zone_manager = create_zone_manager()
+        positions = [
+            (14, 10),  # zone grid
+            (17, 10),  # in range of zones 0 and 1, closer to 0 but zone 0 is neutral
+            (15.2, 3),  # only in range of zone 0
+            (26, 18.2),  # in range of zones 1 and 2, on the same height as zone 2
+            (10, 60),  # outside of zones
+            (6, 6),  # zone grid
+            (26, 17.2),  # in range of zones 1 and 2, on the same height as zone 1
+        ]
+
+        assert zone_tags(zone_manager, positions) == [[0, 2, 5], [1, 6], [3]]
+
+    def test_range_filter_only_applies_to_units_without_zone(self):
+        zone_manager = create_zone_manager()
+        positions = [(14, 10), (26, 12), (26, 8)]
+
+        assert zone_tags(zone_manager, positions, lambda unit: unit.tag != 1) == [[0], [2], []]
+
+    def test_positions_use_same_cells_as_per_unit_lookups(self):
+        zone_manager = create_zone_manager()
+        zone_manager._zone_grid[40:50, 40:50] = 3
+        positions = [
+            # get_zone rounds to the nearest cell, which is in the zone grid
+            (39.6, 45),
+            # get_terrain_height floors to the low ground, so the unit is on the height of zone 1
+            (26, 17.6),
+        ]
+
+        assert zone_tags(zone_manager, positions) == [[], [1], [0]]
+
+    def test_workers_are_split_with_their_zone(self):
+        zone_manager = create_zone_manager()
+        types = [UnitTypeId.PROBE, UnitTypeId.ZEALOT, UnitTypeId.SCV, UnitTypeId.PROBE]
+        units = Units([mock.Mock(tag=i, type_id=type_id) for i, type_id in enumerate(types)], None)
+        tree = cKDTree(np.array([(14, 10), (6, 6), (26, 8), (10, 60)], dtype=float))
+
+        zone_indices = zone_manager._zone_indices(units, tree)
+        zone_units = zone_manager._split_by_zone(units, zone_indices)
+        zone_workers = zone_manager._split_by_zone(units, zone_manager._only_workers(units, zone_indices))
+
+        assert [[unit.tag for unit in units] for units in zone_units] == [[0, 1], [2], []]
+        assert [[unit.tag for unit in units] for units in zone_workers] == [[0], [2], []]
@@ -8,3 +8,5 @@ from .archon import ArchonManager
 from .heat_map import HeatMapManager
 from .custom_func_manager import CustomFuncManager
 from .enemy_vision_manager import EnemyVisionManager
+from .game_recorder import GameRecorder
+from .lag_handler import LagHandler
@@ -1,3 +1,4 @@
+import bisect
 import enum
 import sys
 from typing import Dict, List, TYPE_CHECKING
@@ -20,6 +21,16 @@ townhall_start_types = {
     UnitTypeId.COMMANDCENTER,
 }
 
+# Structure types that other structures morph into without changing their tag
+morphed_types = (
+    UnitTypeId.LAIR,
+    UnitTypeId.HIVE,
+    UnitTypeId.GREATERSPIRE,
+    UnitTypeId.ORBITALCOMMAND,
+    UnitTypeId.PLANETARYFORTRESS,
+    UnitTypeId.WARPGATE,
+)
+
 
 class EnemyRushBuild(enum.IntEnum):
     Macro = 0
@@ -66,7 +77,8 @@ class BuildDetector(ManagerBase):
         # Note that snapshots of units / structures have a different tag.
         # Only visible buildings should be handled
         self.handled_unit_tags: Dict[int, UnitTypeId] = dict()
-        # Timings when the unit was first seen or our estimate when structure was started building
+        # Timings when the unit was first seen or our estimate when structure was started building.
+        # Timings of every type are sorted from the earliest.
         self.timings: Dict[UnitTypeId, List[float]] = dict()
 
     async def start(self, knowledge: "Knowledge"):
@@ -100,28 +112,34 @@ class BuildDetector(ManagerBase):
         self._build_detection()
 
     def _update_timings(self):
-        # Let's update just seen structures for now
-        for unit in self.ai.enemy_structures:
-            if unit.is_snapshot:
-                continue
-
-            if unit.tag not in self.handled_unit_tags or self.handled_unit_tags.get(unit.tag) != unit.type_id:
-                self.handled_unit_tags[unit.tag] = unit.type_id
+        structures = self.ai._enemy_structures_map
+        # Only structures that have not been handled yet, snapshots stay here until they are seen
+        for tag in structures.keys() - self.handled_unit_tags.keys():
+            self._structure_seen(structures[tag])
+
+        for unit in self.cache.enemy(morphed_types):
+            if self.handled_unit_tags.get(unit.tag, unit.type_id) != unit.type_id:
+                self._structure_seen(unit)
+
+    def _structure_seen(self, unit: Unit):
+        """Records the start time of a structure that is seen for the first time or has morphed to a new type."""
+        if unit.is_snapshot:
+            return
 
-                if self.is_first_townhall(unit):
-                    continue  # Don't add it to timings
+        self.handled_unit_tags[unit.tag] = unit.type_id
 
-                real_type = self.real_type(unit.type_id)
-                list = self.timings.get(real_type, None)
-                if not list:
-                    list = []
-                    self.timings[real_type] = list
+        if self.is_first_townhall(unit):
+            return  # Don't add it to timings
 
-                start_time = self.unit_values.building_start_time(self.ai.time, real_type, unit.build_progress)
-                list.append(start_time)
+        real_type = self.real_type(unit.type_id)
+        start_time = self.unit_values.building_start_time(self.ai.time, real_type, unit.build_progress)
+        if start_time is None:
+            start_time = self.ai.time
+        bisect.insort(self.timings.setdefault(real_type, []), start_time)
 
     def started(self, type_id: UnitTypeId, index: int = 0) -> float:
-        """Returns an absurdly large number when the building isn't started yet"""
+        """Start time of the index:th earliest structure of the type.
+        Returns an absurdly large number when the building isn't started yet"""
         list = self.timings.get(type_id, None)
         if not list:
             return sys.float_info.max
@@ -316,6 +334,10 @@ class BuildDetector(ManagerBase):
             # Only set macro build once
             return
 
+        if self.ai.time > 8 * 60:
+            # Macro builds are only recognized during the first eight minutes
+            return
+
         if self.knowledge.enemy_race == Race.Terran:
             if self.ai.time < 7 * 60 and self.cache.enemy(UnitTypeId.BATTLECRUISER):
                 self.macro_build = EnemyMacroBuild.BattleCruisers
@@ -351,11 +373,6 @@ class BuildDetector(ManagerBase):
 
     def building_started_before(self, type_id: UnitTypeId, start_time_ceiling: int) -> bool:
         """Returns true if a building of type type_id has been started before start_time_ceiling seconds."""
-        for unit in self.cache.enemy(type_id):  # type: Unit
-            # fixme: for completed buildings this will report a time later than the actual start_time.
-            # not fatal, but may be misleading.
-            start_time = self.unit_values.building_start_time(self.ai.time, unit.type_id, unit.build_progress)
-            if start_time is not None and start_time < start_time_ceiling:
-                return True
-
-        return False
+        # fixme: for buildings that were first seen completed the start time is later than the actual start time.
+        # not fatal, but may be misleading.
+        return self.started(type_id) < start_time_ceiling
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sharpy.managers.core import UnitValue
+
+from .build_detector import BuildDetector
+
+ENEMY_START = Point2((100.5, 100.5))
+
+
+def create_build_detector() -> BuildDetector:
+    build_detector = BuildDetector()
+    build_detector.ai = mock.Mock(time=0, _enemy_structures_map={})
+    build_detector.unit_values = UnitValue()
+    build_detector.zone_manager = mock.Mock(enemy_start_location=ENEMY_START)
+    build_detector.cache = mock.Mock()
+    build_detector.cache.enemy = lambda types: [
+        unit for unit in build_detector.ai._enemy_structures_map.values() if unit.type_id in types
+    ]
+    return build_detector
+
+
+def add_structure(build_detector: BuildDetector, tag: int, type_id: UnitTypeId, build_progress: float, **kwargs):
+    structure = mock.Mock(
+        tag=tag, type_id=type_id, build_progress=build_progress, is_snapshot=False, position=Point2((50, 50))
+    )
+    structure.configure_mock(**kwargs)
+    build_detector.ai._enemy_structures_map[tag] = structure
+    return structure
+
+
+class TestBuildDetector:
+    def test_structures_are_timed_once_when_first_seen(self):
+        build_detector = create_build_detector()
+        build_time = build_detector.unit_values.build_time(UnitTypeId.SPAWNINGPOOL)
+
+        build_detector.ai.time = 60
+        add_structure(build_detector, 1, UnitTypeId.HATCHERY, 1, position=ENEMY_START)
+        add_structure(build_detector, 2, UnitTypeId.SPAWNINGPOOL, 0.5)
+        snapshot = add_structure(build_detector, 3, UnitTypeId.SPAWNINGPOOL, 1, is_snapshot=True)
+        build_detector._update_timings()
+
+        assert UnitTypeId.HATCHERY not in build_detector.timings
+        assert build_detector.timings[UnitTypeId.SPAWNINGPOOL] == [60 - build_time / 2]
+        assert build_detector.building_started_before(UnitTypeId.SPAWNINGPOOL, 60 - build_time / 2 + 1)
+        assert not build_detector.building_started_before(UnitTypeId.SPAWNINGPOOL, 60 - build_time / 2)
+
+        # The snapshot is timed when it is seen, but the earliest timing stays first
+        build_detector.ai.time = 100
+        snapshot.is_snapshot = False
+        build_detector._update_timings()
+        build_detector._update_timings()
+
+        assert build_detector.timings[UnitTypeId.SPAWNINGPOOL] == [60 - build_time / 2, 100 - build_time]
+        assert build_detector.started(UnitTypeId.SPAWNINGPOOL, 1) == 100 - build_time
+
+    def test_morphed_structures_are_timed_again(self):
+        build_detector = create_build_detector()
+        hatchery = add_structure(build_detector, 1, UnitTypeId.HATCHERY, 1, position=ENEMY_START)
+        build_detector._update_timings()
+
+        build_detector.ai.time = 200
+        hatchery.type_id = UnitTypeId.LAIR
+        hatchery.build_progress = 0.1
+        build_detector._update_timings()
+        build_detector._update_timings()
+
+        assert len(build_detector.timings[UnitTypeId.LAIR]) == 1
@@ -2,7 +2,6 @@ import logging
 import os
 from typing import Optional, Union, Tuple
 
-import jsonpickle
 from datetime import datetime
 from pathlib import Path
 
@@ -11,14 +10,17 @@ from sharpy.interfaces import IGameAnalyzer
 from sharpy.interfaces.data_manager import IDataManager
 from sharpy.managers.extensions.build_detector import EnemyRushBuild, EnemyMacroBuild, BuildDetector
 
-from sharpy.managers.core.manager_base import ManagerBase
-from sharpy.tools import IntervalFunc
-from sharpy.tools.opponent_data import GameResult, OpponentData
+from sharpy.managers.core.manager_base import ManagerBase, ManagerPriority
+from sharpy.tools.scheduler import ScheduledJob
+from sharpy.tools.opponent_data import GameResult
+from sharpy.tools.opponent_store import OpponentStore, migrate_json, migrate_json_file
 
 DATA_FOLDER = "data"
 
 
 class DataManager(ManagerBase, IDataManager):
+    priority = ManagerPriority.Low
+    min_cadence = 5
     game_analyzer: IGameAnalyzer
     build_detector: BuildDetector
     enabled: bool
@@ -28,7 +30,8 @@ class DataManager(ManagerBase, IDataManager):
 
     def __init__(self):
         self.last_result = None
-        self.data: Optional[OpponentData] = None
+        self.last_result_as_current_race = None
+        self.store: Optional[OpponentStore] = None
         super().__init__()
 
     async def start(self, knowledge: "Knowledge"):
@@ -40,45 +43,42 @@ class DataManager(ManagerBase, IDataManager):
 
         self.enabled = self.ai.opponent_id is not None
         self.enable_write = self.knowledge.config["general"].getboolean("write_data")
-        self.file_name = DATA_FOLDER + os.sep + str(self.ai.opponent_id) + ".json"
+        self.file_name = DATA_FOLDER + os.sep + str(self.ai.opponent_id) + ".db"
+        # Results were saved with jsonpickle in older versions
+        self.json_file_name = DATA_FOLDER + os.sep + str(self.ai.opponent_id) + ".json"
 
-        self.updater = IntervalFunc(self.ai, lambda: self.real_update(), 1)
+        self.updater: ScheduledJob = knowledge.scheduler.register("DataManager", self.real_update, 1, cost=1)
         self.result = GameResult()
         self.result.my_race = knowledge.my_race
         self.result.enemy_race = knowledge.enemy_race
 
         if self.enabled:
             self.result.game_started = datetime.now().isoformat()
-            my_file = Path(self.file_name)
-            if my_file.is_file():
-                try:
-                    self.read_data()
-                except Exception:
-                    self.data = OpponentData()
-                    self.data.enemy_id = self.ai.opponent_id
-                    self.knowledge.print("Data read failed on game start.")
-            else:
-                self.data = OpponentData()
-                self.data.enemy_id = self.ai.opponent_id
-
-            if self.data.results:
-                self.last_result = self.data.results[-1]
-                self.last_result_as_current_race = next(
-                    (
-                        result
-                        for result in reversed(self.data.results)
-                        if hasattr(result, "my_race") and result.my_race == self.knowledge.my_race
-                    ),
-                    None,
-                )
+            try:
+                self.read_data()
+            except Exception as e:
+                self.store = None
+                self.knowledge.print(f"Data read failed on game start: {e}")
 
     def read_data(self):
-        with open(self.file_name, "r") as handle:
-            text = handle.read()
-            # Compatibility with older versions to prevent crashes
-            text = text.replace("bot.tools", "sharpy.tools")
-            text = text.replace("frozen.tools", "sharpy.tools")
-            self.data = jsonpickle.decode(text)
+        if Path(self.file_name).is_file():
+            self.store = OpponentStore(self.file_name)
+        elif not self.enable_write:
+            # Keep results in memory so that no files are created
+            self.store = OpponentStore(":memory:")
+            if Path(self.json_file_name).is_file():
+                migrate_json(self.json_file_name, self.store)
+        elif Path(self.json_file_name).is_file():
+            count = migrate_json_file(self.json_file_name, self.file_name)
+            self.print(f"Migrated {count} results from {self.json_file_name}")
+            self.store = OpponentStore(self.file_name)
+        else:
+            if not os.path.exists(DATA_FOLDER):
+                os.makedirs(DATA_FOLDER)
+            self.store = OpponentStore(self.file_name)
+
+        self.last_result = self.store.last_result()
+        self.last_result_as_current_race = self.store.last_result_as_race(self.knowledge.my_race)
 
     async def update(self):
         pass
@@ -129,36 +129,12 @@ class DataManager(ManagerBase, IDataManager):
         self.write_results()
 
     def write_results(self):
-        if not self.enable_write:
+        if not self.enable_write or self.store is None:
+            # Don't write if we can't read the current data
             return
-        my_file = Path(self.file_name)
 
-        if my_file.is_file():
-            try:
-                self.read_data()
-            except Exception as e:
-                # Don't write if we can't read the current data
-                self.print(f"Data read failed on save: {e}")
-                return
-        elif not os.path.exists(DATA_FOLDER):
-            os.makedirs(DATA_FOLDER)
-
-        to_remove = None
-        for result in self.data.results:
-            if result.guid == self.result.guid:
-                to_remove = result
-                break
-
-        if to_remove:
-            self.data.results.remove(to_remove)
-
-        self.data.results.append(self.result)
-
-        frozen = jsonpickle.encode(self.data)
         try:
-            with open(self.file_name, "w") as handle:
-                handle.write(frozen)
-                # pickle.dump(self.data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            self.store.write(self.result)
         except Exception as e:
             self.print(f"Data write failed: {e}")
 
@@ -175,3 +151,7 @@ class DataManager(ManagerBase, IDataManager):
 
         self.result.game_duration = self.ai.time
         self.write_results()
+
+        if self.store is not None:
+            self.store.close()
+            self.store = None
@@ -0,0 +1,97 @@
+import os
+from unittest import mock
+
+import jsonpickle
+import pytest
+
+from sc2.data import Race, Result
+
+from sharpy.managers.extensions import data_manager
+from sharpy.managers.extensions.data_manager import DataManager
+from sharpy.tools.opponent_data import GameResult, OpponentData
+from sharpy.tools.opponent_store import OpponentStore
+
+
+def create_data_manager(folder: str, enable_write: bool) -> DataManager:
+    manager = DataManager()
+    manager.knowledge = mock.Mock()
+    manager.knowledge.my_race = Race.Terran
+    manager.enabled = True
+    manager.enable_write = enable_write
+    manager.file_name = os.path.join(folder, "1.db")
+    manager.json_file_name = os.path.join(folder, "1.json")
+    return manager
+
+
+def write_json(folder: str):
+    result = GameResult()
+    result.my_race = Race.Terran
+    result.enemy_race = Race.Zerg
+    result.build_used = "rush"
+    data = OpponentData()
+    data.results = [result]
+    with open(os.path.join(folder, "1.json"), "w") as handle:
+        handle.write(jsonpickle.encode(data))
+    return result
+
+
+class TestDataManager:
+    def test_read_without_write_creates_no_files(self, tmp_path, monkeypatch):
+        folder = str(tmp_path / "data")
+        monkeypatch.setattr(data_manager, "DATA_FOLDER", folder)
+        manager = create_data_manager(folder, False)
+
+        manager.read_data()
+
+        assert manager.last_result is None
+        assert not os.path.exists(folder)
+
+    def test_read_without_write_uses_json_results(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_manager, "DATA_FOLDER", str(tmp_path))
+        result = write_json(str(tmp_path))
+        manager = create_data_manager(str(tmp_path), False)
+
+        manager.read_data()
+
+        assert manager.last_result.guid == result.guid
+        assert sorted(os.listdir(tmp_path)) == ["1.json"]
+
+    def test_failed_migration_is_retried(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_manager, "DATA_FOLDER", str(tmp_path))
+        with open(os.path.join(tmp_path, "1.json"), "w") as handle:
+            handle.write("{broken")
+        manager = create_data_manager(str(tmp_path), True)
+        manager.print = mock.Mock()
+
+        with pytest.raises(Exception):
+            manager.read_data()
+
+        assert not os.path.exists(manager.file_name)
+
+        result = write_json(str(tmp_path))
+        manager.read_data()
+
+        assert manager.last_result.guid == result.guid
+        assert os.path.isfile(manager.file_name)
+        manager.store.close()
+
+    @pytest.mark.asyncio
+    async def test_result_on_end_replaces_predicted_result(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_manager, "DATA_FOLDER", str(tmp_path))
+        manager = create_data_manager(str(tmp_path), True)
+        manager.ai = mock.Mock()
+        manager.build_detector = None
+        manager.result = GameResult()
+        manager.read_data()
+
+        manager.ai.time = 300.0
+        manager.write_victory()
+        manager.ai.time = 420.0
+        await manager.on_end(Result.Defeat)
+
+        assert manager.store is None
+        store = OpponentStore(manager.file_name)
+        assert store.count() == 1
+        assert store.last_result().result == -1
+        assert store.last_result().game_duration == 420.0
+        store.close()
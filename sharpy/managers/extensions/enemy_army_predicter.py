@@ -1,4 +1,6 @@
-from typing import Dict, Optional, List
+from typing import Optional, List, Tuple
+
+import numpy as np
 
 from sc2.data import Race
 from sharpy.interfaces import IEnemyUnitsManager, ILostUnitsManager, IUnitValues, IZoneManager
@@ -6,36 +8,42 @@ from sharpy.managers.core.manager_base import ManagerBase
 from sharpy.managers.core.enemy_units_manager import EnemyUnitsManager
 from sharpy.general.extended_power import ExtendedPower
 from sharpy.managers.extensions.predict.composition_guesser import CompositionGuesser
+from sharpy.managers.extensions.predict.enemy_economy import EnemyEconomy
 from sharpy.unit_count import UnitCount
 from sharpy.managers.core.lostunitsmanager import LostUnitsManager
 
-from sharpy.tools.interval_func import IntervalFuncAsync
+from sharpy.tools.scheduler import ScheduledJobAsync
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.client import Client
 from sc2.position import Point2
 from sc2.unit import Unit
 
 INTERVAL = 5
-MINERAL_MINING_SPEED = 1800.0 / 15 / 60 / 2
+GAS_BUILDINGS = (
+    UnitTypeId.ASSIMILATOR,
+    UnitTypeId.ASSIMILATORRICH,
+    UnitTypeId.EXTRACTOR,
+    UnitTypeId.EXTRACTORRICH,
+    UnitTypeId.REFINERY,
+    UnitTypeId.REFINERYRICH,
+)
 
 
 class EnemyArmyPredicter(ManagerBase):
     enemy_units_manager: IEnemyUnitsManager
     lost_units_manager: ILostUnitsManager
     unit_values: IUnitValues
-    updater: IntervalFuncAsync
+    updater: ScheduledJobAsync
     zone_manager: IZoneManager
+    economy: EnemyEconomy
 
     def __init__(self):
         super().__init__()
         self.enemy_base_value_minerals = 400 + 12 * 50 + 50
         self.enemy_known_worker_count = 12
 
-        self.mineral_dict: Dict["Zone", int] = {}
-
-        # Last time minerals were updated
-        self.mineral_updated_dict: Dict["Zone", float] = {}
-        self.gas_dict: Dict[Point2, int] = {}
+        # Zones in the order of the zone arrays of the economy model
+        self.zones: List["Zone"] = []
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -45,17 +53,12 @@ class EnemyArmyPredicter(ManagerBase):
         self.unit_values = knowledge.get_required_manager(IUnitValues)
         self.zone_manager = knowledge.get_required_manager(IZoneManager)
 
-        self.updater = IntervalFuncAsync(self.ai, self._real_update, INTERVAL)
-
-        for zone in self.zone_manager.expansion_zones:
-            minerals = 0
-            if zone.last_minerals is not None:
-                minerals = zone.last_minerals
+        self.updater = knowledge.scheduler.register_async("EnemyArmyPredicter", self._real_update, INTERVAL, cost=3)
 
-            self.mineral_dict[zone] = minerals
-
-        for geyser in self.ai.vespene_geyser:  # type: Unit
-            self.gas_dict[geyser.position] = 2250
+        self.zones = list(self.zone_manager.expansion_zones)
+        self.economy = EnemyEconomy(
+            [zone.last_minerals or 0 for zone in self.zones], [geyser.position for geyser in self.ai.vespene_geyser]
+        )
 
         self.enemy_mined_minerals = 0
         self.enemy_mined_minerals_prediction = 0
@@ -68,6 +71,8 @@ class EnemyArmyPredicter(ManagerBase):
         self.own_army_value_gas = 0
 
         self.predicted_enemy_free_minerals = 0
+        # Low and high estimate of free minerals
+        self.predicted_enemy_free_minerals_range: Tuple[int, int] = (0, 0)
         self.predicted_enemy_free_gas = 0
 
         self.predicted_enemy_army_minerals = 0
@@ -89,8 +94,20 @@ class EnemyArmyPredicter(ManagerBase):
         return self.predicted_enemy_army_minerals + self.predicted_enemy_army_gas
 
     async def update(self):
+        self.update_economy()
         await self.updater.execute()
 
+    def update_economy(self):
+        zone_minerals = np.fromiter(
+            (zone.last_minerals or 0 for zone in self.zones), dtype=float, count=len(self.zones)
+        )
+        enemy_zones = np.fromiter((zone.is_enemys for zone in self.zones), dtype=bool, count=len(self.zones))
+        self.economy.update(self.ai.time, zone_minerals, enemy_zones, self.cache.enemy(GAS_BUILDINGS))
+
+        self.enemy_mined_minerals = self.economy.mined_minerals
+        self.enemy_mined_minerals_prediction = round(self.economy.mined_minerals_prediction)
+        self.enemy_mined_gas = self.economy.mined_gas
+
     async def _real_update(self):
         await self.update_own_army_value()
 
@@ -98,9 +115,6 @@ class EnemyArmyPredicter(ManagerBase):
         self.predicted_enemy_power.clear()
 
         self.predicted_enemy_composition.clear()
-        gas_miners = self.ai.enemy_structures.of_type(
-            [UnitTypeId.ASSIMILATOR, UnitTypeId.EXTRACTOR, UnitTypeId.REFINERY]
-        )
 
         minerals_used: int = 0
         gas_used: int = 0
@@ -138,59 +152,18 @@ class EnemyArmyPredicter(ManagerBase):
                     self.enemy_army_known_minerals += mineral_value
                     self.enemy_army_known_gas += gas_value
 
-        mined_minerals: int = 0
-        mined_minerals_predict: float = 0
-        worker_count_per_base = 12  # TODO: Just random guess
-
-        for zone in self.zone_manager.enemy_expansion_zones:
-            current_minerals = zone.last_minerals
-            if current_minerals is None:
-                current_minerals = 0
-
-            last_minerals = self.mineral_dict.get(zone, 0)
-
-            if last_minerals > current_minerals:
-                self.mineral_dict[zone] = current_minerals
-                self.mineral_updated_dict[zone] = self.ai.time
-
-                if zone.is_enemys:
-                    mined_minerals += last_minerals - current_minerals
-            elif zone.is_enemys:
-                prediction = (
-                    last_minerals
-                    - (self.ai.time - self.mineral_updated_dict.get(zone, 0))
-                    * MINERAL_MINING_SPEED
-                    * worker_count_per_base
-                )
-                prediction = max(0.0, prediction)
-                mined_minerals_predict += last_minerals - prediction
-
-        self.enemy_mined_minerals += mined_minerals
-        self.enemy_mined_minerals_prediction = round(self.enemy_mined_minerals + mined_minerals_predict)
-
-        if gas_miners.exists:
-
-            for miner in gas_miners:  # type: Unit
-                last_gas = self.gas_dict.get(miner.position, 2250)
-                if miner.is_visible:
-                    gas = miner.vespene_contents
-                else:
-                    gas = max(0.0, last_gas - 169.61 / 60 * INTERVAL)
-
-                self.gas_dict[miner.position] = gas
-                self.enemy_mined_gas += last_gas - gas
-
         lost_tuple: tuple = self.lost_units_manager.calculate_enemy_lost_resources()
         minerals_used += lost_tuple[0]
         gas_used += lost_tuple[1]
 
-        self.predicted_enemy_free_minerals = round(
-            self.enemy_base_value_minerals + self.enemy_mined_minerals_prediction - minerals_used
-        )
+        low, likely, high = self.economy.free_minerals(self.enemy_base_value_minerals, minerals_used)
+        was_negative = self.predicted_enemy_free_minerals < 0
+        self.predicted_enemy_free_minerals = likely
+        self.predicted_enemy_free_minerals_range = (low, high)
 
         self.predicted_enemy_free_gas = round(self.enemy_mined_gas - gas_used)
 
-        if self.predicted_enemy_free_minerals < 0:
+        if self.predicted_enemy_free_minerals < 0 and not was_negative:
             # Possibly hidden base or more workers than we think?
             self.print(f"Predicting negative free minerals for enemy: {self.predicted_enemy_free_minerals}")
 
@@ -221,10 +194,12 @@ class EnemyArmyPredicter(ManagerBase):
         guesser.left_gas = self.predicted_enemy_free_gas
 
         additional_guess: List[UnitCount] = guesser.predict_enemy_composition()
+        by_type = {unit_count.enemy_type: unit_count for unit_count in self.predicted_enemy_composition}
         for unit_count in additional_guess:
-            existing = self.find(self.predicted_enemy_composition, unit_count.enemy_type)
+            existing = by_type.get(unit_count.enemy_type)
             if existing is None:
                 self.predicted_enemy_composition.append(unit_count)
+                by_type[unit_count.enemy_type] = unit_count
             else:
                 existing.count += unit_count.count
 
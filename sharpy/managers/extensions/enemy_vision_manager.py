@@ -1,23 +1,82 @@
-from sc2pathlib import MapType, Sc2Map
+from typing import Union
+
+import numpy as np
+
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2pathlib import Sc2Map
+from sc2pathlib.mappings import VisionStatus
 from sharpy.managers import ManagerBase
-from sharpy.managers.core import PathingManager
+from sharpy.managers.core import ManagerPriority, PathingManager
+from sharpy.tools.vision_map import VisionMap
 
 
 class EnemyVisionManager(ManagerBase):
+    """
+    Keeps track of the cells that the enemy sees.
+
+    Vision is updated in bulk from the enemy units, redrawing only the units that moved since the previous update.
+    Use is_seen, is_detected and vision_status to check positions, one position or an array of positions at a time.
+
+    The vision of the pathing map is also kept up to date for code that uses it directly, but it is only
+    recalculated when the vision of some enemy unit changed.
+    """
+
+    priority = ManagerPriority.Low
+    min_cadence = 1
     map: Sc2Map
     pather: PathingManager
+    vision_map: VisionMap
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
         self.pather = knowledge.get_required_manager(PathingManager)
         self.map = self.pather.map
+        self.vision_map = VisionMap(self.ai.game_info.terrain_height.data_numpy)
 
     async def update(self):
-        self.map.clear_vision()
-        for unit in self.ai.all_enemy_units:
-            self.map.add_vision_params(unit.is_detector, unit.is_flying, unit.position, unit.sight_range)
-        self.map.calculate_vision()
+        units = self.ai.all_enemy_units
+        count = len(units)
+        self.vision_map.update(
+            np.fromiter((unit.tag for unit in units), dtype=np.int64, count=count),
+            np.fromiter((unit.position_tuple[0] for unit in units), dtype=float, count=count),
+            np.fromiter((unit.position_tuple[1] for unit in units), dtype=float, count=count),
+            np.fromiter((unit.sight_range for unit in units), dtype=float, count=count),
+            np.fromiter((unit.is_flying for unit in units), dtype=bool, count=count),
+            np.fromiter((unit.is_detector for unit in units), dtype=bool, count=count),
+        )
+
+        if self.vision_map.changed:
+            self.map.clear_vision()
+            for unit in units:
+                self.map.add_vision_params(unit.is_detector, unit.is_flying, unit.position, unit.sight_range)
+            self.map.calculate_vision()
+
+    def vision_status(self, positions: Union[Point2, Unit, np.ndarray]) -> Union[VisionStatus, np.ndarray]:
+        """Vision status of a position, or an array of statuses for an array of positions of shape (n, 2)."""
+        if isinstance(positions, (Point2, Unit)):
+            return VisionStatus(self.vision_map.vision_status(self._positions(positions))[0])
+        return self.vision_map.vision_status(positions)
+
+    def is_seen(self, positions: Union[Point2, Unit, np.ndarray]) -> Union[bool, np.ndarray]:
+        """Is the position seen by the enemy, or an array of booleans for an array of positions of shape (n, 2)."""
+        if isinstance(positions, (Point2, Unit)):
+            return bool(self.vision_map.is_seen(self._positions(positions))[0])
+        return self.vision_map.is_seen(positions)
+
+    def is_detected(self, positions: Union[Point2, Unit, np.ndarray]) -> Union[bool, np.ndarray]:
+        """Is the position detected by the enemy, or an array of booleans for an array of positions of shape (n, 2)."""
+        if isinstance(positions, (Point2, Unit)):
+            return bool(self.vision_map.is_detected(self._positions(positions))[0])
+        return self.vision_map.is_detected(positions)
+
+    @staticmethod
+    def _positions(position: Union[Point2, Unit]) -> np.ndarray:
+        if isinstance(position, Unit):
+            position = position.position_tuple
+        return np.array([position], dtype=float)
 
     async def post_update(self):
         if self.debug:
             self.map.plot_vision()
+            self.map.plot_image(np.multiply(self.vision_map.vision_grid, 120, dtype=np.uint8), "enemy_vision_map")
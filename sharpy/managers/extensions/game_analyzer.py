@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from sc2.data import Result
 from sharpy.interfaces import ILostUnitsManager, IIncomeCalculator, IGameAnalyzer, IEnemyUnitsManager
@@ -12,7 +12,7 @@ from .game_states.advantage import (
 )
 from sharpy.managers.core.income_calculator import GAS_MINE_RATE
 from sharpy.general.extended_power import ExtendedPower
-from sharpy.tools import IntervalFunc
+from sharpy.tools.scheduler import ScheduledJob
 from sharpy.unit_count import UnitCount
 from sc2.ids.unit_typeid import UnitTypeId
 
@@ -47,7 +47,7 @@ class GameAnalyzer(ManagerBase, IGameAnalyzer):
         self.predicted_defeat_time = 0.0
         self.minerals_left: List[int] = []
         self.vespene_left: List[int] = []
-        self.resource_updater: IntervalFunc = None
+        self.resource_updater: Optional[ScheduledJob] = None
 
         self._last_income: Advantage = Advantage.Even
         self._last_army: Advantage = Advantage.Even
@@ -76,7 +76,7 @@ class GameAnalyzer(ManagerBase, IGameAnalyzer):
         self._our_power = ExtendedPower(self.unit_values)
         self._enemy_power: ExtendedPower = ExtendedPower(self.unit_values)
         self._enemy_predict_power: ExtendedPower = ExtendedPower(self.unit_values)
-        self.resource_updater = IntervalFunc(self.ai, self.save_resources_status, 1)
+        self.resource_updater = knowledge.scheduler.register("GameAnalyzer", self.save_resources_status, 1, cost=0.1)
         self.resource_updater.execute()
 
     def save_resources_status(self):
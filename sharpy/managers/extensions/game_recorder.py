@@ -0,0 +1,67 @@
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+from sc2.data import Result
+from sharpy.managers.core.manager_base import ManagerBase
+from sharpy.tools.game_recording import RecordingWriter
+
+RECORDING_FOLDER = "recordings"
+
+
+class GameRecorder(ManagerBase):
+    """
+    Records the observation stream of the game to a file that can be played back with GamePlayer.
+
+    Enable by setting record_game = yes in config.ini or by adding the manager in configure_managers.
+    """
+
+    def __init__(self, file_name: Optional[str] = None):
+        super().__init__()
+        self.file_name = file_name
+        self.writer: Optional[RecordingWriter] = None
+        self._last_game_loop = -1
+
+    async def start(self, knowledge: "Knowledge"):
+        await super().start(knowledge)
+
+        if self.file_name is None:
+            os.makedirs(RECORDING_FOLDER, exist_ok=True)
+            map_name = self.ai.game_info.map_name.replace(" ", "")
+            time_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.file_name = os.path.join(
+                RECORDING_FOLDER, f"{map_name}_{self.ai.opponent_id}_{self.ai.player_id}_{time_stamp}.rec"
+            )
+
+        try:
+            game_data = await self.ai.client._execute(
+                data=sc_pb.RequestData(
+                    ability_id=True, unit_type_id=True, upgrade_id=True, buff_id=True, effect_id=True
+                )
+            )
+            game_info = sc_pb.Response()
+            game_info.game_info.CopyFrom(self.ai.game_info._proto)
+            self.writer = RecordingWriter(self.file_name)
+            self.writer.write_header(self.ai.player_id, game_data, game_info, self.ai.base_build)
+        except Exception as e:
+            self.writer = None
+            self.print(f"Game recording could not be started: {e}", stats=False, log_level=logging.WARNING)
+
+    async def update(self):
+        if self.writer is None or self._last_game_loop == self.ai.state.game_loop:
+            return
+
+        self._last_game_loop = self.ai.state.game_loop
+        self.writer.write_frame(self.ai.state.response_observation, self.ai.game_info.pathing_grid._proto.data)
+
+    async def post_update(self):
+        pass
+
+    async def on_end(self, game_result: Result):
+        if self.writer is not None:
+            self.writer.close()
+            self.print(f"{self.writer.frame_count} frames recorded to {self.file_name}", stats=False)
+            self.writer = None
@@ -4,9 +4,9 @@ from typing import List, Optional, Tuple
 import sc2
 from sharpy.general.extended_power import ExtendedPower
 from sharpy.interfaces import IUnitCache, IUnitValues
-from sharpy.managers.core import ManagerBase
+from sharpy.managers.core import ManagerBase, ManagerPriority
 from sharpy.managers.core import UnitCacheManager
-from sharpy.tools import IntervalFunc
+from sharpy.tools.scheduler import ScheduledJob
 from sc2.pixel_map import PixelMap
 from sc2.position import Point2
 from sc2.unit import Unit
@@ -57,16 +57,18 @@ class HeatArea:
 
 
 class HeatMapManager(ManagerBase):
+    priority = ManagerPriority.Low
+    min_cadence = 2
     cache: IUnitCache
     unit_values: IUnitValues
-    updater: IntervalFunc
+    updater: ScheduledJob
 
     def __init__(self) -> None:
         super().__init__()
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
-        self.updater = IntervalFunc(knowledge.ai, self.__real_update, 0.5)
+        self.updater = knowledge.scheduler.register("HeatMapManager", self.__real_update, 0.5, cost=2)
         self.cache = knowledge.get_required_manager(IUnitCache)
         self.init_heat_map(knowledge)
 
@@ -0,0 +1,102 @@
+import logging
+from collections import deque
+from typing import Deque, Dict
+
+from sharpy.interfaces import ILagHandler
+from sharpy.managers.core.manager_base import ManagerBase, ManagerPriority
+from sharpy.sc2math import NEW_TICKS
+
+# Real time that one game loop takes on faster game speed
+MS_PER_GAME_LOOP = 1000 / NEW_TICKS
+# Steps must be this much faster than the budget before the handler stops reacting to lag
+RECOVER_RATIO = 0.7
+
+
+class LagHandler(ManagerBase, ILagHandler):
+    """
+    Keeps step times within the game time that a step covers on faster game speed.
+
+    In step mode games game_step is raised when the average time of recent steps goes over the budget and
+    lowered back to the configured game_step_size when the steps are fast again.
+    Realtime games always use game_step 1, so instead the handler skips the updates of low priority managers and
+    debug drawing while the bot is lagging. Skipped managers still run once per their min_cadence seconds.
+
+    Enable by setting lag_handler = yes in config.ini or by adding the manager in configure_managers.
+    """
+
+    def __init__(self, window: int = 20, max_game_step: int = 0):
+        """
+        @param window: Number of latest steps that are averaged
+        @param max_game_step: Highest game_step used in step mode games, 0 for twice the configured game_step_size
+        """
+        super().__init__()
+        self.step_times: Deque[float] = deque(maxlen=window)
+        self.max_game_step = max_game_step
+        self.base_game_step = 1
+        self._lagging = False
+        self._lag_start = 0.0
+        self._last_runs: Dict[ManagerBase, float] = {}
+
+    async def start(self, knowledge: "Knowledge"):
+        await super().start(knowledge)
+        self.base_game_step = self.client.game_step
+        if self.max_game_step < self.base_game_step:
+            self.max_game_step = self.base_game_step * 2
+
+    @property
+    def lagging(self) -> bool:
+        return self._lagging
+
+    @property
+    def average_step_time(self) -> float:
+        if not self.step_times:
+            return 0
+        return sum(self.step_times) / len(self.step_times)
+
+    async def update(self):
+        pass
+
+    async def post_update(self):
+        pass
+
+    def defer(self, manager: ManagerBase) -> bool:
+        if not self._lagging or manager.priority != ManagerPriority.Low:
+            return False
+
+        if self.ai.time - self._last_runs.get(manager, self._lag_start) < manager.min_cadence:
+            return True
+        self._last_runs[manager] = self.ai.time
+        return False
+
+    def step_took(self, ms: float):
+        self.step_times.append(ms)
+        if len(self.step_times) < self.step_times.maxlen:
+            return
+
+        average = self.average_step_time
+        game_step = self.client.game_step
+        budget = MS_PER_GAME_LOOP * game_step
+
+        if self.ai.realtime:
+            if not self._lagging and average > budget:
+                self._lagging = True
+                self._lag_start = self.ai.time
+                self._last_runs.clear()
+                self.print(
+                    f"Average step time {average:.1f} ms, skipping low priority managers", log_level=logging.DEBUG
+                )
+            elif self._lagging and average < budget * RECOVER_RATIO:
+                self._lagging = False
+                self.print(f"Average step time {average:.1f} ms, running all managers", log_level=logging.DEBUG)
+            return
+
+        if average > budget and game_step < self.max_game_step:
+            self.set_game_step(game_step + 1, average)
+        elif game_step > self.base_game_step and average < MS_PER_GAME_LOOP * (game_step - 1) * RECOVER_RATIO:
+            self.set_game_step(game_step - 1, average)
+
+    def set_game_step(self, game_step: int, average: float):
+        self.client.game_step = game_step
+        # Wait for a full window of steps with the new game step before changing it again
+        self.step_times.clear()
+        self.print(f"Average step time {average:.1f} ms, game step set to {game_step}", log_level=logging.DEBUG)
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from sharpy.managers.extensions import HeatMapManager, LagHandler
+from sharpy.managers.core import ManagerBase
+
+from .lag_handler import MS_PER_GAME_LOOP
+
+
+def create_lag_handler(realtime: bool, game_step: int) -> LagHandler:
+    lag_handler = LagHandler(window=5)
+    lag_handler.knowledge = mock.Mock()
+    lag_handler.ai = mock.Mock(realtime=realtime, time=0)
+    lag_handler.client = mock.Mock(game_step=game_step)
+    lag_handler.base_game_step = game_step
+    lag_handler.max_game_step = game_step * 2
+    return lag_handler
+
+
+class TestLagHandler:
+    def test_game_step_follows_step_times(self):
+        lag_handler = create_lag_handler(False, 4)
+
+        for _ in range(5):
+            lag_handler.step_took(MS_PER_GAME_LOOP * 5)
+        assert lag_handler.client.game_step == 5
+
+        for _ in range(4):
+            lag_handler.step_took(1)
+        assert lag_handler.client.game_step == 5
+        lag_handler.step_took(1)
+        assert lag_handler.client.game_step == 4
+
+        for _ in range(5):
+            lag_handler.step_took(1)
+        assert lag_handler.client.game_step == 4
+
+    def test_low_priority_managers_are_deferred_when_lagging(self):
+        lag_handler = create_lag_handler(True, 1)
+        heat_map = HeatMapManager()
+        normal_manager = mock.Mock(spec=ManagerBase, priority=ManagerBase.priority)
+
+        for _ in range(5):
+            lag_handler.step_took(MS_PER_GAME_LOOP * 2)
+        assert lag_handler.lagging
+
+        assert not lag_handler.defer(normal_manager)
+        assert lag_handler.defer(heat_map)
+        lag_handler.ai.time = heat_map.min_cadence
+        assert not lag_handler.defer(heat_map)
+        assert lag_handler.defer(heat_map)
+
+        for _ in range(5):
+            lag_handler.step_took(1)
+        assert not lag_handler.lagging
+        assert not lag_handler.defer(heat_map)
@@ -63,7 +63,7 @@ class MemoryManager(ManagerBase, IMemoryManager):
         else:
             self.detectors = {UnitTypeId.OVERSEERSIEGEMODE, UnitTypeId.OVERSEER, UnitTypeId.SPORECRAWLER}
 
-        knowledge.register_on_unit_destroyed_listener(self.on_unit_destroyed)
+        knowledge.register_on_units_destroyed_listener(self.on_units_destroyed)
 
     async def update(self):
         detectors = None
@@ -185,6 +185,11 @@ class MemoryManager(ManagerBase, IMemoryManager):
         self._archive_units_by_tag.pop(event.unit_tag, None)
         self._tags_destroyed.add(event.unit_tag)
 
+    def on_units_destroyed(self, events: List[UnitDestroyedEvent]):
+        """Erases all units destroyed on this step from memory."""
+        for event in events:
+            self.on_unit_destroyed(event)
+
     def check_expiration(self, snap: Unit) -> bool:
         if snap.is_flying:
             return snap.age > self.expire_air
@@ -1,5 +1,7 @@
-from math import floor
-from typing import List
+import enum
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+import numpy as np
 
 from sc2.data import Race
 from sc2.ids.unit_typeid import UnitTypeId
@@ -7,6 +9,129 @@ from sharpy.interfaces import IEnemyUnitsManager, ILostUnitsManager
 from sharpy.unit_count import UnitCount
 
 
+class TechFact(enum.Enum):
+    """Facts about the enemy that guess rules can require in addition to structures."""
+
+    ManyBarracks = 1
+    ManyZerglingsLost = 2
+    MorePhoenixesThanVoidRays = 3
+    MostlyStalkers = 4
+    MostlyAdepts = 5
+    ZealotsSeen = 6
+
+
+TechKey = Union[UnitTypeId, TechFact]
+
+
+class GuessRule(NamedTuple):
+    unit_type: UnitTypeId
+    count: int
+    # The rule applies when the enemy has all of these and none of the excluded ones
+    requires: Tuple[TechKey, ...] = ()
+    excludes: Tuple[TechKey, ...] = ()
+    # The rule applies only when any of the earlier rules of the race applied
+    after_any: bool = False
+
+
+# Rules are applied in order, so earlier rules get the resources first
+GUESS_RULES: Dict[Race, List[GuessRule]] = {
+    Race.Zerg: [
+        GuessRule(UnitTypeId.ROACH, 1),
+        GuessRule(UnitTypeId.BROODLORD, 5, (UnitTypeId.GREATERSPIRE,)),
+        GuessRule(UnitTypeId.CORRUPTOR, 5, (UnitTypeId.GREATERSPIRE,)),
+        GuessRule(UnitTypeId.MUTALISK, 6, (UnitTypeId.SPIRE,)),
+        GuessRule(UnitTypeId.HYDRALISK, 10, (UnitTypeId.HYDRALISKDEN,)),
+        GuessRule(UnitTypeId.ROACH, 10, (UnitTypeId.ROACHWARREN,)),
+        GuessRule(UnitTypeId.ZERGLING, 4, (UnitTypeId.SPAWNINGPOOL,)),
+        GuessRule(UnitTypeId.ZERGLING, 20, (UnitTypeId.SPAWNINGPOOL, TechFact.ManyZerglingsLost)),
+    ],
+    Race.Protoss: [
+        GuessRule(UnitTypeId.TEMPEST, 3, (UnitTypeId.FLEETBEACON,)),
+        GuessRule(
+            UnitTypeId.PHOENIX,
+            5,
+            (UnitTypeId.STARGATE, TechFact.MorePhoenixesThanVoidRays),
+            (UnitTypeId.FLEETBEACON,),
+        ),
+        GuessRule(
+            UnitTypeId.VOIDRAY,
+            5,
+            (UnitTypeId.STARGATE,),
+            (UnitTypeId.FLEETBEACON, TechFact.MorePhoenixesThanVoidRays),
+        ),
+        GuessRule(UnitTypeId.DARKTEMPLAR, 4, (UnitTypeId.DARKSHRINE,)),
+        GuessRule(UnitTypeId.HIGHTEMPLAR, 4, (UnitTypeId.TEMPLARARCHIVE,)),
+        GuessRule(UnitTypeId.COLOSSUS, 2, (UnitTypeId.ROBOTICSBAY,)),
+        GuessRule(UnitTypeId.IMMORTAL, 4, (UnitTypeId.ROBOTICSFACILITY,)),
+        GuessRule(UnitTypeId.STALKER, 15, (UnitTypeId.CYBERNETICSCORE, TechFact.MostlyStalkers)),
+        GuessRule(UnitTypeId.ADEPT, 9, (UnitTypeId.CYBERNETICSCORE, TechFact.MostlyAdepts), (TechFact.MostlyStalkers,)),
+        GuessRule(
+            UnitTypeId.ZEALOT,
+            10,
+            (UnitTypeId.CYBERNETICSCORE, TechFact.ZealotsSeen),
+            (TechFact.MostlyStalkers, TechFact.MostlyAdepts),
+        ),
+        GuessRule(UnitTypeId.ZEALOT, 8, (UnitTypeId.WARPGATE,), (UnitTypeId.CYBERNETICSCORE,)),
+        GuessRule(UnitTypeId.STALKER, 8, after_any=True),
+    ],
+    Race.Terran: [
+        GuessRule(UnitTypeId.MARAUDER, 1),
+        GuessRule(UnitTypeId.BATTLECRUISER, 3, (UnitTypeId.FUSIONCORE,)),
+        GuessRule(UnitTypeId.GHOST, 5, (UnitTypeId.GHOSTACADEMY,)),
+        GuessRule(UnitTypeId.VIKINGFIGHTER, 4, (UnitTypeId.STARPORTREACTOR,)),
+        GuessRule(UnitTypeId.BANSHEE, 2, (UnitTypeId.STARPORTTECHLAB,)),
+        GuessRule(UnitTypeId.RAVEN, 2, (UnitTypeId.STARPORTTECHLAB,)),
+        GuessRule(UnitTypeId.SIEGETANK, 4, (UnitTypeId.FACTORYTECHLAB,)),
+        GuessRule(UnitTypeId.MARAUDER, 5, (UnitTypeId.BARRACKSTECHLAB,)),
+        GuessRule(UnitTypeId.MARINE, 10, (UnitTypeId.BARRACKSREACTOR,)),
+        GuessRule(UnitTypeId.MARINE, 10, (TechFact.ManyBarracks,)),
+    ],
+}
+
+# Bit of every structure and fact in tech states
+TECH_BITS: Dict[TechKey, int] = {}
+for _rules in GUESS_RULES.values():
+    for _rule in _rules:
+        for _key in _rule.requires + _rule.excludes:
+            TECH_BITS.setdefault(_key, 1 << len(TECH_BITS))
+for _fact in TechFact:
+    TECH_BITS.setdefault(_fact, 1 << len(TECH_BITS))
+assert len(TECH_BITS) <= 64
+
+STRUCTURE_BITS: Dict[UnitTypeId, int] = {key: bit for key, bit in TECH_BITS.items() if isinstance(key, UnitTypeId)}
+
+
+def tech_mask(keys: Iterable[TechKey]) -> int:
+    mask = 0
+    for key in keys:
+        mask |= TECH_BITS[key]
+    return mask
+
+
+class CompiledRules:
+    """Guess rules of a race as arrays of bit masks, so that any number of tech states can be evaluated at once."""
+
+    def __init__(self, rules: List[GuessRule]):
+        self.unit_types: List[UnitTypeId] = [rule.unit_type for rule in rules]
+        self.counts = np.array([rule.count for rule in rules], dtype=float)
+        self.requires = np.array([tech_mask(rule.requires) for rule in rules], dtype=np.uint64)
+        self.excludes = np.array([tech_mask(rule.excludes) for rule in rules], dtype=np.uint64)
+        self.after_any = np.array([rule.after_any for rule in rules], dtype=bool)
+
+    def applies(self, tech_states: np.ndarray) -> np.ndarray:
+        """Boolean array of shape (states, rules) telling which rules apply in which tech states."""
+        states = np.asarray(tech_states, dtype=np.uint64)[:, np.newaxis]
+        applies = ((states & self.requires) == self.requires) & ((states & self.excludes) == 0)
+        if self.after_any.any():
+            earlier = np.zeros_like(applies)
+            earlier[:, 1:] = np.logical_or.accumulate(applies, axis=1)[:, :-1]
+            applies = np.where(self.after_any, earlier, applies)
+        return applies
+
+
+COMPILED_RULES: Dict[Race, CompiledRules] = {race: CompiledRules(rules) for race, rules in GUESS_RULES.items()}
+
+
 class CompositionGuesser:
     def __init__(
         self, knowledge: "Knowledge", enemy_units_manager: IEnemyUnitsManager, lost_units_manager: ILostUnitsManager
@@ -20,110 +145,89 @@ class CompositionGuesser:
         self.left_gas = 0
 
     def predict_enemy_composition(self) -> List[UnitCount]:
-        if self.knowledge.enemy_race == Race.Random:
+        if self.knowledge.enemy_race not in COMPILED_RULES:
             return []  # let's wait until we know the actual race.
 
-        additional_guess: List[UnitCount] = []
-        # if self.knowledge.enemy_army_predicter.enemy_mined_gas < 150:
-        #     # Should be only mineral units
-        #     if self.knowledge.enemy_race == Race.Zerg:
-        #         additional_guess.append(UnitCount(UnitTypeId.ZERGLING, self.left_minerals / 25))
-        #     if self.knowledge.enemy_race == Race.Terran:
-        #         additional_guess.append(UnitCount(UnitTypeId.MARINE, self.left_minerals / 50))
-        #     if self.knowledge.enemy_race == Race.Protoss:
-        #         additional_guess.append(UnitCount(UnitTypeId.ZEALOT, self.left_minerals / 100))
-        # else:
-        if self.knowledge.enemy_race == Race.Zerg:
-            self.add_units(UnitTypeId.ROACH, 1, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.GREATERSPIRE).exists:
-                self.add_units(UnitTypeId.BROODLORD, 5, additional_guess)
-                self.add_units(UnitTypeId.CORRUPTOR, 5, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.SPIRE).exists:
-                self.add_units(UnitTypeId.MUTALISK, 6, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.HYDRALISK).exists:
-                self.add_units(UnitTypeId.HYDRALISK, 10, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.ROACHWARREN).exists:
-                self.add_units(UnitTypeId.ROACH, 10, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.SPAWNINGPOOL).exists:
-                self.add_units(UnitTypeId.ZERGLING, 4, additional_guess)
-                if self.lost_units_manager.enemy_lost_type(UnitTypeId.ZERGLING) > 10:
-                    self.add_units(UnitTypeId.ZERGLING, 20, additional_guess)
-
-        elif self.knowledge.enemy_race == Race.Protoss:
-            if self.ai.enemy_structures(UnitTypeId.FLEETBEACON).exists:
-                self.add_units(UnitTypeId.TEMPEST, 3, additional_guess)
-            elif self.ai.enemy_structures(UnitTypeId.STARGATE).exists:
-                if self.history(UnitTypeId.PHOENIX) > self.history(UnitTypeId.VOIDRAY):
-                    self.add_units(UnitTypeId.PHOENIX, 5, additional_guess)
-                else:
-                    self.add_units(UnitTypeId.VOIDRAY, 5, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.DARKSHRINE).exists:
-                self.add_units(UnitTypeId.DARKTEMPLAR, 4, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.TEMPLARARCHIVE).exists:
-                self.add_units(UnitTypeId.HIGHTEMPLAR, 4, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.ROBOTICSBAY).exists:
-                self.add_units(UnitTypeId.COLOSSUS, 2, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.ROBOTICSFACILITY).exists:
-                self.add_units(UnitTypeId.IMMORTAL, 4, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.CYBERNETICSCORE).exists:
-                if self.history(UnitTypeId.STALKER) > self.history(UnitTypeId.ADEPT) and self.history(
-                    UnitTypeId.STALKER
-                ) > self.history(UnitTypeId.ZEALOT):
-                    self.add_units(UnitTypeId.STALKER, 15, additional_guess)
-                elif self.history(UnitTypeId.ADEPT) > self.history(UnitTypeId.ZEALOT):
-                    self.add_units(UnitTypeId.ADEPT, 9, additional_guess)
-                elif self.history(UnitTypeId.ZEALOT):
-                    self.add_units(UnitTypeId.ZEALOT, 10, additional_guess)
-            if (
-                not self.ai.enemy_structures(UnitTypeId.CYBERNETICSCORE).exists
-                and self.ai.enemy_structures(UnitTypeId.WARPGATE).exists
-            ):
-                self.add_units(UnitTypeId.ZEALOT, 8, additional_guess)
-            if len(additional_guess):
-                self.add_units(UnitTypeId.STALKER, 8, additional_guess)
-
-        elif self.ai.enemy_race == Race.Terran:
-            self.add_units(UnitTypeId.MARAUDER, 1, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.FUSIONCORE).exists:
-                self.add_units(UnitTypeId.BATTLECRUISER, 3, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.GHOSTACADEMY).exists:
-                self.add_units(UnitTypeId.GHOST, 5, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.STARPORTREACTOR).exists:
-                self.add_units(UnitTypeId.VIKINGFIGHTER, 4, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.STARPORTTECHLAB).exists:
-                self.add_units(UnitTypeId.BANSHEE, 2, additional_guess)
-                self.add_units(UnitTypeId.RAVEN, 2, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.FACTORYTECHLAB).exists:
-                self.add_units(UnitTypeId.SIEGETANK, 4, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.BARRACKSTECHLAB).exists:
-                self.add_units(UnitTypeId.MARAUDER, 5, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.BARRACKSREACTOR).exists:
-                self.add_units(UnitTypeId.MARINE, 10, additional_guess)
-            if self.ai.enemy_structures(UnitTypeId.BARRACKS).amount > 2:
-                self.add_units(UnitTypeId.MARINE, 10, additional_guess)
-
-        return additional_guess
+        rules = COMPILED_RULES[self.knowledge.enemy_race]
+        applies, counts = self.guess_counts(np.array([self.tech_state()]), self.left_minerals, self.left_gas)
+        mineral_prices, gas_prices = self._prices(rules)
+        self.left_minerals -= float(counts[0] @ mineral_prices)
+        self.left_gas -= float(counts[0] @ gas_prices)
 
-    def history(self, type_id: UnitTypeId) -> int:
-        return self.enemy_units_manager.unit_count(type_id) + self.lost_units_manager.enemy_lost_type(type_id)
+        return [
+            UnitCount(type_id, int(count))
+            for type_id, applied, count in zip(rules.unit_types, applies[0], counts[0])
+            if applied
+        ]
+
+    def tech_state(self) -> int:
+        """Bit set of the enemy structures and facts that the guess rules depend on."""
+        state = 0
+        barracks = 0
+        for structure in self.ai.enemy_structures:
+            state |= STRUCTURE_BITS.get(structure.type_id, 0)
+            if structure.type_id == UnitTypeId.BARRACKS:
+                barracks += 1
+
+        stalkers = self.history(UnitTypeId.STALKER)
+        adepts = self.history(UnitTypeId.ADEPT)
+        zealots = self.history(UnitTypeId.ZEALOT)
+        facts = {
+            TechFact.ManyBarracks: barracks > 2,
+            TechFact.ManyZerglingsLost: self.lost_units_manager.enemy_lost_type(UnitTypeId.ZERGLING) > 10,
+            TechFact.MorePhoenixesThanVoidRays: self.history(UnitTypeId.PHOENIX) > self.history(UnitTypeId.VOIDRAY),
+            TechFact.MostlyStalkers: stalkers > adepts and stalkers > zealots,
+            TechFact.MostlyAdepts: adepts > zealots,
+            TechFact.ZealotsSeen: zealots > 0,
+        }
+        for fact, value in facts.items():
+            if value:
+                state |= TECH_BITS[fact]
+        return state
 
-    def add_units(self, type_id, count, additional_guess):
-        mineral_price = self.unit_values.minerals(type_id)
-        gas_price = self.unit_values.gas(type_id)
+    @staticmethod
+    def with_tech(tech_state: int, *keys: TechKey) -> int:
+        """Hypothetical tech state where the enemy also has the given structures and facts."""
+        return tech_state | tech_mask(keys)
 
-        if mineral_price > 0:
-            mineral_amount = self.left_minerals / mineral_price
-        else:
-            mineral_amount = 100
+    def guess_counts(
+        self,
+        tech_states: np.ndarray,
+        left_minerals: Union[float, np.ndarray],
+        left_gas: Union[float, np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluates the guess rules of the enemy race for any number of tech states at once, for example to look
+        ahead what the enemy could build with different tech.
 
-        if gas_price > 0:
-            gas_amount = self.left_gas / gas_price
-        else:
-            gas_amount = 100
+        @param tech_states: Tech states as returned by tech_state and with_tech
+        @param left_minerals: Minerals that the enemy has for units, for all states or one value per state
+        @param left_gas: Gas that the enemy has for units, for all states or one value per state
+        @return: Boolean array of which rules apply and array of unit counts, both of shape (states, rules).
+        Unit types of the rules are in COMPILED_RULES[race].unit_types.
+        """
+        rules = COMPILED_RULES[self.knowledge.enemy_race]
+        applies = rules.applies(tech_states)
+        state_count = len(applies)
+        minerals = np.broadcast_to(np.asarray(left_minerals, dtype=float), (state_count,)).copy()
+        gas = np.broadcast_to(np.asarray(left_gas, dtype=float), (state_count,)).copy()
+        mineral_prices, gas_prices = self._prices(rules)
 
-        count = max(0, floor(min(count, mineral_amount, gas_amount)))
+        counts = np.zeros(applies.shape, dtype=float)
+        for i in range(len(rules.unit_types)):
+            # Units that cost nothing of a resource are capped at 100 by it
+            mineral_amount = minerals / mineral_prices[i] if mineral_prices[i] > 0 else 100
+            gas_amount = gas / gas_prices[i] if gas_prices[i] > 0 else 100
+            count = np.maximum(0, np.floor(np.minimum(np.minimum(rules.counts[i], mineral_amount), gas_amount)))
+            count[~applies[:, i]] = 0
+            counts[:, i] = count
+            minerals -= count * mineral_prices[i]
+            gas -= count * gas_prices[i]
 
-        self.left_minerals -= count * mineral_price
-        self.left_gas -= count * gas_price
+        return applies, counts
 
-        additional_guess.append(UnitCount(type_id, count))
+    def _prices(self, rules: CompiledRules) -> Tuple[np.ndarray, np.ndarray]:
+        return self.unit_values.costs(np.array([type_id.value for type_id in rules.unit_types]))
+
+    def history(self, type_id: UnitTypeId) -> int:
+        return self.enemy_units_manager.unit_count(type_id) + self.lost_units_manager.enemy_lost_type(type_id)
@@ -0,0 +1,69 @@
+from unittest import mock
+
+import numpy as np
+
+from sc2.data import Race
+from sc2.ids.unit_typeid import UnitTypeId
+from sharpy.managers.core import UnitValue
+
+from .composition_guesser import COMPILED_RULES, CompositionGuesser, TechFact
+
+
+def create_guesser(race: Race, structures, history=None) -> CompositionGuesser:
+    history = history or {}
+    knowledge = mock.Mock(enemy_race=race, unit_values=UnitValue())
+    knowledge.ai.enemy_structures = [mock.Mock(type_id=type_id) for type_id in structures]
+    enemy_units_manager = mock.Mock()
+    enemy_units_manager.unit_count = lambda type_id: history.get(type_id, 0)
+    lost_units_manager = mock.Mock()
+    lost_units_manager.enemy_lost_type = lambda type_id: 0
+    return CompositionGuesser(knowledge, enemy_units_manager, lost_units_manager)
+
+
+def as_tuples(unit_counts):
+    return [(unit_count.enemy_type, unit_count.count) for unit_count in unit_counts]
+
+
+class TestCompositionGuesser:
+    def test_rules_spend_resources_in_order(self):
+        guesser = create_guesser(
+            Race.Protoss,
+            [UnitTypeId.CYBERNETICSCORE, UnitTypeId.STARGATE, UnitTypeId.GATEWAY],
+            {UnitTypeId.ADEPT: 2, UnitTypeId.ZEALOT: 1},
+        )
+        guesser.left_minerals = 1000
+        guesser.left_gas = 350
+
+        guess = guesser.predict_enemy_composition()
+
+        # Void rays use up the gas before adepts and stalkers
+        assert as_tuples(guess) == [(UnitTypeId.VOIDRAY, 2), (UnitTypeId.ADEPT, 2), (UnitTypeId.STALKER, 0)]
+        values = guesser.unit_values
+        assert guesser.left_minerals == 1000 - 2 * values.minerals(UnitTypeId.VOIDRAY) - 2 * values.minerals(
+            UnitTypeId.ADEPT
+        )
+        assert guesser.left_gas == 350 - 2 * values.gas(UnitTypeId.VOIDRAY) - 2 * values.gas(UnitTypeId.ADEPT)
+
+    def test_hypothetical_tech_states_are_evaluated_in_batch(self):
+        guesser = create_guesser(Race.Terran, [UnitTypeId.BARRACKS])
+        state = guesser.tech_state()
+        states = np.array(
+            [
+                state,
+                guesser.with_tech(state, UnitTypeId.FACTORYTECHLAB),
+                guesser.with_tech(state, UnitTypeId.BARRACKSREACTOR, TechFact.ManyBarracks),
+            ]
+        )
+
+        applies, counts = guesser.guess_counts(states, np.array([1000, 1000, 300]), 500)
+
+        unit_types = COMPILED_RULES[Race.Terran].unit_types
+        guesses = [
+            [(unit_type, count) for unit_type, applied, count in zip(unit_types, row, count_row) if applied]
+            for row, count_row in zip(applies, counts)
+        ]
+        assert guesses == [
+            [(UnitTypeId.MARAUDER, 1)],
+            [(UnitTypeId.MARAUDER, 1), (UnitTypeId.SIEGETANK, 3)],
+            [(UnitTypeId.MARAUDER, 1), (UnitTypeId.MARINE, 4), (UnitTypeId.MARINE, 0)],
+        ]
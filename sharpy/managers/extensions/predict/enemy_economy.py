@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from sc2.position import Point2
+from sc2.unit import Unit
+
+# Minerals per second that a single worker mines
+MINERAL_MINING_SPEED = 1800.0 / 15 / 60 / 2
+# Gas per second from a saturated gas building
+GAS_MINING_SPEED = 169.61 / 60
+GEYSER_START_GAS = 2250
+# Low, likely and high estimate of mineral workers in an enemy base
+WORKERS_PER_BASE = np.array([6, 12, 16], dtype=float)
+
+
+class EnemyEconomy:
+    """
+    Estimate of the resources that the enemy has mined.
+
+    Minerals are tracked per expansion zone and gas per vespene geyser in arrays, so an update is a handful of
+    NumPy operations regardless of the number of bases. Remaining minerals of a zone are known when the zone
+    has been seen. Between sightings the minerals of enemy zones are predicted to go down, with a low,
+    likely and high estimate of the enemy workers mining them. Gas of enemy gas buildings that are not visible
+    is predicted to go down at full mining speed.
+    """
+
+    def __init__(self, zone_minerals: Sequence[float], geysers: Iterable[Point2]):
+        """
+        @param zone_minerals: Minerals on every zone at start, in the order that zone values are given to update
+        @param geysers: Positions of all vespene geysers on the map
+        """
+        zone_count = len(zone_minerals)
+        # Remaining minerals when last seen and the time they were seen
+        self.minerals = np.array(zone_minerals, dtype=float)
+        self.minerals_seen = np.zeros(zone_count, dtype=float)
+
+        self.geyser_indices: Dict[Point2, int] = {position: i for i, position in enumerate(geysers)}
+        geyser_count = len(self.geyser_indices)
+        self.gas = np.full(geyser_count, GEYSER_START_GAS, dtype=float)
+        # Last time gas of the geyser was updated, nan if the enemy hasn't taken the geyser
+        self.gas_updated = np.full(geyser_count, np.nan, dtype=float)
+
+        # Minerals that the enemy has been seen to mine
+        self.mined_minerals = 0.0
+        # Low, likely and high estimate of minerals mined by the enemy
+        self.mined_minerals_range = np.zeros(len(WORKERS_PER_BASE), dtype=float)
+        self.mined_gas = 0.0
+
+    @property
+    def mined_minerals_prediction(self) -> float:
+        return float(self.mined_minerals_range[1])
+
+    def update(self, time: float, zone_minerals: np.ndarray, enemy_zones: np.ndarray, gas_buildings: Iterable[Unit]):
+        """
+        @param time: Game time in seconds
+        @param zone_minerals: Latest known minerals of every zone
+        @param enemy_zones: Boolean mask of the zones that have an enemy base
+        @param gas_buildings: Known enemy gas buildings
+        """
+        self._update_minerals(time, zone_minerals, enemy_zones)
+        self._update_gas(time, gas_buildings)
+
+    def _update_minerals(self, time: float, zone_minerals: np.ndarray, enemy_zones: np.ndarray):
+        mined = self.minerals - zone_minerals
+        seen = mined > 0
+        self.mined_minerals += mined[seen & enemy_zones].sum()
+        self.minerals[seen] = zone_minerals[seen]
+        self.minerals_seen[seen] = time
+
+        predicted = ~seen & enemy_zones
+        remaining = self.minerals[predicted, np.newaxis]
+        elapsed = time - self.minerals_seen[predicted, np.newaxis]
+        predicted_mined = np.minimum(remaining, elapsed * MINERAL_MINING_SPEED * WORKERS_PER_BASE)
+        self.mined_minerals_range = self.mined_minerals + predicted_mined.sum(axis=0)
+
+    def _update_gas(self, time: float, gas_buildings: Iterable[Unit]):
+        for building in gas_buildings:
+            index = self.geyser_indices.get(building.position)
+            if index is None:
+                continue
+
+            if building.is_visible:
+                gas = building.vespene_contents
+            elif np.isnan(self.gas_updated[index]):
+                gas = self.gas[index]
+            else:
+                gas = max(0.0, self.gas[index] - GAS_MINING_SPEED * (time - self.gas_updated[index]))
+
+            self.mined_gas += self.gas[index] - gas
+            self.gas[index] = gas
+            self.gas_updated[index] = time
+
+    def free_minerals(self, start_minerals: float, minerals_used: float) -> Tuple[int, int, int]:
+        """Low, likely and high estimate of minerals that the enemy has not spent."""
+        low, likely, high = np.round(start_minerals + self.mined_minerals_range - minerals_used)
+        return int(low), int(likely), int(high)
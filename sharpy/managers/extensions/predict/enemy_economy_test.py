@@ -0,0 +1,39 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from sc2.position import Point2
+
+from .enemy_economy import EnemyEconomy, GAS_MINING_SPEED, MINERAL_MINING_SPEED, WORKERS_PER_BASE
+
+
+class TestEnemyEconomy:
+    def test_minerals_are_predicted_between_sightings(self):
+        economy = EnemyEconomy([10000, 10000, 10000], [])
+        enemy_zones = np.array([True, True, False])
+
+        economy.update(0, np.array([10000, 10000, 10000.0]), enemy_zones, [])
+        assert list(economy.mined_minerals_range) == [0, 0, 0]
+
+        # First zone is seen to be mined, second one isn't seen and the third is mined by us
+        economy.update(10, np.array([9000, 10000, 8000.0]), enemy_zones, [])
+        assert economy.mined_minerals == 1000
+        expected = 1000 + 10 * MINERAL_MINING_SPEED * WORKERS_PER_BASE
+        assert economy.mined_minerals_range == pytest.approx(expected)
+
+        low, likely, high = economy.free_minerals(1000, 500)
+        assert low < likely == round(500 + expected[1]) < high
+
+    def test_hidden_gas_buildings_are_predicted_to_be_mined(self):
+        geysers = [Point2((10.5, 10.5)), Point2((20.5, 10.5))]
+        economy = EnemyEconomy([], geysers)
+        no_zones = np.zeros(0)
+
+        visible = mock.Mock(position=geysers[0], is_visible=True, vespene_contents=2000)
+        economy.update(0, no_zones, no_zones.astype(bool), [visible])
+        assert economy.mined_gas == 250
+
+        hidden = mock.Mock(position=geysers[0], is_visible=False)
+        economy.update(10, no_zones, no_zones.astype(bool), [hidden])
+        assert economy.mined_gas == pytest.approx(250 + 10 * GAS_MINING_SPEED)
@@ -172,6 +172,23 @@ class ActBase(Component, ABC):
 
         return count
 
+    def get_count_inputs(self, unit_type: UnitTypeId) -> tuple:
+        """Returns a snapshot of everything `get_count` depends on, without filtering any units."""
+        related = EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, ())
+        related_amount = 0
+        lost = self.lost_units_manager.own_lost_type(unit_type, real_type=False)
+        for related_type in related:
+            related_amount += self.cache.own(related_type).amount
+            lost += self.lost_units_manager.own_lost_type(related_type, real_type=False)
+
+        return (
+            self.cache.own(unit_type).amount,
+            self.cache.own_ready_count(unit_type),
+            self.unit_pending_count(unit_type),
+            related_amount,
+            lost,
+        )
+
     def related_count(self, count, unit_type):
         if unit_type in EQUIVALENTS_FOR_TECH_PROGRESS:
             count += self.cache.own(EQUIVALENTS_FOR_TECH_PROGRESS[unit_type]).amount
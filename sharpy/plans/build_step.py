@@ -52,11 +52,11 @@ class Step(ActBase):
             await self.start_component(self.skip_until, knowledge)
 
     async def execute(self) -> bool:
-        if self.skip is not None and self.skip.check():
+        if self.skip is not None and self.skip.is_met():
             return True
-        if self.skip_until is not None and not self.skip_until.check():
+        if self.skip_until is not None and not self.skip_until.is_met():
             return True
-        if self.requirement is not None and not self.requirement.check():
+        if self.requirement is not None and not self.requirement.is_met():
             return False
 
         if self.action is None:
@@ -55,11 +55,11 @@ class IfElse(ActBase):
             await self.start_component(self.skip_until, knowledge)
 
     async def execute(self) -> bool:
-        if self.skip is not None and self.skip.check():
+        if self.skip is not None and self.skip.is_met():
             return True
-        if self.skip_until is not None and not self.skip_until.check():
+        if self.skip_until is not None and not self.skip_until.is_met():
             return True
-        if self.condition.check():
+        if self.condition.is_met():
             return await self.action.execute()
         if self.action_else is None:
             return True
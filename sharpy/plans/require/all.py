@@ -40,9 +40,12 @@ class All(RequireBase):
         for condition in self.conditions:
             await self.start_component(condition, knowledge)
 
+    def inputs(self):
+        return self.combine_inputs(self.conditions)
+
     def check(self) -> bool:
         for condition in self.conditions:
-            if not condition.check():
+            if not condition.is_met():
                 return False
 
         return True
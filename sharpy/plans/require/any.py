@@ -39,9 +39,12 @@ class Any(RequireBase):
         for condition in self.conditions:
             await self.start_component(condition, knowledge)
 
+    def inputs(self):
+        return self.combine_inputs(self.conditions)
+
     def check(self) -> bool:
         for condition in self.conditions:
-            if condition.check():
+            if condition.is_met():
                 return True
 
         return False
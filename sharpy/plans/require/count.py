@@ -17,10 +17,13 @@ class Count(RequireBase):
         for condition in self.conditions:
             await self.start_component(condition, knowledge)
 
+    def inputs(self):
+        return self.combine_inputs(self.conditions)
+
     def check(self) -> bool:
         amount = 0
         for condition in self.conditions:
-            if condition.check():
+            if condition.is_met():
                 amount += 1
 
         return amount >= self.count
@@ -25,6 +25,9 @@ class EnemyUnitExists(RequireBase):
         await super().start(knowledge)
         self.enemy_units_manager = knowledge.get_required_manager(IEnemyUnitsManager)
 
+    def inputs(self):
+        return self.enemy_units_manager.unit_count(self.unit_type)
+
     def check(self) -> bool:
         enemy_count = self.enemy_units_manager.unit_count(self.unit_type)
         if enemy_count is None:
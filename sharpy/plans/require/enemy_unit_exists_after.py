@@ -25,6 +25,11 @@ class EnemyUnitExistsAfter(RequireBase):
         self.enemy_units_manager = self.knowledge.get_required_manager(IEnemyUnitsManager)
         self.lost_units_manager = self.knowledge.get_required_manager(ILostUnitsManager)
 
+    def inputs(self):
+        enemy_count = self.enemy_units_manager.unit_count(self.unit_type)
+        lost_count = self.lost_units_manager.enemy_lost_type(self.unit_type)
+        return enemy_count, lost_count
+
     def check(self) -> bool:
         enemy_count = self.enemy_units_manager.unit_count(self.unit_type)
         enemy_count += self.lost_units_manager.enemy_lost_type(self.unit_type)
@@ -14,6 +14,9 @@ class Gas(RequireBase):
 
         self.vespene_requirement = vespene_requirement
 
+    def inputs(self):
+        return self.ai.vespene
+
     def check(self) -> bool:
         if self.ai.vespene > self.vespene_requirement:
             return True
@@ -11,6 +11,9 @@ class Minerals(RequireBase):
 
         self.mineralRequirement = mineral_requirement
 
+    def inputs(self):
+        return self.ai.minerals
+
     def check(self) -> bool:
         if self.ai.minerals > self.mineralRequirement:
             return True
@@ -23,11 +23,16 @@ class Once(RequireBase):
         await super().start(knowledge)
         await self.start_component(self.condition, knowledge)
 
+    def inputs(self):
+        if self.triggered:
+            return True
+        return self.condition.inputs()
+
     def check(self) -> bool:
         if self.triggered:
             return True
 
-        if self.condition.check():
+        if self.condition.is_met():
             self.triggered = True
             return True
 
@@ -1,11 +1,73 @@
 from abc import abstractmethod
+from typing import Hashable, Optional, List
+
 from sharpy.plans.acts import ActBase
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sharpy.knowledges import Knowledge
+
 
 class RequireBase(ActBase):
+    # Cached check results are trusted for at most this many game seconds, even if inputs haven't changed.
+    input_timeout: float = 5
+
+    def __init__(self):
+        super().__init__()
+        self.cached = False
+        self._last_inputs: Optional[Hashable] = None
+        self._last_result = False
+        self._last_check_time = float("-inf")
+
+    async def start(self, knowledge: "Knowledge"):
+        await super().start(knowledge)
+        self.cached = knowledge.cache_requirements is True
+
     async def execute(self) -> bool:
-        return self.check()
+        return self.is_met()
 
     @abstractmethod
     def check(self) -> bool:
         pass
+
+    def inputs(self) -> Optional[Hashable]:
+        """
+        Declares the values that the check depends on, i.e. unit counts, minerals, supply or time.
+        Inputs are expected to be considerably cheaper to calculate than the check itself.
+
+        @return: Hashable snapshot of the inputs or None when inputs are not declared and check must always be run.
+        """
+        return None
+
+    @staticmethod
+    def combine_inputs(conditions: List["RequireBase"]) -> Optional[tuple]:
+        """Combines inputs of child conditions. Returns None if any of the conditions has undeclared inputs."""
+        inputs = []
+        for condition in conditions:
+            condition_inputs = condition.inputs()
+            if condition_inputs is None:
+                return None
+            inputs.append(condition_inputs)
+        return tuple(inputs)
+
+    def is_met(self) -> bool:
+        """
+        Returns check result. When requirement caching is enabled, the previous result is returned
+        as long as declared inputs haven't changed and the result hasn't timed out.
+        """
+        if not self.cached:
+            return self.check()
+
+        inputs = self.inputs()
+        if inputs is None:
+            return self.check()
+
+        time = self.ai.time
+        if inputs == self._last_inputs and time - self._last_check_time < self.input_timeout:
+            return self._last_result
+
+        self._last_inputs = inputs
+        self._last_result = self.check()
+        self._last_check_time = time
+        return self._last_result
@@ -17,6 +17,9 @@ class Supply(RequireBase):
         self.supply_type = supply_type
         self.supply_amount = supply_amount
 
+    def inputs(self):
+        return self.ai.supply_used, self.ai.supply_workers
+
     def check(self) -> bool:
         if self.supply_type == SupplyType.All:
             return self.ai.supply_used >= self.supply_amount
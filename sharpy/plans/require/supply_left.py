@@ -11,6 +11,9 @@ class SupplyLeft(RequireBase):
         # if less than supply amount of free supply left
         self.supplyAmount = supply_amount
 
+    def inputs(self):
+        return self.ai.supply_left, self.ai.supply_cap
+
     def check(self) -> bool:
         if self.ai.supply_left <= self.supplyAmount and self.ai.supply_cap < 200:
             return True
@@ -29,3 +29,46 @@ class TestRequiredSupply:
 
         # Act & Assert
         assert req_supply.check()
+
+    @pytest.mark.asyncio
+    async def test_cached_check_is_reused_until_inputs_change(self):
+        # Arrange
+        req_supply = Supply(15)
+
+        knowledge_mock = mock.Mock()
+        knowledge_mock.cache_requirements = True
+        knowledge_mock.ai.time = 0
+        knowledge_mock.ai.supply_used = 13
+        knowledge_mock.ai.supply_workers = 13
+        await req_supply.start(knowledge_mock)
+        assert not req_supply.is_met()
+
+        # Act & Assert
+        with mock.patch.object(Supply, "check", return_value=True) as check_mock:
+            assert not req_supply.is_met()
+            check_mock.assert_not_called()
+
+            knowledge_mock.ai.supply_used = 15
+            assert req_supply.is_met()
+            check_mock.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_check_is_evaluated_after_timeout(self):
+        # Arrange
+        req_supply = Supply(15)
+
+        knowledge_mock = mock.Mock()
+        knowledge_mock.cache_requirements = True
+        knowledge_mock.ai.time = 0
+        knowledge_mock.ai.supply_used = 13
+        knowledge_mock.ai.supply_workers = 13
+        await req_supply.start(knowledge_mock)
+        assert not req_supply.is_met()
+
+        # Act
+        knowledge_mock.ai.time = req_supply.input_timeout
+
+        # Assert
+        with mock.patch.object(Supply, "check", return_value=True) as check_mock:
+            assert req_supply.is_met()
+            check_mock.assert_called_once()
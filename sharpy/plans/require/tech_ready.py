@@ -18,6 +18,12 @@ class TechReady(RequireBase):
         self.name = upgrade
         self.percentage = percentage
 
+    def inputs(self):
+        if self.percentage < 1:
+            # Research progress changes every frame
+            return None
+        return self.name in self.ai.state.upgrades
+
     def check(self) -> bool:
         if self.ai.already_pending_upgrade(self.name) >= self.percentage:
             return True
@@ -10,6 +10,10 @@ class Time(RequireBase):
 
         self.time_in_seconds = time_in_seconds
 
+    def inputs(self):
+        # Time only matters when it passes the required time
+        return self.ai.time > self.time_in_seconds
+
     def check(self) -> bool:
         if self.ai.time > self.time_in_seconds:
             return True
@@ -31,6 +31,9 @@ class UnitExists(RequireBase):
         self.count = count
         self.strict = strict
 
+    def inputs(self):
+        return self.get_count_inputs(self.unit_type)
+
     def check(self) -> bool:
         count = self.get_count(self.unit_type, self.include_pending, self.include_killed, self.include_not_ready)
         if self.strict:
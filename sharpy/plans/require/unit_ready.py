@@ -13,6 +13,13 @@ class UnitReady(RequireBase):
         self.unit_type = unit_type
         self.count = count
 
+    def inputs(self):
+        inputs = self.get_count_inputs(self.unit_type)
+        if inputs[0] > inputs[1]:
+            # Build progress of units that are not ready changes every frame
+            return None
+        return inputs
+
     def check(self) -> bool:
         count = self.get_count(self.unit_type, False, include_not_ready=False)
         build_progress = 0
@@ -1,5 +1,9 @@
 from typing import Optional, List, Dict
 
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
+
 from sc2.constants import IS_COLLECTING, ALL_GAS
 from sc2.ids.ability_id import AbilityId
 from sharpy.managers.core import UnitRoleManager
@@ -18,12 +22,26 @@ MAX_WORKERS_PER_GAS = 3
 ZONE_EVACUATION_POWER_THRESHOLD = -5
 BAD_ZONE_POWER_THRESHOLD = -2
 
+# Batch assignment costs, distances are added on top of these
+# Moving a worker must be worth more than a short walk, otherwise workers would be shuffled around on every frame
+MOVE_COST = 10
+# Mining with a third worker in a mineral patch
+OVERSATURATION_COST = 100
+# Staying in an oversaturated workplace
+EXCESS_COST = 1000
+# Leaving an idle worker without work
+IDLE_COST = 100000
+# Filling a gas slot with aggressive gas fill, negative so that workers are pulled from minerals to gas
+GAS_FILL_COST = -100
+
 
 class WorkStatus:
-    def __init__(self, unit: Unit, available: int, force_exit: bool = False) -> None:
+    def __init__(self, unit: Unit, available: int, force_exit: bool = False, target: int = 0) -> None:
         self.force_exit = force_exit
         self.unit = unit
         self.available = available
+        # How many workers the workplace should have in total
+        self.target = target
 
 
 class DistributeWorkers(ActBase):
@@ -36,7 +54,12 @@ class DistributeWorkers(ActBase):
         aggressive_gas_fill: bool = True,
         evacuate_zones: bool = True,
         leave_builders_alone: bool = True,
+        batch: bool = False,
     ):
+        """
+        @param batch: Assign all workers at once by solving a minimum cost assignment instead of moving
+        a single worker per frame. Only workers whose workplace changes are given new orders.
+        """
         super().__init__()
         assert min_gas is None or isinstance(min_gas, int)
         assert max_gas is None or isinstance(max_gas, int)
@@ -47,6 +70,7 @@ class DistributeWorkers(ActBase):
         self.leave_builders_alone = leave_builders_alone
         # evacuate
         self.evacuate_zones = evacuate_zones
+        self.batch = batch
         self.active_gas_workers = 0
         self.roles: UnitRoleManager = None
         # self.force_work = False
@@ -68,13 +92,13 @@ class DistributeWorkers(ActBase):
         self.calculate_workers()
         self.generate_worker_queue()
 
-        for worker in (
-            self.roles.all_from_task(UnitTask.Idle).of_type(UnitValue.worker_types)
-            + self.roles.all_from_task(UnitTask.Gathering).idle
-        ):  # type: Unit
+        if self.batch:
+            await self.assign_batch()
+            return True
+
+        for worker in self.idle_workers():
             # Re-assign idle workers
-            if not self.leave_builders_alone or not worker.is_using_ability(UnitValue.build_abilities):
-                await self.set_work(worker)
+            await self.set_work(worker)
 
         # Balance workers in bases that have to many
         work_status: Optional[WorkStatus] = None
@@ -116,6 +140,119 @@ class DistributeWorkers(ActBase):
 
         return True
 
+    async def assign_batch(self):
+        """
+        Assigns all workers at once. Workplaces are split into worker slots based on their saturation targets
+        and the gas worker target, and workers are matched to the slots with a minimum cost assignment
+        over distances. Staying in the current workplace is free, so only workers that change workplace get orders.
+        Workers in workplaces that must be exited or no longer take workers are assigned like idle workers.
+        """
+        index_by_tag: Dict[int, int] = {status.unit.tag: index for index, status in enumerate(self.work_queue)}
+        current_work: Dict[int, int] = {}
+        # Workers that have to leave their workplace, either because it must be exited or because it is
+        # depleted or won't finish anytime soon and thus isn't in the work queue at all
+        displaced: Dict[int, Optional[WorkStatus]] = {}
+
+        for work_tag, worker_tags in self.worker_dict.items():
+            index = index_by_tag.get(work_tag)
+            for tag in worker_tags:
+                if index is None:
+                    displaced[tag] = None
+                elif self.work_queue[index].force_exit:
+                    displaced[tag] = self.work_queue[index]
+                else:
+                    current_work[tag] = index
+
+        for tag in current_work:
+            displaced.pop(tag, None)
+
+        workers: List[Unit] = list(self.cache.by_tags(list(current_work.keys()) + list(displaced.keys())))
+        for worker in self.idle_workers():
+            if worker.tag not in current_work and worker.tag not in displaced:
+                workers.append(worker)
+
+        if not workers:
+            return
+
+        gas_slots = self.gas_slots()
+        slot_work: List[int] = []
+        slot_costs: List[float] = []
+
+        for index, status in enumerate(self.work_queue):
+            if status.force_exit or status.target <= 0:
+                continue
+            if status.unit.has_vespene:
+                count = gas_slots.get(status.unit.tag, 0)
+                slot_work.extend([index] * count)
+                slot_costs.extend([GAS_FILL_COST if self.aggressive_gas_fill else 0] * count)
+            else:
+                # Third worker for half of the patches
+                oversaturation = status.target // 2
+                slot_work.extend([index] * (status.target + oversaturation))
+                slot_costs.extend([0] * status.target + [OVERSATURATION_COST] * oversaturation)
+
+        worker_work = np.array([current_work.get(worker.tag, -1) for worker in workers])
+        no_work_cost = np.where(worker_work >= 0, EXCESS_COST, IDLE_COST)
+        # Not being assigned to any slot keeps the worker in its current workplace
+        costs = np.repeat(no_work_cost[:, np.newaxis], len(workers), axis=1)
+
+        if slot_work:
+            worker_positions = np.array([worker.position for worker in workers])
+            slot_positions = np.array([self.work_queue[index].unit.position for index in slot_work])
+            slot_cost_array = np.array(slot_costs)
+            move_costs = cdist(worker_positions, slot_positions) + MOVE_COST + slot_cost_array
+            staying = worker_work[:, np.newaxis] == np.array(slot_work)[np.newaxis, :]
+            costs = np.hstack((np.where(staying, slot_cost_array, move_costs), costs))
+
+        rows, columns = linear_sum_assignment(costs)
+
+        for row, column in zip(rows, columns):
+            worker = workers[row]
+            if column >= len(slot_work):
+                if worker.tag in displaced:
+                    if displaced[worker.tag] is not None:
+                        # Nothing free, exit the workplace the same way as without batch assignment
+                        await self.set_work(worker, displaced[worker.tag])
+                elif worker_work[row] < 0:
+                    # Nothing free, fall back to regular assignment
+                    await self.set_work(worker)
+                continue
+
+            index = slot_work[column]
+            if index == worker_work[row]:
+                continue
+
+            new_work = self.resolve_work_target(self.work_queue[index].unit)
+            if new_work:
+                self.assign_to_work(worker, new_work)
+
+    def gas_slots(self) -> Dict[int, int]:
+        """Splits gas worker target to gas buildings, buildings that already have workers are filled first."""
+        remaining = self.gas_workers_target
+        gas_statuses = [
+            status
+            for status in self.work_queue
+            if status.unit.has_vespene and not status.force_exit and status.target > 0
+        ]
+        gas_statuses.sort(key=lambda s: len(self.worker_dict.get(s.unit.tag, [])), reverse=True)
+
+        slots: Dict[int, int] = {}
+        for status in gas_statuses:
+            count = min(status.target, remaining)
+            slots[status.unit.tag] = count
+            remaining -= count
+        return slots
+
+    def idle_workers(self) -> List[Unit]:
+        workers = []
+        for worker in (
+            self.roles.all_from_task(UnitTask.Idle).of_type(UnitValue.worker_types)
+            + self.roles.all_from_task(UnitTask.Gathering).idle
+        ):  # type: Unit
+            if not self.leave_builders_alone or not worker.is_using_ability(UnitValue.build_abilities):
+                workers.append(worker)
+        return workers
+
     @property
     def active_gas_buildings(self) -> Units:
         """All gas buildings that are ready."""
@@ -235,14 +372,20 @@ class DistributeWorkers(ActBase):
                 harvesters = min(building.assigned_harvesters, current_workers + 1)
                 self.active_gas_workers += harvesters
                 if building.is_ready:
-                    self.work_queue.append(WorkStatus(building, building.ideal_harvesters - harvesters))
+                    self.work_queue.append(
+                        WorkStatus(building, building.ideal_harvesters - harvesters, target=building.ideal_harvesters)
+                    )
                 else:
-                    self.work_queue.append(WorkStatus(building, 1 - current_workers))
+                    self.work_queue.append(WorkStatus(building, 1 - current_workers, target=1))
             else:
                 if building.is_ready:
-                    self.work_queue.append(WorkStatus(building, building.ideal_harvesters - current_workers))
+                    self.work_queue.append(
+                        WorkStatus(
+                            building, building.ideal_harvesters - current_workers, target=building.ideal_harvesters
+                        )
+                    )
                 else:
-                    self.work_queue.append(WorkStatus(building, 8 - current_workers))
+                    self.work_queue.append(WorkStatus(building, 8 - current_workers, target=8))
 
         if self.active_gas_workers < self.gas_workers_target:
 
@@ -282,11 +425,7 @@ class DistributeWorkers(ActBase):
             self.print(f"No work to assign worker {worker.tag} to.")
             return True
 
-        if new_work.type_id in buildings_5x5:
-            for zone in self.zone_manager.expansion_zones:  # type: Zone
-                if zone.center_location.distance_to(new_work.position) < 1:
-                    new_work = zone.check_best_mineral_field()
-                    break
+        new_work = self.resolve_work_target(new_work)
 
         if new_work:
             self.print(f"New work found, gathering {new_work.type_id} {new_work.tag}!")
@@ -294,6 +433,14 @@ class DistributeWorkers(ActBase):
 
         return True  # Always non-blocking
 
+    def resolve_work_target(self, work: Unit) -> Optional[Unit]:
+        """Returns the mineral field to gather when work is a townhall."""
+        if work.type_id in buildings_5x5:
+            for zone in self.zone_manager.expansion_zones:  # type: Zone
+                if zone.center_location.distance_to(work.position) < 1:
+                    return zone.check_best_mineral_field()
+        return work
+
     def get_new_work(self, worker: Unit, last_work_status: Optional[WorkStatus] = None) -> Optional[Unit]:
         new_work: Optional[WorkStatus] = None
 
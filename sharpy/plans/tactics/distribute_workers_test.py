@@ -3,6 +3,7 @@ import sys
 from random import randint
 from typing import Optional, Union, List
 
+import numpy as np
 import pytest
 from unittest import mock
 
@@ -12,7 +13,7 @@ from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.constants import ALL_GAS, mineral_ids, IS_STRUCTURE, IS_MINE
 from sc2.game_data import AbilityData
-from sc2.position import Point2
+from sc2.position import Point2, Rect, Size
 from sc2.unit import Unit
 
 from .distribute_workers import DistributeWorkers
@@ -66,7 +67,7 @@ def mock_ai() -> BotAI:
     ai.state.effects = []
     ai.state.visibility.__getitem__ = lambda s, x: 2
 
-    ai.client = mock.Mock()
+    ai.client = mock.Mock(game_step=2)
     ai.game_info = mock.Mock()
     ai.game_info.player_start_location = MAIN_POINT
     ai.game_info.start_locations = [ENEMY_MAIN_POINT]
@@ -75,7 +76,9 @@ def mock_ai() -> BotAI:
     ai.game_info.map_center = Point2((50, 50))
     ai.game_info.map_name = "Mock"
     ai.game_info.terrain_height.__getitem__ = lambda s, x: 0
-    ai.game_info.terrain_height.data_numpy = [0]
+    ai.game_info.terrain_height.data_numpy = np.zeros((100, 100), dtype=np.uint8)
+    ai.game_info.map_size = Size((100, 100))
+    ai.game_info.playable_area = Rect((0, 0, 100, 100))
     ai.game_info.map_ramps = []
 
     ai.game_data = mock.Mock()
@@ -109,7 +112,10 @@ def mock_ai() -> BotAI:
     mineral2 = create_mineral(ai, Point2((16, 60)))
 
     ai._expansion_positions_list = [MAIN_POINT, NATURAL_POINT, ENEMY_MAIN_POINT, ENEMY_NATURAL_POINT]
-    ai._resource_location_to_expansion_position_dict = {mineral.position: MAIN_POINT, mineral2.position: NATURAL_POINT}
+    ai._resource_location_to_expansion_position_dict = {
+        mineral.position: {MAIN_POINT},
+        mineral2.position: {NATURAL_POINT},
+    }
 
     return ai
 
@@ -619,3 +625,138 @@ class TestDistributeWorkers:
         await distribute_workers.start(knowledge)
         await distribute_workers.execute()
         assert len(ai.actions) == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_only_orders_changed_workers(self):
+        distribute_workers = DistributeWorkers(min_gas=0, max_gas=0, batch=True)
+        ai = mock_ai()
+
+        nexus1 = mock_unit(ai, UnitTypeId.NEXUS, Point2(MAIN_POINT))
+        nexus1._proto.assigned_harvesters = 17
+
+        nexus2 = mock_unit(ai, UnitTypeId.NEXUS, Point2(NATURAL_POINT))
+        nexus2._proto.assigned_harvesters = 14
+
+        for i in range(0, 17):
+            worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 10)))
+            set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[0].tag)
+
+        for i in range(0, 14):
+            worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 60)))
+            set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[1].tag)
+
+        idle_worker = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 55)))
+
+        knowledge = await mock_knowledge(ai)
+
+        for worker in ai.workers:
+            knowledge.roles.set_task(UnitTask.Gathering, worker)
+        knowledge.roles.set_task(UnitTask.Idle, idle_worker)
+
+        await distribute_workers.start(knowledge)
+        await distribute_workers.execute()
+
+        assert len(ai.actions) == 2
+        assert {action.target.tag for action in ai.actions} == {ai.mineral_field[1].tag}
+        assert idle_worker.tag in {action.unit.tag for action in ai.actions}
+
+    @pytest.mark.asyncio
+    async def test_batch_evacuate_zone_nexus(self):
+        distribute_workers = DistributeWorkers(min_gas=0, max_gas=0, batch=True)
+        ai = mock_ai()
+
+        nexus1 = mock_unit(ai, UnitTypeId.NEXUS, Point2(MAIN_POINT))
+        nexus1._proto.assigned_harvesters = 1
+
+        nexus2 = mock_unit(ai, UnitTypeId.NEXUS, Point2(NATURAL_POINT))
+        nexus2._proto.assigned_harvesters = 14
+
+        for i in range(0, 14):
+            worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 60)))
+            set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[1].tag)
+
+        worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 10)))
+        set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[0].tag)
+
+        knowledge = await mock_knowledge(ai)
+        for worker in ai.workers:
+            knowledge.roles.set_task(UnitTask.Gathering, worker)
+
+        knowledge.zone_manager.expansion_zones[0].needs_evacuation = True
+        await distribute_workers.start(knowledge)
+        await distribute_workers.execute()
+        assert len(ai.actions) == 1
+        assert ai.actions[0].unit.tag == worker1.tag
+        assert ai.actions[0].target.tag == ai.mineral_field[1].tag
+
+    @pytest.mark.asyncio
+    async def test_batch_leave_depleted_nexus(self):
+        distribute_workers = DistributeWorkers(min_gas=0, max_gas=0, batch=True)
+        ai = mock_ai()
+
+        nexus1 = mock_unit(ai, UnitTypeId.NEXUS, Point2(MAIN_POINT))
+        nexus1._proto.assigned_harvesters = 1
+        nexus1._proto.ideal_harvesters = 0
+
+        mock_unit(ai, UnitTypeId.NEXUS, Point2(NATURAL_POINT))
+
+        worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 10)))
+        set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[0].tag)
+
+        knowledge = await mock_knowledge(ai)
+        knowledge.roles.set_task(UnitTask.Gathering, worker1)
+
+        await distribute_workers.start(knowledge)
+        await distribute_workers.execute()
+        assert len(ai.actions) == 1
+        assert ai.actions[0].unit.tag == worker1.tag
+        assert ai.actions[0].target.tag == ai.mineral_field[1].tag
+
+    @pytest.mark.asyncio
+    async def test_batch_force_assign_to_gas(self):
+        distribute_workers = DistributeWorkers(aggressive_gas_fill=True, batch=True)
+        ai = mock_ai()
+
+        nexus1 = mock_unit(ai, UnitTypeId.NEXUS, Point2(MAIN_POINT))
+        nexus1._proto.assigned_harvesters = 14
+
+        gas = mock_unit(ai, UnitTypeId.ASSIMILATOR, Point2(MAIN_POINT))
+
+        for i in range(0, 14):
+            worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 10)))
+            set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[0].tag)
+
+        knowledge = await mock_knowledge(ai)
+
+        for worker in ai.workers:
+            knowledge.roles.set_task(UnitTask.Gathering, worker)
+
+        await distribute_workers.start(knowledge)
+        await distribute_workers.execute()
+
+        assert len(ai.actions) == 3
+        assert {action.target.tag for action in ai.actions} == {gas.tag}
+
+    @pytest.mark.asyncio
+    async def test_batch_no_force_assign_to_gas(self):
+        distribute_workers = DistributeWorkers(aggressive_gas_fill=False, batch=True)
+        ai = mock_ai()
+
+        nexus1 = mock_unit(ai, UnitTypeId.NEXUS, Point2(MAIN_POINT))
+        nexus1._proto.assigned_harvesters = 14
+
+        mock_unit(ai, UnitTypeId.ASSIMILATOR, Point2(MAIN_POINT))
+
+        for i in range(0, 14):
+            worker1 = mock_unit(ai, UnitTypeId.PROBE, Point2((20, 10)))
+            set_fake_order(worker1, AbilityId.HARVEST_GATHER, ai.mineral_field[0].tag)
+
+        knowledge = await mock_knowledge(ai)
+
+        for worker in ai.workers:
+            knowledge.roles.set_task(UnitTask.Gathering, worker)
+
+        await distribute_workers.start(knowledge)
+        await distribute_workers.execute()
+
+        assert len(ai.actions) == 0
@@ -1,4 +1,8 @@
-from typing import List, Dict
+import json
+import os
+from typing import List, Dict, Tuple
+
+import numpy as np
 
 from sc2.ids.ability_id import AbilityId
 from sc2.position import Point2
@@ -10,70 +14,124 @@ from sharpy.plans.acts import ActBase
 from sharpy.sc2math import get_intersections
 
 MINING_RADIUS = 1.325
+TOWNHALL_RADIUS = 2.75
+WORKER_RADIUS = 0.375
+# Workers are moved manually when they are this close to their waypoint
+MIN_MOVE_DISTANCE = 0.75
+MAX_MOVE_DISTANCE = 2
+CACHE_FOLDER = os.path.join("data", "speed_mining")
+
+
+class MiningWaypoints:
+    """Precomputed speed mining waypoints for a single mineral field."""
+
+    __slots__ = ("gather", "center", "return_point")
+
+    def __init__(self, gather: Point2, center: Point2, return_point: Point2):
+        # Where to release the gather command when moving to the mineral field
+        self.gather = gather
+        # Expansion location that the mineral field belongs to
+        self.center = center
+        # Where to release the return command when moving to the townhall
+        self.return_point = return_point
 
 
 class SpeedMining(ActBase):
-    """Make worker mine faster perhaps?"""
+    """
+    Make worker mine faster perhaps?
+
+    Waypoints are precomputed for every mineral field on start and cached per map in data/speed_mining.
+    The cache is only written when the write_data setting is on.
+    On each step worker distances to their waypoints are checked together and workers are only given commands
+    when they reach their waypoint.
+    """
 
-    def __init__(self, enable_on_return=True, enable_on_mine=True) -> None:
+    def __init__(self, enable_on_return=True, enable_on_mine=True, use_cache=True) -> None:
         super().__init__()
         self.enable_on_return = enable_on_return
         self.enable_on_mine = enable_on_mine
+        self.use_cache = use_cache
         self.mineral_target_dict: Dict[Point2, Point2] = {}
+        self.waypoints: Dict[Point2, MiningWaypoints] = {}
+        # Worker tag to position of the mineral field that the worker is mining
+        self.worker_minerals: Dict[int, Point2] = {}
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
-        self.calculate_targets()
+        if not self.use_cache or not self.load_targets():
+            self.calculate_targets()
+            if self.use_cache and self.knowledge.get_boolean_setting("general.write_data"):
+                self.save_targets()
 
     async def execute(self) -> bool:
         if len(self.ai.townhalls) < 1 or (not self.enable_on_return and not self.enable_on_mine):
             return True
-        workers = self.get_mineral_workers()
-        self.speedmine(workers)
+        self.speedmine(self.roles.units(UnitTask.Gathering))
         return True
 
-    def get_mineral_workers(self) -> Units:
-        def miner_filter(unit: Unit) -> bool:
-            if unit.is_carrying_vespene:
-                return False
-            if unit.order_target is not None and isinstance(unit.order_target, int):
-                target_unit = self.cache.by_tag(unit.order_target)
-                if target_unit is not None and target_unit.has_vespene:
-                    return False
-            return True
-
-        units = self.roles.all_from_task(UnitTask.Gathering).filter(miner_filter)
-
-        return units
-
     def speedmine(self, workers: Units):
-        for worker in workers:
-            self.speedmine_single(worker)
+        worker_minerals: Dict[int, Point2] = {}
+        self._speedmine(workers, self.worker_minerals, worker_minerals)
+        self.worker_minerals = worker_minerals
 
     def speedmine_single(self, worker: Unit):
-        townhall = self.ai.townhalls.closest_to(worker)
-
-        if self.enable_on_return and worker.is_returning and len(worker.orders) == 1:
-            target: Point2 = townhall.position
-            target = target.towards(worker, townhall.radius + worker.radius)
-            if 0.75 < worker.distance_to(target) < 2:
-                worker.move(target)
-                worker(AbilityId.SMART, townhall, True)
-                return
-
-        if (
-            self.enable_on_mine
-            and not worker.is_returning
-            and len(worker.orders) == 1
-            and isinstance(worker.order_target, int)
-        ):
-            mf = self.cache.by_tag(worker.order_target)
-            if mf is not None and mf.is_mineral_field:
-
-                target = self.mineral_target_dict.get(mf.position)
-                if target and 0.75 < worker.distance_to(target) < 2:
-                    worker.move(target)
-                    worker(AbilityId.SMART, mf, True)
+        previous = self.worker_minerals.pop(worker.tag, None)
+        previous_minerals = {} if previous is None else {worker.tag: previous}
+        self._speedmine(Units([worker], self.ai), previous_minerals, self.worker_minerals)
+
+    def _speedmine(self, workers: Units, previous_minerals: Dict[int, Point2], worker_minerals: Dict[int, Point2]):
+        """
+        Gives commands to the workers that reached their waypoint.
+
+        @param previous_minerals: Mineral field positions of the workers on the previous step
+        @param worker_minerals: Mineral field positions of the workers are set to this
+        """
+        townhalls: Dict[Point2, Unit] = {townhall.position: townhall for townhall in self.ai.townhalls.ready}
+        movers: List[Unit] = []
+        points: List[Point2] = []
+        targets: List[Unit] = []
+
+        for worker in workers:
+            if len(worker.orders) != 1:
+                # Worker has already been given its waypoint
+                if worker.tag in previous_minerals:
+                    worker_minerals[worker.tag] = previous_minerals[worker.tag]
+                continue
+
+            if worker.is_returning:
+                mineral_position = previous_minerals.get(worker.tag, None)
+                if mineral_position is None or not worker.is_carrying_minerals:
+                    continue
+                worker_minerals[worker.tag] = mineral_position
+                waypoints = self.waypoints.get(mineral_position, None)
+                townhall = townhalls.get(waypoints.center, None) if waypoints else None
+                if self.enable_on_return and townhall is not None:
+                    movers.append(worker)
+                    points.append(waypoints.return_point)
+                    targets.append(townhall)
+
+            elif isinstance(worker.order_target, int):
+                mf = self.cache.by_tag(worker.order_target)
+                if mf is None or not mf.is_mineral_field:
+                    continue
+                worker_minerals[worker.tag] = mf.position
+                waypoints = self.waypoints.get(mf.position, None)
+                if self.enable_on_mine and waypoints is not None:
+                    movers.append(worker)
+                    points.append(waypoints.gather)
+                    targets.append(mf)
+
+        if not movers:
+            return
+
+        positions = np.array([worker.position for worker in movers])
+        distances = np.linalg.norm(positions - np.array(points), axis=1)
+        in_range = np.flatnonzero((distances > MIN_MOVE_DISTANCE) & (distances < MAX_MOVE_DISTANCE))
+
+        for index in in_range:
+            worker = movers[index]
+            worker.move(points[index])
+            worker(AbilityId.SMART, targets[index], True)
 
     def calculate_targets(self):
         zone_manager = self.knowledge.get_required_manager(IZoneManager)
@@ -94,3 +152,49 @@ class SpeedMining(ActBase):
                     if len(points) == 2:
                         target = center.closest(points)
             self.mineral_target_dict[mf.position] = target
+            return_point = center.towards(target, TOWNHALL_RADIUS + WORKER_RADIUS)
+            self.waypoints[mf.position] = MiningWaypoints(target, center, return_point)
+
+    @property
+    def cache_file(self) -> str:
+        map_name = "".join(c if c.isalnum() else "_" for c in self.ai.game_info.map_name)
+        return os.path.join(CACHE_FOLDER, map_name + ".json")
+
+    def load_targets(self) -> bool:
+        """Loads waypoints from the map cache. Returns False if there is no valid cache for the current map."""
+        if not os.path.isfile(self.cache_file):
+            return False
+
+        try:
+            with open(self.cache_file, "r") as handle:
+                rows: List[List[float]] = json.load(handle)
+        except Exception as e:
+            self.print(f"Speed mining cache read failed: {e}")
+            return False
+
+        waypoints: Dict[Point2, MiningWaypoints] = {}
+        for row in rows:
+            waypoints[Point2((row[0], row[1]))] = MiningWaypoints(
+                Point2((row[2], row[3])), Point2((row[4], row[5])), Point2((row[6], row[7]))
+            )
+
+        if set(waypoints.keys()) != {mf.position for mf in self.ai.mineral_field}:
+            # Different version of the map
+            return False
+
+        self.waypoints = waypoints
+        self.mineral_target_dict = {position: waypoint.gather for position, waypoint in waypoints.items()}
+        return True
+
+    def save_targets(self):
+        rows: List[Tuple[float, ...]] = []
+        for position, waypoint in self.waypoints.items():
+            rows.append((*position, *waypoint.gather, *waypoint.center, *waypoint.return_point))
+
+        try:
+            if not os.path.exists(CACHE_FOLDER):
+                os.makedirs(CACHE_FOLDER)
+            with open(self.cache_file, "w") as handle:
+                json.dump(rows, handle)
+        except Exception as e:
+            self.print(f"Speed mining cache write failed: {e}")
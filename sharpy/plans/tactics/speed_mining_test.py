@@ -0,0 +1,100 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from sc2.position import Point2
+
+from sharpy.plans.tactics import speed_mining
+from sharpy.plans.tactics.speed_mining import MiningWaypoints, SpeedMining
+
+MINERALS = [Point2((10.5, 20)), Point2((11.5, 21)), Point2((30.5, 40))]
+
+
+def create_speed_mining(minerals=MINERALS) -> SpeedMining:
+    act = SpeedMining()
+    act.ai = mock.Mock()
+    act.ai.game_info.map_name = "Test Map LE"
+    act.ai.mineral_field = [mock.Mock(position=position) for position in minerals]
+    act.knowledge = mock.Mock()
+    for position in minerals:
+        act.waypoints[position] = MiningWaypoints(
+            position.offset(Point2((1, 1))), Point2((15.5, 25.5)), Point2((14.5, 24.5))
+        )
+    return act
+
+
+class TestSpeedMining:
+    def test_saved_targets_are_loaded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(speed_mining, "CACHE_FOLDER", str(tmp_path / "speed_mining"))
+        saved = create_speed_mining()
+        saved.save_targets()
+
+        assert os.path.isfile(os.path.join(tmp_path, "speed_mining", "Test_Map_LE.json"))
+
+        loaded = create_speed_mining()
+        loaded.waypoints = {}
+
+        assert loaded.load_targets()
+        assert set(loaded.waypoints) == set(MINERALS)
+        for position, waypoint in saved.waypoints.items():
+            assert loaded.waypoints[position].gather == waypoint.gather
+            assert loaded.waypoints[position].center == waypoint.center
+            assert loaded.waypoints[position].return_point == waypoint.return_point
+        assert loaded.mineral_target_dict == {position: position.offset(Point2((1, 1))) for position in MINERALS}
+
+    def test_targets_of_different_mineral_fields_are_not_loaded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(speed_mining, "CACHE_FOLDER", str(tmp_path))
+        create_speed_mining().save_targets()
+
+        loaded = create_speed_mining(MINERALS[:2])
+        loaded.waypoints = {}
+
+        assert not loaded.load_targets()
+        assert loaded.waypoints == {}
+
+    def test_missing_or_broken_cache_is_not_loaded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(speed_mining, "CACHE_FOLDER", str(tmp_path))
+        act = create_speed_mining()
+
+        assert not act.load_targets()
+
+        with open(act.cache_file, "w") as handle:
+            handle.write("[[1, 2")
+
+        assert not act.load_targets()
+
+        with open(act.cache_file, "w") as handle:
+            json.dump([], handle)
+
+        assert not act.load_targets()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write_data", [True, False])
+    async def test_targets_are_saved_only_with_write_data(self, tmp_path, monkeypatch, write_data):
+        monkeypatch.setattr(speed_mining, "CACHE_FOLDER", str(tmp_path / "speed_mining"))
+        act = create_speed_mining()
+        act.calculate_targets = mock.Mock()
+        knowledge = mock.Mock()
+        knowledge.ai = act.ai
+        knowledge.get_boolean_setting = lambda key: write_data if key == "general.write_data" else False
+
+        await act.start(knowledge)
+
+        act.calculate_targets.assert_called_once()
+        assert os.path.exists(act.cache_file) == write_data
+
+    def test_speedmine_single_keeps_other_workers(self):
+        act = create_speed_mining()
+        townhall = mock.Mock(position=Point2((15.5, 25.5)))
+        act.ai.townhalls.ready = [townhall]
+        act.worker_minerals = {1: MINERALS[0], 2: MINERALS[2]}
+        worker = mock.Mock(
+            tag=2, orders=[mock.Mock()], is_returning=True, is_carrying_minerals=True, position=Point2((13.5, 23.5))
+        )
+
+        act.speedmine_single(worker)
+
+        assert act.worker_minerals == {1: MINERALS[0], 2: MINERALS[2]}
+        worker.move.assert_called_once_with(Point2((14.5, 24.5)))
@@ -0,0 +1,2 @@
+from .sim_data import SimGameData
+from .build_simulator import BuildSimulator, SimulationResult, TimelineEntry, sweep
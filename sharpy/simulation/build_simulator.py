@@ -0,0 +1,836 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time as timer
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import ceil
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from sc2.constants import EQUIVALENTS_FOR_TECH_PROGRESS
+from sc2.data import Race
+from sc2.dicts.upgrade_researched_from import UPGRADE_RESEARCHED_FROM
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+from sharpy.plans import BuildOrder, IfElse, SequentialList, Step
+from sharpy.plans.acts import (
+    ActBase,
+    ActBuilding,
+    ActUnit,
+    AutoWorker,
+    BuildGas,
+    BuildPosition,
+    Expand,
+    Tech,
+    Workers,
+)
+from sharpy.plans.acts.morph_building import MorphBuilding
+from sharpy.plans.acts.protoss import AutoPylon
+from sharpy.plans.acts.terran import AutoDepot, BuildAddon
+from sharpy.plans.acts.zerg import AutoOverLord, ZergUnit
+from sharpy.plans.acts.zerg.morph_units import MorphUnit
+from sharpy.plans.require.require_base import RequireBase
+from sharpy.simulation.sim_data import PAIRED_UNITS, SimGameData, default_game_data
+from sharpy.simulation.sim_state import SimAi, SimKnowledge, SimUnit
+
+# Approximate harvest rates on faster game speed, per worker per second
+MINERAL_RATE = 0.92
+THIRD_WORKER_MINERAL_RATE = 0.38
+GAS_RATE = 0.89
+WORKERS_PER_BASE = 16
+THIRD_WORKERS_PER_BASE = 8
+WORKERS_PER_GAS = 3
+GAS_PER_BASE = 2
+
+LARVA_INTERVAL = 11
+MAX_LARVA = 3
+MAX_SUPPLY = 200
+# Protoss workers only warp in the structure, but they still need to walk to the build site
+PROBE_BUILD_TIME = 4
+
+START_WORKERS = 12
+START_MINERALS = 50
+
+WORKER_TYPES = {Race.Terran: UnitTypeId.SCV, Race.Protoss: UnitTypeId.PROBE, Race.Zerg: UnitTypeId.DRONE}
+TOWNHALL_TYPES = {
+    Race.Terran: UnitTypeId.COMMANDCENTER,
+    Race.Protoss: UnitTypeId.NEXUS,
+    Race.Zerg: UnitTypeId.HATCHERY,
+}
+GAS_TYPES = {Race.Terran: UnitTypeId.REFINERY, Race.Protoss: UnitTypeId.ASSIMILATOR, Race.Zerg: UnitTypeId.EXTRACTOR}
+ALL_GAS = {
+    UnitTypeId.REFINERY,
+    UnitTypeId.REFINERYRICH,
+    UnitTypeId.ASSIMILATOR,
+    UnitTypeId.ASSIMILATORRICH,
+    UnitTypeId.EXTRACTOR,
+    UnitTypeId.EXTRACTORRICH,
+}
+HATCHERY_TYPES = {UnitTypeId.HATCHERY, UnitTypeId.LAIR, UnitTypeId.HIVE}
+SUPPLY_TYPES = {Race.Terran: UnitTypeId.SUPPLYDEPOT, Race.Protoss: UnitTypeId.PYLON, Race.Zerg: UnitTypeId.OVERLORD}
+
+# Structures that can produce in place of the requested producer, same as in ActUnit.builders
+PRODUCER_EQUIVALENTS = {
+    UnitTypeId.COMMANDCENTER: {UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND, UnitTypeId.PLANETARYFORTRESS},
+    UnitTypeId.HATCHERY: HATCHERY_TYPES,
+    UnitTypeId.GATEWAY: {UnitTypeId.GATEWAY, UnitTypeId.WARPGATE},
+}
+
+# Supply growth per second for each ready production structure, same values as AutoDepot and AutoPylon use
+SUPPLY_GROWTH = {
+    UnitTypeId.COMMANDCENTER: 1 / 12.0,
+    UnitTypeId.ORBITALCOMMAND: 1 / 12.0,
+    UnitTypeId.PLANETARYFORTRESS: 1 / 12.0,
+    UnitTypeId.NEXUS: 1 / 12.0,
+    UnitTypeId.BARRACKS: 2 / 21.0,
+    UnitTypeId.BARRACKSREACTOR: 2 / 21.0,
+    UnitTypeId.FACTORY: 2 / 21.0,
+    UnitTypeId.FACTORYREACTOR: 2 / 21.0,
+    UnitTypeId.STARPORT: 2 / 30.0,
+    UnitTypeId.STARPORTREACTOR: 2 / 30.0,
+    UnitTypeId.GATEWAY: 2 / 20.0,
+    UnitTypeId.WARPGATE: 2 / 20.0,
+    UnitTypeId.ROBOTICSFACILITY: 4 / 39.0,
+    UnitTypeId.STARGATE: 5 / 43.0,
+}
+
+
+class TimelineEntry(NamedTuple):
+    time: float
+    key: str
+    item: Union[UnitTypeId, UpgradeId]
+
+
+class SimulationResult:
+    """Outcome of a single simulated build order."""
+
+    def __init__(
+        self,
+        duration: float,
+        timeline: List[TimelineEntry],
+        unsupported: Set[str],
+        unit_counts: Dict[UnitTypeId, int],
+        upgrades: Set[UpgradeId],
+        minerals: int,
+        vespene: int,
+        supply_used: float,
+        supply_cap: float,
+        wall_time: float,
+    ):
+        self.duration = duration
+        self.timeline = timeline
+        # Type names of acts and requirements that the simulator could not evaluate
+        self.unsupported = unsupported
+        self.unit_counts = unit_counts
+        self.upgrades = upgrades
+        self.minerals = minerals
+        self.vespene = vespene
+        self.supply_used = supply_used
+        self.supply_cap = supply_cap
+        self.wall_time = wall_time
+
+    def started(self, item: Union[UnitTypeId, UpgradeId], nth: int = 1) -> Optional[float]:
+        """Returns the time when production of the nth item was started or None if it never was."""
+        count = 0
+        for entry in self.timeline:
+            if entry.item == item:
+                count += 1
+                if count >= nth:
+                    return entry.time
+        return None
+
+    def __repr__(self) -> str:
+        lines = [f"{entry.time:6.1f} {entry.item.name} ({entry.key})" for entry in self.timeline]
+        return "\n".join(lines)
+
+
+class BuildSimulator:
+    """
+    Fast forwards a build order without the game by running its requirements against a simplified economy
+    model and interpreting the production acts. Meant for comparing timings of build order variants offline.
+
+    Requirements are real instances that are checked against simulated state, acts are interpreted by type.
+    Acts that the simulator does not know are treated as complete and reported in `SimulationResult.unsupported`.
+    Mules, chrono boost, queen injects, mineral depletion and unit travel times are not modelled.
+    """
+
+    def __init__(
+        self,
+        race: Race,
+        enemy_race: Race = Race.Random,
+        step_time: float = 1.0,
+        enemy_units: Optional[Dict[UnitTypeId, int]] = None,
+        data: Optional[SimGameData] = None,
+    ):
+        assert race in WORKER_TYPES
+        assert step_time > 0
+        self.race = race
+        self.enemy_race = enemy_race
+        self.step_time = step_time
+        self.enemy_units = enemy_units
+        self.data = data if data is not None else default_game_data()
+
+        self.worker_type = WORKER_TYPES[race]
+        self.townhall_type = TOWNHALL_TYPES[race]
+        self.gas_type = GAS_TYPES[race]
+
+        self._dispatch: Dict[type, Callable[[ActBase, str], bool]] = {}
+        self._handlers: List[Tuple[type, Callable[[ActBase, str], bool]]] = [
+            (Step, self._step),
+            (IfElse, self._if_else),
+            (RequireBase, self._require),
+            (AutoOverLord, self._auto_supply),
+            (ZergUnit, self._zerg_unit),
+            (BuildOrder, self._build_order),
+            (SequentialList, self._sequential_list),
+            (AutoWorker, self._auto_worker),
+            (Workers, self._workers),
+            (AutoDepot, self._auto_supply),
+            (AutoPylon, self._auto_supply),
+            (ActUnit, self._act_unit),
+            (BuildGas, self._build_gas),
+            (Expand, self._expand),
+            (ActBuilding, self._act_building),
+            (BuildPosition, self._build_position),
+            (Tech, self._tech),
+            (MorphBuilding, self._morph_building),
+            (MorphUnit, self._morph_unit),
+            (BuildAddon, self._build_addon),
+        ]
+
+    def run(self, plan: ActBase, duration: float) -> SimulationResult:
+        """
+        Simulates the plan from game start until duration game seconds have passed.
+        Plans keep internal state, so a new plan instance should be used for each run.
+        """
+        started = timer.perf_counter()
+        self._reset()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._start(plan, "0"))
+        finally:
+            loop.close()
+
+        while self.time <= duration:
+            self._update_ai()
+            self._execute(plan, "0")
+            self._advance(self.step_time)
+
+        unit_counts: Dict[UnitTypeId, int] = {}
+        for unit in self.units:
+            if unit.is_ready:
+                unit_counts[unit.type_id] = unit_counts.get(unit.type_id, 0) + 1
+
+        return SimulationResult(
+            duration,
+            self.timeline,
+            self.unsupported,
+            unit_counts,
+            set(self.ai.state.upgrades),
+            int(self.minerals),
+            int(self.vespene),
+            self.supply_used,
+            self.ai.supply_cap,
+            timer.perf_counter() - started,
+        )
+
+    # region State
+
+    def _reset(self):
+        self.ai = SimAi(self.race, self.enemy_race)
+        self.knowledge = SimKnowledge(self.ai, self.enemy_units)
+        self.time = 0.0
+        self.minerals = float(START_MINERALS)
+        self.vespene = 0.0
+        self.supply_used = 0.0
+        self.reserved_minerals = 0.0
+        self.reserved_vespene = 0.0
+        self.units: List[SimUnit] = []
+        self.pending: Dict[UnitTypeId, float] = {}
+        self.research_started: Dict[UpgradeId, Tuple[float, float]] = {}
+        self.timeline: List[TimelineEntry] = []
+        self.unsupported: Set[str] = set()
+        self._ready_types: Set[UnitTypeId] = set()
+        self._events: List[tuple] = []
+        self._sequence = itertools.count()
+        self._tags = itertools.count(1)
+        self._next_larva: Dict[int, float] = {}
+
+        townhall = self._add_unit(self.townhall_type, 0)
+        if self.race == Race.Zerg:
+            townhall.larva = MAX_LARVA
+            self._add_unit(UnitTypeId.OVERLORD, 0)
+        for _ in range(START_WORKERS):
+            self._add_unit(self.worker_type, 0)
+        self.supply_used = START_WORKERS
+        self.ai.pending = self.pending
+
+    def _add_unit(self, type_id: UnitTypeId, build_time: float) -> SimUnit:
+        unit = SimUnit(next(self._tags), type_id, self.time, build_time)
+        self.units.append(unit)
+        return unit
+
+    def _schedule(self, end_time: float, callback: Callable, *args):
+        heapq.heappush(self._events, (end_time, next(self._sequence), callback, args))
+
+    def _update_ai(self):
+        self.reserved_minerals = 0
+        self.reserved_vespene = 0
+        ai = self.ai
+        ai.time = self.time
+        ai.minerals = int(self.minerals)
+        ai.vespene = int(self.vespene)
+        ai.supply_used = self.supply_used
+
+        supply_cap = 0.0
+        self._ready_types.clear()
+        workers = 0
+        visible_units = list(self.units)
+        for unit in self.units:
+            if unit.is_ready:
+                self._ready_types.add(unit.type_id)
+                supply_cap += self.data.units[unit.type_id].supply_provided
+            if unit.type_id == self.worker_type:
+                workers += 1
+            for _ in range(unit.larva):
+                visible_units.append(SimUnit(0, UnitTypeId.LARVA, self.time, 0))
+
+        ai.supply_cap = min(MAX_SUPPLY, supply_cap)
+        ai.supply_workers = workers + self.pending.get(self.worker_type, 0)
+
+        for upgrade, (start_time, research_time) in self.research_started.items():
+            ai.upgrade_progress[upgrade] = min(1, (self.time - start_time) / research_time)
+
+        self.knowledge.unit_cache.update(visible_units)
+        self.knowledge.iteration += 1
+
+    def _advance(self, step_time: float):
+        self._gather(step_time)
+        self.time += step_time
+
+        while self._events and self._events[0][0] <= self.time:
+            _, _, callback, args = heapq.heappop(self._events)
+            callback(*args)
+
+        for unit in self.units:
+            if unit.busy_until:
+                unit.busy_until = [end for end in unit.busy_until if end > self.time]
+            if not unit.is_ready:
+                unit.build_progress = min(0.99, (self.time - unit.start_time) / unit.build_time)
+            elif unit.type_id in HATCHERY_TYPES:
+                self._spawn_larva(unit)
+
+    def _spawn_larva(self, hatchery: SimUnit):
+        if hatchery.larva >= MAX_LARVA:
+            self._next_larva[hatchery.tag] = self.time + LARVA_INTERVAL
+        elif self._next_larva.setdefault(hatchery.tag, self.time + LARVA_INTERVAL) <= self.time:
+            hatchery.larva += 1
+            self._next_larva[hatchery.tag] = self.time + LARVA_INTERVAL
+
+    def _gather(self, step_time: float):
+        bases = 0
+        gas_buildings = 0
+        miners = 0
+        for unit in self.units:
+            if not unit.is_ready:
+                continue
+            if unit.type_id == self.worker_type:
+                if not unit.busy_until:
+                    miners += 1
+            elif self.data.units[unit.type_id].is_townhall:
+                bases += 1
+            elif unit.type_id in ALL_GAS:
+                gas_buildings += 1
+
+        gas_workers = min(miners, gas_buildings * WORKERS_PER_GAS)
+        mineral_workers = miners - gas_workers
+        first_workers = min(mineral_workers, bases * WORKERS_PER_BASE)
+        third_workers = min(mineral_workers - first_workers, bases * THIRD_WORKERS_PER_BASE)
+
+        self.minerals += (first_workers * MINERAL_RATE + third_workers * THIRD_WORKER_MINERAL_RATE) * step_time
+        self.vespene += gas_workers * GAS_RATE * step_time
+
+    def _own(self, types: Iterable[UnitTypeId]) -> List[SimUnit]:
+        types = set(types)
+        return [unit for unit in self.units if unit.type_id in types]
+
+    def _count(self, unit_type: UnitTypeId) -> float:
+        """Same as ActBase.get_count, ready and not ready units including pending and related types."""
+        count = self.pending.get(unit_type, 0)
+        related = EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, set())
+        for unit in self.units:
+            if unit.type_id == unit_type:
+                if unit.is_ready:
+                    count += 1
+            elif unit.type_id in related:
+                count += 1
+        return count
+
+    def _has_building(self, unit_type: Optional[UnitTypeId]) -> bool:
+        if unit_type is None or unit_type in self._ready_types:
+            return True
+        return not self._ready_types.isdisjoint(EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, ()))
+
+    def _meets(self, info: dict) -> bool:
+        if not self._has_building(info.get("required_building")):
+            return False
+        upgrade = info.get("required_upgrade")
+        if upgrade is not None and upgrade not in self.ai.state.upgrades:
+            return False
+        if info.get("requires_power") and UnitTypeId.PYLON not in self._ready_types:
+            return False
+        return True
+
+    def _can_afford(self, minerals: float, gas: float, supply: float = 0) -> bool:
+        if supply > 0 and self.supply_used + supply > self.ai.supply_cap:
+            return False
+        return self.minerals - self.reserved_minerals >= minerals and self.vespene - self.reserved_vespene >= gas
+
+    def _reserve(self, minerals: float, gas: float):
+        self.reserved_minerals += minerals
+        self.reserved_vespene += gas
+
+    def _pay(self, key: str, item: Union[UnitTypeId, UpgradeId], minerals: float, gas: float, supply: float = 0):
+        self.minerals -= minerals
+        self.vespene -= gas
+        self.supply_used += supply
+        self.timeline.append(TimelineEntry(self.time, key, item))
+
+    def _add_pending(self, unit_type: UnitTypeId, amount: float):
+        self.pending[unit_type] = self.pending.get(unit_type, 0) + amount
+
+    # endregion
+
+    # region Production
+
+    def _idle(self, unit: SimUnit) -> bool:
+        if not unit.is_ready:
+            return False
+        capacity = 2 if unit.addon_type is not None and unit.addon_type.name.endswith("REACTOR") else 1
+        return len(unit.busy_until) < capacity
+
+    def _train(self, key: str, unit_type: UnitTypeId, producer_type: UnitTypeId, priority: bool = False) -> bool:
+        """Starts training a single unit. Returns True if production was started."""
+        producer_types = PRODUCER_EQUIVALENTS.get(producer_type, {producer_type})
+        unit_data = self.data.units[unit_type]
+        minerals, gas = self.data.cost(unit_type, producer_type)
+        supply = self.data.supply_cost(unit_type, producer_type)
+        amount = 2 if unit_type in PAIRED_UNITS else 1
+
+        if producer_type == UnitTypeId.LARVA:
+            info = self.data.train_info(unit_type, UnitTypeId.LARVA)
+            producers = [unit for unit in self._own(HATCHERY_TYPES) if unit.larva > 0]
+        else:
+            info = self.data.train_info(unit_type, producer_type)
+            producers = [unit for unit in self._own(producer_types) if self._idle(unit)]
+
+        if not producers or not self._meets(info):
+            return False
+        if not self._can_afford(minerals, gas, supply):
+            if priority:
+                self._reserve(minerals, gas)
+            return False
+
+        producer = None
+        for candidate in producers:
+            if info.get("requires_techlab") and (
+                candidate.addon_type is None or not candidate.addon_type.name.endswith("TECHLAB")
+            ):
+                continue
+            producer = candidate
+            break
+
+        if producer is None:
+            return False
+
+        end_time = self.time + unit_data.build_time
+        self._pay(key, unit_type, minerals, gas, supply)
+        self._add_pending(unit_type, amount)
+
+        if producer_type == UnitTypeId.LARVA:
+            producer.larva -= 1
+        else:
+            producer.busy_until.append(end_time)
+
+        self._schedule(end_time, self._unit_ready, unit_type, amount)
+        return True
+
+    def _unit_ready(self, unit_type: UnitTypeId, amount: int):
+        self._add_pending(unit_type, -amount)
+        for _ in range(amount):
+            self._add_unit(unit_type, 0)
+
+    def _construct(self, key: str, unit_type: UnitTypeId, priority: bool = False) -> bool:
+        """Starts construction of a single structure with a worker. Returns True if construction was started."""
+        unit_data = self.data.units[unit_type]
+        info = self.data.train_info(unit_type, self.worker_type)
+        if not self._meets(info):
+            return False
+
+        minerals, gas = unit_data.minerals, unit_data.gas
+        if not self._can_afford(minerals, gas):
+            if priority:
+                self._reserve(minerals, gas)
+            return False
+
+        builder = next((unit for unit in self._own({self.worker_type}) if self._idle(unit)), None)
+        if builder is None:
+            return False
+
+        self._pay(key, unit_type, minerals, gas)
+        self._add_pending(unit_type, 1)
+        structure = self._add_unit(unit_type, unit_data.build_time)
+        end_time = self.time + unit_data.build_time
+
+        if self.race == Race.Zerg:
+            # Drone is consumed
+            self.units.remove(builder)
+            self.supply_used -= self.data.units[self.worker_type].supply
+        elif self.race == Race.Terran:
+            builder.busy_until.append(end_time)
+        else:
+            builder.busy_until.append(self.time + PROBE_BUILD_TIME)
+
+        self._schedule(end_time, self._structure_ready, structure)
+        return True
+
+    def _structure_ready(self, structure: SimUnit):
+        self._add_pending(structure.type_id, -1)
+        structure.build_progress = 1
+
+        if structure.type_id in HATCHERY_TYPES:
+            self._next_larva[structure.tag] = self.time + LARVA_INTERVAL
+
+    def _morph(self, key: str, producer: SimUnit, result_type: UnitTypeId, cocoon_type: Optional[UnitTypeId] = None):
+        minerals, gas = self.data.cost(result_type, producer.type_id)
+        supply = self.data.supply_cost(result_type, producer.type_id)
+        end_time = self.time + self.data.units[result_type].build_time
+        self._pay(key, result_type, minerals, gas, supply)
+        self._add_pending(result_type, 1)
+        producer.busy_until.append(end_time)
+        if cocoon_type is not None:
+            producer.type_id = cocoon_type
+        self._schedule(end_time, self._morph_ready, producer, result_type)
+
+    def _morph_ready(self, unit: SimUnit, result_type: UnitTypeId):
+        self._add_pending(result_type, -1)
+        unit.type_id = result_type
+
+    def _research(self, key: str, upgrade: UpgradeId) -> bool:
+        if upgrade in self.research_started or upgrade not in self.data.upgrades:
+            return False
+
+        building_type, info = self.data.researched_from.get(upgrade, (UPGRADE_RESEARCHED_FROM.get(upgrade), {}))
+        if building_type is None:
+            return False
+        if not self._meets(info):
+            return False
+
+        building_types = Tech.equivalent_structures.get(building_type, {building_type})
+        building = next((unit for unit in self._own(building_types) if self._idle(unit)), None)
+        if building is None:
+            return False
+
+        upgrade_data = self.data.upgrades[upgrade]
+        if not self._can_afford(upgrade_data.minerals, upgrade_data.gas):
+            # Same as Tech, cost is reserved only when there is a building waiting for the research
+            self._reserve(upgrade_data.minerals, upgrade_data.gas)
+            return False
+
+        end_time = self.time + upgrade_data.research_time
+        self._pay(key, upgrade, upgrade_data.minerals, upgrade_data.gas)
+        self.research_started[upgrade] = (self.time, upgrade_data.research_time)
+        building.busy_until.append(end_time)
+        self._schedule(end_time, self._research_ready, upgrade)
+        return True
+
+    def _research_ready(self, upgrade: UpgradeId):
+        self.research_started.pop(upgrade, None)
+        self.ai.upgrade_progress.pop(upgrade, None)
+        self.ai.state.upgrades.add(upgrade)
+
+    # endregion
+
+    # region Plan
+
+    async def _start(self, node: ActBase, key: str):
+        """Starts requirements with simulated knowledge. Acts are interpreted and never started."""
+        if isinstance(node, RequireBase):
+            try:
+                await node.start(self.knowledge)
+            except Exception:
+                self.unsupported.add(type(node).__name__)
+            return
+
+        for index, child in enumerate(self._children(node)):
+            await self._start(child, f"{key}/{index}")
+
+    def _children(self, node: ActBase) -> List[ActBase]:
+        if isinstance(node, (Step, IfElse)):
+            names = ("requirement", "condition", "skip", "skip_until", "action", "action_else")
+            return [getattr(node, name) for name in names if getattr(node, name, None) is not None]
+        if isinstance(node, ZergUnit):
+            return []
+        if isinstance(node, (BuildOrder, SequentialList)):
+            return node.orders
+        return []
+
+    def _execute(self, node: ActBase, key: str) -> bool:
+        node_type = type(node)
+        handler = self._dispatch.get(node_type)
+        if handler is None:
+            handler = self._unsupported
+            for handled_type, type_handler in self._handlers:
+                if issubclass(node_type, handled_type):
+                    handler = type_handler
+                    break
+            self._dispatch[node_type] = handler
+        return handler(node, key)
+
+    def _unsupported(self, node: ActBase, key: str) -> bool:
+        self.unsupported.add(type(node).__name__)
+        return True
+
+    def _require(self, node: RequireBase, key: str) -> bool:
+        try:
+            return node.is_met()
+        except Exception:
+            self.unsupported.add(type(node).__name__)
+            return False
+
+    def _step(self, node: Step, key: str) -> bool:
+        if node.skip is not None and self._require(node.skip, key):
+            return True
+        if node.skip_until is not None and not self._require(node.skip_until, key):
+            return True
+        if node.requirement is not None and not self._require(node.requirement, key):
+            return False
+        if node.action is None:
+            return True
+        return self._execute(node.action, f"{key}/{type(node.action).__name__}")
+
+    def _if_else(self, node: IfElse, key: str) -> bool:
+        if node.skip is not None and self._require(node.skip, key):
+            return True
+        if node.skip_until is not None and not self._require(node.skip_until, key):
+            return True
+        if self._require(node.condition, key):
+            return self._execute(node.action, f"{key}/{type(node.action).__name__}")
+        if node.action_else is None:
+            return True
+        return self._execute(node.action_else, f"{key}/else/{type(node.action_else).__name__}")
+
+    def _build_order(self, node: BuildOrder, key: str) -> bool:
+        result = True
+        for index, order in enumerate(node.orders):
+            result &= self._execute(order, f"{key}/{index}")
+        return result
+
+    def _sequential_list(self, node: SequentialList, key: str) -> bool:
+        for index, order in enumerate(node.orders):
+            if not self._execute(order, f"{key}/{index}"):
+                return False
+        return True
+
+    def _train_to_count(
+        self, key: str, unit_type: UnitTypeId, producer_type: UnitTypeId, to_count: float, priority: bool = False
+    ) -> bool:
+        count = self._count(unit_type)
+        while count < to_count and self._train(key, unit_type, producer_type, priority):
+            count = self._count(unit_type)
+        return count >= to_count
+
+    def _act_unit(self, node: ActUnit, key: str) -> bool:
+        return self._train_to_count(key, node.unit_type, node.from_building, node.to_count, node.priority)
+
+    def _zerg_unit(self, node: ZergUnit, key: str) -> bool:
+        if node.morph_unit is None:
+            act_unit = node.act_unit
+            return self._train_to_count(key, act_unit.unit_type, act_unit.from_building, node.to_count)
+
+        morph_unit: MorphUnit = node.morph_unit
+        morph_unit.target_count = node.to_count
+        to_count = node.to_count - self._count(morph_unit.result_type)
+        self._morph_unit(morph_unit, key)
+        return self._train_to_count(key, morph_unit.unit_type, node.act_unit.from_building, to_count)
+
+    def _worker_producer(self) -> UnitTypeId:
+        return UnitTypeId.LARVA if self.race == Race.Zerg else self.townhall_type
+
+    def _workers(self, node: Workers, key: str) -> bool:
+        return self._train_to_count(key, self.worker_type, self._worker_producer(), node.to_count, True)
+
+    def _auto_worker(self, node: AutoWorker, key: str) -> bool:
+        optimal = 1
+        for unit in self.units:
+            if self.data.units[unit.type_id].is_townhall:
+                optimal += WORKERS_PER_BASE if unit.is_ready else node.notready_count
+            elif unit.type_id in ALL_GAS:
+                optimal += WORKERS_PER_GAS
+        to_count = min(node.to_count, optimal)
+        return self._train_to_count(key, self.worker_type, self._worker_producer(), to_count, True)
+
+    def _auto_supply(self, node: ActBase, key: str) -> bool:
+        """Supply provider count prediction of AutoDepot, AutoPylon and AutoOverLord."""
+        supply_type = SUPPLY_TYPES[self.race]
+        build_time = self.data.units[supply_type].build_time
+
+        if self.race == Race.Zerg:
+            mineral_workers = min(self.ai.supply_workers, len(self._own(HATCHERY_TYPES)) * WORKERS_PER_BASE)
+            growth_speed = mineral_workers * MINERAL_RATE / 50
+            larva = sum(unit.larva for unit in self.units)
+            bonus = min(larva * 2, int((self.minerals - 300) / 50))
+        else:
+            growth_speed = 0.0
+            for unit in self.units:
+                if unit.is_ready:
+                    growth_speed += SUPPLY_GROWTH.get(unit.type_id, 0)
+            growth_speed *= 1.2
+            bonus = 0
+
+        predicted_supply = min(MAX_SUPPLY, self.supply_used + build_time * growth_speed + bonus)
+        current = sum(1 for unit in self._own({supply_type}) if unit.is_ready)
+        if self.ai.supply_cap >= MAX_SUPPLY:
+            to_count = current
+        else:
+            to_count = ceil((predicted_supply - self.ai.supply_cap) / 8) + current
+
+        if self.race == Race.Zerg:
+            return self._train_to_count(key, supply_type, UnitTypeId.LARVA, to_count)
+        return self._build_to_count(key, supply_type, to_count)
+
+    def _build_to_count(self, key: str, unit_type: UnitTypeId, to_count: float, priority: bool = False) -> bool:
+        count = self._count(unit_type)
+        if count < to_count and self._construct(key, unit_type, priority):
+            count += 1
+        return count >= to_count
+
+    def _act_building(self, node: ActBuilding, key: str) -> bool:
+        return self._build_to_count(key, node.unit_type, node.to_count, getattr(node, "priority", False))
+
+    def _build_position(self, node: BuildPosition, key: str) -> bool:
+        return self._build_to_count(key, node.unit_type, 1)
+
+    def _build_gas(self, node: BuildGas, key: str) -> bool:
+        count = len(self._own(ALL_GAS))
+        if count >= node.to_count:
+            return True
+        townhalls = sum(1 for unit in self.units if self.data.units[unit.type_id].is_townhall)
+        if count < townhalls * GAS_PER_BASE and self._construct(key, self.gas_type):
+            count += 1
+        return count >= node.to_count
+
+    def _expand(self, node: Expand, key: str) -> bool:
+        count = sum(1 for unit in self.units if self.data.units[unit.type_id].is_townhall)
+        if count < node.to_count and self._construct(key, self.townhall_type, node.priority):
+            count += 1
+        return count >= node.to_count
+
+    def _tech(self, node: Tech, key: str) -> bool:
+        upgrade = node.upgrade_type
+        if upgrade in self.ai.state.upgrades or upgrade in self.research_started:
+            return True
+        return self._research(key, upgrade)
+
+    def _morph_building(self, node: MorphBuilding, key: str) -> bool:
+        count = len(self._own({node.result_type})) + self.pending.get(node.result_type, 0)
+        if count >= node.target_count:
+            return True
+
+        info = self.data.train_info(node.result_type, node.building_type)
+        if not self._meets(info):
+            return False
+        building = next((unit for unit in self._own({node.building_type}) if self._idle(unit)), None)
+        if building is None:
+            return False
+
+        minerals, gas = self.data.cost(node.result_type, node.building_type)
+        if not self._can_afford(minerals, gas):
+            self._reserve(minerals, gas)
+            return False
+
+        self._morph(key, building, node.result_type)
+        return count + 1 >= node.target_count
+
+    def _morph_unit(self, node: MorphUnit, key: str) -> bool:
+        count = len(self._own({node.result_type, node.cocoon_type}))
+        if count >= node.target_count:
+            return True
+
+        info = self.data.train_info(node.result_type, node.unit_type)
+        if not self._meets(info):
+            return False
+        minerals, gas = self.data.cost(node.result_type, node.unit_type)
+        supply = self.data.supply_cost(node.result_type, node.unit_type)
+        for unit in self._own({node.unit_type}):
+            if count >= node.target_count or not self._can_afford(minerals, gas, supply):
+                break
+            if self._idle(unit):
+                self._morph(key, unit, node.result_type, node.cocoon_type)
+                count += 1
+        return count >= node.target_count
+
+    def _build_addon(self, node: BuildAddon, key: str) -> bool:
+        count = len(self._own({node.unit_type}))
+        if count >= node.to_count:
+            return True
+
+        unit_data = self.data.units[node.unit_type]
+        if not self._can_afford(unit_data.minerals, unit_data.gas):
+            return False
+
+        for unit in self._own({node.unit_from_type}):
+            if unit.addon_type is None and self._idle(unit):
+                end_time = self.time + unit_data.build_time
+                self._pay(key, node.unit_type, unit_data.minerals, unit_data.gas)
+                self._add_pending(node.unit_type, 1)
+                unit.addon_type = node.unit_type
+                unit.busy_until.append(end_time)
+                addon = self._add_unit(node.unit_type, unit_data.build_time)
+                self._schedule(end_time, self._structure_ready, addon)
+                return count + 1 >= node.to_count
+        return False
+
+    # endregion
+
+
+def _run_variant(
+    plan_factory: Callable[[object], ActBase],
+    race: Race,
+    enemy_race: Race,
+    step_time: float,
+    duration: float,
+    variant: object,
+) -> SimulationResult:
+    simulator = BuildSimulator(race, enemy_race, step_time)
+    return simulator.run(plan_factory(variant), duration)
+
+
+def sweep(
+    plan_factory: Callable[[object], ActBase],
+    variants: Iterable[object],
+    race: Race,
+    duration: float,
+    enemy_race: Race = Race.Random,
+    step_time: float = 1.0,
+    processes: Optional[int] = None,
+) -> List[SimulationResult]:
+    """
+    Simulates a build order variant for each of the variants in parallel processes.
+
+    @param plan_factory: Module level function that creates a new plan for a variant, it must be picklable.
+    @param variants: Parameters passed to plan_factory, i.e. supply counts or timings to compare.
+    @param processes: Number of worker processes, defaults to cpu count. Use 1 to run in the current process.
+    @return: Simulation results in the same order as variants.
+    """
+    variants = list(variants)
+    run_variant = partial(_run_variant, plan_factory, race, enemy_race, step_time, duration)
+    if processes == 1 or len(variants) < 2:
+        return [run_variant(variant) for variant in variants]
+
+    workers = processes or os.cpu_count() or 1
+    chunksize = max(1, len(variants) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_variant, variants, chunksize=chunksize))
@@ -0,0 +1,64 @@
+from sc2.data import Race
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+from sharpy.plans import BuildOrder, SequentialList, Step
+from sharpy.plans.acts import ActCustom, BuildGas, GridBuilding, Tech, Workers
+from sharpy.plans.require import Supply, UnitReady
+
+from .build_simulator import BuildSimulator
+
+
+def create_plan(depot_supply: int) -> BuildOrder:
+    return BuildOrder(
+        Workers(16),
+        SequentialList(
+            Step(Supply(depot_supply), GridBuilding(UnitTypeId.SUPPLYDEPOT, 1)),
+            GridBuilding(UnitTypeId.BARRACKS, 1),
+            BuildGas(1),
+            Step(UnitReady(UnitTypeId.BARRACKS), GridBuilding(UnitTypeId.ENGINEERINGBAY, 1)),
+            Tech(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1),
+        ),
+    )
+
+
+class TestBuildSimulator:
+    def test_build_order_is_completed_in_order(self):
+        # Arrange
+        simulator = BuildSimulator(Race.Terran)
+
+        # Act
+        result = simulator.run(create_plan(14), 300)
+
+        # Assert
+        depot_time = result.started(UnitTypeId.SUPPLYDEPOT)
+        rax_time = result.started(UnitTypeId.BARRACKS)
+        bay_time = result.started(UnitTypeId.ENGINEERINGBAY)
+        upgrade_time = result.started(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1)
+        assert 0 < depot_time < rax_time < bay_time < upgrade_time
+        assert result.started(UnitTypeId.SCV, 2) < depot_time
+        assert result.unit_counts[UnitTypeId.ENGINEERINGBAY] == 1
+        assert not result.unsupported
+
+    def test_requirement_delays_production(self):
+        # Arrange
+        simulator = BuildSimulator(Race.Terran)
+
+        # Act
+        early = simulator.run(create_plan(13), 120)
+        late = simulator.run(create_plan(14), 120)
+
+        # Assert
+        assert early.started(UnitTypeId.SUPPLYDEPOT) < late.started(UnitTypeId.SUPPLYDEPOT)
+
+    def test_unknown_act_is_reported(self):
+        # Arrange
+        simulator = BuildSimulator(Race.Zerg)
+        plan = BuildOrder(ActCustom(lambda: True), Workers(14))
+
+        # Act
+        result = simulator.run(plan, 60)
+
+        # Assert
+        assert result.unsupported == {"ActCustom"}
+        assert result.started(UnitTypeId.DRONE, 2) is not None
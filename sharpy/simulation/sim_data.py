@@ -0,0 +1,163 @@
+import json
+import os
+from typing import Dict, Optional, Set, Tuple
+
+import sc2
+from sc2.data import Race
+from sc2.dicts.unit_research_abilities import RESEARCH_INFO
+from sc2.dicts.unit_train_build_abilities import TRAIN_INFO
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+# Game loops per second on faster game speed
+LOOPS_PER_SECOND = 22.4
+
+# Units that are trained in pairs from a single larva
+PAIRED_UNITS = {UnitTypeId.ZERGLING}
+
+# Producers that are not consumed or transformed when they produce something
+NON_MORPH_PRODUCERS = {UnitTypeId.LARVA, UnitTypeId.SCV, UnitTypeId.PROBE, UnitTypeId.DRONE}
+
+ADDON_SUFFIXES = ("TECHLAB", "REACTOR")
+
+
+class SimUnitData:
+    __slots__ = (
+        "type_id",
+        "race",
+        "minerals",
+        "gas",
+        "build_time",
+        "supply",
+        "supply_provided",
+        "is_structure",
+        "is_townhall",
+        "is_worker",
+        "needs_geyser",
+    )
+
+    def __init__(self, proto: dict):
+        self.type_id = UnitTypeId(proto["id"])
+        self.race: Race = Race[proto["race"]]
+        self.minerals: int = proto["minerals"]
+        self.gas: int = proto["gas"]
+        self.build_time: float = proto["time"] / LOOPS_PER_SECOND
+        supply: float = proto["supply"]
+        self.supply: float = max(0, supply)
+        self.supply_provided: float = max(0, -supply)
+        self.is_structure: bool = proto["is_structure"]
+        self.is_townhall: bool = proto["is_townhall"]
+        self.is_worker: bool = proto["is_worker"]
+        self.needs_geyser: bool = proto["needs_geyser"]
+
+    @property
+    def is_addon(self) -> bool:
+        return self.type_id.name.endswith(ADDON_SUFFIXES) and self.is_structure
+
+
+class SimUpgradeData:
+    __slots__ = ("upgrade_id", "minerals", "gas", "research_time")
+
+    def __init__(self, proto: dict):
+        self.upgrade_id = UpgradeId(proto["id"])
+        self.minerals: int = proto["cost"]["minerals"]
+        self.gas: int = proto["cost"]["gas"]
+        self.research_time: float = proto["cost"]["time"] / LOOPS_PER_SECOND
+
+
+def default_data_path() -> str:
+    """Location of data.json in the python-sc2 submodule."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(sc2.__file__))), "data", "data.json")
+
+
+class SimGameData:
+    """Static unit and upgrade data for simulation, loaded from python-sc2 data.json and sc2/dicts."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = default_data_path()
+
+        with open(path, "r") as file:
+            data = json.load(file)
+
+        self.units: Dict[UnitTypeId, SimUnitData] = {}
+        self.upgrades: Dict[UpgradeId, SimUpgradeData] = {}
+        # Unit type -> producer type -> train info from TRAIN_INFO
+        self.trained_from: Dict[UnitTypeId, Dict[UnitTypeId, dict]] = {}
+        # Upgrade -> (research building, research info from RESEARCH_INFO)
+        self.researched_from: Dict[UpgradeId, Tuple[UnitTypeId, dict]] = {}
+
+        for proto in data["Unit"]:
+            try:
+                unit_data = SimUnitData(proto)
+            except ValueError:
+                # Unit not present in UnitTypeId of this python-sc2 version
+                continue
+            self.units[unit_data.type_id] = unit_data
+
+        for proto in data["Upgrade"]:
+            try:
+                upgrade_data = SimUpgradeData(proto)
+            except ValueError:
+                continue
+            self.upgrades[upgrade_data.upgrade_id] = upgrade_data
+
+        for producer, trainable in TRAIN_INFO.items():
+            for unit_type, info in trainable.items():
+                self.trained_from.setdefault(unit_type, {})[producer] = info
+
+        for building, researches in RESEARCH_INFO.items():
+            for upgrade, info in researches.items():
+                self.researched_from[upgrade] = (building, info)
+
+    def producers(self, unit_type: UnitTypeId) -> Set[UnitTypeId]:
+        return set(self.trained_from.get(unit_type, {}).keys())
+
+    def train_info(self, unit_type: UnitTypeId, producer: UnitTypeId) -> dict:
+        return self.trained_from.get(unit_type, {}).get(producer, {})
+
+    def is_morph(self, unit_type: UnitTypeId, producer: UnitTypeId) -> bool:
+        """True when the producer is transformed into the unit, i.e. command center into orbital command."""
+        if producer in NON_MORPH_PRODUCERS:
+            return False
+        unit_data = self.units[unit_type]
+        producer_data = self.units.get(producer)
+        if producer_data is None or unit_data.is_addon:
+            return False
+        return unit_data.is_structure == producer_data.is_structure
+
+    def cost(self, unit_type: UnitTypeId, producer: UnitTypeId) -> Tuple[int, int]:
+        """Returns mineral and gas cost of a single production command."""
+        unit_data = self.units[unit_type]
+        minerals = unit_data.minerals
+        gas = unit_data.gas
+
+        if self.is_morph(unit_type, producer):
+            producer_data = self.units[producer]
+            minerals -= producer_data.minerals
+            gas -= producer_data.gas
+        elif unit_type in PAIRED_UNITS:
+            minerals *= 2
+            gas *= 2
+
+        return max(0, minerals), max(0, gas)
+
+    def supply_cost(self, unit_type: UnitTypeId, producer: UnitTypeId) -> float:
+        """Returns supply cost of a single production command."""
+        supply = self.units[unit_type].supply
+        if self.is_morph(unit_type, producer):
+            supply -= self.units[producer].supply
+        elif unit_type in PAIRED_UNITS:
+            supply *= 2
+        return max(0, supply)
+
+
+_default_game_data: Optional[SimGameData] = None
+
+
+def default_game_data() -> SimGameData:
+    """Game data from the default location, loaded once per process."""
+    global _default_game_data
+    if _default_game_data is None:
+        _default_game_data = SimGameData()
+    return _default_game_data
@@ -0,0 +1,204 @@
+from typing import Dict, Iterable, List, Optional, Set, Type, Union
+
+from sc2.data import Race
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+from sharpy.interfaces import IEnemyUnitsManager, ILostUnitsManager
+
+
+class SimUnit:
+    """Simulated unit with just enough of the `Unit` interface for plan requirements."""
+
+    __slots__ = ("tag", "type_id", "build_progress", "start_time", "build_time", "busy_until", "addon_type", "larva")
+
+    def __init__(self, tag: int, type_id: UnitTypeId, start_time: float, build_time: float):
+        self.tag = tag
+        self.type_id = type_id
+        self.start_time = start_time
+        self.build_time = build_time
+        self.build_progress: float = 1 if build_time <= 0 else 0
+        # Completion times of the current production commands
+        self.busy_until: List[float] = []
+        self.addon_type: Optional[UnitTypeId] = None
+        self.larva: int = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.build_progress >= 1
+
+
+class SimUnits(list):
+    """List of simulated units with the `Units` properties used by plan requirements."""
+
+    @property
+    def amount(self) -> int:
+        return len(self)
+
+    @property
+    def exists(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def ready(self) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.build_progress >= 1)
+
+    @property
+    def not_ready(self) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.build_progress < 1)
+
+    def __call__(self, unit_types: Union[UnitTypeId, Iterable[UnitTypeId]]) -> "SimUnits":
+        if isinstance(unit_types, UnitTypeId):
+            unit_types = {unit_types}
+        else:
+            unit_types = set(unit_types)
+        return SimUnits(unit for unit in self if unit.type_id in unit_types)
+
+
+EMPTY_UNITS = SimUnits()
+
+
+class SimUnitCache:
+    """Implements the parts of `IUnitCache` that plan requirements use."""
+
+    def __init__(self):
+        self._own_unit_cache: Dict[UnitTypeId, SimUnits] = {}
+        self._own_ready_counts: Dict[UnitTypeId, int] = {}
+
+    def update(self, units: Iterable[SimUnit]):
+        self._own_unit_cache.clear()
+        self._own_ready_counts.clear()
+        for unit in units:
+            self._own_unit_cache.setdefault(unit.type_id, SimUnits()).append(unit)
+            if unit.build_progress >= 1:
+                self._own_ready_counts[unit.type_id] = self._own_ready_counts.get(unit.type_id, 0) + 1
+
+    def own(self, type_id: Union[UnitTypeId, Iterable[UnitTypeId]]) -> SimUnits:
+        if isinstance(type_id, UnitTypeId):
+            return self._own_unit_cache.get(type_id, EMPTY_UNITS)
+
+        units = SimUnits()
+        for single_type in type_id:
+            units.extend(self._own_unit_cache.get(single_type, EMPTY_UNITS))
+        return units
+
+    def own_ready_count(self, type_id: UnitTypeId) -> int:
+        return self._own_ready_counts.get(type_id, 0)
+
+
+class SimState:
+    __slots__ = ("upgrades",)
+
+    def __init__(self):
+        self.upgrades: Set[UpgradeId] = set()
+
+
+class SimAi:
+    """
+    Stands in for `SkeletonBot` when plan requirements are checked in simulation.
+    Values are written by `BuildSimulator` before each plan evaluation.
+    """
+
+    def __init__(self, race: Race, enemy_race: Race):
+        self.race = race
+        self.enemy_race = enemy_race
+        self.state = SimState()
+        self.time: float = 0
+        self.minerals: int = 0
+        self.vespene: int = 0
+        self.supply_used: float = 0
+        self.supply_cap: float = 0
+        self.supply_workers: float = 0
+        self.all_enemy_units = EMPTY_UNITS
+        self._client = None
+        self.pending: Dict[UnitTypeId, float] = {}
+        self.upgrade_progress: Dict[UpgradeId, float] = {}
+
+    @property
+    def supply_left(self) -> float:
+        return self.supply_cap - self.supply_used
+
+    def already_pending(self, unit_type: Union[UnitTypeId, UpgradeId]) -> float:
+        if isinstance(unit_type, UpgradeId):
+            return self.already_pending_upgrade(unit_type)
+        return self.pending.get(unit_type, 0)
+
+    def already_pending_upgrade(self, upgrade_type: UpgradeId) -> float:
+        if upgrade_type in self.state.upgrades:
+            return 1
+        return self.upgrade_progress.get(upgrade_type, 0)
+
+
+class SimLostUnitsManager(ILostUnitsManager):
+    """Nothing is lost in an economy only simulation."""
+
+    def calculate_own_lost_resources(self) -> tuple:
+        return 0, 0
+
+    def calculate_enemy_lost_resources(self) -> tuple:
+        return 0, 0
+
+    def own_lost_type(self, unit_type: UnitTypeId, real_type=True) -> int:
+        return 0
+
+    def enemy_lost_type(self, unit_type: UnitTypeId, real_type=True) -> int:
+        return 0
+
+    def get_own_enemy_lost_units(self):
+        return {}, {}
+
+
+class SimEnemyUnitsManager:
+    """Returns scripted enemy sightings for enemy unit requirements."""
+
+    def __init__(self, enemy_units: Optional[Dict[UnitTypeId, int]] = None):
+        self.enemy_units: Dict[UnitTypeId, int] = enemy_units if enemy_units else {}
+
+    def unit_count(self, unit_type: UnitTypeId) -> int:
+        return self.enemy_units.get(unit_type, 0)
+
+
+class SimKnowledge:
+    """Stands in for `Knowledge` when plan requirements are started in simulation."""
+
+    def __init__(self, ai: SimAi, enemy_units: Optional[Dict[UnitTypeId, int]] = None):
+        self.ai = ai
+        self.debug = False
+        self.cache_requirements = False
+        self.iteration = 0
+        self.unit_cache = SimUnitCache()
+        self.unit_values = None
+        self.pathing_manager = None
+        self.combat_manager = None
+        self.roles = None
+        self.zone_manager = None
+        self.cooldown_manager = None
+        self.lost_units_manager = SimLostUnitsManager()
+        self.enemy_units_manager = SimEnemyUnitsManager(enemy_units)
+
+    @property
+    def my_race(self) -> Race:
+        return self.ai.race
+
+    @property
+    def enemy_race(self) -> Race:
+        return self.ai.enemy_race
+
+    def get_boolean_setting(self, key: str) -> bool:
+        return False
+
+    def get_manager(self, manager_type: Type):
+        if issubclass(manager_type, ILostUnitsManager):
+            return self.lost_units_manager
+        if issubclass(manager_type, IEnemyUnitsManager):
+            return self.enemy_units_manager
+        return None
+
+    def get_required_manager(self, manager_type: Type):
+        manager = self.get_manager(manager_type)
+        if not manager:
+            raise KeyError(manager_type)
+        return manager
+
+    def print(self, message: str, tag: str = None, stats: bool = True, log_level=None):
+        pass
@@ -0,0 +1,210 @@
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+from sc2.bot_ai import BotAI
+from sc2.client import Client
+from sc2.data import ActionResult, Result, Status
+from sc2.game_data import GameData
+from sc2.game_info import GameInfo
+from sc2.game_state import GameState
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2, Point3
+from sc2.unit import Unit
+from sc2.units import Units
+from sharpy.tools.game_recording import RecordingReader
+
+
+class PlaybackClient(Client):
+    """
+    Client that answers bot requests without a game.
+
+    Actions and debug drawing are discarded, pathing queries return straight line distances,
+    building placements always succeed and no abilities are available.
+    """
+
+    def __init__(self):
+        super().__init__(True)
+        self._status = Status.in_game
+        self.actions_sent = 0
+        self.queries = 0
+        self.unhandled_requests = 0
+
+    async def _execute(self, **kwargs):
+        self.unhandled_requests += 1
+        return sc_pb.Response()
+
+    async def actions(self, actions, return_successes: bool = False):
+        if not actions:
+            return None
+        self.actions_sent += len(actions) if isinstance(actions, list) else 1
+        return [ActionResult.Success] * len(actions) if return_successes else []
+
+    async def query_pathing(self, start: Union[Unit, Point2, Point3], end: Union[Point2, Point3]) -> Optional[float]:
+        self.queries += 1
+        return start.position.to2.distance_to(end)
+
+    async def query_pathings(self, zipped_list: List[List[Union[Unit, Point2, Point3]]]) -> List[float]:
+        self.queries += 1
+        return [start.position.to2.distance_to(end) for start, end in zipped_list]
+
+    async def _query_building_placement_fast(
+        self, ability: AbilityId, positions: List[Union[Point2, Point3]], ignore_resources: bool = True
+    ) -> List[bool]:
+        self.queries += 1
+        return [True] * len(positions)
+
+    async def query_building_placement(
+        self, ability, positions: List[Union[Point2, Point3]], ignore_resources: bool = True
+    ) -> List[ActionResult]:
+        self.queries += 1
+        return [ActionResult.Success] * len(positions)
+
+    async def query_available_abilities(self, units, ignore_resource_requirements: bool = False):
+        self.queries += 1
+        if not isinstance(units, (list, Units)):
+            return []
+        return [[] for _ in units]
+
+    async def query_available_abilities_with_tag(self, units, ignore_resource_requirements: bool = False):
+        self.queries += 1
+        return {unit.tag: set() for unit in units}
+
+    async def chat_send(self, message: str, team_only: bool) -> None:
+        pass
+
+    async def toggle_autocast(self, units, ability: AbilityId) -> None:
+        pass
+
+    async def move_camera(self, position) -> None:
+        pass
+
+    async def _send_debug(self) -> None:
+        self._debug_texts.clear()
+        self._debug_lines.clear()
+        self._debug_boxes.clear()
+        self._debug_spheres.clear()
+
+
+class PlaybackResult:
+    """Step and manager timings of a played back recording."""
+
+    def __init__(self):
+        self.game_loops: List[int] = []
+        self.step_ns: List[int] = []
+        # Manager name -> time spent in update and post_update for each step
+        self.manager_ns: Dict[str, List[int]] = {}
+
+    @property
+    def frames(self) -> int:
+        return len(self.step_ns)
+
+    def summary(self) -> str:
+        lines = [f"{'':<30} {'avg ms':>10} {'max ms':>10} {'total ms':>10}"]
+
+        def add_line(name: str, values: List[int]):
+            if values:
+                lines.append(
+                    f"{name:<30} {sum(values) / len(values) / 1e6:10.3f} "
+                    f"{max(values) / 1e6:10.3f} {sum(values) / 1e6:10.1f}"
+                )
+
+        add_line("step", self.step_ns)
+        for name, values in sorted(self.manager_ns.items(), key=lambda item: -sum(item[1])):
+            add_line(name, values)
+        return "\n".join(lines)
+
+
+class GamePlayer:
+    """
+    Plays back a recorded game through a bot without SC2.
+
+    Every recorded observation is fed through BotAI._prepare_step, events and on_step the same way
+    as in a real game, so the whole manager stack runs on real game states. Bot decisions don't affect
+    the observations, so this is meant for performance measurements, not for testing behaviour.
+    """
+
+    def __init__(self, file_name: str, bot_factory: Callable[[], BotAI]):
+        self.file_name = file_name
+        self.bot_factory = bot_factory
+        self.bot: Optional[BotAI] = None
+        self.client: Optional[PlaybackClient] = None
+
+    async def play(self, max_frames: Optional[int] = None, start: int = 0) -> PlaybackResult:
+        """
+        Plays the recording and measures time taken by each step and manager.
+
+        :param max_frames: Maximum number of frames to play.
+        :param start: Position of the first frame to play. Bot is started on this frame.
+        """
+        result = PlaybackResult()
+
+        with RecordingReader(self.file_name) as reader:
+            game_info_response = sc_pb.Response()
+            game_info_response.CopyFrom(reader.game_info)
+            pathing_grid = game_info_response.game_info.start_raw.pathing_grid
+
+            self.client = PlaybackClient()
+            self.bot = self.bot_factory()
+            bot = self.bot
+            bot._initialize_variables()
+            bot._prepare_start(
+                self.client,
+                reader.player_id,
+                GameInfo(reader.game_info.game_info),
+                GameData(reader.game_data.data),
+                realtime=False,
+                base_build=reader.base_build,
+            )
+
+            stop = None if max_frames is None else start + max_frames
+            for iteration, frame in enumerate(reader.frames(start, stop), start=-1):
+                if frame.pathing_grid is not None:
+                    pathing_grid.data = frame.pathing_grid
+
+                bot._prepare_step(GameState(frame.observation), game_info_response)
+
+                if iteration < 0:
+                    await bot.on_before_start()
+                    bot._prepare_first_step()
+                    await bot.on_start()
+                    self._measure_managers(bot, result)
+                    continue
+
+                ns_step = time.perf_counter_ns()
+                await bot.issue_events()
+                await bot.on_step(iteration)
+                await bot._after_step()
+                result.step_ns.append(time.perf_counter_ns() - ns_step)
+                result.game_loops.append(frame.game_loop)
+
+            await bot.on_end(Result.Undecided)
+        return result
+
+    @staticmethod
+    def _measure_managers(bot: BotAI, result: PlaybackResult):
+        knowledge = getattr(bot, "knowledge", None)
+        if knowledge is None:
+            return
+
+        for manager in knowledge.managers:
+            name = type(manager).__name__
+            if name in result.manager_ns:
+                name = f"{name} {id(manager)}"
+            timings = result.manager_ns.setdefault(name, [])
+            update = manager.update
+            post_update = manager.post_update
+
+            async def timed_update(update=update, timings=timings):
+                ns = time.perf_counter_ns()
+                await update()
+                timings.append(time.perf_counter_ns() - ns)
+
+            async def timed_post_update(post_update=post_update, timings=timings):
+                ns = time.perf_counter_ns()
+                await post_update()
+                timings[-1] += time.perf_counter_ns() - ns
+
+            manager.update = timed_update
+            manager.post_update = timed_post_update
@@ -0,0 +1,232 @@
+import bisect
+import struct
+import zlib
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+# Increase when the file layout changes
+RECORDING_VERSION = 1
+
+MAGIC = b"SHRPYREC"
+INDEX_MAGIC = b"SHRPYIDX"
+
+_FILE_HEADER = struct.Struct("<8sH")
+_BLOCK_HEADER = struct.Struct("<BI")
+_HEADER = struct.Struct("<Ii")
+_FRAME = struct.Struct("<II")
+_INDEX_ENTRY = struct.Struct("<IQ")
+_FOOTER = struct.Struct("<Q8s")
+
+_BLOCK_HEADER_DATA = 0
+_BLOCK_FRAME = 1
+_BLOCK_INDEX = 2
+
+
+class RecordedFrame(NamedTuple):
+    game_loop: int
+    observation: "sc_pb.ResponseObservation"
+    # Set only when the pathing grid changed since the previous frame
+    pathing_grid: Optional[bytes]
+
+
+class RecordingWriter:
+    """
+    Writes the observation stream of a game to a compressed recording file.
+
+    The file starts with the game data and game info responses, followed by one zlib compressed
+    block per observation. Pathing grid is only stored when it changes. An index of frame offsets
+    is written when the recording is closed, which allows seeking to any frame without
+    decompressing the frames before it.
+    """
+
+    def __init__(self, file_name: str, compression_level: int = 6):
+        self.file_name = file_name
+        self.compression_level = compression_level
+        self._file: BinaryIO = open(file_name, "wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, RECORDING_VERSION))
+        self._index: List[Tuple[int, int]] = []
+        self._last_pathing_grid: Optional[bytes] = None
+        self._header_written = False
+
+    def write_header(
+        self, player_id: int, game_data: "sc_pb.Response", game_info: "sc_pb.Response", base_build: int = -1
+    ):
+        """
+        Writes the static data of the game. Must be called once before any frames are written.
+
+        :param player_id: Id of the recording player.
+        :param game_data: Response to RequestData.
+        :param game_info: Response to RequestGameInfo at the start of the game.
+        :param base_build: Base build of the game client.
+        """
+        assert not self._header_written
+        data = game_data.SerializeToString()
+        info = game_info.SerializeToString()
+        self._write_block(
+            _BLOCK_HEADER_DATA,
+            _HEADER.pack(player_id, base_build) + struct.pack("<I", len(data)) + data + info,
+        )
+        self._last_pathing_grid = game_info.game_info.start_raw.pathing_grid.data
+        self._header_written = True
+
+    def write_frame(self, observation: "sc_pb.ResponseObservation", pathing_grid: Optional[bytes] = None):
+        """
+        Writes a single observation.
+
+        :param observation: The observation response received from the server.
+        :param pathing_grid: Current pathing grid data, stored only when it differs from the previous frame.
+        """
+        assert self._header_written
+        if pathing_grid is None or pathing_grid == self._last_pathing_grid:
+            pathing_grid = b""
+        else:
+            self._last_pathing_grid = pathing_grid
+
+        obs = observation.SerializeToString()
+        offset = self._file.tell()
+        self._write_block(_BLOCK_FRAME, _FRAME.pack(observation.observation.game_loop, len(obs)) + obs + pathing_grid)
+        self._index.append((observation.observation.game_loop, offset))
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._index)
+
+    def flush(self):
+        """Writes buffered frames to disk. Frames written so far can be read even if the recording is never closed."""
+        self._file.flush()
+
+    def close(self):
+        """Writes the frame index and closes the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._write_block(_BLOCK_INDEX, b"".join(_INDEX_ENTRY.pack(*entry) for entry in self._index))
+        self._file.write(_FOOTER.pack(index_offset, INDEX_MAGIC))
+        self._file.close()
+
+    def _write_block(self, block_type: int, payload: bytes):
+        compressed = zlib.compress(payload, self.compression_level)
+        self._file.write(_BLOCK_HEADER.pack(block_type, len(compressed)))
+        self._file.write(compressed)
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RecordingReader:
+    """
+    Reads recordings written with RecordingWriter.
+
+    Frames can be iterated in order or accessed by position. Recordings that were not closed properly
+    (e.g. the bot crashed) have no index, in which case the frames are indexed by scanning the file.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self._file: BinaryIO = open(file_name, "rb")
+        magic, version = _FILE_HEADER.unpack(self._file.read(_FILE_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{file_name} is not a recording file")
+        if version != RECORDING_VERSION:
+            raise ValueError(f"{file_name} has recording version {version}, expected {RECORDING_VERSION}")
+
+        block_type, payload = self._read_block()
+        assert block_type == _BLOCK_HEADER_DATA
+        self.player_id, self.base_build = _HEADER.unpack_from(payload)
+        data_start = _HEADER.size + 4
+        (data_length,) = struct.unpack_from("<I", payload, _HEADER.size)
+        self.game_data = sc_pb.Response.FromString(payload[data_start : data_start + data_length])
+        self.game_info = sc_pb.Response.FromString(payload[data_start + data_length :])
+
+        self._frames_start = self._file.tell()
+        self._index: List[Tuple[int, int]] = self._read_index()
+        self._game_loops = [game_loop for game_loop, _ in self._index]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, position: int) -> RecordedFrame:
+        return self._read_frame(self._index[position][1])
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        return self.frames()
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[RecordedFrame]:
+        """Reads frames sequentially, starting from the frame at position start."""
+        stop = len(self._index) if stop is None else min(stop, len(self._index))
+        if start >= stop:
+            return
+        self._file.seek(self._index[start][1])
+        for _ in range(start, stop):
+            yield self._parse_frame(self._read_block()[1])
+
+    @property
+    def game_loops(self) -> List[int]:
+        return self._game_loops
+
+    def position_of(self, game_loop: int) -> int:
+        """Returns position of the first frame at or after the game loop."""
+        return bisect.bisect_left(self._game_loops, game_loop)
+
+    def close(self):
+        self._file.close()
+
+    def _read_index(self) -> List[Tuple[int, int]]:
+        self._file.seek(0, 2)
+        file_size = self._file.tell()
+        if file_size - self._frames_start >= _FOOTER.size:
+            self._file.seek(file_size - _FOOTER.size)
+            index_offset, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+            if magic == INDEX_MAGIC:
+                self._file.seek(index_offset)
+                block_type, payload = self._read_block()
+                assert block_type == _BLOCK_INDEX
+                return [entry for entry in _INDEX_ENTRY.iter_unpack(payload)]
+
+        return self._scan_index()
+
+    def _scan_index(self) -> List[Tuple[int, int]]:
+        index: List[Tuple[int, int]] = []
+        self._file.seek(self._frames_start)
+        while True:
+            offset = self._file.tell()
+            header = self._file.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                break
+            block_type, length = _BLOCK_HEADER.unpack(header)
+            compressed = self._file.read(length)
+            if block_type != _BLOCK_FRAME or len(compressed) < length:
+                break
+            try:
+                payload = zlib.decompress(compressed)
+            except zlib.error:
+                # Last frame was only partially written
+                break
+            index.append((_FRAME.unpack_from(payload)[0], offset))
+        return index
+
+    def _read_frame(self, offset: int) -> RecordedFrame:
+        self._file.seek(offset)
+        return self._parse_frame(self._read_block()[1])
+
+    def _read_block(self) -> Tuple[int, bytes]:
+        block_type, length = _BLOCK_HEADER.unpack(self._file.read(_BLOCK_HEADER.size))
+        return block_type, zlib.decompress(self._file.read(length))
+
+    @staticmethod
+    def _parse_frame(payload: bytes) -> RecordedFrame:
+        game_loop, length = _FRAME.unpack_from(payload)
+        start = _FRAME.size
+        observation = sc_pb.ResponseObservation.FromString(payload[start : start + length])
+        pathing_grid = payload[start + length :] or None
+        return RecordedFrame(game_loop, observation, pathing_grid)
+
+    def __enter__(self) -> "RecordingReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,74 @@
+import lzma
+import os
+import pickle
+
+import pytest
+
+from sc2.bot_ai import BotAI
+
+from .game_player import GamePlayer
+from .game_recording import RecordingReader, RecordingWriter
+
+PICKLE_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "python-sc2", "test", "pickle_data", "AbiogenesisLE.xz"
+)
+
+
+def write_recording(file_name: str, frames: int, close: bool = True):
+    with lzma.open(PICKLE_FILE, "rb") as f:
+        raw_game_data, raw_game_info, raw_observation = pickle.load(f)
+
+    writer = RecordingWriter(file_name)
+    writer.write_header(1, raw_game_data, raw_game_info)
+    pathing_grid = raw_game_info.game_info.start_raw.pathing_grid.data
+    for i in range(frames):
+        raw_observation.observation.game_loop = i * 10
+        # Pathing grid changes on the second frame only
+        writer.write_frame(raw_observation, pathing_grid if i != 1 else bytes(len(pathing_grid)))
+    if close:
+        writer.close()
+    else:
+        writer.flush()
+
+
+class StepCounterBot(BotAI):
+    def __init__(self):
+        self.steps = 0
+
+    async def on_step(self, iteration: int):
+        self.steps += 1
+
+
+class TestGameRecording:
+    def test_frames_are_read_back(self, tmp_path):
+        file_name = os.path.join(tmp_path, "game.rec")
+        write_recording(file_name, 5)
+
+        with RecordingReader(file_name) as reader:
+            assert reader.player_id == 1
+            assert len(reader) == 5
+            assert reader.game_loops == [0, 10, 20, 30, 40]
+            assert reader.position_of(25) == 3
+            assert reader[3].game_loop == 30
+            assert [frame.game_loop for frame in reader.frames(2)] == [20, 30, 40]
+            assert [frame.pathing_grid is not None for frame in reader] == [False, True, True, False, False]
+
+    def test_unclosed_recording_is_scanned(self, tmp_path):
+        file_name = os.path.join(tmp_path, "game.rec")
+        write_recording(file_name, 3, close=False)
+
+        with RecordingReader(file_name) as reader:
+            assert reader.game_loops == [0, 10, 20]
+            assert reader[2].observation.observation.game_loop == 20
+
+    @pytest.mark.asyncio
+    async def test_recording_is_played_through_bot(self, tmp_path):
+        file_name = os.path.join(tmp_path, "game.rec")
+        write_recording(file_name, 4)
+
+        player = GamePlayer(file_name, StepCounterBot)
+        result = await player.play()
+
+        # First frame is used to start the bot
+        assert player.bot.steps == 3
+        assert result.game_loops == [10, 20, 30]
@@ -0,0 +1,175 @@
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from sc2.game_info import GameInfo, Ramp
+from sc2.position import Point2
+
+MAP_CACHE_FOLDER = os.path.join("data", "map_cache")
+
+EXPANSIONS = "expansions"
+RAMPS = "ramps"
+
+
+def map_key(game_info: GameInfo) -> str:
+    """Key of the map, made of the map name and a hash of the terrain, placement and pathing grids at game start."""
+    start_raw = game_info._proto.start_raw
+    digest = hashlib.sha1()
+    digest.update(f"{start_raw.map_size.x}x{start_raw.map_size.y}".encode())
+    digest.update(start_raw.terrain_height.data)
+    digest.update(start_raw.placement_grid.data)
+    digest.update(start_raw.pathing_grid.data)
+    name = "".join(c for c in game_info.map_name if c.isalnum())
+    return f"{name}_{digest.hexdigest()[:16]}"
+
+
+class MapCache:
+    """
+    Content addressed cache of static map analysis results.
+
+    Every entry is a folder of NumPy files, which are opened read-only as memory maps, so any number of
+    bot processes running on the same map can share them. Entries are written to a temporary folder
+    and renamed in place, which means that readers never see a partially written entry.
+    A missing or unreadable entry is reported as None and the caller should calculate the results again.
+    """
+
+    def __init__(self, game_info: GameInfo, folder: str = MAP_CACHE_FOLDER):
+        self.key = map_key(game_info)
+        self.folder = os.path.join(folder, self.key)
+        # Names of entries that were loaded from the cache and don't need to be saved
+        self.loaded: Set[str] = set()
+
+    def load(self, name: str) -> Optional[Dict[str, np.ndarray]]:
+        """Loads read-only arrays of the cache entry, or None if the entry is missing or corrupt."""
+        path = os.path.join(self.folder, name)
+        if not os.path.isdir(path):
+            return None
+
+        try:
+            arrays = {
+                file_name[: -len(".npy")]: np.load(os.path.join(path, file_name), mmap_mode="r", allow_pickle=False)
+                for file_name in os.listdir(path)
+                if file_name.endswith(".npy")
+            }
+        except (OSError, ValueError) as e:
+            logging.warning(f"Map cache entry {path} is corrupt and will be recalculated: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+
+        self.loaded.add(name)
+        return arrays
+
+    def save(self, name: str, arrays: Dict[str, np.ndarray]) -> bool:
+        """
+        Saves arrays as a cache entry. Returns False if the entry couldn't be written.
+        An entry that was loaded earlier is replaced, since it is only saved again when its contents were rejected.
+        """
+        path = os.path.join(self.folder, name)
+        if name in self.loaded:
+            self.discard(name)
+        temp_path = os.path.join(self.folder, f".{name}.{uuid.uuid4().hex}")
+
+        try:
+            os.makedirs(temp_path)
+            for array_name, array in arrays.items():
+                np.save(os.path.join(temp_path, array_name + ".npy"), np.ascontiguousarray(array), allow_pickle=False)
+            os.rename(temp_path, path)
+        except OSError as e:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if os.path.isdir(path):
+                # Another process saved the same entry at the same time
+                return True
+            logging.warning(f"Map cache entry {path} could not be saved: {e}")
+            return False
+
+        self.loaded.add(name)
+        return True
+
+    def discard(self, name: str):
+        """Removes an entry that failed validation, so that it gets saved again."""
+        self.loaded.discard(name)
+        shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+
+    def load_map_analysis(self, ai: "BotAI"):
+        """
+        Loads expansion locations, ramps and vision blockers to the bot.
+        Must be called before BotAI._prepare_first_step, which then skips calculating them.
+        """
+        if ai.townhalls and not self._load_expansions(ai):
+            self.discard(EXPANSIONS)
+        if not self._load_ramps(ai.game_info):
+            self.discard(RAMPS)
+
+    def save_map_analysis(self, ai: "BotAI"):
+        """Saves expansion locations, ramps and vision blockers that were not loaded from the cache."""
+        if EXPANSIONS not in self.loaded and ai._expansion_positions_list:
+            expansions = ai._expansion_positions_list
+            expansion_index = {expansion: index for index, expansion in enumerate(expansions)}
+            resources = [
+                (position.x, position.y, expansion_index[expansion])
+                for position, expansion_set in ai._resource_location_to_expansion_position_dict.items()
+                for expansion in expansion_set
+            ]
+            self.save(
+                EXPANSIONS,
+                {
+                    "expansions": np.array(expansions, dtype=np.float64).reshape(-1, 2),
+                    "resources": np.array(resources, dtype=np.float64).reshape(-1, 3),
+                },
+            )
+
+        if RAMPS not in self.loaded and ai.game_info.map_ramps is not None:
+            ramp_points = [
+                (point.x, point.y, index) for index, ramp in enumerate(ai.game_info.map_ramps) for point in ramp.points
+            ]
+            self.save(
+                RAMPS,
+                {
+                    "ramp_points": np.array(ramp_points, dtype=np.int32).reshape(-1, 3),
+                    "vision_blockers": np.array(list(ai.game_info.vision_blockers), dtype=np.int32).reshape(-1, 2),
+                },
+            )
+
+    def _load_expansions(self, ai: "BotAI") -> bool:
+        arrays = self.load(EXPANSIONS)
+        if arrays is None:
+            return False
+
+        try:
+            expansions = [Point2((float(x), float(y))) for x, y in arrays["expansions"]]
+            resource_dict: Dict[Point2, Set[Point2]] = {}
+            for x, y, index in arrays["resources"]:
+                resource_dict.setdefault(Point2((float(x), float(y))), set()).add(expansions[int(index)])
+        except (KeyError, IndexError, ValueError):
+            return False
+
+        # Resources are neutral units that are always visible, all of them must still be on the map
+        resource_positions = {resource.position for resource in ai.resources}
+        if not expansions or any(position not in resource_positions for position in resource_dict):
+            return False
+
+        ai._expansion_positions_list.extend(expansions)
+        ai._resource_location_to_expansion_position_dict.update(resource_dict)
+        return True
+
+    def _load_ramps(self, game_info: GameInfo) -> bool:
+        arrays = self.load(RAMPS)
+        if arrays is None:
+            return False
+
+        try:
+            groups: Dict[int, Set[Point2]] = {}
+            for x, y, index in arrays["ramp_points"]:
+                groups.setdefault(int(index), set()).add(Point2((int(x), int(y))))
+            vision_blockers = frozenset(Point2((int(x), int(y))) for x, y in arrays["vision_blockers"])
+        except (KeyError, ValueError):
+            return False
+
+        game_info.map_ramps = [Ramp(frozenset(groups[index]), game_info) for index in sorted(groups)]
+        game_info.vision_blockers = vision_blockers
+        return True
@@ -0,0 +1,68 @@
+import lzma
+import os
+import pickle
+
+import numpy as np
+
+from sc2.bot_ai import BotAI
+from sc2.client import Client
+from sc2.game_data import GameData
+from sc2.game_info import GameInfo
+from sc2.game_state import GameState
+
+from .map_cache import EXPANSIONS, MapCache
+
+PICKLE_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "python-sc2", "test", "pickle_data", "AbiogenesisLE.xz"
+)
+
+
+def create_bot() -> BotAI:
+    with lzma.open(PICKLE_FILE, "rb") as f:
+        raw_game_data, raw_game_info, raw_observation = pickle.load(f)
+
+    bot = BotAI()
+    bot._initialize_variables()
+    bot._prepare_start(Client(True), 1, GameInfo(raw_game_info.game_info), GameData(raw_game_data.data))
+    bot._prepare_step(GameState(raw_observation), raw_game_info)
+    return bot
+
+
+class TestMapCache:
+    def test_entries_are_read_only(self, tmp_path):
+        cache = MapCache(create_bot().game_info, str(tmp_path))
+        assert cache.load("grid") is None
+
+        cache.save("grid", {"values": np.arange(6).reshape(2, 3)})
+        arrays = MapCache(create_bot().game_info, str(tmp_path)).load("grid")
+
+        assert arrays["values"].tolist() == [[0, 1, 2], [3, 4, 5]]
+        assert not arrays["values"].flags.writeable
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        cache = MapCache(create_bot().game_info, str(tmp_path))
+        cache.save("grid", {"values": np.arange(1000)})
+        file_name = os.path.join(cache.folder, "grid", "values.npy")
+        with open(file_name, "r+b") as handle:
+            handle.truncate(200)
+
+        assert MapCache(create_bot().game_info, str(tmp_path)).load("grid") is None
+        assert not os.path.exists(file_name)
+
+    def test_map_analysis_is_loaded(self, tmp_path):
+        bot = create_bot()
+        bot._prepare_first_step()
+        MapCache(bot.game_info, str(tmp_path)).save_map_analysis(bot)
+
+        cached_bot = create_bot()
+        cache = MapCache(cached_bot.game_info, str(tmp_path))
+        cache.load_map_analysis(cached_bot)
+        cached_bot._prepare_first_step()
+
+        assert EXPANSIONS in cache.loaded
+        assert cached_bot.expansion_locations_list == bot.expansion_locations_list
+        assert cached_bot.expansion_locations_dict.keys() == bot.expansion_locations_dict.keys()
+        assert [ramp.points for ramp in cached_bot.game_info.map_ramps] == [
+            ramp.points for ramp in bot.game_info.map_ramps
+        ]
+        assert cached_bot.game_info.vision_blockers == bot.game_info.vision_blockers
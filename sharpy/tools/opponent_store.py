@@ -0,0 +1,190 @@
+import os
+import sqlite3
+from typing import List, Optional
+from uuid import UUID
+
+import jsonpickle
+
+from sc2.data import Race
+from sharpy.tools.opponent_data import GameResult, OpponentData
+
+# Increase when the table layout changes and add a migration step to OpponentStore._migrate
+STORE_VERSION = 1
+
+COLUMNS = (
+    "guid",
+    "game_started",
+    "my_race",
+    "enemy_race",
+    "result",
+    "build_used",
+    "enemy_build",
+    "enemy_macro_build",
+    "first_attacked",
+    "game_duration",
+)
+
+
+class OpponentStore:
+    """
+    Append-only store of game results against a single opponent, kept in a SQLite database.
+
+    Results are only ever appended, except for the result of the current game, which is updated in place
+    when it is written again. Latest results are found through indexes, so reading them doesn't depend on
+    the amount of games played.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name)
+        self._migrate()
+
+    def _migrate(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > STORE_VERSION:
+            raise ValueError(f"{self.file_name} has version {version}, newest known version is {STORE_VERSION}")
+
+        with self.connection:
+            if version < 1:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "id INTEGER PRIMARY KEY, "
+                    "guid TEXT NOT NULL UNIQUE, "
+                    "game_started TEXT, "
+                    "my_race INTEGER, "
+                    "enemy_race INTEGER, "
+                    "result INTEGER, "
+                    "build_used TEXT, "
+                    "enemy_build INTEGER, "
+                    "enemy_macro_build INTEGER, "
+                    "first_attacked REAL, "
+                    "game_duration REAL)"
+                )
+                self.connection.execute("CREATE INDEX IF NOT EXISTS results_race ON results (my_race, id)")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS results_build ON results (build_used, id)")
+            self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def write(self, result: GameResult):
+        """Appends the result, or updates it if a result with the same guid has already been written."""
+        values = self._to_row(result)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                f"ON CONFLICT (guid) DO UPDATE SET {updates}",
+                values,
+            )
+
+    def write_many(self, results: List[GameResult]):
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [self._to_row(result) for result in results],
+            )
+
+    def last_result(self) -> Optional[GameResult]:
+        return self._first(f"SELECT {', '.join(COLUMNS)} FROM results ORDER BY id DESC LIMIT 1")
+
+    def last_result_as_race(self, race: Race) -> Optional[GameResult]:
+        return self._first(
+            f"SELECT {', '.join(COLUMNS)} FROM results WHERE my_race = ? ORDER BY id DESC LIMIT 1", race.value
+        )
+
+    def last_result_with_build(self, build_used: str) -> Optional[GameResult]:
+        return self._first(
+            f"SELECT {', '.join(COLUMNS)} FROM results WHERE build_used = ? ORDER BY id DESC LIMIT 1", build_used
+        )
+
+    def results(self) -> List[GameResult]:
+        """Returns all results in the order they were played."""
+        rows = self.connection.execute(f"SELECT {', '.join(COLUMNS)} FROM results ORDER BY id")
+        return [self._from_row(row) for row in rows]
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _first(self, query: str, *parameters) -> Optional[GameResult]:
+        row = self.connection.execute(query, parameters).fetchone()
+        if row is None:
+            return None
+        return self._from_row(row)
+
+    @staticmethod
+    def _to_row(result: GameResult) -> tuple:
+        return (
+            str(result.guid),
+            getattr(result, "game_started", ""),
+            race_value(getattr(result, "my_race", None)),
+            race_value(getattr(result, "enemy_race", None)),
+            getattr(result, "result", 0),
+            getattr(result, "build_used", ""),
+            int(getattr(result, "enemy_build", 0)),
+            int(getattr(result, "enemy_macro_build", 0)),
+            getattr(result, "first_attacked", None),
+            getattr(result, "game_duration", None),
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> GameResult:
+        result = GameResult()
+        result.guid = UUID(row[0])
+        result.game_started = row[1]
+        result.my_race = Race(row[2]) if row[2] is not None else None
+        result.enemy_race = Race(row[3]) if row[3] is not None else None
+        result.result = row[4]
+        result.build_used = row[5]
+        result.enemy_build = row[6]
+        result.enemy_macro_build = row[7]
+        result.first_attacked = row[8]
+        result.game_duration = row[9]
+        return result
+
+
+def race_value(race) -> Optional[int]:
+    if isinstance(race, Race):
+        return race.value
+    return race
+
+
+def read_json_data(file_name: str) -> OpponentData:
+    """Reads opponent data from the legacy jsonpickle format."""
+    with open(file_name, "r") as handle:
+        text = handle.read()
+        # Compatibility with older versions to prevent crashes
+        text = text.replace("bot.tools", "sharpy.tools")
+        text = text.replace("frozen.tools", "sharpy.tools")
+        return jsonpickle.decode(text)
+
+
+def migrate_json(json_file_name: str, store: OpponentStore) -> int:
+    """Copies results from a legacy jsonpickle file to the store. Returns the amount of results copied."""
+    data = read_json_data(json_file_name)
+    store.write_many(data.results)
+    return len(data.results)
+
+
+def migrate_json_file(json_file_name: str, file_name: str) -> int:
+    """
+    Creates the store file from a legacy jsonpickle file. Returns the amount of results copied.
+
+    Results are first written to a temporary file that is renamed to the store file only when all results
+    have been copied, so a failed migration never leaves behind a store that would prevent migrating again.
+    """
+    temp_file_name = file_name + ".tmp"
+    if os.path.exists(temp_file_name):
+        os.remove(temp_file_name)
+
+    store = OpponentStore(temp_file_name)
+    try:
+        count = migrate_json(json_file_name, store)
+    except Exception:
+        store.close()
+        os.remove(temp_file_name)
+        raise
+
+    store.close()
+    os.replace(temp_file_name, file_name)
+    return count
@@ -0,0 +1,87 @@
+import os
+
+import jsonpickle
+import pytest
+
+from sc2.data import Race
+
+from .opponent_data import GameResult, OpponentData
+from .opponent_store import OpponentStore, migrate_json, migrate_json_file
+
+
+def write_json(json_path: str, data: OpponentData):
+    with open(json_path, "w") as handle:
+        handle.write(jsonpickle.encode(data))
+
+
+def create_result(race: Race, build: str) -> GameResult:
+    result = GameResult()
+    result.my_race = race
+    result.enemy_race = Race.Zerg
+    result.build_used = build
+    result.result = 1
+    return result
+
+
+class TestOpponentStore:
+    def test_last_results(self, tmp_path):
+        store = OpponentStore(os.path.join(tmp_path, "1.db"))
+        terran = create_result(Race.Terran, "rush")
+        protoss = create_result(Race.Protoss, "macro")
+        store.write(terran)
+        store.write(protoss)
+
+        assert store.last_result().guid == protoss.guid
+        assert store.last_result_as_race(Race.Terran).guid == terran.guid
+        assert store.last_result_as_race(Race.Terran).my_race == Race.Terran
+        assert store.last_result_as_race(Race.Zerg) is None
+        assert store.last_result_with_build("rush").guid == terran.guid
+
+    def test_writing_same_game_updates_result(self, tmp_path):
+        store = OpponentStore(os.path.join(tmp_path, "1.db"))
+        result = create_result(Race.Terran, "rush")
+        store.write(result)
+        result.result = -1
+        result.game_duration = 300.0
+        store.write(result)
+
+        assert store.count() == 1
+        assert store.last_result().result == -1
+        assert store.last_result().game_duration == 300.0
+
+    def test_migrate_json(self, tmp_path):
+        data = OpponentData()
+        data.results = [create_result(Race.Terran, "rush"), create_result(Race.Zerg, "macro")]
+        json_path = os.path.join(tmp_path, "1.json")
+        write_json(json_path, data)
+
+        store = OpponentStore(os.path.join(tmp_path, "1.db"))
+        assert migrate_json(json_path, store) == 2
+
+        assert [result.guid for result in store.results()] == [result.guid for result in data.results]
+        assert store.last_result().my_race == Race.Zerg
+
+    def test_migrate_json_file(self, tmp_path):
+        data = OpponentData()
+        data.results = [create_result(Race.Terran, "rush")]
+        json_path = os.path.join(tmp_path, "1.json")
+        write_json(json_path, data)
+        db_path = os.path.join(tmp_path, "1.db")
+
+        assert migrate_json_file(json_path, db_path) == 1
+
+        assert sorted(os.listdir(tmp_path)) == ["1.db", "1.json"]
+        store = OpponentStore(db_path)
+        assert store.last_result().guid == data.results[0].guid
+        store.close()
+
+    def test_failed_migration_does_not_create_store(self, tmp_path):
+        json_path = os.path.join(tmp_path, "1.json")
+        with open(json_path, "w") as handle:
+            handle.write("{broken")
+        db_path = os.path.join(tmp_path, "1.db")
+
+        with pytest.raises(Exception):
+            migrate_json_file(json_path, db_path)
+
+        assert sorted(os.listdir(tmp_path)) == ["1.json"]
@@ -0,0 +1,158 @@
+import time
+from typing import Awaitable, Callable, List, Optional
+
+# Share of the period that a job can be postponed to keep a step within the budget
+MAX_DELAY_RATIO = 0.5
+
+
+class ScheduledJob:
+    """
+    Periodic job registered to Scheduler. Drop-in replacement for IntervalFunc.
+
+    The job runs when it is executed for the first time, then at most once per period. Calling execute
+    when the job is not due returns the result of the latest run.
+    """
+
+    def __init__(self, scheduler: "Scheduler", name: str, func: Callable, period: float, cost: float):
+        self.scheduler = scheduler
+        self.name = name
+        self.func = func
+        self.period = period
+        # Estimated run time in milliseconds, updated with measured run times
+        self.cost = cost
+        # Delay from the first run to the second, which spreads jobs with similar periods to different steps
+        self.offset = period
+        self.next_time: Optional[float] = None
+        self.cached_value = None
+
+        self.runs = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def execute(self):
+        if self.scheduler.claim(self):
+            start = time.perf_counter_ns()
+            self.cached_value = self.func()
+            self._finish(start)
+        return self.cached_value
+
+    def _finish(self, start_ns: int):
+        ms = (time.perf_counter_ns() - start_ns) / 1000 / 1000
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.cost = self.cost * 0.8 + ms * 0.2
+
+    @property
+    def average_lateness(self) -> float:
+        return self.total_lateness / max(1, self.runs)
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / max(1, self.runs)
+
+
+class ScheduledJobAsync(ScheduledJob):
+    """Same as ScheduledJob for coroutine functions, replaces IntervalFuncAsync."""
+
+    async def execute(self):
+        if self.scheduler.claim(self):
+            start = time.perf_counter_ns()
+            self.cached_value = await self.func()
+            self._finish(start)
+        return self.cached_value
+
+
+class Scheduler:
+    """
+    Runs periodic jobs of managers so that their expensive steps don't land on the same game step.
+
+    Every job has a period in game seconds and a cost estimate in milliseconds. Jobs are given different phases
+    when they are registered, and on every step the jobs that are due run until the step budget is used.
+    The rest are postponed to the next steps, up to half of their period. Lateness of every run is recorded.
+    """
+
+    def __init__(self, budget_ms: float = 5):
+        self.budget_ms = budget_ms
+        self.jobs: List[ScheduledJob] = []
+        self.time = 0.0
+        self.step_length = 1 / 22.4
+        self.spent_ms = 0.0
+
+    def register(self, name: str, func: Callable[[], object], period: float, cost: float = 1) -> ScheduledJob:
+        """
+        Registers a periodic job. Call execute of the returned job on every step where it could run.
+
+        @param name: Name for statistics
+        @param func: Function to run
+        @param period: Time between runs in game seconds
+        @param cost: Estimated run time in milliseconds
+        """
+        return self._add(ScheduledJob(self, name, func, period, cost))
+
+    def register_async(
+        self, name: str, func: Callable[[], Awaitable[object]], period: float, cost: float = 1
+    ) -> ScheduledJobAsync:
+        """Same as register for coroutine functions."""
+        return self._add(ScheduledJobAsync(self, name, func, period, cost))
+
+    def _add(self, job: ScheduledJob) -> ScheduledJob:
+        job.offset = self._least_loaded_offset(job)
+        self.jobs.append(job)
+        return job
+
+    def _least_loaded_offset(self, new_job: ScheduledJob) -> float:
+        """Delay to the second run of the job, chosen so that the job runs on the same steps with as few other jobs
+        as possible. Jobs are assumed to run for the first time on the same step."""
+        step = max(self.step_length, 1e-3)
+        slots = max(1, int(new_job.period / step))
+        horizon = max([new_job.period] + [job.period for job in self.jobs]) * 4
+
+        def load(offset: float) -> float:
+            total = 0.0
+            t = offset
+            while t < horizon:
+                for job in self.jobs:
+                    phase = (t - job.offset) % job.period
+                    if min(phase, job.period - phase) < step / 2:
+                        total += job.cost
+                t += new_job.period
+            return total
+
+        candidates = [new_job.period - i * step for i in range(slots)]
+        return min(candidates, key=load)
+
+    def begin_step(self, game_time: float, game_step: int):
+        self.time = game_time
+        self.step_length = game_step / 22.4
+        self.spent_ms = 0.0
+
+    def claim(self, job: ScheduledJob) -> bool:
+        """True if the job should run now. Records the run."""
+        if job.next_time is None:
+            lateness = 0.0
+            job.next_time = self.time + job.offset
+        else:
+            lateness = self.time - job.next_time
+            if lateness < 0:
+                return False
+            if self.spent_ms > 0 and self.spent_ms + job.cost > self.budget_ms:
+                if lateness + self.step_length <= job.period * MAX_DELAY_RATIO:
+                    # Postpone to a step with less work
+                    return False
+            while job.next_time <= self.time:
+                job.next_time += job.period
+
+        self.spent_ms += job.cost
+        job.runs += 1
+        job.total_lateness += lateness
+        job.max_lateness = max(job.max_lateness, lateness)
+        return True
+
+    def summary(self) -> List[str]:
+        return [
+            f"{job.name}: {job.runs} runs, {job.average_ms:.2f} ms avg, {job.max_ms:.2f} ms max, "
+            f"{job.average_lateness:.2f} s late avg, {job.max_lateness:.2f} s late max"
+            for job in self.jobs
+        ]
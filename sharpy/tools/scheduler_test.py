@@ -0,0 +1,44 @@
+from .scheduler import Scheduler
+
+
+def run_steps(scheduler: Scheduler, steps: int, game_step: int = 4):
+    """Runs every job on every step and returns the steps on which each job ran."""
+    ran = {job.name: [] for job in scheduler.jobs}
+    for step in range(steps):
+        scheduler.begin_step(step * game_step / 22.4, game_step)
+        for job in scheduler.jobs:
+            runs = job.runs
+            job.execute()
+            if job.runs > runs:
+                ran[job.name].append(step)
+    return ran
+
+
+class TestScheduler:
+    def test_jobs_with_same_period_run_on_different_steps(self):
+        scheduler = Scheduler(budget_ms=100)
+        scheduler.begin_step(0, 4)
+        scheduler.register("a", lambda: 1, 1, cost=5)
+        scheduler.register("b", lambda: 2, 1, cost=5)
+
+        ran = run_steps(scheduler, 60)
+
+        assert ran["a"][0] == ran["b"][0] == 0
+        assert not set(ran["a"][1:]) & set(ran["b"][1:])
+        assert len(ran["a"]) == len(ran["b"]) == 11
+
+    def test_step_budget_postpones_jobs(self):
+        scheduler = Scheduler(budget_ms=5)
+        scheduler.begin_step(0, 4)
+        jobs = [scheduler.register(str(i), lambda: None, 2, cost=4) for i in range(3)]
+        for job in jobs:
+            job.offset = 2
+            job.cost = 4
+        jobs[0].func = lambda: "value"
+
+        ran = run_steps(scheduler, 40)
+
+        # All jobs are due at the same time, but only one of them fits the budget on each step
+        assert [runs[1] for runs in ran.values()] == [12, 13, 14]
+        assert jobs[2].max_lateness > jobs[0].max_lateness
+        assert jobs[0].execute() == "value"
@@ -0,0 +1,159 @@
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from sc2pathlib.mappings import VisionStatus
+
+# Ground units see terrain that is at most this much higher than their own cell, about half of a cliff level.
+# test_cliff_vision_matches_native_map compares this to the vision of the native map.
+HEIGHT_TOLERANCE = 8
+# Units that moved less than this since their stamp was drawn keep the stamp
+MOVE_TOLERANCE = 0.1
+
+
+class VisionStamp(NamedTuple):
+    x: float
+    y: float
+    sight_range: float
+    flying: bool
+    detector: bool
+    area: Tuple[slice, slice]
+    mask: np.ndarray
+
+
+class VisionMap:
+    """
+    Grid of the cells that enemy units see, in [x, y] order like the grids of sc2pathlib.
+
+    Every unit draws a stamp of the cells within its sight range. Ground units don't see higher terrain.
+    Stamps are kept between updates by unit tag and the grid keeps a count of stamps on every cell,
+    so an update only draws the stamps of units that moved, appeared or disappeared.
+    """
+
+    def __init__(self, terrain_height: np.ndarray):
+        """
+        @param terrain_height: Terrain height in [y, x] order as in GameInfo.terrain_height.data_numpy
+        """
+        self.height = np.ascontiguousarray(terrain_height.T).astype(np.int16)
+        self.seen_count = np.zeros(self.height.shape, dtype=np.int16)
+        self.detected_count = np.zeros(self.height.shape, dtype=np.int16)
+        self.stamps: Dict[int, VisionStamp] = {}
+        # Number of stamps drawn during the latest update
+        self.redrawn = 0
+        # Number of stamps removed during the latest update
+        self.removed = 0
+
+    def update(
+        self,
+        tags: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        sight_range: np.ndarray,
+        flying: np.ndarray,
+        detector: np.ndarray,
+    ):
+        """
+        Sets the units that give vision. All arguments are arrays with one value per unit.
+        """
+        tags = np.asarray(tags, dtype=np.int64)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        sight_range = np.asarray(sight_range, dtype=float)
+        flying = np.asarray(flying, dtype=bool)
+        detector = np.asarray(detector, dtype=bool)
+
+        old = self.stamps
+        self.stamps = {}
+        self.redrawn = 0
+        self.removed = 0
+
+        # Compare the units to their previous stamps in bulk, so that only the changed units are handled one by one
+        previous = np.array(
+            [(s.x, s.y, s.sight_range, s.flying, s.detector) if s else (np.nan,) * 5 for s in map(old.get, tags)],
+            dtype=float,
+        ).reshape(-1, 5)
+        unchanged = (
+            (np.abs(previous[:, 0] - x) < MOVE_TOLERANCE)
+            & (np.abs(previous[:, 1] - y) < MOVE_TOLERANCE)
+            & (previous[:, 2] == sight_range)
+            & (previous[:, 3] == flying)
+            & (previous[:, 4] == detector)
+        )
+
+        for i in np.flatnonzero(unchanged):
+            tag = int(tags[i])
+            self.stamps[tag] = old.pop(tag)
+
+        for stamp in old.values():
+            self._draw(stamp, -1)
+            self.removed += 1
+
+        for i in np.flatnonzero(~unchanged):
+            stamp = self._stamp(x[i], y[i], sight_range[i], flying[i], detector[i])
+            self.stamps[int(tags[i])] = stamp
+            self._draw(stamp, 1)
+            self.redrawn += 1
+
+    def _stamp(self, x: float, y: float, sight_range: float, flying: bool, detector: bool) -> VisionStamp:
+        width, height = self.height.shape
+        x0 = min(width, max(0, int(x - sight_range)))
+        x1 = min(width, max(0, int(x + sight_range) + 1))
+        y0 = min(height, max(0, int(y - sight_range)))
+        y1 = min(height, max(0, int(y + sight_range) + 1))
+
+        dx = np.arange(x0, x1) + 0.5 - x
+        dy = np.arange(y0, y1) + 0.5 - y
+        mask = dx[:, np.newaxis] ** 2 + dy[np.newaxis, :] ** 2 <= sight_range * sight_range
+
+        if not flying and 0 <= x < width and 0 <= y < height:
+            own_height = self.height[int(x), int(y)]
+            mask &= self.height[x0:x1, y0:y1] <= own_height + HEIGHT_TOLERANCE
+
+        return VisionStamp(x, y, sight_range, flying, detector, (slice(x0, x1), slice(y0, y1)), mask)
+
+    def _draw(self, stamp: VisionStamp, sign: int):
+        self.seen_count[stamp.area] += sign * stamp.mask
+        if stamp.detector:
+            self.detected_count[stamp.area] += sign * stamp.mask
+
+    def vision_status(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Vision status of every position as VisionStatus values.
+
+        @param positions: Array of shape (n, 2) of x, y coordinates
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        width, height = self.height.shape
+        xs = positions[:, 0].astype(int)
+        ys = positions[:, 1].astype(int)
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs = xs[inside]
+        ys = ys[inside]
+
+        status = np.full(len(positions), VisionStatus.NotSeen, dtype=np.uint8)
+        status[inside] = np.where(
+            self.detected_count[xs, ys] > 0,
+            VisionStatus.Detected,
+            np.where(self.seen_count[xs, ys] > 0, VisionStatus.Seen, VisionStatus.NotSeen),
+        )
+        return status
+
+    def is_seen(self, positions: np.ndarray) -> np.ndarray:
+        """Boolean array telling which of the positions are seen."""
+        return self.vision_status(positions) != VisionStatus.NotSeen
+
+    def is_detected(self, positions: np.ndarray) -> np.ndarray:
+        """Boolean array telling which of the positions are detected."""
+        return self.vision_status(positions) == VisionStatus.Detected
+
+    @property
+    def changed(self) -> bool:
+        """Did the latest update change the vision of any unit."""
+        return self.redrawn > 0 or self.removed > 0
+
+    @property
+    def vision_grid(self) -> np.ndarray:
+        """Grid of VisionStatus values in [x, y] order."""
+        grid = (self.seen_count > 0).astype(np.uint8)
+        grid[self.detected_count > 0] = VisionStatus.Detected
+        return grid
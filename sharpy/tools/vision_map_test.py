@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from sc2pathlib.mappings import VisionStatus
+
+from sc2.position import Rect
+
+from .vision_map import VisionMap
+
+
+def create_vision_map() -> VisionMap:
+    # Low ground on the left half, high ground on the right half, in [y, x] order
+    terrain_height = np.zeros((40, 40), dtype=np.uint8)
+    terrain_height[:, 20:] = 40
+    return VisionMap(terrain_height)
+
+
+def update(vision_map: VisionMap, units):
+    tags, x, y, sight_range, flying, detector = zip(*units) if units else ([],) * 6
+    vision_map.update(tags, x, y, sight_range, flying, detector)
+
+
+class TestVisionMap:
+    def test_ground_units_do_not_see_high_ground(self):
+        vision_map = create_vision_map()
+        update(vision_map, [(1, 15.5, 10.5, 8, False, False), (2, 15.5, 30.5, 8, True, True)])
+
+        positions = np.array([(15.5, 10.5), (22.5, 10.5), (18.5, 10.5), (22.5, 30.5), (15.5, 20.5)])
+        status = vision_map.vision_status(positions)
+
+        assert list(status) == [VisionStatus.Seen, VisionStatus.NotSeen, VisionStatus.Seen, VisionStatus.Detected, 0]
+        assert list(vision_map.is_seen(positions)) == [True, False, True, True, False]
+        assert list(vision_map.is_seen(np.array([(-5, 3), (100, 10)]))) == [False, False]
+
+    def test_only_moved_units_are_redrawn(self):
+        vision_map = create_vision_map()
+        units = [(1, 5.5, 5.5, 4, False, False), (2, 10.5, 10.5, 4, False, True), (3, 30.5, 30.5, 4, True, False)]
+        update(vision_map, units)
+        assert vision_map.redrawn == 3
+
+        update(vision_map, [units[0], (2, 10.55, 10.5, 4, False, True), (3, 34.5, 30.5, 4, True, False)])
+        assert vision_map.redrawn == 1
+        assert vision_map.is_seen(np.array([(36.5, 30.5)]))[0]
+        assert not vision_map.is_seen(np.array([(27.5, 30.5)]))[0]
+
+        update(vision_map, [units[0], (2, 10.55, 10.5, 4, False, True), (3, 34.5, 30.5, 4, True, False)])
+        assert not vision_map.changed
+
+        update(vision_map, [units[0]])
+        assert vision_map.redrawn == 0
+        assert vision_map.changed
+        assert not vision_map.is_detected(np.array([(10.5, 10.5)]))[0]
+        assert vision_map.detected_count.sum() == 0
+
+        update(vision_map, [])
+        assert vision_map.seen_count.sum() == 0
+
+    def test_cliff_vision_matches_native_map(self):
+        Sc2Map = pytest.importorskip("sc2pathlib").Sc2Map
+        # One cliff level between the halves, in [y, x] order
+        terrain_height = np.full((40, 40), 200, dtype=np.uint8)
+        terrain_height[:, 20:] = 216
+        grid = np.ones((40, 40), dtype=np.uint8)
+        native = Sc2Map(grid, grid, terrain_height, Rect((0, 0, 40, 40)))
+        vision_map = VisionMap(terrain_height)
+
+        units = [(1, 15.5, 10.5, 8, False, False), (2, 25.5, 30.5, 8, False, False)]
+        native.clear_vision()
+        for _, x, y, sight_range, flying, detector in units:
+            native.add_vision_params(detector, flying, (x, y), sight_range)
+        native.calculate_vision()
+        update(vision_map, units)
+
+        # Low ground, high ground next to the low ground unit, low ground and high ground next to the high ground unit
+        positions = [(12.5, 10.5), (22.5, 10.5), (20.5, 30.5), (28.5, 30.5)]
+        expected = [native.vision_status(position) for position in positions]
+
+        assert list(vision_map.vision_status(np.array(positions))) == expected
+        assert expected == [VisionStatus.Seen, VisionStatus.NotSeen, VisionStatus.Seen, VisionStatus.Seen]
@@ -0,0 +1,92 @@
+"""
+Compares reading and writing opponent data with jsonpickle and with the SQLite opponent store.
+
+Usage: python tools/benchmark_opponent_store.py [games]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(1, "python-sc2")
+
+import jsonpickle
+
+from sc2.data import Race
+from sharpy.tools.opponent_data import GameResult, OpponentData
+from sharpy.tools.opponent_store import OpponentStore, migrate_json, read_json_data
+
+
+def create_result() -> GameResult:
+    result = GameResult()
+    result.my_race = random.choice([Race.Protoss, Race.Terran, Race.Zerg])
+    result.enemy_race = Race.Zerg
+    result.result = random.choice([-1, 0, 1])
+    result.build_used = random.choice(["macro", "rush", "air", "proxy"])
+    result.enemy_build = random.randint(0, 10)
+    result.enemy_macro_build = random.randint(0, 5)
+    result.first_attacked = random.uniform(100, 500)
+    result.game_duration = random.uniform(200, 1500)
+    return result
+
+
+def measure(name: str, func, repeat: int = 5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    duration = (time.perf_counter() - start) / repeat
+    print(f"{name:<40} {duration * 1000:10.3f} ms")
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = OpponentData()
+    data.enemy_id = "benchmark"
+    data.results = [create_result() for _ in range(games)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = os.path.join(folder, "benchmark.json")
+        store_path = os.path.join(folder, "benchmark.db")
+        with open(json_path, "w") as handle:
+            handle.write(jsonpickle.encode(data))
+
+        store = OpponentStore(store_path)
+        migrate_json(json_path, store)
+        store.close()
+
+        print(
+            f"{games} games, json {os.path.getsize(json_path) // 1024} kB, db {os.path.getsize(store_path) // 1024} kB"
+        )
+
+        def json_start():
+            loaded = read_json_data(json_path)
+            _ = loaded.results[-1]
+            _ = next(result for result in reversed(loaded.results) if result.my_race == Race.Terran)
+
+        def json_write():
+            loaded = read_json_data(json_path)
+            loaded.results.append(create_result())
+            with open(json_path, "w") as handle:
+                handle.write(jsonpickle.encode(loaded))
+
+        def store_start():
+            opened = OpponentStore(store_path)
+            _ = opened.last_result()
+            _ = opened.last_result_as_race(Race.Terran)
+            opened.close()
+
+        def store_write():
+            opened = OpponentStore(store_path)
+            opened.write(create_result())
+            opened.close()
+
+        measure("jsonpickle: start and last results", json_start)
+        measure("jsonpickle: write result", json_write)
+        measure("store: start and last results", store_start)
+        measure("store: write result", store_write)
+
+
+if __name__ == "__main__":
+    main()
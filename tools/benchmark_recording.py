@@ -0,0 +1,47 @@
+"""
+Plays back a game recorded with GameRecorder and prints how long each step and manager took.
+
+Record games by setting record_game = yes in config.ini, recordings are saved to the recordings folder.
+
+Usage: python tools/benchmark_recording.py <recording> [module:BotClass] [max frames]
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(1, "python-sc2")
+
+from sc2.main import logger
+from sharpy.tools.game_player import GamePlayer
+
+
+def bot_factory(definition: str):
+    module_name, class_name = definition.split(":")
+    bot_type = getattr(importlib.import_module(module_name), class_name)
+    return lambda: bot_type()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    file_name = sys.argv[1]
+    factory = bot_factory(sys.argv[2] if len(sys.argv) > 2 else "stockfish:Stockfish")
+    max_frames = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    # Bot logging would dominate the measurements
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    player = GamePlayer(file_name, factory)
+    result = asyncio.run(player.play(max_frames))
+
+    print(f"{file_name}: {result.frames} steps, {player.client.actions_sent} actions, {player.client.queries} queries")
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
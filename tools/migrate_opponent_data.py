@@ -0,0 +1,35 @@
+"""
+Converts opponent data files saved with jsonpickle to the SQLite opponent store.
+
+Usage: python tools/migrate_opponent_data.py [data folder]
+"""
+
+import os
+import sys
+
+sys.path.insert(1, "python-sc2")
+
+from sharpy.tools.opponent_store import OpponentStore, migrate_json
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else "data"
+
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.endswith(".json"):
+            continue
+
+        json_path = os.path.join(folder, file_name)
+        store_path = os.path.join(folder, file_name[: -len(".json")] + ".db")
+
+        try:
+            store = OpponentStore(store_path)
+            count = migrate_json(json_path, store)
+            store.close()
+            print(f"{json_path}: {count} results migrated to {store_path}")
+        except Exception as e:
+            print(f"{json_path}: migration failed: {e}")
+
+
+if __name__ == "__main__":
+    main()